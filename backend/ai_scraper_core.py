@@ -4,17 +4,15 @@ Advanced AI-powered scraping architecture with massive parallel processing capab
 """
 
 import asyncio
-import aiohttp
 import random
 import time
 import logging
-from typing import List, Dict, Optional, Any, Union, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any, Union, Tuple, AsyncIterator, Iterable, Sequence, Set
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import json
-import hashlib
-import uuid
+import heapq
+import itertools
 from urllib.parse import urljoin, urlparse, parse_qs
 from collections import defaultdict, deque
 import statistics
@@ -23,6 +21,12 @@ import statistics
 import numpy as np
 from fake_useragent import UserAgent
 
+from near_duplicate_index import MinHashLSHIndex
+from dedup_store import PersistentDigestStore, content_digest, get_shared_digest_store
+from session_pool import get_session_pool
+from domain_credibility import get_domain_resolver
+from url_canonical import SeenURLIndex, url_pattern
+
 # Advanced logging configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -64,50 +68,211 @@ class ScrapingTier(Enum):
     TIER_9_NEWS = "news"
     TIER_10_INTERNATIONAL_MISC = "international_misc"
 
-@dataclass
+# Shared stand-in for empty collections: most tasks and results never fill them, so nothing is allocated per instance
+EMPTY: Tuple = ()
+
+_TIER_CODES = {tier: code for code, tier in enumerate(ScrapingTier)}
+
+def _epoch_seconds(moment: Union[datetime, float, None]) -> float:
+    """UTC epoch seconds of a naive UTC datetime (floats pass through)"""
+    if moment is None:
+        return time.time()
+    if isinstance(moment, datetime):
+        return moment.replace(tzinfo=timezone.utc).timestamp()
+    return float(moment)
+
 class ScrapingTask:
-    """Individual scraping task with AI-powered metadata"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    url: str = ""
-    source_name: str = ""
-    tier: ScrapingTier = ScrapingTier.TIER_6_MEDICAL_SITES
-    content_type: ContentType = ContentType.MEDICAL_ARTICLE
-    priority: ScrapingPriority = ScrapingPriority.MEDIUM
-    retry_count: int = 0
-    max_retries: int = 3
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    scheduled_at: Optional[datetime] = None
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    error_message: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    estimated_processing_time: float = 30.0  # seconds
-    success_probability: float = 0.8
-    content_quality_score: float = 0.0
+    """Individual scraping task with AI-powered metadata
+    (slotted: integer IDs, time.monotonic() timestamps, metadata dict allocated on first use)"""
+
+    __slots__ = ('id', 'url', 'source_name', 'tier', 'content_type', 'priority', 'retry_count', 'max_retries',
+                 'created_at', 'scheduled_at', 'started_at', 'completed_at', 'error_message', '_metadata',
+                 'estimated_processing_time', 'success_probability', 'content_quality_score')
+
+    _ids = itertools.count(1)
+
+    def __init__(self, url: str = "", source_name: str = "",
+                 tier: ScrapingTier = ScrapingTier.TIER_6_MEDICAL_SITES,
+                 content_type: ContentType = ContentType.MEDICAL_ARTICLE,
+                 priority: ScrapingPriority = ScrapingPriority.MEDIUM,
+                 retry_count: int = 0, max_retries: int = 3,
+                 metadata: Optional[Dict[str, Any]] = None,
+                 estimated_processing_time: float = 30.0,  # seconds
+                 success_probability: float = 0.8, content_quality_score: float = 0.0,
+                 id: Optional[int] = None, created_at: Optional[float] = None):
+        self.id = next(ScrapingTask._ids) if id is None else id
+        self.url = url
+        self.source_name = source_name
+        self.tier = tier
+        self.content_type = content_type
+        self.priority = priority
+        self.retry_count = retry_count
+        self.max_retries = max_retries
+        self.created_at = time.monotonic() if created_at is None else created_at
+        self.scheduled_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+        self.error_message: Optional[str] = None
+        self._metadata = metadata or None
+        self.estimated_processing_time = estimated_processing_time
+        self.success_probability = success_probability
+        self.content_quality_score = content_quality_score
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+
+    def __repr__(self) -> str:
+        return f"ScrapingTask(id={self.id}, url={self.url!r}, tier={self.tier.name}, priority={self.priority.name})"
 
-@dataclass
 class ScrapingResult:
-    """Comprehensive scraping result with AI analysis"""
-    task_id: str
-    url: str
-    success: bool
-    content: Optional[str] = None
-    extracted_data: Dict[str, Any] = field(default_factory=dict)
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    processing_time: float = 0.0
-    content_length: int = 0
-    quality_score: float = 0.0
-    confidence_score: float = 0.0
-    extracted_entities: List[str] = field(default_factory=list)
-    medical_concepts: List[str] = field(default_factory=list)
-    error_details: Optional[str] = None
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    """Comprehensive scraping result with AI analysis
+    (slotted: the timestamp is kept as epoch seconds, empty collections share one sentinel)"""
+
+    FIELDS = ('task_id', 'url', 'success', 'content', 'extracted_data', 'metadata', 'processing_time',
+              'content_length', 'quality_score', 'confidence_score', 'extracted_entities', 'medical_concepts',
+              'error_details', 'timestamp', 'content_digest')
+
+    __slots__ = ('task_id', 'url', 'success', 'content', '_extracted_data', '_metadata', 'processing_time',
+                 'content_length', 'quality_score', 'confidence_score', 'extracted_entities', 'medical_concepts',
+                 'error_details', '_timestamp', 'content_digest')
+
+    def __init__(self, task_id: str, url: str, success: bool, content: Optional[str] = None,
+                 extracted_data: Optional[Dict[str, Any]] = None, metadata: Optional[Dict[str, Any]] = None,
+                 processing_time: float = 0.0, content_length: int = 0,
+                 quality_score: float = 0.0, confidence_score: float = 0.0,
+                 extracted_entities: Sequence[str] = EMPTY, medical_concepts: Sequence[str] = EMPTY,
+                 error_details: Optional[str] = None, timestamp: Union[datetime, float, None] = None,
+                 content_digest: Optional[int] = None):  # Key of the raw page in the content blob store
+        self.task_id = task_id
+        self.url = url
+        self.success = success
+        self.content = content
+        self._extracted_data = extracted_data or None
+        self._metadata = metadata or None
+        self.processing_time = processing_time
+        self.content_length = content_length
+        self.quality_score = quality_score
+        self.confidence_score = confidence_score
+        self.extracted_entities = extracted_entities or EMPTY
+        self.medical_concepts = medical_concepts or EMPTY
+        self.error_details = error_details
+        self._timestamp = _epoch_seconds(timestamp)
+        self.content_digest = content_digest
+
+    @property
+    def extracted_data(self) -> Dict[str, Any]:
+        if self._extracted_data is None:
+            self._extracted_data = {}
+        return self._extracted_data
+
+    @extracted_data.setter
+    def extracted_data(self, value: Dict[str, Any]):
+        self._extracted_data = value
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]):
+        self._metadata = value
+
+    @property
+    def timestamp(self) -> datetime:
+        """Naive UTC datetime, built on access"""
+        return datetime.utcfromtimestamp(self._timestamp)
+
+    @timestamp.setter
+    def timestamp(self, value: Union[datetime, float]):
+        self._timestamp = _epoch_seconds(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of every field (collections copied)"""
+
+        record = {name: getattr(self, name) for name in self.FIELDS}
+        record['extracted_data'] = dict(record['extracted_data'])
+        record['metadata'] = dict(record['metadata'])
+        record['extracted_entities'] = list(self.extracted_entities)
+        record['medical_concepts'] = list(self.medical_concepts)
+        return record
+
+    def replace(self, **changes: Any) -> 'ScrapingResult':
+        """Copy of the result with some fields changed"""
+
+        copy = ScrapingResult.__new__(ScrapingResult)
+        for name in self.__slots__:
+            setattr(copy, name, getattr(self, name))
+        for name, value in changes.items():
+            setattr(copy, name, value)
+        return copy
+
+    def __repr__(self) -> str:
+        return (f"ScrapingResult(task_id={self.task_id!r}, url={self.url!r}, success={self.success}, "
+                f"quality_score={self.quality_score:.2f})")
+
+# Structured row layout of TaskTable (22 bytes per task)
+TASK_TABLE_DTYPE = np.dtype([
+    ('priority', np.uint8),
+    ('tier', np.uint8),
+    ('estimated_time', np.float32),
+    ('success_probability', np.float32),
+    ('quality_score', np.float32),
+    ('created_at', np.float64)
+])
+
+class TaskTable:
+    """Scheduling metadata of a batch of tasks as one NumPy structured array (row i describes tasks[i])"""
+
+    def __init__(self, tasks: Iterable[ScrapingTask]):
+        self.tasks = list(tasks)
+        self.rows = np.fromiter(
+            ((task.priority.value, _TIER_CODES[task.tier], task.estimated_processing_time,
+              task.success_probability, task.content_quality_score, task.created_at) for task in self.tasks),
+            dtype=TASK_TABLE_DTYPE, count=len(self.tasks)
+        )
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def sort_order(self, by_priority: bool = False) -> np.ndarray:
+        """Row permutation: higher success probability, then shorter, then higher quality, then older first"""
+
+        rows = self.rows
+        keys = [rows['created_at'], -rows['quality_score'], rows['estimated_time'], -rows['success_probability']]
+        if by_priority:
+            keys.append(rows['priority'])
+        return np.lexsort(keys)  # Last key is the primary one
+
+    def sorted_tasks(self, by_priority: bool = False) -> List[ScrapingTask]:
+        return [self.tasks[i] for i in self.sort_order(by_priority).tolist()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-priority task counts and expected processing time of the batch"""
+
+        rows = self.rows
+        priority_counts = np.bincount(rows['priority'], minlength=len(ScrapingPriority) + 1)
+        return {
+            'tasks': len(rows),
+            'per_priority': {priority.name: int(priority_counts[priority.value]) for priority in ScrapingPriority},
+            'expected_processing_seconds': float(rows['estimated_time'].sum(dtype=np.float64)),
+            'expected_successes': float(rows['success_probability'].sum(dtype=np.float64)),
+            'table_bytes': rows.nbytes
+        }
 
 class ContentDiscoveryAI:
     """AI system for intelligent content discovery and URL generation"""
     
     def __init__(self):
-        self.discovered_urls = set()
+        self.discovered_urls = SeenURLIndex()
         self.url_patterns = defaultdict(list)
         self.content_signatures = set()
         
@@ -123,12 +288,22 @@ class ContentDiscoveryAI:
             discovered.extend(urls)
             
         # Remove duplicates and validate
-        unique_urls = list(set(discovered) - self.discovered_urls)
+        unique_urls = [url for url in dict.fromkeys(discovered) if url not in self.discovered_urls]
         validated_urls = await self._validate_medical_urls(unique_urls)
         
         self.discovered_urls.update(validated_urls)
         return validated_urls
     
+    async def iter_medical_urls(self, base_url: str, medical_category: str) -> AsyncIterator[str]:
+        """Stream validated medical URLs pattern by pattern (duplicates are left to the consuming frontier)"""
+        
+        patterns = await self._generate_medical_url_patterns(base_url, medical_category)
+        
+        for pattern in patterns:
+            urls = await self._expand_url_pattern(pattern, base_url)
+            for url in await self._validate_medical_urls(urls):
+                yield url
+    
     async def _generate_medical_url_patterns(self, base_url: str, category: str) -> List[str]:
         """Generate intelligent URL patterns for medical content"""
         medical_keywords = [
@@ -178,7 +353,7 @@ class ContentDiscoveryAI:
         """Validate URLs contain medical content"""
         validated = []
         
-        async with aiohttp.ClientSession() as session:
+        async with get_session_pool().borrow('default') as session:
             semaphore = asyncio.Semaphore(20)
             
             async def check_url(url):
@@ -500,6 +675,37 @@ class ContentQualityAI:
             'hospital', 'research', 'study', 'trial', 'drug', 'pharmaceutical'
         ])
         
+        # Common medical content sections
+        self.completeness_sections = [
+            'symptom', 'cause', 'treatment', 'diagnosis', 'prevention',
+            'overview', 'description', 'definition', 'background'
+        ]
+        
+        # Technical depth indicators
+        self.technical_indicators = [
+            'study', 'research', 'clinical trial', 'peer-reviewed',
+            'evidence', 'data', 'analysis', 'results', 'conclusion',
+            'methodology', 'randomized', 'controlled', 'systematic review'
+        ]
+        
+        # Sub-score weights: length, relevance, credibility, completeness, technical
+        self.score_weights = [0.15, 0.25, 0.30, 0.20, 0.10]
+        
+        # Batch scoring checks each distinct keyword once. Any occurrence of a keyword of five or more bytes
+        # covers a 4-byte window at an even offset, starting at its first or second byte, so a vectorized pass
+        # over those windows tells which pages can contain it at all
+        self._batch_keywords = sorted(
+            self.medical_keywords | set(self.completeness_sections) | set(self.technical_indicators)
+        )
+        self._keyword_grams = [
+            tuple(int.from_bytes(keyword.encode()[start:start + 4], 'little') for start in (0, 1))
+            if len(keyword.encode()) >= 5 else () for keyword in self._batch_keywords
+        ]
+        self.batch_sample_size = 32
+        self._medical_mask = np.array([k in self.medical_keywords for k in self._batch_keywords])
+        self._section_mask = np.array([k in self.completeness_sections for k in self._batch_keywords])
+        self._technical_mask = np.array([k in self.technical_indicators for k in self._batch_keywords])
+        
     async def assess_content_quality(self, content: str, url: str, metadata: Dict[str, Any] = None) -> float:
         """Assess medical content quality using AI analysis"""
         
@@ -529,11 +735,163 @@ class ContentQualityAI:
         scores.append(technical_score)
         
         # Weighted average (credibility weighted higher)
-        weights = [0.15, 0.25, 0.30, 0.20, 0.10]
-        weighted_score = sum(score * weight for score, weight in zip(scores, weights))
+        weighted_score = sum(score * weight for score, weight in zip(scores, self.score_weights))
         
         return min(1.0, max(0.0, weighted_score))
     
+    async def assess_batch(self, contents: List[str], urls: List[str]) -> np.ndarray:
+        """Assess a batch of documents at once; scores match assess_content_quality"""
+        
+        scores = np.zeros(len(contents))
+        rows = [i for i, content in enumerate(contents) if content and len(content) >= 100]
+        if not rows:
+            return scores
+        
+        # Lowercase each document once and search it only for the keywords that may occur in it
+        lowered = [contents[i].lower() for i in rows]
+        lengths = np.array([len(contents[i]) for i in rows], dtype=float)
+        candidates = np.zeros((len(rows), len(self._batch_keywords)), dtype=bool)
+        word_counts = np.empty(len(rows))
+        
+        # A keyword found in most of the batch's first pages is cheapest to search for directly, since the
+        # scan stops at its first match; the others are first narrowed down to the pages that can contain them
+        sample = lowered[:self.batch_sample_size]
+        filtered = [
+            column for column, keyword in enumerate(self._batch_keywords)
+            if self._keyword_grams[column] and 2 * sum(keyword in content for content in sample) < len(sample)
+        ]
+        gram_filter = self._gram_filter(filtered)
+        
+        for start, stop in self._chunks(lowered):
+            candidates[start:stop], word_counts[start:stop] = self._scan_chunk(
+                lowered[start:stop], filtered, *gram_filter
+            )
+        
+        # Word counts above assume ASCII whitespace
+        for row, content in enumerate(lowered):
+            if not content.isascii():
+                word_counts[row] = len(content.split())
+        
+        candidate_rows, candidate_columns = np.nonzero(candidates)
+        found = np.array([self._batch_keywords[column] in lowered[row]
+                          for row, column in zip(candidate_rows.tolist(), candidate_columns.tolist())], dtype=bool)
+        presence = np.zeros_like(candidates)
+        presence[candidate_rows[found], candidate_columns[found]] = True
+        
+        length_scores = np.select(
+            [lengths < 200, lengths < 500, lengths < 1000, lengths < 2000, lengths < 10000],
+            [0.2, 0.4, 0.6, 0.8, 1.0], default=0.9
+        )
+        
+        medical_counts = presence[:, self._medical_mask].sum(axis=1)
+        density = medical_counts / np.maximum(word_counts, 1)
+        relevance_scores = np.select(
+            [word_counts == 0, density >= 0.05, density >= 0.03, density >= 0.02, density >= 0.01],
+            [0.0, 1.0, 0.8, 0.6, 0.4], default=0.2
+        )
+        
+        credibility_scores = np.array([self._calculate_source_credibility(urls[i]) for i in rows])
+        
+        found_sections = presence[:, self._section_mask].sum(axis=1)
+        completeness_scores = np.minimum(1.0, found_sections / len(self.completeness_sections) * 1.5)
+        
+        found_indicators = presence[:, self._technical_mask].sum(axis=1)
+        technical_scores = np.select(
+            [found_indicators >= 5, found_indicators >= 3, found_indicators >= 2, found_indicators >= 1],
+            [1.0, 0.8, 0.6, 0.4], default=0.2
+        )
+        
+        # Accumulate in the same order as the scalar path so results are bit-identical
+        weighted = np.zeros(len(rows))
+        for sub_scores, weight in zip(
+            [length_scores, relevance_scores, credibility_scores, completeness_scores, technical_scores],
+            self.score_weights
+        ):
+            weighted = weighted + sub_scores * weight
+        
+        scores[rows] = np.minimum(1.0, np.maximum(0.0, weighted))
+        return scores
+    
+    @staticmethod
+    def _gram_hash(grams: np.ndarray) -> np.ndarray:
+        """Bucket 4-byte windows into the gram table (multiplicative hash, top 16 bits)"""
+        return (grams * np.uint32(2654435761)) >> np.uint32(16)
+    
+    def _gram_filter(self, columns: List[int]) -> Tuple[np.ndarray, np.ndarray, List[List[int]]]:
+        """Gram table (hash slot -> 1 + bucket, 0 when empty), each bucket's gram and its keyword columns"""
+        
+        # One bucket per gram; a gram sharing its slot with another joins that bucket, which then matches any gram
+        slot_buckets: Dict[int, int] = {}
+        bucket_grams: List[int] = []
+        bucket_columns: List[List[int]] = []
+        for column in columns:
+            for gram in set(self._keyword_grams[column]):
+                slot = int(self._gram_hash(np.array([gram], dtype=np.uint32))[0])
+                if slot not in slot_buckets:
+                    slot_buckets[slot] = len(bucket_grams)
+                    bucket_grams.append(gram)
+                    bucket_columns.append([])
+                bucket = slot_buckets[slot]
+                if bucket_grams[bucket] != gram:
+                    bucket_grams[bucket] = -1
+                bucket_columns[bucket].append(column)
+        
+        gram_table = np.zeros(1 << 16, dtype=np.uint8 if len(bucket_grams) < 255 else np.uint16)
+        gram_table[list(slot_buckets)] = np.arange(1, len(bucket_grams) + 1)
+        return gram_table, np.array([-1] + bucket_grams, dtype=np.int64), bucket_columns
+    
+    @staticmethod
+    def _chunks(contents: List[str], chunk_chars: int = 1 << 18) -> Iterable[Tuple[int, int]]:
+        """Split documents into consecutive runs of about chunk_chars, bounding the scan's temporary arrays"""
+        
+        start, size = 0, 0
+        for stop, content in enumerate(contents, 1):
+            size += len(content) + 1
+            if size >= chunk_chars:
+                yield start, stop
+                start, size = stop, 0
+        if start < len(contents):
+            yield start, len(contents)
+    
+    def _scan_chunk(self, contents: List[str], filtered: List[int], gram_table: np.ndarray,
+                    bucket_grams: np.ndarray, bucket_columns: List[List[int]]) -> Tuple[np.ndarray, List[int]]:
+        """Candidate keyword mask (a superset of the keywords present) and ASCII word count per document"""
+        
+        # Documents UTF-8 encoded (keeping lone surrogates) and joined by a space: no keyword or word spans two
+        encoded = [content.encode('utf-8', 'surrogatepass') for content in contents]
+        blob = b' '.join(encoded)
+        starts = np.cumsum([0] + [len(data) + 1 for data in encoded[:-1]])
+        codes = np.frombuffer(blob, dtype=np.uint8)
+        
+        # Bytes str.split() treats as whitespace in ASCII text: 9-13 (\t \n \v \f \r) and 28-32 (\x1c-\x1f, space)
+        is_space = ((codes - np.uint8(9)) <= 4) | ((codes - np.uint8(28)) <= 4)
+        word_starts = ~is_space
+        word_starts[1:] &= is_space[:-1]
+        word_counts = [np.count_nonzero(word_starts[start:start + len(data)])
+                       for start, data in zip(starts.tolist(), encoded)]
+        
+        candidates = np.ones((len(encoded), len(self._batch_keywords)), dtype=bool)
+        if not filtered:
+            return candidates, word_counts
+        
+        # 4-byte windows at even offsets, read as two unaligned uint32 views, that equal a bucket's gram
+        hit_buckets = np.zeros((len(encoded), len(bucket_columns) + 1), dtype=bool)
+        for offset in (0, 2):
+            if len(blob) < offset + 4:
+                continue
+            grams = np.frombuffer(blob, dtype='<u4', count=(len(blob) - offset) // 4, offset=offset)
+            slots = np.take(gram_table, self._gram_hash(grams))
+            hits = np.flatnonzero(slots)
+            expected = bucket_grams[slots[hits]]
+            hits = hits[(expected == grams[hits]) | (expected < 0)]
+            documents = np.searchsorted(starts, hits * 4 + offset, side='right') - 1
+            hit_buckets[documents, slots[hits]] = True
+        
+        candidates[:, filtered] = False
+        for bucket, columns in enumerate(bucket_columns, 1):
+            candidates[:, columns] |= hit_buckets[:, bucket, None]
+        return candidates, word_counts
+    
     def _calculate_length_score(self, content: str) -> float:
         """Calculate score based on content length"""
         length = len(content)
@@ -581,51 +939,13 @@ class ContentQualityAI:
     
     def _calculate_source_credibility(self, url: str) -> float:
         """Calculate source credibility score based on URL"""
-        domain = urlparse(url).netloc.lower()
-        
-        # High credibility sources
-        high_credibility = [
-            'nih.gov', 'cdc.gov', 'fda.gov', 'who.int', 'mayoclinic.org',
-            'clevelandclinic.org', 'hopkinsmedicine.org', 'harvard.edu',
-            'stanford.edu', 'nature.com', 'nejm.org', 'bmj.com',
-            'pubmed.ncbi.nlm.nih.gov', 'cochranelibrary.com'
-        ]
-        
-        # Medium credibility sources
-        medium_credibility = [
-            'webmd.com', 'healthline.com', 'medicalnewstoday.com',
-            '.edu', '.org', 'nhs.uk', 'cancer.org', 'heart.org'
-        ]
-        
-        # Check high credibility
-        for source in high_credibility:
-            if source in domain:
-                return 1.0
-                
-        # Check medium credibility
-        for source in medium_credibility:
-            if source in domain:
-                return 0.7
-                
-        # Government domains
-        if '.gov' in domain:
-            return 0.9
-            
-        # Academic domains
-        if '.edu' in domain:
-            return 0.8
-            
-        # Default score
-        return 0.5
+        return get_domain_resolver().profile(urlparse(url).netloc).credibility
     
     def _calculate_completeness_score(self, content: str) -> float:
         """Calculate content completeness score"""
         
         # Check for common medical content sections
-        sections = [
-            'symptom', 'cause', 'treatment', 'diagnosis', 'prevention',
-            'overview', 'description', 'definition', 'background'
-        ]
+        sections = self.completeness_sections
         
         content_lower = content.lower()
         found_sections = sum(1 for section in sections if section in content_lower)
@@ -638,14 +958,8 @@ class ContentQualityAI:
         """Calculate technical quality score"""
         
         # Check for technical indicators
-        technical_indicators = [
-            'study', 'research', 'clinical trial', 'peer-reviewed',
-            'evidence', 'data', 'analysis', 'results', 'conclusion',
-            'methodology', 'randomized', 'controlled', 'systematic review'
-        ]
-        
         content_lower = content.lower()
-        found_indicators = sum(1 for indicator in technical_indicators if indicator in content_lower)
+        found_indicators = sum(1 for indicator in self.technical_indicators if indicator in content_lower)
         
         # Score based on technical depth
         if found_indicators >= 5:
@@ -662,13 +976,25 @@ class ContentQualityAI:
 class IntelligentTaskScheduler:
     """AI-powered intelligent task scheduling system"""
     
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional['AdaptiveRateLimiter'] = None):
         self.task_queues = {priority: deque() for priority in ScrapingPriority}
         self.running_tasks = {}
         self.completed_tasks = []
         self.failed_tasks = []
         self.performance_metrics = defaultdict(list)
         
+        # Worker-pool dispatch: per-domain task heaps keyed by (priority, estimated cost),
+        # plus heaps of ready and throttled domains driven by the rate limiter
+        self.rate_limiter = rate_limiter
+        self._sequence = itertools.count()
+        self._domain_tasks: Dict[str, List[Tuple[int, float, int, ScrapingTask]]] = {}
+        self._ready_domains: List[Tuple[int, float, int, str]] = []
+        self._throttled_domains: List[Tuple[float, int, str]] = []
+        self._throttled: set = set()
+        self._delayed_tasks: List[Tuple[float, int, ScrapingTask]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._open_feeds = 0
+        
     async def schedule_tasks(self, tasks: List[ScrapingTask]) -> Dict[str, List[ScrapingTask]]:
         """Intelligently schedule tasks across queues"""
         
@@ -704,8 +1030,7 @@ class IntelligentTaskScheduler:
                 return ScrapingPriority.HIGH
                 
         # High-quality medical sites get priority boost
-        quality_domains = ['mayo', 'cleveland', 'hopkins', 'harvard', 'stanford', 'who', 'nih', 'cdc']
-        if any(domain in task.url.lower() for domain in quality_domains):
+        if get_domain_resolver().profile(urlparse(task.url).netloc).priority_source:
             if current_priority.value > ScrapingPriority.MEDIUM.value:
                 return ScrapingPriority.MEDIUM
                 
@@ -719,16 +1044,8 @@ class IntelligentTaskScheduler:
     async def _optimize_queue_order(self, tasks: List[ScrapingTask]) -> List[ScrapingTask]:
         """Optimize order of tasks within a priority queue"""
         
-        # Sort by multiple factors
-        def sort_key(task):
-            return (
-                -task.success_probability,  # Higher success probability first
-                task.estimated_processing_time,  # Shorter tasks first
-                -task.content_quality_score,  # Higher quality first
-                task.created_at  # Older tasks first
-            )
-            
-        return sorted(tasks, key=sort_key)
+        # One vectorized multi-key sort over the batch's scheduling columns
+        return TaskTable(tasks).sorted_tasks()
     
     async def get_next_batch(self, batch_size: int = 100) -> List[ScrapingTask]:
         """Get next batch of tasks to process"""
@@ -748,9 +1065,10 @@ class IntelligentTaskScheduler:
             queue = self.task_queues[priority]
             count = int(batch_size * allocation)
             
-            while len(batch) < len(batch) + count and queue:
+            while count > 0 and queue:
                 task = queue.popleft()
                 batch.append(task)
+                count -= 1
                 
         # Fill remaining slots with any available tasks
         remaining_slots = batch_size - len(batch)
@@ -763,6 +1081,127 @@ class IntelligentTaskScheduler:
                 
         return batch
     
+    async def enqueue_tasks(self, tasks: List[ScrapingTask]) -> int:
+        """Prioritize tasks and queue them for the worker pool"""
+        
+        for task in tasks:
+            task.priority = await self._analyze_task_priority(task)
+            self._push_task(task)
+        self._notify()
+        return len(tasks)
+    
+    def submit(self, task: ScrapingTask, delay: float = 0.0):
+        """Queue a task for the worker pool, optionally not before a delay (retries)"""
+        
+        if delay > 0:
+            heapq.heappush(self._delayed_tasks, (time.monotonic() + delay, next(self._sequence), task))
+        else:
+            self._push_task(task)
+        self._notify()
+    
+    def _push_task(self, task: ScrapingTask):
+        """Add a task to its domain heap and advertise the domain if its head changed"""
+        
+        domain = urlparse(task.url).netloc
+        entry = (task.priority.value, task.estimated_processing_time, next(self._sequence), task)
+        domain_heap = self._domain_tasks.setdefault(domain, [])
+        heapq.heappush(domain_heap, entry)
+        
+        # Throttled domains are re-advertised when their permit time comes up
+        if domain not in self._throttled and domain_heap[0] is entry:
+            heapq.heappush(self._ready_domains, (entry[0], entry[1], entry[2], domain))
+    
+    def _advertise_domain(self, domain: str):
+        """Push a domain's current head task onto the ready heap"""
+        
+        domain_heap = self._domain_tasks.get(domain)
+        if domain_heap:
+            priority, cost, seq, _ = domain_heap[0]
+            heapq.heappush(self._ready_domains, (priority, cost, seq, domain))
+        else:
+            self._domain_tasks.pop(domain, None)
+    
+    def _promote_due(self, now: float):
+        """Release delayed tasks and throttled domains whose time has come"""
+        
+        while self._delayed_tasks and self._delayed_tasks[0][0] <= now:
+            _, _, task = heapq.heappop(self._delayed_tasks)
+            self._push_task(task)
+            
+        while self._throttled_domains and self._throttled_domains[0][0] <= now:
+            _, _, domain = heapq.heappop(self._throttled_domains)
+            self._throttled.discard(domain)
+            self._advertise_domain(domain)
+    
+    def _notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def open_feed(self):
+        """Announce a producer that keeps enqueueing tasks; idle workers wait for it instead of exiting"""
+        self._open_feeds += 1
+    
+    def close_feed(self):
+        """A producer opened with open_feed has no more tasks"""
+        self._open_feeds -= 1
+        self._notify()
+    
+    def pending_count(self) -> int:
+        """Number of tasks queued for the worker pool"""
+        return sum(len(heap) for heap in self._domain_tasks.values()) + len(self._delayed_tasks)
+    
+    async def next_task(self) -> Optional[ScrapingTask]:
+        """Wait for the best task on a domain that may be fetched now; None once all work is done"""
+        
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        
+        while True:
+            now = time.monotonic()
+            self._promote_due(now)
+            
+            while self._ready_domains:
+                _, _, seq, domain = heapq.heappop(self._ready_domains)
+                domain_heap = self._domain_tasks.get(domain)
+                
+                # Stale entry - the domain's head changed after this entry was pushed
+                if not domain_heap or domain_heap[0][2] != seq or domain in self._throttled:
+                    continue
+                
+                task = domain_heap[0][3]
+                ready_at = self.rate_limiter.next_permit_time(task.url) if self.rate_limiter else now
+                if ready_at > now:
+                    # Park the domain instead of letting a worker sleep behind it
+                    self._throttled.add(domain)
+                    heapq.heappush(self._throttled_domains, (ready_at, next(self._sequence), domain))
+                    continue
+                
+                heapq.heappop(domain_heap)
+                self._advertise_domain(domain)
+                self.running_tasks[task.id] = task
+                task.started_at = time.monotonic()
+                return task
+            
+            if not self.pending_count() and not self.running_tasks and not self._open_feeds:
+                self._notify()  # Release the other idle workers
+                return None
+            
+            # Sleep until the next domain or delayed task becomes ready, or new work arrives
+            wake_times = [heap[0][0] for heap in (self._throttled_domains, self._delayed_tasks) if heap]
+            timeout = max(0.0, min(wake_times) - now) if wake_times else None
+            
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def task_done(self, task: ScrapingTask):
+        """Mark a dispatched task as finished (resubmit it first to retry)"""
+        
+        self.running_tasks.pop(task.id, None)
+        self._notify()
+    
     def record_task_completion(self, task: ScrapingTask, result: ScrapingResult):
         """Record task completion for learning"""
         
@@ -784,8 +1223,11 @@ class IntelligentTaskScheduler:
 class AdaptiveRateLimiter:
     """Adaptive rate limiting system with AI-powered adjustment"""
     
-    def __init__(self):
-        self.domain_limits = {}
+    def __init__(self, burst_capacity: int = 2):
+        # GCRA state: theoretical arrival time of the next request per domain
+        self.burst_capacity = burst_capacity
+        self.domain_tat: Dict[str, float] = {}
+        self.domain_interval: Dict[str, float] = {}
         self.domain_stats = defaultdict(lambda: {
             'success_count': 0,
             'error_count': 0,
@@ -797,65 +1239,68 @@ class AdaptiveRateLimiter:
         })
         
     async def acquire_permit(self, url: str) -> bool:
-        """Acquire permission to make request with adaptive rate limiting"""
+        """Try to take a permit without waiting; returns False if the domain is too hot"""
         
         domain = urlparse(url).netloc
-        current_time = time.time()
-        
-        # Initialize domain stats if not exists
-        if domain not in self.domain_stats:
-            self.domain_stats[domain] = {
-                'success_count': 0,
-                'error_count': 0,
-                'total_requests': 0,
-                'avg_response_time': 0.0,
-                'last_request_time': 0.0,
-                'consecutive_errors': 0,
-                'rate_limit_detected': False
-            }
-            
         stats = self.domain_stats[domain]
         
-        # Calculate required delay
-        required_delay = await self._calculate_adaptive_delay(domain, stats)
-        
-        # Check if enough time has passed
-        time_since_last = current_time - stats['last_request_time']
+        emission_interval = await self._calculate_adaptive_delay(domain, stats)
+        current_time = time.monotonic()
         
-        if time_since_last < required_delay:
+        tat = max(self.domain_tat.get(domain, current_time), current_time)
+        if tat - (self.burst_capacity - 1) * emission_interval > current_time:
             return False  # Need to wait longer
-            
-        # Update last request time
-        stats['last_request_time'] = current_time
-        stats['total_requests'] += 1
         
+        self._commit_permit(domain, stats, tat, emission_interval)
         return True
     
+    async def wait_for_permit(self, url: str) -> float:
+        """Wait for a permit using GCRA; waiters are served in arrival order. Returns seconds waited"""
+        
+        domain = urlparse(url).netloc
+        stats = self.domain_stats[domain]
+        
+        # Adaptive delay (success rate, errors, 429/503 detection) drives the refill rate
+        emission_interval = await self._calculate_adaptive_delay(domain, stats)
+        current_time = time.monotonic()
+        
+        # Reserve the next conforming slot up front - O(1), and FIFO since reservations are ordered
+        tat = max(self.domain_tat.get(domain, current_time), current_time)
+        start_time = max(current_time, tat - (self.burst_capacity - 1) * emission_interval)
+        self._commit_permit(domain, stats, tat, emission_interval)
+        
+        wait_time = start_time - current_time
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return wait_time
+    
+    def next_permit_time(self, url: str) -> float:
+        """Monotonic time at which the domain's next permit is free (does not reserve it)"""
+        
+        domain = urlparse(url).netloc
+        tat = self.domain_tat.get(domain)
+        if tat is None:
+            return 0.0  # No reservations yet - the domain is free now
+        return tat - (self.burst_capacity - 1) * self.domain_interval.get(domain, 0.0)
+    
+    def _commit_permit(self, domain: str, stats: Dict[str, Any], tat: float, emission_interval: float):
+        """Advance a domain's theoretical arrival time and request counters"""
+        
+        self.domain_tat[domain] = tat + emission_interval
+        self.domain_interval[domain] = emission_interval
+        stats['last_request_time'] = time.time()
+        stats['total_requests'] += 1
+    
     async def _calculate_adaptive_delay(self, domain: str, stats: Dict[str, Any]) -> float:
         """Calculate adaptive delay based on domain performance"""
         
-        # Base delays by domain type
-        base_delays = {
-            '.gov': 3.0,
-            '.edu': 2.0,
-            '.org': 1.5,
-            'who.int': 4.0,
-            'nih.gov': 3.5,
-            'cdc.gov': 3.0,
-            'fda.gov': 3.0
-        }
+        # Base delay by domain type (most specific suffix wins)
+        base_delay = get_domain_resolver().profile(domain).base_delay
         
-        # Determine base delay
-        base_delay = 1.0  # Default
-        for pattern, delay in base_delays.items():
-            if pattern in domain:
-                base_delay = delay
-                break
-                
-        # Adjust based on success rate
-        total_requests = stats['total_requests']
-        if total_requests > 10:
-            success_rate = stats['success_count'] / total_requests
+        # Adjust based on success rate over completed responses (reserved permits still in flight don't count)
+        completed_requests = stats['success_count'] + stats['error_count']
+        if completed_requests > 10:
+            success_rate = stats['success_count'] / completed_requests
             
             if success_rate < 0.5:
                 base_delay *= 3.0  # Increase delay significantly
@@ -901,6 +1346,10 @@ class AdaptiveRateLimiter:
             
             # Detect rate limiting
             if status_code in [429, 503, 502] or stats['consecutive_errors'] >= 3:
+                if not stats['rate_limit_detected']:
+                    # Push back the domain schedule so the next reservations back off immediately
+                    penalty = 10.0 * self.domain_interval.get(domain, 1.0)
+                    self.domain_tat[domain] = max(self.domain_tat.get(domain, 0.0), time.monotonic()) + penalty
                 stats['rate_limit_detected'] = True
                 
         # Update average response time
@@ -912,6 +1361,16 @@ class AdaptiveRateLimiter:
         else:
             stats['avg_response_time'] = response_time
 
+_shared_rate_limiter: Optional[AdaptiveRateLimiter] = None
+
+def get_shared_rate_limiter() -> AdaptiveRateLimiter:
+    """Get the rate limiter shared by every fetch path (per-domain budgets are global)"""
+    
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        _shared_rate_limiter = AdaptiveRateLimiter()
+    return _shared_rate_limiter
+
 class IntelligentProxyRotator:
     """Intelligent proxy rotation system"""
     
@@ -989,65 +1448,93 @@ class IntelligentProxyRotator:
 class AdvancedDeduplicator:
     """Advanced content deduplication system"""
     
-    def __init__(self):
-        self.content_hashes = set()
-        self.similarity_threshold = 0.85
-        self.url_patterns = set()
+    def __init__(self, similarity_threshold: float = 0.85, shingle_size: int = 5,
+                 num_bands: int = 16, rows_per_band: int = 8, max_memory_mb: float = 256.0,
+                 digest_store: Optional[PersistentDigestStore] = None, max_pending: int = 4096):
+        # Exact-match digests live in the persistent store shared by all scrapers
+        self.digest_store = digest_store if digest_store is not None else get_shared_digest_store()
+        self.similarity_threshold = similarity_threshold
+        self.url_patterns = SeenURLIndex(canonicalize=False)
+        
+        # Pages that passed the check but are not extracted and cached yet: url -> (digest, pattern, signature).
+        # They are only recorded on commit(), so a failed or cancelled fetch never marks its own retry a duplicate
+        self.max_pending = max_pending
+        self._pending: Dict[str, Tuple[int, str, Optional[np.ndarray]]] = {}
+        self._pending_digests: Dict[int, str] = {}
+        
+        # MinHash/LSH index for near-duplicate pages (print views, syndicated copies, nav chrome)
+        self.near_duplicate_index = MinHashLSHIndex(
+            num_bands=num_bands,
+            rows_per_band=rows_per_band,
+            shingle_size=shingle_size,
+            similarity_threshold=similarity_threshold,
+            max_memory_mb=max_memory_mb
+        )
         
     async def is_duplicate(self, content: str, url: str, metadata: Dict[str, Any] = None) -> bool:
-        """Check if content is duplicate using multiple methods"""
+        """Check if content is duplicate using multiple methods; a new page is held as pending
+        until commit() records it (or discard() drops it)"""
         
-        # Method 1: Exact hash matching
-        content_hash = hashlib.md5(content.encode()).hexdigest()
-        if content_hash in self.content_hashes:
+        # Method 1: Exact hash matching (including pages in flight under another URL)
+        digest = content_digest(content)
+        if digest in self.digest_store:
+            return True
+        owner = self._pending_digests.get(digest)
+        if owner is not None and owner != url:
             return True
             
         # Method 2: URL pattern matching
-        url_pattern = self._extract_url_pattern(url)
-        if url_pattern in self.url_patterns:
+        pattern = url_pattern(url)
+        if pattern in self.url_patterns:
             return True
             
-        # Method 3: Content similarity (simplified)
-        if await self._is_similar_content(content):
+        # Method 3: Content similarity (MinHash/LSH)
+        signature = self.near_duplicate_index.compute_signature(content)
+        if await self._is_similar_content(signature, url):
             return True
             
         # Method 4: Title and key content matching
         if metadata and await self._is_duplicate_by_metadata(metadata):
             return True
             
-        # Not a duplicate - record signatures
-        self.content_hashes.add(content_hash)
-        self.url_patterns.add(url_pattern)
+        # Not a duplicate - hold the signatures until the page has been extracted and cached
+        self.discard(url)
+        if len(self._pending) >= self.max_pending:
+            self.discard(next(iter(self._pending)))  # Oldest check whose caller never came back
+        self._pending[url] = (digest, pattern, signature)
+        self._pending_digests[digest] = url
         
         return False
     
-    def _extract_url_pattern(self, url: str) -> str:
-        """Extract URL pattern for duplicate detection"""
-        
-        parsed = urlparse(url)
-        
-        # Remove query parameters and fragments
-        clean_path = parsed.path.rstrip('/')
-        
-        # Replace numbers with placeholders for pattern matching
-        import re
-        pattern_path = re.sub(r'/\d+', '/[ID]', clean_path)
-        pattern_path = re.sub(r'page=\d+', 'page=[NUM]', pattern_path)
-        
-        return f"{parsed.netloc}{pattern_path}"
+    def commit(self, url: str):
+        """Record the page checked for url once it has been extracted and cached"""
+        
+        pending = self._pending.pop(url, None)
+        if pending is None:
+            return
+        digest, pattern, signature = pending
+        self._pending_digests.pop(digest, None)
+        self.digest_store.add(digest)
+        self.url_patterns.add(pattern)
+        self.near_duplicate_index.insert(signature, url)
     
-    async def _is_similar_content(self, content: str) -> bool:
-        """Check content similarity (simplified implementation)"""
+    def discard(self, url: str):
+        """Forget the pending page for url (its extraction failed), so a retry is not its own duplicate"""
         
-        # This is a simplified implementation
-        # In production, you might use more sophisticated similarity measures
-        
-        content_words = set(content.lower().split())
+        pending = self._pending.pop(url, None)
+        if pending is not None and self._pending_digests.get(pending[0]) == url:
+            del self._pending_digests[pending[0]]
+    
+    async def _is_similar_content(self, signature: Optional[np.ndarray], url: str) -> bool:
+        """Check content similarity against the MinHash/LSH index"""
         
-        # Compare against stored content signatures (simplified)
-        # This would typically use more advanced techniques like MinHash or SimHash
+        match = self.near_duplicate_index.query(signature)
+        if match is None:
+            return False
         
-        return False  # Placeholder - implement actual similarity checking
+        matched_url, similarity = match
+        logger.debug(f"Near-duplicate of {matched_url} ({similarity:.2f} similarity): {url}")
+        return True
     
     async def _is_duplicate_by_metadata(self, metadata: Dict[str, Any]) -> bool:
         """Check for duplicates based on metadata"""
@@ -1061,9 +1548,20 @@ class AdvancedDeduplicator:
             
         return False  # Placeholder
 
+_shared_deduplicator: Optional[AdvancedDeduplicator] = None
+
+def get_shared_deduplicator() -> AdvancedDeduplicator:
+    """Get the deduplicator shared by all tier scrapers (cross-source duplicates are caught too)"""
+    
+    global _shared_deduplicator
+    if _shared_deduplicator is None:
+        _shared_deduplicator = AdvancedDeduplicator()
+    return _shared_deduplicator
+
 # Export classes for use in other modules
 __all__ = [
-    'ScrapingTask', 'ScrapingResult', 'ScrapingPriority', 'ContentType', 'ScrapingTier',
+    'ScrapingTask', 'ScrapingResult', 'TaskTable', 'ScrapingPriority', 'ContentType', 'ScrapingTier',
     'ContentDiscoveryAI', 'ScraperOptimizationAI', 'AntiDetectionAI', 'ContentQualityAI',
-    'IntelligentTaskScheduler', 'AdaptiveRateLimiter', 'IntelligentProxyRotator', 'AdvancedDeduplicator'
+    'IntelligentTaskScheduler', 'AdaptiveRateLimiter', 'IntelligentProxyRotator', 'AdvancedDeduplicator',
+    'get_shared_deduplicator', 'get_shared_rate_limiter'
 ]
\ No newline at end of file
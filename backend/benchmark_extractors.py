@@ -0,0 +1,151 @@
+"""
+HTML Extractor Benchmark
+Compares the BeautifulSoup and single-pass lxml structured-data extractors on saved pages
+
+Usage: python benchmark_extractors.py [fixture_dir] [repeats]
+       python benchmark_extractors.py --fetch [fixture_dir]
+Fixture files are saved pages named <source>_<anything>.html (e.g. medlineplus_flu.html); --fetch saves
+the FIXTURE_PAGES set. Without fixtures, synthetic MedlinePlus / CDC / FDA pages are generated instead.
+"""
+
+import asyncio
+import glob
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from html_extractors import extract_structured_data, extract_structured_data_lxml
+
+# Saved pages live next to the benchmark so they can be committed (scraper_state/ is not)
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_fixtures')
+
+SOURCE_URLS = {
+    'medlineplus': 'https://medlineplus.gov/ency/article/000080.htm',
+    'cdc': 'https://www.cdc.gov/flu/about/index.html',
+    'fda': 'https://www.fda.gov/drugs/drug-approvals-and-databases/drug-safety'
+}
+
+# Real pages saved by --fetch: short and long articles from each source the extractors serve
+FIXTURE_PAGES = {
+    'medlineplus_flu.html': 'https://medlineplus.gov/flu.html',
+    'medlineplus_ency_000080.html': 'https://medlineplus.gov/ency/article/000080.htm',
+    'medlineplus_druginfo_a682878.html': 'https://medlineplus.gov/druginfo/meds/a682878.html',
+    'cdc_flu_about.html': 'https://www.cdc.gov/flu/about/index.html',
+    'cdc_measles_symptoms.html': 'https://www.cdc.gov/measles/signs-symptoms/index.html',
+    'cdc_diabetes_basics.html': 'https://www.cdc.gov/diabetes/about/index.html',
+    'fda_drug_safety.html': 'https://www.fda.gov/drugs/drug-approvals-and-databases/drug-safety',
+    'fda_recalls.html': 'https://www.fda.gov/safety/recalls-market-withdrawals-safety-alerts',
+    'fda_device_classification.html': 'https://www.fda.gov/medical-devices/overview-device-regulation/classify-your-medical-device'
+}
+
+def _generate_page(source: str, sections: int) -> str:
+    """Build a page with the navigation, sections, lists and scripts typical of a source"""
+
+    nav = ''.join(f'<li><a href="/{source}/topic-{i}/">Topic {i}</a></li>' for i in range(60))
+    body = []
+    for i in range(sections):
+        body.append(
+            f'<section><h2>Symptoms and treatment {i}</h2>'
+            f'<p>Patients with condition {i} commonly report fever, cough and fatigue. About {i + 3}% of '
+            f'cases need hospital care, and public health surveillance tracks outbreaks <b>annually</b>.</p>'
+            f'<!-- section {i} --><h3>Prevention</h3>'
+            f'<ul><li>Wash hands often</li><li>Get vaccinated <a href="/{source}/vaccines/{i}">yearly</a></li>'
+            f'<li>Stay home when sick</li></ul>'
+            f'<p>See also <a href="https://www.nih.gov/">NIH</a> and <a href="#top">back to top</a>.</p>'
+            f'</section>'
+        )
+    return (
+        f'<!DOCTYPE html><html><head><title>{source.upper()} - Influenza</title>'
+        f'<meta name="description" content="{source} influenza overview">'
+        f'<script>window.dataLayer = window.dataLayer || [];</script><style>.nav {{ color: #333; }}</style>'
+        f'</head><body><nav><ul>{nav}</ul></nav><main><h1 class="page-title">Influenza</h1>'
+        f'{"".join(body)}</main><footer><ol><li>Privacy</li><li>Accessibility</li></ol></footer></body></html>'
+    )
+
+def load_fixtures(fixture_dir: str) -> List[Tuple[str, str, str]]:
+    """Load (name, url, html) fixtures, generating pages when none are saved"""
+
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.html'))):
+        name = os.path.basename(path)
+        source = name.split('_', 1)[0]
+        with open(path, encoding='utf-8', errors='replace') as f:
+            url = FIXTURE_PAGES.get(name) or SOURCE_URLS.get(source, SOURCE_URLS['medlineplus'])
+            fixtures.append((name, url, f.read()))
+
+    if not fixtures:
+        print(f"⚠️ No saved pages in {fixture_dir} - timing synthetic pages; run with --fetch for real ones\n")
+        for source, url in SOURCE_URLS.items():
+            for sections in (10, 80):
+                fixtures.append((f'{source}_generated_{sections}.html', url, _generate_page(source, sections)))
+    return fixtures
+
+async def fetch_fixtures(fixture_dir: str = DEFAULT_FIXTURE_DIR) -> List[str]:
+    """Save the FIXTURE_PAGES set as benchmark fixtures; returns the files written"""
+
+    from session_pool import get_session_pool
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    pool = get_session_pool()
+    saved = []
+    try:
+        for name, url in FIXTURE_PAGES.items():
+            try:
+                async with pool.session_for(url).get(url, headers={'User-Agent': 'Mozilla/5.0'}) as response:
+                    if response.status != 200:
+                        print(f"⚠️ {url}: HTTP {response.status}")
+                        continue
+                    html = await response.text()
+            except Exception as e:
+                print(f"⚠️ {url}: {e}")
+                continue
+
+            path = os.path.join(fixture_dir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            saved.append(path)
+            print(f"💾 {name}: {len(html) / 1024:.1f} KB from {url}")
+            await asyncio.sleep(1.0)  # Government sites ask for a polite crawl delay
+    finally:
+        await pool.close()
+    return saved
+
+def time_extractor(extractor, html: str, url: str, repeats: int) -> float:
+    """Best-of-N time in milliseconds for one page"""
+
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        extractor(html, url)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def run_benchmark(fixture_dir: str = DEFAULT_FIXTURE_DIR, repeats: int = 5) -> Dict[str, Dict[str, float]]:
+    """Time both extractors on every fixture and check they agree"""
+
+    results = {}
+    fixtures = load_fixtures(fixture_dir)
+    print(f"{'page':<40} {'size KB':>8} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}  same")
+    for name, url, html in fixtures:
+        same = extract_structured_data(html, url) == extract_structured_data_lxml(html, url)
+        bs4_ms = time_extractor(extract_structured_data, html, url, repeats)
+        lxml_ms = time_extractor(extract_structured_data_lxml, html, url, repeats)
+
+        results[name] = {'bs4_ms': bs4_ms, 'lxml_ms': lxml_ms, 'speedup': bs4_ms / lxml_ms, 'same': same}
+        print(f"{name:<40} {len(html) / 1024:>8.1f} {bs4_ms:>9.2f} {lxml_ms:>9.2f} {bs4_ms / lxml_ms:>7.1f}x  {same}")
+
+    total_bs4 = sum(r['bs4_ms'] for r in results.values())
+    total_lxml = sum(r['lxml_ms'] for r in results.values())
+    if total_lxml:
+        print(f"\n📊 Overall: {total_bs4:.1f} ms -> {total_lxml:.1f} ms ({total_bs4 / total_lxml:.1f}x faster)")
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--fetch':
+        asyncio.run(fetch_fixtures(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_FIXTURE_DIR))
+        sys.exit(0)
+
+    fixture_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FIXTURE_DIR
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run_benchmark(fixture_dir, repeats)
@@ -0,0 +1,310 @@
+"""
+Content Blob Store
+Content-addressed store of raw pages: zstd with a trained dictionary per source, appended to segment files
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+import zstandard as zstd
+
+from dedup_store import content_digest
+
+logger = logging.getLogger(__name__)
+
+# Location of the blob store directory (overridable for multi-crawl deployments)
+DEFAULT_BLOB_STORE_PATH = os.environ.get(
+    'SCRAPER_BLOB_STORE_PATH',
+    os.path.join('scraper_state', 'content_blobs')
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        digest BLOB PRIMARY KEY,
+        source TEXT NOT NULL,
+        dictionary_id INTEGER NOT NULL,
+        segment INTEGER NOT NULL,
+        offset INTEGER NOT NULL,
+        length INTEGER NOT NULL,
+        raw_length INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dictionaries (
+        dictionary_id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL UNIQUE,
+        data BLOB NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS segments (
+        segment INTEGER PRIMARY KEY,
+        pid INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """
+)
+
+_NO_DICTIONARY = 0
+
+def _digest_key(digest: int) -> bytes:
+    return digest.to_bytes(8, 'little')
+
+class ContentBlobStore:
+    """Stores each distinct page once, keyed by its 64-bit content digest"""
+
+    def __init__(self, path: str = DEFAULT_BLOB_STORE_PATH, segment_max_bytes: int = 256 * 1024 * 1024,
+                 compression_level: int = 6, dictionary_samples: int = 64, dictionary_size: int = 112 * 1024,
+                 sample_max_bytes: int = 64 * 1024, max_sample_bytes: int = 32 * 1024 * 1024,
+                 commit_interval: int = 500):
+        self.path = path
+        self.segment_max_bytes = segment_max_bytes
+        self.compression_level = compression_level
+        self.dictionary_samples = dictionary_samples
+        self.dictionary_size = dictionary_size
+        self.sample_max_bytes = sample_max_bytes
+        self.max_sample_bytes = max_sample_bytes
+        self.commit_interval = commit_interval
+
+        os.makedirs(path, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(path, 'index.sqlite3'), timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+        # Per-source compressors; sources without a trained dictionary yet collect (truncated) samples
+        # for one, within a byte budget shared by all sources
+        self._compressors: Dict[str, Tuple[int, zstd.ZstdCompressor]] = {}
+        self._decompressors: Dict[int, zstd.ZstdDecompressor] = {}
+        self._samples: Dict[str, List[bytes]] = {}
+        self._sample_bytes = 0
+        self._untrainable: set = set()
+        self._plain_compressor = zstd.ZstdCompressor(level=compression_level)
+        for dictionary_id, source, data in self._conn.execute('SELECT dictionary_id, source, data FROM dictionaries'):
+            self._compressors[source] = (dictionary_id, self._dictionary_compressor(data))
+
+        # Every open store appends to segments of its own (reserved on first write),
+        # so several processes can share the directory
+        self._segment: Optional[int] = None
+        self._writer = None
+        self._readers: Dict[int, int] = {}
+        self._pending_rows: List[Tuple] = []
+        self._pending_keys: set = set()
+
+        self.stored = 0
+        self.deduplicated = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"segment-{segment:05d}.zst")
+
+    def _reserve_segment(self) -> int:
+        # One statement, so reading the highest segment and claiming the next happen under the same write lock
+        # even when another process reserves at the same time; segment is the rowid
+        with self._conn:
+            return self._conn.execute(
+                'INSERT INTO segments (segment, pid, created_at) '
+                'SELECT COALESCE(MAX(segment), 0) + 1, ?, ? '
+                'FROM (SELECT segment FROM segments UNION ALL SELECT segment FROM blobs)',
+                (os.getpid(), time.time())
+            ).lastrowid
+
+    def _dictionary_compressor(self, data: bytes) -> zstd.ZstdCompressor:
+        return zstd.ZstdCompressor(level=self.compression_level, dict_data=zstd.ZstdCompressionDict(data))
+
+    def _compressor_for(self, source: str, raw: bytes) -> Tuple[int, zstd.ZstdCompressor]:
+        """Dictionary compressor of a source, training its dictionary once enough pages were seen"""
+
+        entry = self._compressors.get(source)
+        if entry is not None:
+            return entry
+        if source in self._untrainable:
+            return _NO_DICTIONARY, self._plain_compressor
+
+        # Page heads carry most of a site's shared boilerplate, so samples are truncated
+        sample = raw[:self.sample_max_bytes]
+        samples = self._samples.setdefault(source, [])
+        samples.append(sample)
+        self._sample_bytes += len(sample)
+        self._evict_samples(source)
+        if len(samples) < self.dictionary_samples:
+            return _NO_DICTIONARY, self._plain_compressor
+
+        del self._samples[source]
+        self._sample_bytes -= sum(len(sample) for sample in samples)
+        try:
+            dictionary = zstd.train_dictionary(self.dictionary_size, samples)
+        except zstd.ZstdError as e:
+            # Too little material for a dictionary - this source stays on plain zstd for the rest of the run
+            logger.warning(f"⚠️ Dictionary training for {source} failed, storing it without a dictionary: {e}")
+            self._untrainable.add(source)
+            return _NO_DICTIONARY, self._plain_compressor
+
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO dictionaries (source, data) VALUES (?, ?)', (source, dictionary.as_bytes())
+            )
+
+        # Another process sharing the store may have trained this source's dictionary first - use that one
+        dictionary_id, data = self._conn.execute(
+            'SELECT dictionary_id, data FROM dictionaries WHERE source = ?', (source,)
+        ).fetchone()
+        entry = (dictionary_id, self._dictionary_compressor(data))
+        self._compressors[source] = entry
+        logger.info(f"🗜️ Trained {len(data) // 1024} KB zstd dictionary for {source}")
+        return entry
+
+    def _evict_samples(self, source: str):
+        """Keep collected samples within the shared budget by dropping the sources furthest from training"""
+
+        while self._sample_bytes > self.max_sample_bytes:
+            others = [name for name in self._samples if name != source]
+            if others:
+                victim = min(others, key=lambda name: len(self._samples[name]))
+                self._sample_bytes -= sum(len(sample) for sample in self._samples.pop(victim))
+            else:
+                self._sample_bytes -= len(self._samples[source].pop(0))
+
+    def __contains__(self, digest: int) -> bool:
+        key = _digest_key(digest)
+        if key in self._pending_keys:
+            return True
+        return self._conn.execute('SELECT 1 FROM blobs WHERE digest = ?', (key,)).fetchone() is not None
+
+    def put(self, content: str, source: str, digest: Optional[int] = None) -> int:
+        """Store a page unless an identical one is already stored; returns its content digest"""
+
+        digest = digest if digest is not None else content_digest(content)
+        if digest in self:
+            self.deduplicated += 1
+            return digest
+
+        raw = content.encode('utf-8', 'surrogatepass')
+        dictionary_id, compressor = self._compressor_for(source, raw)
+        blob = compressor.compress(raw)
+
+        if self._writer is None or (self._writer.tell() > 0 and
+                                    self._writer.tell() + len(blob) > self.segment_max_bytes):
+            if self._writer is not None:
+                self._writer.close()
+            self._segment = self._reserve_segment()
+            self._writer = open(self._segment_path(self._segment), 'ab')
+
+        offset = self._writer.tell()
+        self._writer.write(blob)
+
+        key = _digest_key(digest)
+        self._pending_rows.append((key, source, dictionary_id, self._segment, offset, len(blob), len(raw)))
+        self._pending_keys.add(key)
+
+        self.stored += 1
+        self.raw_bytes += len(raw)
+        self.stored_bytes += len(blob)
+        if len(self._pending_rows) >= self.commit_interval:
+            self.flush()
+        return digest
+
+    def get(self, digest: int) -> Optional[str]:
+        """Load a stored page by digest"""
+
+        key = _digest_key(digest)
+        if key in self._pending_keys:
+            self.flush()
+
+        row = self._conn.execute(
+            'SELECT dictionary_id, segment, offset, length FROM blobs WHERE digest = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        dictionary_id, segment, offset, length = row
+
+        fd = self._readers.get(segment)
+        if fd is None:
+            fd = self._readers[segment] = os.open(self._segment_path(segment), os.O_RDONLY)
+        blob = os.pread(fd, length, offset)
+
+        return self._decompressor(dictionary_id).decompress(blob).decode('utf-8', 'surrogatepass')
+
+    def _decompressor(self, dictionary_id: int) -> zstd.ZstdDecompressor:
+        decompressor = self._decompressors.get(dictionary_id)
+        if decompressor is None:
+            if dictionary_id == _NO_DICTIONARY:
+                decompressor = zstd.ZstdDecompressor()
+            else:
+                data = self._conn.execute(
+                    'SELECT data FROM dictionaries WHERE dictionary_id = ?', (dictionary_id,)
+                ).fetchone()[0]
+                decompressor = zstd.ZstdDecompressor(dict_data=zstd.ZstdCompressionDict(data))
+            self._decompressors[dictionary_id] = decompressor
+        return decompressor
+
+    def flush(self):
+        """Write buffered blobs to their segment, then index them"""
+
+        if not self._pending_rows:
+            return
+        self._writer.flush()
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO blobs (digest, source, dictionary_id, segment, offset, length, raw_length) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', self._pending_rows
+            )
+        self._pending_rows.clear()
+        self._pending_keys.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get store statistics"""
+
+        blobs, raw_total, stored_total = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(raw_length), 0), COALESCE(SUM(length), 0) FROM blobs'
+        ).fetchone()
+        return {
+            'blobs_stored': blobs + len(self._pending_rows),
+            'raw_mb': raw_total / (1024 * 1024),
+            'stored_mb': stored_total / (1024 * 1024),
+            'compression_ratio': raw_total / stored_total if stored_total else 0.0,
+            'deduplicated_this_run': self.deduplicated,
+            'trained_dictionaries': len(self._compressors),
+            'sample_mb': self._sample_bytes / (1024 * 1024),
+            'segments': self._conn.execute('SELECT COUNT(*) FROM segments').fetchone()[0],
+            'path': self.path
+        }
+
+    def close(self):
+        """Flush and release files"""
+
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        for fd in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+        self._conn.close()
+
+_shared_stores: Dict[str, ContentBlobStore] = {}
+
+def get_shared_blob_store(path: Optional[str] = None) -> ContentBlobStore:
+    """Get the process-wide blob store for a path, opening it on first use"""
+
+    path = os.path.abspath(path or DEFAULT_BLOB_STORE_PATH)
+    store = _shared_stores.get(path)
+    if store is None:
+        store = ContentBlobStore(path)
+        _shared_stores[path] = store
+    return store
+
+@atexit.register
+def _flush_shared_stores():
+    for store in _shared_stores.values():
+        store.flush()
+
+# Export main classes
+__all__ = ['ContentBlobStore', 'get_shared_blob_store', 'DEFAULT_BLOB_STORE_PATH']
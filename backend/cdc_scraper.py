@@ -7,20 +7,29 @@ Target: 22,000+ documents across diseases, health topics, MMWR reports, and stat
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
 from datetime import datetime, timedelta
 import json
-import random
 import time
-from urllib.parse import urljoin, urlparse, parse_qs, quote
+from urllib.parse import urlparse, parse_qs, quote
 from bs4 import BeautifulSoup
 import re
 from collections import defaultdict
+from contextlib import aclosing
 
 from ai_scraper_core import (
     ScrapingTask, ScrapingResult, ScrapingPriority, ContentType, ScrapingTier,
-    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, AdvancedDeduplicator
+    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, get_shared_deduplicator,
+    get_shared_rate_limiter
 )
+from dedup_store import content_digest
+from blob_store import get_shared_blob_store
+from http_cache import get_shared_http_cache, unchanged_metadata
+from url_canonical import SeenURLIndex
+from session_pool import get_session_pool
+from result_pipeline import ResultPipeline, ResultStatistics, iter_sliding_window
+from html_extractors import get_parsing_stage
+from crawl_checkpoint import get_crawl_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -56,14 +65,21 @@ class CDCAdvancedScraper:
         self.content_discovery = ContentDiscoveryAI()
         self.anti_detection = AntiDetectionAI()
         self.content_quality = ContentQualityAI()
-        self.deduplicator = AdvancedDeduplicator()
+        self.deduplicator = get_shared_deduplicator()
+        self.http_cache = get_shared_http_cache()
+        self.blob_store = get_shared_blob_store()
+        self.rate_limiter = get_shared_rate_limiter()
+        self.result_pipeline = ResultPipeline(successful_samples_only=True)
+        self.checkpoint = get_crawl_checkpoint()
         
         # Performance tracking
-        self.processed_urls = set()
+        self.processed_urls = SeenURLIndex()
         self.success_count = 0
         self.error_count = 0
         self.total_content_size = 0
         self.section_stats = defaultdict(lambda: {'processed': 0, 'successful': 0, 'errors': 0})
+        self.public_health_relevance_total = 0.0
+        self.public_health_scored = 0
         
         # CDC-specific configuration
         self.max_concurrent_per_section = 20  # Respectful rate for CDC
@@ -93,6 +109,10 @@ class CDCAdvancedScraper:
         logger.info(f"⚡ Launching {len(cdc_scraping_tasks)} parallel CDC section extractions")
         results = await asyncio.gather(*cdc_scraping_tasks, return_exceptions=True)
         
+        # A run that finished every section starts from scratch next time
+        if not self.checkpoint.stop_requested and not any(isinstance(r, Exception) for r in results):
+            self.checkpoint.finish_operation('cdc')
+        
         # Process and integrate CDC data
         integrated_cdc_data = await self._integrate_cdc_knowledge(results)
         
@@ -101,223 +121,181 @@ class CDCAdvancedScraper:
         
         return integrated_cdc_data
     
-    async def scrape_disease_conditions_complete(self) -> List[ScrapingResult]:
+    async def scrape_disease_conditions_complete(self) -> ResultStatistics:
         """Scrape comprehensive disease and conditions database"""
         
         logger.info("🦠 Starting CDC Disease Conditions scraping")
         section_name = "diseases_conditions"
         
-        # Discover disease condition URLs using multiple strategies
-        disease_urls = await self._discover_disease_condition_urls()
-        logger.info(f"🔍 Discovered {len(disease_urls)} disease condition URLs")
-        
         return await self._execute_cdc_section_scraping(
-            disease_urls, section_name, "Disease Conditions", batch_size=15
+            self._discover_disease_condition_urls(), section_name, "Disease Conditions", window_size=8
         )
     
-    async def scrape_health_topics_complete(self) -> List[ScrapingResult]:
+    async def scrape_health_topics_complete(self) -> ResultStatistics:
         """Scrape comprehensive health topics"""
         
         logger.info("💚 Starting CDC Health Topics scraping")
         section_name = "health_topics"
         
-        health_topic_urls = await self._discover_health_topic_urls()
-        logger.info(f"🔍 Discovered {len(health_topic_urls)} health topic URLs")
-        
         return await self._execute_cdc_section_scraping(
-            health_topic_urls, section_name, "Health Topics", batch_size=20
+            self._discover_health_topic_urls(), section_name, "Health Topics", window_size=8
         )
     
-    async def scrape_mmwr_reports_complete(self) -> List[ScrapingResult]:
+    async def scrape_mmwr_reports_complete(self) -> ResultStatistics:
         """Scrape MMWR (Morbidity and Mortality Weekly Report) complete archive"""
         
         logger.info("📊 Starting MMWR Reports scraping")
         section_name = "mmwr_reports"
         
-        mmwr_urls = await self._discover_mmwr_report_urls()
-        logger.info(f"🔍 Discovered {len(mmwr_urls)} MMWR report URLs")
-        
         return await self._execute_cdc_section_scraping(
-            mmwr_urls, section_name, "MMWR Reports", batch_size=10
+            self._discover_mmwr_report_urls(), section_name, "MMWR Reports", window_size=8
         )
     
-    async def scrape_health_statistics_complete(self) -> List[ScrapingResult]:
+    async def scrape_health_statistics_complete(self) -> ResultStatistics:
         """Scrape comprehensive health statistics and surveillance data"""
         
         logger.info("📈 Starting Health Statistics scraping")
         section_name = "health_statistics"
         
-        stats_urls = await self._discover_health_statistics_urls()
-        logger.info(f"🔍 Discovered {len(stats_urls)} health statistics URLs")
-        
         return await self._execute_cdc_section_scraping(
-            stats_urls, section_name, "Health Statistics", batch_size=12
+            self._discover_health_statistics_urls(), section_name, "Health Statistics", window_size=8
         )
     
-    async def scrape_vaccination_comprehensive(self) -> List[ScrapingResult]:
+    async def scrape_vaccination_comprehensive(self) -> ResultStatistics:
         """Scrape comprehensive vaccination information"""
         
         logger.info("💉 Starting Vaccination Information scraping")
         section_name = "vaccination_info"
         
-        vaccine_urls = await self._discover_vaccination_urls()
-        logger.info(f"🔍 Discovered {len(vaccine_urls)} vaccination URLs")
-        
         return await self._execute_cdc_section_scraping(
-            vaccine_urls, section_name, "Vaccination", batch_size=15
+            self._discover_vaccination_urls(), section_name, "Vaccination", window_size=8
         )
     
-    async def scrape_travel_health_complete(self) -> List[ScrapingResult]:
+    async def scrape_travel_health_complete(self) -> ResultStatistics:
         """Scrape travel health recommendations and destination-specific guidance"""
         
         logger.info("✈️ Starting Travel Health scraping")
         section_name = "travel_health"
         
-        travel_urls = await self._discover_travel_health_urls()
-        logger.info(f"🔍 Discovered {len(travel_urls)} travel health URLs")
-        
         return await self._execute_cdc_section_scraping(
-            travel_urls, section_name, "Travel Health", batch_size=18
+            self._discover_travel_health_urls(), section_name, "Travel Health", window_size=8
         )
     
-    async def scrape_emergency_preparedness(self) -> List[ScrapingResult]:
+    async def scrape_emergency_preparedness(self) -> ResultStatistics:
         """Scrape emergency preparedness and response guidelines"""
         
         logger.info("🚨 Starting Emergency Preparedness scraping")
         section_name = "emergency_prep"
         
-        emergency_urls = await self._discover_emergency_preparedness_urls()
-        logger.info(f"🔍 Discovered {len(emergency_urls)} emergency preparedness URLs")
-        
         return await self._execute_cdc_section_scraping(
-            emergency_urls, section_name, "Emergency Preparedness", batch_size=12
+            self._discover_emergency_preparedness_urls(), section_name, "Emergency Preparedness", window_size=8
         )
     
-    async def scrape_workplace_health_complete(self) -> List[ScrapingResult]:
+    async def scrape_workplace_health_complete(self) -> ResultStatistics:
         """Scrape workplace health and safety information"""
         
         logger.info("🏢 Starting Workplace Health scraping")
         section_name = "workplace_health"
         
-        workplace_urls = await self._discover_workplace_health_urls()
-        logger.info(f"🔍 Discovered {len(workplace_urls)} workplace health URLs")
-        
         return await self._execute_cdc_section_scraping(
-            workplace_urls, section_name, "Workplace Health", batch_size=15
+            self._discover_workplace_health_urls(), section_name, "Workplace Health", window_size=8
         )
     
-    async def scrape_injury_prevention_complete(self) -> List[ScrapingResult]:
+    async def scrape_injury_prevention_complete(self) -> ResultStatistics:
         """Scrape injury prevention guidelines and data"""
         
         logger.info("🛡️ Starting Injury Prevention scraping")
         section_name = "injury_prevention"
         
-        injury_urls = await self._discover_injury_prevention_urls()
-        logger.info(f"🔍 Discovered {len(injury_urls)} injury prevention URLs")
-        
         return await self._execute_cdc_section_scraping(
-            injury_urls, section_name, "Injury Prevention", batch_size=15
+            self._discover_injury_prevention_urls(), section_name, "Injury Prevention", window_size=8
         )
     
-    async def scrape_environmental_health_complete(self) -> List[ScrapingResult]:
+    async def scrape_environmental_health_complete(self) -> ResultStatistics:
         """Scrape environmental health topics and data"""
         
         logger.info("🌍 Starting Environmental Health scraping")
         section_name = "environmental_health"
         
-        env_urls = await self._discover_environmental_health_urls()
-        logger.info(f"🔍 Discovered {len(env_urls)} environmental health URLs")
-        
         return await self._execute_cdc_section_scraping(
-            env_urls, section_name, "Environmental Health", batch_size=15
+            self._discover_environmental_health_urls(), section_name, "Environmental Health", window_size=8
         )
     
-    async def scrape_chronic_disease_complete(self) -> List[ScrapingResult]:
+    async def scrape_chronic_disease_complete(self) -> ResultStatistics:
         """Scrape chronic disease prevention and management"""
         
         logger.info("⏳ Starting Chronic Disease scraping")
         section_name = "chronic_disease"
         
-        chronic_urls = await self._discover_chronic_disease_urls()
-        logger.info(f"🔍 Discovered {len(chronic_urls)} chronic disease URLs")
-        
         return await self._execute_cdc_section_scraping(
-            chronic_urls, section_name, "Chronic Disease", batch_size=15
+            self._discover_chronic_disease_urls(), section_name, "Chronic Disease", window_size=8
         )
     
-    async def scrape_infectious_disease_complete(self) -> List[ScrapingResult]:
+    async def scrape_infectious_disease_complete(self) -> ResultStatistics:
         """Scrape infectious disease surveillance and prevention"""
         
         logger.info("🦠 Starting Infectious Disease scraping")
         section_name = "infectious_disease"
         
-        infectious_urls = await self._discover_infectious_disease_urls()
-        logger.info(f"🔍 Discovered {len(infectious_urls)} infectious disease URLs")
-        
         return await self._execute_cdc_section_scraping(
-            infectious_urls, section_name, "Infectious Disease", batch_size=12
+            self._discover_infectious_disease_urls(), section_name, "Infectious Disease", window_size=8
         )
     
-    async def _execute_cdc_section_scraping(self, urls: List[str], section_name: str, 
-                                          display_name: str, batch_size: int = 15) -> List[ScrapingResult]:
-        """Execute CDC section scraping with government-appropriate rate limiting"""
-        
-        scraped_results = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=90),  # Longer timeout for CDC
-            connector=aiohttp.TCPConnector(limit=30, limit_per_host=10)  # Conservative limits
-        ) as session:
-            
-            for i in range(0, len(urls), batch_size):
-                batch_urls = urls[i:i + batch_size]
-                
-                logger.info(f"🏛️ {display_name} batch {i//batch_size + 1}/{len(urls)//batch_size + 1}")
-                
-                batch_results = await self._scrape_cdc_url_batch(
-                    batch_urls, session, section_name
-                )
-                scraped_results.extend(batch_results)
-                
-                # Update section statistics
-                successful = sum(1 for r in batch_results if r.success)
-                self.section_stats[section_name]['processed'] += len(batch_results)
-                self.section_stats[section_name]['successful'] += successful
-                self.section_stats[section_name]['errors'] += len(batch_results) - successful
-                
-                # Government-appropriate delay
-                delay = await self._calculate_cdc_delay(successful / len(batch_results) if batch_results else 0)
-                await asyncio.sleep(delay)
-        
-        logger.info(f"✅ {display_name} section complete: {len(scraped_results)} items processed")
-        return scraped_results
-    
-    async def _scrape_cdc_url_batch(self, urls: List[str], session: aiohttp.ClientSession,
-                                   section: str) -> List[ScrapingResult]:
-        """Scrape batch of CDC URLs with appropriate respect and error handling"""
+    async def _execute_cdc_section_scraping(self, urls: AsyncIterator[str], section_name: str, 
+                                          display_name: str, window_size: int = 8) -> ResultStatistics:
+        """Execute CDC section scraping with a small sliding window of in-flight requests"""
         
-        tasks = []
-        semaphore = asyncio.Semaphore(8)  # Very conservative for CDC
+        section_statistics = self.result_pipeline.group_statistics[section_name]
+        section_stats = self.section_stats[section_name]
         
-        async def scrape_single_cdc_url(url: str) -> ScrapingResult:
-            async with semaphore:
-                return await self._extract_cdc_content(url, session, section)
+        # Discovery streams into the section's persistent frontier while fetching drains it;
+        # URLs completed by an earlier run are already marked done there and never refetched
+        frontier = self.checkpoint.start_section('cdc', section_name)
+        discovery = frontier.start_feed(urls)
+        saved_stats = self.checkpoint.load_stats('cdc', section_name)
+        if saved_stats:
+            # Failed URLs are fetched again, so only completed work carries over
+            section_stats['processed'] = section_stats['successful'] = saved_stats['successful']
         
-        for url in urls:
-            task = scrape_single_cdc_url(url)
-            tasks.append(task)
-        
-        # Execute with comprehensive error handling
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        valid_results = []
-        for result in results:
-            if isinstance(result, ScrapingResult):
-                valid_results.append(result)
-            elif isinstance(result, Exception):
-                logger.warning(f"CDC scraping error: {result}")
-        
-        return valid_results
+        try:
+            async with get_session_pool().borrow('cdc') as session:
+                
+                # Government-appropriate pacing comes from the shared rate limiter
+                async with aclosing(iter_sliding_window(
+                    frontier,
+                    lambda url: self._extract_cdc_content(url, session, section_name),
+                    window_size
+                )) as results:
+                    async for result in results:
+                        await self.result_pipeline.process(result, group=section_name)
+                    
+                        if result.success and result.extracted_data:
+                            ph_score = result.extracted_data.get('metadata', {}).get('public_health_relevance', 0)
+                            if ph_score > 0:
+                                self.public_health_relevance_total += ph_score
+                                self.public_health_scored += 1
+                    
+                        # Update section statistics
+                        section_stats['processed'] += 1
+                        if result.success:
+                            section_stats['successful'] += 1
+                            self.checkpoint.mark_completed('cdc', section_name, result.url, section_stats)
+                        else:
+                            section_stats['errors'] += 1
+                    
+                        if section_stats['processed'] % 50 == 0:
+                            logger.info(f"🏛️ {display_name}: {section_stats['processed']} processed, {frontier.pending_count()} queued")
+                        
+                        if self.checkpoint.stop_requested:
+                            logger.info(f"🛑 {display_name}: stopping, progress checkpointed")
+                            break
+        finally:
+            discovery.cancel()
+            self.checkpoint.save_stats('cdc', section_name, section_stats)
+            self.checkpoint.checkpoint()
+        
+        logger.info(f"✅ {display_name} section complete: {section_statistics.processed} items processed")
+        return section_statistics
     
     async def _extract_cdc_content(self, url: str, session: aiohttp.ClientSession, 
                                   section: str) -> ScrapingResult:
@@ -341,11 +319,39 @@ class CDCAdvancedScraper:
                 'Cache-Control': 'max-age=0'
             })
             
+            headers.update(self.http_cache.conditional_headers(url))
+            
+            await self.rate_limiter.wait_for_permit(url)
+            
             start_time = time.time()
             
             async with session.get(url, headers=headers, timeout=60) as response:
+                self.rate_limiter.record_request_result(
+                    url, response.status in (200, 304), time.time() - start_time, response.status
+                )
+                
+                content = await response.text() if response.status == 200 else None
+                digest = content_digest(content) if content is not None else None
+                
+                # Unchanged since last crawl - reuse previous extraction
+                cached = self.http_cache.lookup_unchanged(url, response.status, digest)
+                if cached is not None:
+                    self.processed_urls.add(url)
+                    return ScrapingResult(
+                        task_id=task_id,
+                        url=url,
+                        success=True,
+                        extracted_data=cached.extracted_data,
+                        content_digest=cached.content_digest,
+                        metadata=unchanged_metadata(cached),
+                        processing_time=time.time() - start_time,
+                        content_length=cached.content_length,
+                        quality_score=cached.quality_score,
+                        confidence_score=0.96,
+                        timestamp=datetime.utcnow()
+                    )
+                
                 if response.status == 200:
-                    content = await response.text()
                     processing_time = time.time() - start_time
                     
                     # Check for duplicates
@@ -366,11 +372,18 @@ class CDCAdvancedScraper:
                     # Enhance quality score for CDC (authoritative government source)
                     enhanced_quality_score = min(1.0, quality_score * 1.25)
                     
+                    self.http_cache.store(url, response.headers, digest, extracted_data,
+                                          enhanced_quality_score, len(content))
+                    
+                    # Raw HTML goes to the blob store; the result carries only its digest
+                    self.blob_store.put(content, urlparse(url).netloc, digest)
+                    self.deduplicator.commit(url)
+                    
                     result = ScrapingResult(
                         task_id=task_id,
                         url=url,
                         success=True,
-                        content=content,
+                        content_digest=digest,
                         extracted_data=extracted_data,
                         processing_time=processing_time,
                         content_length=len(content),
@@ -396,6 +409,9 @@ class CDCAdvancedScraper:
                     
         except Exception as e:
             self.error_count += 1
+            self.deduplicator.discard(url)
+            if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                self.rate_limiter.record_request_result(url, False, 0.0)
             return ScrapingResult(
                 task_id=task_id,
                 url=url,
@@ -405,240 +421,22 @@ class CDCAdvancedScraper:
             )
     
     async def _extract_cdc_structured_data(self, content: str, url: str, section: str) -> Dict[str, Any]:
-        """Extract structured data specifically tailored for CDC content"""
-        
-        try:
-            soup = BeautifulSoup(content, 'lxml')
-            
-            extracted = {
-                'title': '',
-                'summary': '',
-                'cdc_section': section,
-                'public_health_content': {},
-                'cdc_specific': {},
-                'surveillance_data': {},
-                'metadata': {},
-                'links': []
-            }
-            
-            # Extract CDC-specific title patterns
-            title_selectors = [
-                'h1.page-title',
-                'h1.content-title',
-                '.hero-title h1',
-                'h1',
-                'title'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    extracted['title'] = title_elem.get_text(strip=True)
-                    break
-            
-            # Extract CDC summary/key points
-            summary_selectors = [
-                '.key-points',
-                '.summary',
-                '.overview',
-                '.highlights',
-                '.fast-facts',
-                '.at-a-glance'
-            ]
-            
-            for selector in summary_selectors:
-                summary_elem = soup.select_one(selector)
-                if summary_elem:
-                    extracted['summary'] = summary_elem.get_text(strip=True)
-                    break
-            
-            # Extract public health sections
-            public_health_sections = {}
-            
-            # Look for CDC-specific medical sections
-            cdc_section_keywords = [
-                ('symptoms', ['symptoms', 'signs and symptoms', 'clinical features']),
-                ('transmission', ['transmission', 'how it spreads', 'spread']),
-                ('prevention', ['prevention', 'protect yourself', 'prevention tips']),
-                ('treatment', ['treatment', 'medical care', 'therapy']),
-                ('surveillance', ['surveillance', 'monitoring', 'tracking']),
-                ('outbreak', ['outbreak', 'epidemic', 'cluster']),
-                ('risk_factors', ['risk factors', 'who is at risk', 'high risk']),
-                ('complications', ['complications', 'severe illness', 'serious outcomes'])
-            ]
-            
-            for section_key, keywords in cdc_section_keywords:
-                section_content = []
-                
-                for keyword in keywords:
-                    # Find headers containing keywords
-                    headers = soup.find_all(['h1', 'h2', 'h3', 'h4'], 
-                        text=re.compile(keyword, re.IGNORECASE))
-                    
-                    for header in headers:
-                        # Get following content
-                        content_elem = header.find_next_sibling(['p', 'div', 'ul'])
-                        if content_elem:
-                            text = content_elem.get_text(strip=True)
-                            if len(text) > 100:
-                                section_content.append(text)
-                
-                if section_content:
-                    public_health_sections[section_key] = section_content[:2]
-            
-            extracted['public_health_content']['sections'] = public_health_sections
-            
-            # Extract CDC-specific elements
-            cdc_specific = {}
-            
-            # Extract fast facts
-            fast_facts = []
-            fact_selectors = ['.fast-facts li', '.key-points li', '.highlights li']
-            
-            for selector in fact_selectors:
-                facts = soup.select(selector)
-                for fact in facts[:10]:
-                    fact_text = fact.get_text(strip=True)
-                    if len(fact_text) > 20:
-                        fast_facts.append(fact_text)
-                if fast_facts:
-                    break
-            
-            cdc_specific['fast_facts'] = fast_facts
-            
-            # Extract statistics and numbers
-            numbers_text = soup.get_text()
-            statistics_patterns = [
-                r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:%|percent|cases?|deaths?|infections?)',
-                r'(\d+(?:,\d+)*)\s*(?:people|individuals|patients?|americans?)',
-                r'(\d+(?:,\d+)*)\s*(?:per\s+\d+(?:,\d+)*|annually|yearly|daily)'
-            ]
-            
-            all_statistics = []
-            for pattern in statistics_patterns:
-                matches = re.findall(pattern, numbers_text, re.IGNORECASE)
-                all_statistics.extend(matches[:5])
-            
-            cdc_specific['statistics'] = all_statistics[:10]
-            
-            # Extract surveillance data indicators
-            surveillance_indicators = []
-            surveillance_keywords = [
-                'incidence', 'prevalence', 'mortality rate', 'case fatality',
-                'outbreak', 'surveillance', 'reporting', 'notifiable'
-            ]
-            
-            for keyword in surveillance_keywords:
-                if keyword.lower() in content.lower():
-                    # Extract surrounding context
-                    pattern = rf'.{{0,100}}{re.escape(keyword)}.{{0,100}}'
-                    matches = re.findall(pattern, content, re.IGNORECASE)
-                    surveillance_indicators.extend(matches[:2])
-            
-            extracted['surveillance_data']['indicators'] = surveillance_indicators[:5]
-            
-            # Extract related CDC pages
-            related_links = []
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                text = a.get_text(strip=True)
-                
-                if (href and 
-                    ('cdc.gov' in href or href.startswith('/')) and
-                    text and 
-                    len(text) > 5 and
-                    not href.startswith('#')):
-                    
-                    full_url = urljoin(url, href)
-                    related_links.append({
-                        'url': full_url,
-                        'text': text
-                    })
-            
-            extracted['links'] = related_links[:30]
-            
-            # Extract comprehensive metadata
-            extracted['metadata'] = {
-                'word_count': len(content.split()),
-                'public_health_sections_count': len(public_health_sections),
-                'fast_facts_count': len(fast_facts),
-                'statistics_count': len(all_statistics),
-                'surveillance_indicators_count': len(surveillance_indicators),
-                'related_links_count': len(related_links),
-                'government_authority_score': self._calculate_government_authority(content),
-                'extracted_at': datetime.utcnow().isoformat(),
-                'source_authority': 'cdc.gov',
-                'government_source': True,
-                'public_health_relevance': self._calculate_public_health_relevance(content)
-            }
-            
-            extracted['cdc_specific'] = cdc_specific
-            
-            return extracted
-            
-        except Exception as e:
-            logger.error(f"Error extracting CDC structured data from {url}: {e}")
-            return {'error': str(e), 'url': url, 'section': section}
-    
-    def _calculate_government_authority(self, content: str) -> float:
-        """Calculate government authority score"""
-        
-        authority_indicators = [
-            'centers for disease control', 'cdc', 'public health',
-            'surveillance', 'epidemiology', 'morbidity', 'mortality',
-            'notifiable disease', 'outbreak investigation', 'prevention'
-        ]
-        
-        content_lower = content.lower()
-        found_indicators = sum(1 for indicator in authority_indicators if indicator in content_lower)
-        
-        return min(1.0, found_indicators / len(authority_indicators) * 2)
-    
-    def _calculate_public_health_relevance(self, content: str) -> float:
-        """Calculate public health relevance score"""
-        
-        public_health_terms = [
-            'public health', 'prevention', 'surveillance', 'outbreak', 'epidemic',
-            'population health', 'community health', 'health promotion',
-            'disease prevention', 'health protection', 'environmental health'
-        ]
-        
-        content_lower = content.lower()
-        relevance_count = sum(1 for term in public_health_terms if term in content_lower)
-        
-        return min(1.0, relevance_count / len(public_health_terms) * 2.5)
-    
-    async def _calculate_cdc_delay(self, success_rate: float) -> float:
-        """Calculate appropriate delay for CDC requests"""
-        
-        base_delay = self.base_delay
-        
-        # Adjust based on success rate
-        if success_rate < 0.5:
-            base_delay *= 3.0  # Significantly increase if many failures
-        elif success_rate < 0.7:
-            base_delay *= 2.0
-        elif success_rate > 0.9:
-            base_delay *= 0.9  # Slightly reduce if all successful
-        
-        # Add respectful randomization for government site
-        jitter = random.uniform(1.0, 3.0)
-        return base_delay + jitter
+        """Extract structured data specifically tailored for CDC content in the parsing pool"""
+        return await get_parsing_stage().parse('cdc', content, url, section)
     
     # URL Discovery Methods for each CDC section
-    async def _discover_disease_condition_urls(self) -> List[str]:
+    async def _discover_disease_condition_urls(self) -> AsyncIterator[str]:
         """Discover disease and condition URLs from CDC"""
         
         base_url = self.cdc_sections['diseases_conditions']
-        discovered_urls = set()
         
         # A-Z disease browsing
         for letter in 'abcdefghijklmnopqrstuvwxyz':
-            letter_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_url}{letter}/",
                 f"cdc_diseases_{letter}"
-            )
-            discovered_urls.update(letter_urls)
+            ):
+                yield url
         
         # Category-based discovery
         disease_categories = [
@@ -647,179 +445,176 @@ class CDCAdvancedScraper:
         ]
         
         for category in disease_categories:
-            cat_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_url}{category}/",
                 f"cdc_diseases_{category}"
-            )
-            discovered_urls.update(cat_urls)
-        
-        return list(discovered_urls)
+            ):
+                yield url
     
-    async def _discover_health_topic_urls(self) -> List[str]:
+    async def _discover_health_topic_urls(self) -> AsyncIterator[str]:
         """Discover CDC health topic URLs"""
         
         base_url = self.cdc_sections['health_topics']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_health_topics"
-        )
+        ):
+            yield url
     
-    async def _discover_mmwr_report_urls(self) -> List[str]:
+    async def _discover_mmwr_report_urls(self) -> AsyncIterator[str]:
         """Discover MMWR report URLs"""
         
         base_url = self.cdc_sections['mmwr_reports']
-        discovered_urls = set()
         
         # Current and recent years
         current_year = datetime.now().year
         years = list(range(current_year - 5, current_year + 1))
         
         for year in years:
-            year_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_url}volumes/{year}/",
                 f"mmwr_{year}"
-            )
-            discovered_urls.update(year_urls)
-        
-        return list(discovered_urls)
+            ):
+                yield url
     
-    async def _discover_health_statistics_urls(self) -> List[str]:
+    async def _discover_health_statistics_urls(self) -> AsyncIterator[str]:
         """Discover health statistics URLs"""
         
         base_url = self.cdc_sections['health_statistics']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_health_statistics"
-        )
+        ):
+            yield url
     
-    async def _discover_vaccination_urls(self) -> List[str]:
+    async def _discover_vaccination_urls(self) -> AsyncIterator[str]:
         """Discover vaccination information URLs"""
         
         base_url = self.cdc_sections['vaccination_info']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_vaccines"
-        )
+        ):
+            yield url
     
-    async def _discover_travel_health_urls(self) -> List[str]:
+    async def _discover_travel_health_urls(self) -> AsyncIterator[str]:
         """Discover travel health URLs"""
         
         base_url = self.cdc_sections['travel_health']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_travel_health"
-        )
+        ):
+            yield url
     
-    async def _discover_emergency_preparedness_urls(self) -> List[str]:
+    async def _discover_emergency_preparedness_urls(self) -> AsyncIterator[str]:
         """Discover emergency preparedness URLs"""
         
         base_url = self.cdc_sections['emergency_prep']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_emergency"
-        )
+        ):
+            yield url
     
-    async def _discover_workplace_health_urls(self) -> List[str]:
+    async def _discover_workplace_health_urls(self) -> AsyncIterator[str]:
         """Discover workplace health URLs"""
         
         base_url = self.cdc_sections['workplace_health']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_workplace"
-        )
+        ):
+            yield url
     
-    async def _discover_injury_prevention_urls(self) -> List[str]:
+    async def _discover_injury_prevention_urls(self) -> AsyncIterator[str]:
         """Discover injury prevention URLs"""
         
         base_url = self.cdc_sections['injury_prevention']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_injury"
-        )
+        ):
+            yield url
     
-    async def _discover_environmental_health_urls(self) -> List[str]:
+    async def _discover_environmental_health_urls(self) -> AsyncIterator[str]:
         """Discover environmental health URLs"""
         
         base_url = self.cdc_sections['environmental_health']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_environmental"
-        )
+        ):
+            yield url
     
-    async def _discover_chronic_disease_urls(self) -> List[str]:
+    async def _discover_chronic_disease_urls(self) -> AsyncIterator[str]:
         """Discover chronic disease URLs"""
         
         base_url = self.cdc_sections['chronic_disease']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_chronic"
-        )
+        ):
+            yield url
     
-    async def _discover_infectious_disease_urls(self) -> List[str]:
+    async def _discover_infectious_disease_urls(self) -> AsyncIterator[str]:
         """Discover infectious disease URLs"""
         
         base_url = self.cdc_sections['infectious_disease']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "cdc_infectious"
-        )
+        ):
+            yield url
     
     async def _integrate_cdc_knowledge(self, results: List[Any]) -> Dict[str, Any]:
-        """Integrate and analyze all CDC scraping results"""
+        """Integrate and analyze CDC results from the running pipeline statistics"""
         
         logger.info("🔄 Integrating CDC comprehensive knowledge base")
         
-        all_results = []
-        section_summaries = {}
+        for section_result in results:
+            if isinstance(section_result, Exception):
+                logger.warning(f"CDC section failed: {section_result}")
         
-        # Process results from all sections
-        for i, section_results in enumerate(results):
-            if isinstance(section_results, list):
-                all_results.extend(section_results)
-                
-                section_name = list(self.cdc_sections.keys())[i] if i < len(self.cdc_sections) else f"section_{i}"
-                successful = sum(1 for r in section_results if r.success)
-                
-                section_summaries[section_name] = {
-                    'total_processed': len(section_results),
-                    'successful': successful,
-                    'success_rate': successful / len(section_results) if section_results else 0,
-                    'avg_quality': sum(r.quality_score for r in section_results if r.success) / max(successful, 1)
-                }
+        # Section summaries come from per-section running statistics
+        section_summaries = {}
+        for section_name, section_statistics in self.result_pipeline.group_statistics.items():
+            section_summaries[section_name] = {
+                'total_processed': section_statistics.processed,
+                'successful': section_statistics.successful,
+                'success_rate': section_statistics.successful / section_statistics.processed if section_statistics.processed else 0,
+                'avg_quality': section_statistics.average_successful_quality
+            }
         
         # Calculate comprehensive statistics
-        total_processed = len(all_results)
-        successful_results = [r for r in all_results if r.success]
-        total_successful = len(successful_results)
+        statistics = self.result_pipeline.statistics
+        total_processed = statistics.processed
+        total_successful = statistics.successful
         
         # Quality distribution
-        high_quality = len([r for r in successful_results if r.quality_score >= 0.8])
-        medium_quality = len([r for r in successful_results if 0.6 <= r.quality_score < 0.8])
+        high_quality = statistics.count_quality_between(0.8)
+        medium_quality = statistics.count_quality_between(0.6, 0.8)
         low_quality = total_successful - high_quality - medium_quality
         
         # Content analysis
-        total_content_size = sum(r.content_length for r in successful_results)
-        avg_processing_time = sum(r.processing_time for r in successful_results) / max(total_successful, 1)
-        
-        # Calculate public health relevance
-        public_health_scores = []
-        for result in successful_results:
-            if hasattr(result, 'extracted_data') and result.extracted_data:
-                ph_score = result.extracted_data.get('metadata', {}).get('public_health_relevance', 0)
-                if ph_score > 0:
-                    public_health_scores.append(ph_score)
+        total_content_size = statistics.successful_content_size
+        avg_processing_time = statistics.average_processing_time
         
-        avg_public_health_relevance = sum(public_health_scores) / len(public_health_scores) if public_health_scores else 0.8
+        # Public health relevance is accumulated per batch as results stream in
+        avg_public_health_relevance = (
+            self.public_health_relevance_total / self.public_health_scored
+            if self.public_health_scored else 0.8
+        )
         
         final_summary = {
             'cdc_scraping_summary': {
@@ -851,7 +646,8 @@ class CDCAdvancedScraper:
                 'surveillance_data_quality': 0.95,
                 'public_health_authority': 0.99
             },
-            'extracted_content': successful_results
+            'result_statistics': statistics,
+            'extracted_content': self.result_pipeline.samples
         }
         
         logger.info("=" * 80)
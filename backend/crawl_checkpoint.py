@@ -0,0 +1,190 @@
+"""
+Crawl Checkpoint Store
+SQLite WAL log of section frontiers, completed URLs and section stats for resumable crawls
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from dedup_store import get_shared_digest_store
+from url_frontier import URLFrontier
+
+logger = logging.getLogger(__name__)
+
+# Location of the checkpoint database (overridable for multi-crawl deployments)
+DEFAULT_CHECKPOINT_PATH = os.environ.get(
+    'SCRAPER_CHECKPOINT_PATH',
+    os.path.join('scraper_state', 'crawl_checkpoints.sqlite3')
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS section_stats (
+    operation TEXT NOT NULL,
+    section TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (operation, section)
+)
+"""
+
+class CrawlCheckpoint:
+    """SQLite-backed checkpoint of crawl progress; section frontiers share its database file"""
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, checkpoint_interval: int = 50):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+        self._frontiers: Dict[Tuple[str, str], URLFrontier] = {}
+        self._stats_buffer: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._completed_since_checkpoint = 0
+        self._stop_requested = False
+
+        self.checkpoints_written = 0
+
+    def section_frontier(self, operation: str, section: str) -> URLFrontier:
+        """Get the persistent frontier of a section; pending URLs of an interrupted run are still queued"""
+
+        key = (operation, section)
+        frontier = self._frontiers.get(key)
+        if frontier is None:
+            frontier = URLFrontier(f"{operation}/{section}", path=self.path)
+            self._frontiers[key] = frontier
+        return frontier
+
+    def start_section(self, operation: str, section: str) -> URLFrontier:
+        """Get a section's frontier for a new run; URLs a previous run in this process left unconfirmed
+        (in flight at a stop, or failed) are queued again"""
+
+        frontier = self.section_frontier(operation, section)
+        frontier.requeue_unconfirmed()
+        return frontier
+
+    def load_stats(self, operation: str, section: str) -> Optional[Dict[str, Any]]:
+        """Get the last checkpointed stats of a section"""
+
+        buffered = self._stats_buffer.get((operation, section))
+        if buffered is not None:
+            return dict(buffered)
+
+        row = self._conn.execute(
+            'SELECT stats FROM section_stats WHERE operation = ? AND section = ?', (operation, section)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def mark_completed(self, operation: str, section: str, url: str, stats: Optional[Dict[str, Any]] = None):
+        """Record a completed URL (and the section stats after it), checkpointing every interval"""
+
+        self.section_frontier(operation, section).mark_done(url)
+        if stats is not None:
+            self._stats_buffer[(operation, section)] = dict(stats)
+
+        self._completed_since_checkpoint += 1
+        if self._completed_since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def save_stats(self, operation: str, section: str, stats: Dict[str, Any]):
+        """Buffer the latest stats of a section until the next checkpoint"""
+        self._stats_buffer[(operation, section)] = dict(stats)
+
+    def checkpoint(self):
+        """Write completed URLs and section stats, then flush the dedup store"""
+
+        for frontier in self._frontiers.values():
+            frontier.flush()
+
+        if self._stats_buffer:
+            now = time.time()
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO section_stats (operation, section, stats, updated_at) VALUES (?, ?, ?, ?)',
+                    [(operation, section, json.dumps(stats), now)
+                     for (operation, section), stats in self._stats_buffer.items()]
+                )
+            self._stats_buffer.clear()
+
+        # Dedup state must be at least as recent as the completed set it guards
+        get_shared_digest_store().flush()
+
+        self._completed_since_checkpoint = 0
+        self.checkpoints_written += 1
+
+    def finish_operation(self, operation: str):
+        """Drop the frontiers and stats of an operation that ran to completion"""
+
+        for (frontier_operation, section), frontier in list(self._frontiers.items()):
+            if frontier_operation == operation:
+                frontier.clear()
+                del self._frontiers[(frontier_operation, section)]
+        self._stats_buffer = {key: stats for key, stats in self._stats_buffer.items() if key[0] != operation}
+
+        with self._conn:
+            self._conn.execute('DELETE FROM section_stats WHERE operation = ?', (operation,))
+        logger.info(f"🧹 Cleared checkpoint for completed operation: {operation}")
+
+    def request_stop(self):
+        """Ask running sections to stop at the next result and checkpoint their progress"""
+
+        self._stop_requested = True
+        self.checkpoint()
+        logger.info("🛑 Stop requested - crawl progress checkpointed")
+
+    def clear_stop(self):
+        """Allow a new operation to run after a stop"""
+        self._stop_requested = False
+
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop_requested
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get checkpoint statistics"""
+
+        frontier_stats = [frontier.get_stats() for frontier in self._frontiers.values()]
+        return {
+            'pending_urls': sum(stats['queued'] + stats['in_head'] for stats in frontier_stats),
+            'completed_urls': sum(stats['done'] for stats in frontier_stats),
+            'sections_tracked': len(frontier_stats),
+            'checkpoints_written': self.checkpoints_written,
+            'path': self.path
+        }
+
+    def close(self):
+        """Write outstanding progress and close the database connection"""
+
+        self.checkpoint()
+        self._conn.close()
+
+_shared_checkpoints: Dict[str, CrawlCheckpoint] = {}
+
+def get_crawl_checkpoint(path: Optional[str] = None) -> CrawlCheckpoint:
+    """Get the process-wide crawl checkpoint for a path, opening it on first use"""
+
+    path = os.path.abspath(path or DEFAULT_CHECKPOINT_PATH)
+    checkpoint = _shared_checkpoints.get(path)
+    if checkpoint is None:
+        checkpoint = CrawlCheckpoint(path)
+        _shared_checkpoints[path] = checkpoint
+    return checkpoint
+
+@atexit.register
+def _checkpoint_shared_stores():
+    for checkpoint in _shared_checkpoints.values():
+        checkpoint.checkpoint()
+
+# Export main classes
+__all__ = ['CrawlCheckpoint', 'get_crawl_checkpoint']
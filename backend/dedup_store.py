@@ -0,0 +1,194 @@
+"""
+Persistent Content Dedup Store
+Memory-mapped open-addressing table of 8-byte content digests shared by every scraper and kept across restarts
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Location of on-disk dedup state (overridable for multi-crawl deployments)
+DEFAULT_DEDUP_STORE_PATH = os.environ.get(
+    'SCRAPER_DEDUP_STORE_PATH',
+    os.path.join('scraper_state', 'content_digests.bin')
+)
+
+_MAGIC = b'MSDEDUP1'
+_HEADER_FORMAT = '<8sQQ'
+_HEADER_BYTES = 64
+_EMPTY_SLOT = 0
+
+def content_digest(content: str) -> int:
+    """Compute the 8-byte BLAKE2b digest of page content as an unsigned integer"""
+
+    digest = int.from_bytes(
+        hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=8).digest(),
+        'little'
+    )
+    # Zero marks an empty slot in the table
+    return digest or 1
+
+class PersistentDigestStore:
+    """On-disk, memory-mapped hash set of 64-bit content digests"""
+
+    def __init__(self, path: str = DEFAULT_DEDUP_STORE_PATH, initial_capacity: int = 1 << 20,
+                 max_load_factor: float = 0.7, flush_interval: int = 10000):
+        self.path = path
+        self.max_load_factor = max_load_factor
+        self.flush_interval = flush_interval
+        self._pending_writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if not os.path.exists(path):
+            capacity = 1 << max(4, (initial_capacity - 1).bit_length())
+            self._create_file(path, capacity)
+
+        self._open()
+        if self._count > self._capacity * self.max_load_factor:
+            self._grow()
+        logger.info(f"💾 Dedup store ready: {self._count:,} digests in {self.path}")
+
+    @staticmethod
+    def _create_file(path: str, capacity: int):
+        """Create an empty table file with the given power-of-two capacity"""
+
+        with open(path, 'wb') as f:
+            f.write(struct.pack(_HEADER_FORMAT, _MAGIC, capacity, 0).ljust(_HEADER_BYTES, b'\0'))
+            f.truncate(_HEADER_BYTES + capacity * 8)
+
+    def _open(self):
+        """Map the table file into memory"""
+
+        with open(self.path, 'rb') as f:
+            magic, capacity, _ = struct.unpack(_HEADER_FORMAT, f.read(struct.calcsize(_HEADER_FORMAT)))
+
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a dedup store file")
+
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._table = np.memmap(self.path, dtype=np.uint64, mode='r+',
+                                offset=_HEADER_BYTES, shape=(capacity,))
+        # The header count lags the table after a crash between flushes; the occupied slots are authoritative
+        self._count = int(np.count_nonzero(self._table))
+
+    def _find_slot(self, digest: int) -> int:
+        """Linear-probe for the slot holding a digest or the first empty slot"""
+
+        table = self._table
+        slot = digest & self._mask
+        while True:
+            stored = int(table[slot])
+            if stored == digest or stored == _EMPTY_SLOT:
+                return slot
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, digest: int) -> bool:
+        return int(self._table[self._find_slot(digest)]) == digest
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, digest: int) -> bool:
+        """Insert a digest; returns False if it was already present"""
+
+        slot = self._find_slot(digest)
+        if int(self._table[slot]) == digest:
+            return False
+
+        self._table[slot] = digest
+        self._count += 1
+        self._pending_writes += 1
+
+        if self._count > self._capacity * self.max_load_factor:
+            self._grow()
+        elif self._pending_writes >= self.flush_interval:
+            self.flush()
+
+        return True
+
+    def _grow(self):
+        """Rehash into a table of twice the capacity and atomically replace the file"""
+
+        digests = np.asarray(self._table[self._table != _EMPTY_SLOT])
+        new_capacity = self._capacity * 2
+        tmp_path = f"{self.path}.grow"
+
+        self._create_file(tmp_path, new_capacity)
+        new_table = np.memmap(tmp_path, dtype=np.uint64, mode='r+',
+                              offset=_HEADER_BYTES, shape=(new_capacity,))
+        mask = new_capacity - 1
+
+        for digest in digests.tolist():
+            slot = digest & mask
+            while new_table[slot] != _EMPTY_SLOT:
+                slot = (slot + 1) & mask
+            new_table[slot] = digest
+
+        new_table.flush()
+        del new_table
+        self._write_count(tmp_path, len(digests))
+
+        self._table.flush()
+        del self._table
+        os.replace(tmp_path, self.path)
+        self._open()
+        self._pending_writes = 0
+
+        logger.info(f"💾 Dedup store grown to {new_capacity:,} slots ({self._count:,} digests)")
+
+    @staticmethod
+    def _write_count(path: str, count: int):
+        """Persist the digest count into the file header"""
+
+        with open(path, 'r+b') as f:
+            f.seek(struct.calcsize('<8sQ'))
+            f.write(struct.pack('<Q', count))
+
+    def flush(self):
+        """Write pending digests and the header count to disk"""
+
+        self._table.flush()
+        self._write_count(self.path, self._count)
+        self._pending_writes = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get store utilisation statistics"""
+
+        return {
+            'digests_stored': self._count,
+            'capacity': self._capacity,
+            'load_factor': self._count / self._capacity,
+            'file_size_mb': (_HEADER_BYTES + self._capacity * 8) / (1024 * 1024),
+            'path': self.path
+        }
+
+_shared_stores: Dict[str, PersistentDigestStore] = {}
+
+def get_shared_digest_store(path: Optional[str] = None) -> PersistentDigestStore:
+    """Get the process-wide digest store for a path, opening it on first use"""
+
+    path = os.path.abspath(path or DEFAULT_DEDUP_STORE_PATH)
+    store = _shared_stores.get(path)
+    if store is None:
+        store = PersistentDigestStore(path)
+        _shared_stores[path] = store
+    return store
+
+@atexit.register
+def _flush_shared_stores():
+    for store in _shared_stores.values():
+        store.flush()
+
+# Export main classes
+__all__ = ['PersistentDigestStore', 'content_digest', 'get_shared_digest_store']
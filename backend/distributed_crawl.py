@@ -0,0 +1,682 @@
+"""
+Distributed Crawl
+Coordinator/worker crawl mode: worker processes lease tasks from a SQLite broker, heartbeat their leases
+and hand results back to the coordinator, which owns the task queue and the dedup state
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ai_scraper_core import ScrapingPriority, ScrapingResult, ScrapingTask, ScrapingTier
+from dedup_store import PersistentDigestStore, get_shared_digest_store
+from result_pipeline import ResultPipeline, result_from_record, result_to_record
+from super_parallel_engine import SuperParallelScrapingEngine
+from url_canonical import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Location of the broker database (overridable for multi-crawl deployments)
+DEFAULT_BROKER_PATH = os.environ.get(
+    'SCRAPER_BROKER_PATH',
+    os.path.join('scraper_state', 'crawl_broker.sqlite3')
+)
+
+# Per-worker scratch state (each worker process keeps its own single-writer dedup store)
+DEFAULT_WORKER_STATE_PATH = os.environ.get(
+    'SCRAPER_WORKER_STATE_PATH',
+    os.path.join('scraper_state', 'crawl_workers')
+)
+
+# Task states: waiting for a worker, leased by a live worker, finished, given up after repeated lease losses
+QUEUED, LEASED, DONE, FAILED = 0, 1, 2, 3
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS crawl_tasks (
+        crawl TEXT NOT NULL,
+        url TEXT NOT NULL,          -- canonical form, the dedup key
+        domain TEXT NOT NULL,
+        tier TEXT NOT NULL,
+        priority INTEGER NOT NULL,
+        state INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        lease_expires REAL,
+        deliveries INTEGER NOT NULL DEFAULT 0,
+        fetch_url TEXT,             -- URL as queued, which is what gets fetched
+        PRIMARY KEY (crawl, url)
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS crawl_task_queue ON crawl_tasks (crawl, state, priority)',
+    'CREATE INDEX IF NOT EXISTS crawl_task_leases ON crawl_tasks (crawl, worker, state)',
+    """
+    CREATE TABLE IF NOT EXISTS crawl_domains (
+        crawl TEXT NOT NULL,
+        domain TEXT NOT NULL,
+        worker TEXT NOT NULL,
+        lease_expires REAL NOT NULL,
+        PRIMARY KEY (crawl, domain)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS crawl_results (
+        result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        crawl TEXT NOT NULL,
+        record TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS crawl_workers (
+        crawl TEXT NOT NULL,
+        worker TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        started_at REAL NOT NULL,
+        heartbeat_at REAL NOT NULL,
+        PRIMARY KEY (crawl, worker)
+    )
+    """
+)
+
+class CrawlBroker:
+    """SQLite-backed task broker shared by the coordinator and worker processes of one machine
+
+    Tasks are leased for lease_timeout seconds and kept alive by worker heartbeats; leases that lapse
+    (the worker died or hung) are delivered again, up to max_deliveries times. A domain is leased to one
+    worker at a time, so each process's per-domain rate limiter still governs the whole crawl.
+    """
+
+    def __init__(self, crawl: str, path: str = DEFAULT_BROKER_PATH, lease_timeout: float = 60.0,
+                 max_deliveries: int = 3, domains_per_lease: int = 2):
+        self.crawl = crawl
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_deliveries = max_deliveries
+        self.domains_per_lease = domains_per_lease
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Autocommit mode: every multi-statement change runs in an explicit BEGIN IMMEDIATE transaction.
+        # Workers call the broker from several threads at once, so the connection is used under a lock
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # Taking the write lock up front keeps two workers from leasing the same rows
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def add_tasks(self, tasks: Iterable[ScrapingTask]) -> int:
+        """Queue tasks keyed by canonical URL (fetched as given); URLs already known to this crawl are skipped.
+        Returns how many were new"""
+
+        rows = []
+        for task in tasks:
+            url = canonicalize_url(task.url)
+            rows.append((self.crawl, url, urlparse(url).netloc, task.tier.name, task.priority.value, task.url))
+        if not rows:
+            return 0
+
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO crawl_tasks (crawl, url, domain, tier, priority, fetch_url) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows
+            )
+            return conn.total_changes - before
+
+    def register_worker(self, worker: str):
+        now = time.time()
+        self._query(
+            'INSERT OR REPLACE INTO crawl_workers (crawl, worker, pid, started_at, heartbeat_at) VALUES (?, ?, ?, ?, ?)',
+            (self.crawl, worker, os.getpid(), now, now)
+        )
+
+    def lease(self, worker: str, limit: int) -> List[ScrapingTask]:
+        """Lease up to limit queued tasks (best priority first) on domains the worker holds,
+        claiming at most domains_per_lease further domains that no live worker holds"""
+
+        now = time.time()
+        expires = now + self.lease_timeout
+        with self._transaction() as conn:
+            domains = [domain for domain, in conn.execute(
+                'SELECT domain FROM crawl_domains WHERE crawl = ? AND worker = ? AND lease_expires > ?',
+                (self.crawl, worker, now)
+            )]
+            domains += [domain for domain, in conn.execute(
+                'SELECT t.domain FROM crawl_tasks t WHERE t.crawl = ? AND t.state = ? AND NOT EXISTS ('
+                '  SELECT 1 FROM crawl_domains d WHERE d.crawl = t.crawl AND d.domain = t.domain '
+                '  AND d.lease_expires > ?) '
+                'GROUP BY t.domain ORDER BY MIN(t.priority) LIMIT ?',
+                (self.crawl, QUEUED, now, self.domains_per_lease)
+            )]
+            if not domains:
+                return []
+
+            placeholders = ', '.join('?' * len(domains))
+            rows = conn.execute(
+                f'SELECT rowid, COALESCE(fetch_url, url), domain, tier, priority FROM crawl_tasks '
+                f'WHERE crawl = ? AND state = ? AND domain IN ({placeholders}) '
+                f'ORDER BY priority, rowid LIMIT ?',
+                (self.crawl, QUEUED, *domains, limit)
+            ).fetchall()
+            if not rows:
+                return []
+
+            conn.executemany(
+                'UPDATE crawl_tasks SET state = ?, worker = ?, lease_expires = ?, deliveries = deliveries + 1 '
+                'WHERE rowid = ?', [(LEASED, worker, expires, rowid) for rowid, *_ in rows]
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO crawl_domains (crawl, domain, worker, lease_expires) VALUES (?, ?, ?, ?)',
+                [(self.crawl, domain, worker, expires) for domain in {row[2] for row in rows}]
+            )
+
+        # Task ids are broker row ids, so results from different worker processes never share one
+        return [
+            ScrapingTask(url=url, tier=ScrapingTier[tier], priority=ScrapingPriority(priority),
+                         source_name=f"{ScrapingTier[tier].value}_source", id=rowid)
+            for rowid, url, _, tier, priority in rows
+        ]
+
+    def heartbeat(self, worker: str) -> int:
+        """Extend the worker's task and domain leases; returns how many tasks it holds"""
+
+        now = time.time()
+        expires = now + self.lease_timeout
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE crawl_workers SET heartbeat_at = ? WHERE crawl = ? AND worker = ?', (now, self.crawl, worker)
+            )
+            held = conn.execute(
+                'UPDATE crawl_tasks SET lease_expires = ? WHERE crawl = ? AND worker = ? AND state = ?',
+                (expires, self.crawl, worker, LEASED)
+            ).rowcount
+            # Domains the worker no longer has tasks on are left to lapse
+            conn.execute(
+                'UPDATE crawl_domains SET lease_expires = ? WHERE crawl = ? AND worker = ? AND domain IN ('
+                '  SELECT domain FROM crawl_tasks WHERE crawl = ? AND worker = ? AND state = ?)',
+                (expires, self.crawl, worker, self.crawl, worker, LEASED)
+            )
+        return held
+
+    def complete(self, worker: str, result: ScrapingResult, group: Optional[str] = None) -> bool:
+        """Finish a leased task and queue its result for the coordinator;
+        False if the lease was lost (the task has been delivered to another worker)"""
+        return self.complete_many(worker, [(result, group)]) == 1
+
+    def complete_many(self, worker: str, results: List[Tuple[ScrapingResult, Optional[str]]]) -> int:
+        """complete() for a batch of (result, group) pairs in one transaction; returns how many still held their lease"""
+
+        rows = []
+        for result, group in results:
+            record = result_to_record(result)
+            if group:
+                record['group'] = group
+            rows.append((canonicalize_url(result.url), json.dumps(record, default=str, ensure_ascii=False)))
+
+        finished = 0
+        with self._transaction() as conn:
+            for url, payload in rows:
+                if conn.execute(
+                    'UPDATE crawl_tasks SET state = ?, lease_expires = NULL '
+                    'WHERE crawl = ? AND url = ? AND worker = ? AND state = ?',
+                    (DONE, self.crawl, url, worker, LEASED)
+                ).rowcount:
+                    conn.execute('INSERT INTO crawl_results (crawl, record) VALUES (?, ?)', (self.crawl, payload))
+                    finished += 1
+        return finished
+
+    def release(self, worker: Optional[str] = None) -> int:
+        """Put the tasks leased by a worker (every worker if None) straight back in the queue;
+        tasks that already used up max_deliveries fail instead. Returns how many were re-queued"""
+
+        owner, params = ('', ()) if worker is None else (' AND worker = ?', (worker,))
+        with self._transaction() as conn:
+            conn.execute(
+                f'UPDATE crawl_tasks SET state = ?, lease_expires = NULL '
+                f'WHERE crawl = ? AND state = ? AND deliveries >= ?{owner}',
+                (FAILED, self.crawl, LEASED, self.max_deliveries, *params)
+            )
+            released = conn.execute(
+                f'UPDATE crawl_tasks SET state = ?, worker = NULL, lease_expires = NULL '
+                f'WHERE crawl = ? AND state = ?{owner}', (QUEUED, self.crawl, LEASED, *params)
+            ).rowcount
+            conn.execute(f'DELETE FROM crawl_domains WHERE crawl = ?{owner}', (self.crawl, *params))
+        return released
+
+    def requeue_expired(self) -> Tuple[int, int]:
+        """Deliver lapsed leases again, or fail them once they reached max_deliveries; returns (requeued, failed)"""
+
+        now = time.time()
+        with self._transaction() as conn:
+            failed = conn.execute(
+                'UPDATE crawl_tasks SET state = ?, lease_expires = NULL '
+                'WHERE crawl = ? AND state = ? AND lease_expires < ? AND deliveries >= ?',
+                (FAILED, self.crawl, LEASED, now, self.max_deliveries)
+            ).rowcount
+            requeued = conn.execute(
+                'UPDATE crawl_tasks SET state = ?, worker = NULL, lease_expires = NULL '
+                'WHERE crawl = ? AND state = ? AND lease_expires < ?',
+                (QUEUED, self.crawl, LEASED, now)
+            ).rowcount
+            conn.execute('DELETE FROM crawl_domains WHERE crawl = ? AND lease_expires < ?', (self.crawl, now))
+        return requeued, failed
+
+    def take_results(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Remove and return the oldest queued result records"""
+
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT result_id, record FROM crawl_results WHERE crawl = ? ORDER BY result_id LIMIT ?',
+                (self.crawl, limit)
+            ).fetchall()
+            if rows:
+                conn.execute('DELETE FROM crawl_results WHERE crawl = ? AND result_id <= ?', (self.crawl, rows[-1][0]))
+        return [json.loads(record) for _, record in rows]
+
+    def stale_workers(self) -> List[str]:
+        """Registered workers that have not sent a heartbeat for longer than the lease timeout"""
+        return [worker for worker, in self._query(
+            'SELECT worker FROM crawl_workers WHERE crawl = ? AND heartbeat_at < ?',
+            (self.crawl, time.time() - self.lease_timeout)
+        )]
+
+    def active_domains(self) -> int:
+        """Domains with queued or leased tasks"""
+        return self._query(
+            'SELECT COUNT(DISTINCT domain) FROM crawl_tasks WHERE crawl = ? AND state IN (?, ?)',
+            (self.crawl, QUEUED, LEASED)
+        )[0][0]
+
+    def tiers(self) -> List[ScrapingTier]:
+        """Tiers that have tasks in this crawl"""
+        return [ScrapingTier[name] for name, in self._query(
+            'SELECT DISTINCT tier FROM crawl_tasks WHERE crawl = ?', (self.crawl,)
+        )]
+
+    def is_finished(self) -> bool:
+        """No task is queued or leased"""
+
+        return not self._query(
+            'SELECT 1 FROM crawl_tasks WHERE crawl = ? AND state IN (?, ?) LIMIT 1', (self.crawl, QUEUED, LEASED)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broker statistics"""
+
+        counts = dict(self._query(
+            'SELECT state, COUNT(*) FROM crawl_tasks WHERE crawl = ? GROUP BY state', (self.crawl,)
+        ))
+        redelivered = self._query(
+            'SELECT COUNT(*) FROM crawl_tasks WHERE crawl = ? AND deliveries > 1', (self.crawl,)
+        )[0][0]
+        return {
+            'crawl': self.crawl,
+            'queued': counts.get(QUEUED, 0),
+            'leased': counts.get(LEASED, 0),
+            'done': counts.get(DONE, 0),
+            'failed': counts.get(FAILED, 0),
+            'redelivered': redelivered,
+            'workers_seen': self._query(
+                'SELECT COUNT(*) FROM crawl_workers WHERE crawl = ?', (self.crawl,)
+            )[0][0]
+        }
+
+    def close(self):
+        self._conn.close()
+
+class BrokerResultSink:
+    """Result sink of a worker process: completes the tasks' leases and queues the results for the coordinator,
+    batch_size results per broker transaction, run off the event loop"""
+
+    def __init__(self, broker: CrawlBroker, worker: str, batch_size: int = 50):
+        self.broker = broker
+        self.worker = worker
+        self.batch_size = batch_size
+        self._buffer: List[Tuple[ScrapingResult, Optional[str]]] = []
+        self.records_written = 0
+        self.lost_leases = 0
+
+    async def write(self, result: ScrapingResult, group: Optional[str] = None):
+        self._buffer.append((result, group))
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Complete the buffered results now"""
+
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            finished = await asyncio.to_thread(self.broker.complete_many, self.worker, batch)
+            self.records_written += finished
+            self.lost_leases += len(batch) - finished
+
+    async def close(self):
+        await self.flush()
+        if self.lost_leases:
+            logger.warning(f"Worker {self.worker}: {self.lost_leases} results dropped after their lease lapsed")
+
+def default_tier_scrapers(tiers: Iterable[ScrapingTier]) -> Dict[ScrapingTier, Any]:
+    """Tier scrapers of the master controller, built inside the worker process"""
+
+    from master_scraper_controller import WorldClassMedicalScraper
+
+    tier_scrapers = WorldClassMedicalScraper().tier_scrapers
+    return {tier: tier_scrapers[tier] for tier in tiers if tier in tier_scrapers}
+
+class CrawlWorker:
+    """One worker process: its own event loop, session pool and scheduler, fed with leased tasks"""
+
+    def __init__(self, broker: CrawlBroker, worker: str, tier_scrapers: Dict[ScrapingTier, Any],
+                 concurrency: int = 50, prefetch: int = 200, poll_interval: float = 0.5):
+        self.broker = broker
+        self.worker = worker
+        self.tier_scrapers = tier_scrapers
+        self.concurrency = concurrency
+        self.prefetch = prefetch
+        self.poll_interval = poll_interval
+
+        self.engine = SuperParallelScrapingEngine()
+        self.sink = BrokerResultSink(broker, worker)
+        self.engine.result_pipeline.add_sink(self.sink)
+        self.leased = 0
+
+    async def run(self) -> Dict[str, Any]:
+        """Process leased tasks until the crawl has none left"""
+
+        # Broker calls wait on the write lock every worker shares, so they run off the event loop
+        await asyncio.to_thread(self.broker.register_worker, self.worker)
+        scheduler = self.engine.task_scheduler
+        scheduler.open_feed()
+
+        heartbeat = asyncio.create_task(self._heartbeat())
+        feed = asyncio.create_task(self._feed())
+        try:
+            await self.engine.run_worker_pool(self.tier_scrapers, self.concurrency)
+            await feed
+        finally:
+            heartbeat.cancel()
+            feed.cancel()
+            await self.engine.result_pipeline.close()
+            await asyncio.to_thread(self.broker.release, self.worker)
+
+        return {
+            'worker': self.worker,
+            'leased': self.leased,
+            'completed': self.sink.records_written,
+            'lost_leases': self.sink.lost_leases
+        }
+
+    async def _feed(self):
+        """Keep up to prefetch tasks queued or running locally"""
+
+        scheduler = self.engine.task_scheduler
+        try:
+            while True:
+                backlog = scheduler.pending_count() + len(scheduler.running_tasks)
+                if backlog < self.prefetch:
+                    tasks = await asyncio.to_thread(self.broker.lease, self.worker, self.prefetch - backlog)
+                    if tasks:
+                        self.leased += len(tasks)
+                        await scheduler.enqueue_tasks(tasks)
+                        continue
+
+                # Results short of a full batch still reach the coordinator within a poll interval,
+                # and must be completed before the crawl can count as finished
+                await self.sink.flush()
+                if backlog == 0 and await asyncio.to_thread(self.broker.is_finished):
+                    return
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            scheduler.close_feed()
+
+    async def _heartbeat(self):
+        interval = self.broker.lease_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.broker.heartbeat, self.worker)
+            except sqlite3.Error as e:
+                logger.warning(f"Worker {self.worker}: heartbeat failed: {e}")
+
+def _run_worker_process(crawl: str, broker_path: str, worker: str, tier_names: List[str],
+                        scraper_factory: Callable[[Iterable[ScrapingTier]], Dict[ScrapingTier, Any]],
+                        concurrency: int, prefetch: int, lease_timeout: float, max_deliveries: int):
+    """Entry point of a spawned worker process"""
+
+    broker = CrawlBroker(crawl, broker_path, lease_timeout, max_deliveries)
+    tier_scrapers = scraper_factory([ScrapingTier[name] for name in tier_names])
+    summary = asyncio.run(CrawlWorker(broker, worker, tier_scrapers, concurrency, prefetch).run())
+    logger.info(f"👷 Worker {worker} finished: {summary['completed']:,} of {summary['leased']:,} leased tasks")
+    broker.close()
+
+@contextmanager
+def _environment(overrides: Dict[str, str]):
+    # Spawned processes copy os.environ at start, so scraper modules read these when the worker imports them
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+class CrawlCoordinator:
+    """Owns the crawl's task queue and dedup state; spawns worker processes and restarts dead ones"""
+
+    def __init__(self, num_workers: Optional[int] = None, crawl: Optional[str] = None,
+                 broker_path: str = DEFAULT_BROKER_PATH, state_path: str = DEFAULT_WORKER_STATE_PATH,
+                 worker_concurrency: int = 50, prefetch: int = 200, lease_timeout: float = 60.0,
+                 max_deliveries: int = 3, max_restarts: int = 10, poll_interval: float = 0.5,
+                 result_pipeline: Optional[ResultPipeline] = None,
+                 digest_store: Optional[PersistentDigestStore] = None,
+                 scraper_factory: Callable[[Iterable[ScrapingTier]], Dict[ScrapingTier, Any]] = default_tier_scrapers):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.crawl = crawl or f"crawl-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self.broker_path = broker_path
+        self.state_path = state_path
+        self.worker_concurrency = worker_concurrency
+        self.prefetch = prefetch
+        self.max_restarts = max_restarts
+        self.poll_interval = poll_interval
+        self.scraper_factory = scraper_factory
+
+        self.broker = CrawlBroker(self.crawl, broker_path, lease_timeout, max_deliveries)
+        self.result_pipeline = result_pipeline or ResultPipeline()
+        # Cross-worker exact duplicates are caught here; workers' own stores only see their share of the crawl.
+        # Only this crawl's pages count: the shared store also holds every earlier run's digests.
+        # Accepted pages are still written back to it, so later single-process runs know them
+        self._crawl_digests = set()
+        self.digest_store = digest_store if digest_store is not None else get_shared_digest_store()
+
+        self._context = multiprocessing.get_context('spawn')
+        self._processes: Dict[int, Tuple[str, multiprocessing.process.BaseProcess]] = {}
+        self._generations: Dict[int, int] = {}
+        # Workers the parsing cores are split between (see _scale_workers)
+        self._worker_target = self.num_workers
+
+        self.restarts = 0
+        self.results_received = 0
+        self.duplicates = 0
+
+    def add_tasks(self, tasks: Iterable[ScrapingTask]) -> int:
+        """Queue tasks for the workers; returns how many were new to this crawl"""
+        return self.broker.add_tasks(tasks)
+
+    async def add_tasks_async(self, tasks: Iterable[ScrapingTask]) -> int:
+        """Queue tasks from the event loop without blocking it on the broker's write lock"""
+        return await asyncio.to_thread(self.broker.add_tasks, list(tasks))
+
+    def _spawn(self, slot: int, tier_names: List[str]):
+        generation = self._generations.get(slot, 0) + 1
+        self._generations[slot] = generation
+        worker = f"worker-{slot}.{generation}"
+
+        # Each slot keeps its own dedup store: the memory-mapped store has a single writer
+        worker_state = os.path.join(self.state_path, self.crawl, f"worker-{slot}")
+        os.makedirs(worker_state, exist_ok=True)
+        overrides = {
+            'SCRAPER_DEDUP_STORE_PATH': os.path.join(worker_state, 'content_digests.bin'),
+            # Workers split the cores for HTML parsing instead of each starting a pool the size of the machine
+            'SCRAPER_PARSE_WORKERS': str(max(1, (os.cpu_count() or 1) // self._worker_target))
+        }
+
+        process = self._context.Process(
+            target=_run_worker_process, name=worker, daemon=True,
+            args=(self.crawl, self.broker_path, worker, tier_names, self.scraper_factory,
+                  self.worker_concurrency, self.prefetch, self.broker.lease_timeout, self.broker.max_deliveries)
+        )
+        with _environment(overrides):
+            process.start()
+        self._processes[slot] = (worker, process)
+
+    async def _scale_workers(self, tier_names: List[str]):
+        """Run one worker per active domain, up to num_workers
+
+        A domain is leased to one worker at a time, so further workers would only sit idle holding a share
+        of the parsing cores. Workers started later, as tasks on new domains arrive, split the cores among
+        the larger number of workers; those already running keep their parsing pools.
+        """
+
+        target = max(1, min(self.num_workers, await asyncio.to_thread(self.broker.active_domains)))
+        started = len(self._generations)
+        if target > started:
+            self._worker_target = target
+            for slot in range(started, target):
+                self._spawn(slot, tier_names)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the queued crawl to completion; results stream into the result pipeline"""
+
+        # Broker calls can wait on the write lock every worker shares, so they run off the event loop.
+        # Workers build a scraper for every tier the crawl has tasks in
+        tier_names = [tier.name for tier in await asyncio.to_thread(self.broker.tiers)]
+        # Leases left by an interrupted coordinator of the same crawl belong to workers that are gone
+        resumed = await asyncio.to_thread(self.broker.release)
+        if resumed:
+            logger.info(f"♻️ Crawl {self.crawl}: re-queued {resumed:,} tasks leased before the last stop")
+
+        start_time = time.time()
+        queued = (await asyncio.to_thread(self.broker.get_stats))['queued']
+        await self._scale_workers(tier_names)
+        logger.info(f"🛰️ Crawl {self.crawl}: started {len(self._processes)} of up to {self.num_workers} "
+                    f"worker processes ({queued:,} queued tasks)")
+
+        try:
+            while self._processes:
+                await self._drain_results()
+                requeued, failed = await asyncio.to_thread(self.broker.requeue_expired)
+                if requeued or failed:
+                    logger.warning(f"⏱️ Crawl {self.crawl}: {requeued} lapsed leases re-queued, {failed} tasks failed")
+
+                # A worker whose event loop stopped heartbeating has lost its leases; stop it and start a fresh one
+                stale = set(await asyncio.to_thread(self.broker.stale_workers))
+                for worker, process in self._processes.values():
+                    if worker in stale and process.is_alive():
+                        logger.warning(f"🫀 Worker {worker} stopped sending heartbeats; terminating it")
+                        process.terminate()
+
+                finished = await asyncio.to_thread(self.broker.is_finished)
+                for slot, (worker, process) in list(self._processes.items()):
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    del self._processes[slot]
+                    if finished and process.exitcode == 0:
+                        continue
+
+                    released = await asyncio.to_thread(self.broker.release, worker)
+                    logger.warning(f"💀 Worker {worker} exited with code {process.exitcode}; "
+                                   f"{released} leased tasks re-queued")
+                    if not finished and self.restarts < self.max_restarts:
+                        self.restarts += 1
+                        self._spawn(slot, tier_names)
+
+                # Tasks added while the crawl runs may bring new domains to keep further workers busy
+                if not finished:
+                    await self._scale_workers(tier_names)
+
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            for worker, process in self._processes.values():
+                process.terminate()
+                process.join()
+                await asyncio.to_thread(self.broker.release, worker)
+            self._processes.clear()
+
+        await self._drain_results()
+        self.digest_store.flush()
+        stats = await asyncio.to_thread(self.get_stats)
+        stats['execution_time'] = time.time() - start_time
+        logger.info(f"🛰️ Crawl {self.crawl}: {stats['done']:,} tasks done, {stats['failed']:,} failed, "
+                    f"{self.duplicates:,} cross-worker duplicates, {self.restarts} worker restarts")
+        return stats
+
+    async def _drain_results(self):
+        """Move results reported by workers into the pipeline"""
+
+        while True:
+            records = await asyncio.to_thread(self.broker.take_results)
+            if not records:
+                return
+            for record in records:
+                group = record.pop('group', None)
+                result = result_from_record(record)
+                if result.success and result.content_digest is not None \
+                        and not result.metadata.get('unchanged'):
+                    if result.content_digest in self._crawl_digests:
+                        # Another worker already stored this page
+                        result.success = False
+                        result.error_details = "Duplicate content detected"
+                        self.duplicates += 1
+                    else:
+                        self._crawl_digests.add(result.content_digest)
+                        self.digest_store.add(result.content_digest)
+                await self.result_pipeline.process(result, group)
+                self.results_received += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get crawl statistics"""
+
+        stats = self.broker.get_stats()
+        stats.update({
+            'workers': self.num_workers,
+            'worker_restarts': self.restarts,
+            'results_received': self.results_received,
+            'cross_worker_duplicates': self.duplicates
+        })
+        return stats
+
+# Export main classes
+__all__ = [
+    'CrawlCoordinator', 'CrawlWorker', 'CrawlBroker', 'BrokerResultSink', 'default_tier_scrapers',
+    'DEFAULT_BROKER_PATH', 'DEFAULT_WORKER_STATE_PATH'
+]
@@ -0,0 +1,130 @@
+"""
+Domain Credibility Resolver
+Reversed-label suffix tries for per-domain credibility, crawl delay and priority, memoized by netloc
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Credibility by domain suffix; the most specific matching suffix wins
+HIGH_CREDIBILITY_DOMAINS = (
+    'nih.gov', 'cdc.gov', 'fda.gov', 'who.int', 'mayoclinic.org',
+    'clevelandclinic.org', 'hopkinsmedicine.org', 'harvard.edu',
+    'stanford.edu', 'nature.com', 'nejm.org', 'bmj.com',
+    'pubmed.ncbi.nlm.nih.gov', 'cochranelibrary.com'
+)
+MEDIUM_CREDIBILITY_DOMAINS = (
+    'webmd.com', 'healthline.com', 'medicalnewstoday.com',
+    'edu', 'org', 'nhs.uk', 'cancer.org', 'heart.org'
+)
+GOVERNMENT_CREDIBILITY = 0.9
+DEFAULT_CREDIBILITY = 0.5
+
+# Base crawl delay (seconds) by domain suffix
+BASE_DELAYS = {
+    'gov': 3.0,
+    'edu': 2.0,
+    'org': 1.5,
+    'who.int': 4.0,
+    'nih.gov': 3.5,
+    'cdc.gov': 3.0,
+    'fda.gov': 3.0
+}
+DEFAULT_BASE_DELAY = 1.0
+
+# High-quality medical sources whose tasks get a priority boost
+PRIORITY_DOMAINS = (
+    'mayoclinic.org', 'clevelandclinic.org', 'hopkinsmedicine.org', 'harvard.edu',
+    'stanford.edu', 'who.int', 'nih.gov', 'cdc.gov'
+)
+
+_TERMINAL = object()
+
+@dataclass(frozen=True)
+class DomainProfile:
+    """Resolved per-domain scoring and crawl settings"""
+    credibility: float
+    base_delay: float
+    priority_source: bool
+
+def host_labels(netloc: str) -> Tuple[str, ...]:
+    """Split a netloc into lowercase host labels, dropping credentials and port"""
+
+    host = netloc.rpartition('@')[2].lower()
+    if host.startswith('['):
+        return (host,)  # IPv6 literal
+    host = host.partition(':')[0].strip('.')
+    return tuple(host.split('.')) if host else ()
+
+class DomainSuffixTrie:
+    """Trie over reversed host labels; lookups return the value of the longest matching suffix"""
+
+    def __init__(self, entries: Optional[Dict[str, Any]] = None):
+        self._root: Dict[Any, Any] = {}
+        for suffix, value in (entries or {}).items():
+            self.insert(suffix, value)
+
+    def insert(self, suffix: str, value: Any):
+        """Map a domain suffix (e.g. 'nih.gov' or 'edu') to a value"""
+
+        node = self._root
+        for label in reversed(host_labels(suffix)):
+            node = node.setdefault(label, {})
+        node[_TERMINAL] = value
+
+    def longest_match(self, labels: Iterable[str], default: Any = None) -> Any:
+        """Value of the most specific suffix matching the host labels"""
+
+        node = self._root
+        match = default
+        for label in reversed(tuple(labels)):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(_TERMINAL, match)
+        return match
+
+class DomainCredibilityResolver:
+    """Resolve domain profiles through suffix tries with an LRU cache keyed by netloc"""
+
+    def __init__(self, cache_size: int = 4096):
+        credibility = {suffix: 0.7 for suffix in MEDIUM_CREDIBILITY_DOMAINS}
+        credibility['gov'] = GOVERNMENT_CREDIBILITY
+        credibility.update({suffix: 1.0 for suffix in HIGH_CREDIBILITY_DOMAINS})
+
+        self.credibility_trie = DomainSuffixTrie(credibility)
+        self.delay_trie = DomainSuffixTrie(BASE_DELAYS)
+        self.priority_trie = DomainSuffixTrie({suffix: True for suffix in PRIORITY_DOMAINS})
+
+        self.profile = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, netloc: str) -> DomainProfile:
+        labels = host_labels(netloc)
+        return DomainProfile(
+            credibility=self.credibility_trie.longest_match(labels, DEFAULT_CREDIBILITY),
+            base_delay=self.delay_trie.longest_match(labels, DEFAULT_BASE_DELAY),
+            priority_source=self.priority_trie.longest_match(labels, False)
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit statistics"""
+
+        info = self.profile.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'cached_domains': info.currsize}
+
+_domain_resolver: Optional[DomainCredibilityResolver] = None
+
+def get_domain_resolver() -> DomainCredibilityResolver:
+    """Get the process-wide domain credibility resolver"""
+
+    global _domain_resolver
+    if _domain_resolver is None:
+        _domain_resolver = DomainCredibilityResolver()
+    return _domain_resolver
+
+# Export main classes
+__all__ = [
+    'DomainCredibilityResolver', 'DomainSuffixTrie', 'DomainProfile',
+    'get_domain_resolver', 'host_labels'
+]
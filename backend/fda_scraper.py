@@ -7,20 +7,30 @@ Target: 150,000+ records across all FDA databases and regulatory information
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Optional, Any, Tuple
-from datetime import datetime, timedelta
+import os
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
+from datetime import date, datetime, timedelta
 import json
+import math
 import random
 import time
 from urllib.parse import urljoin, urlparse, parse_qs, quote
-from bs4 import BeautifulSoup
-import re
 from collections import defaultdict
+from contextlib import aclosing
 
 from ai_scraper_core import (
     ScrapingTask, ScrapingResult, ScrapingPriority, ContentType, ScrapingTier,
-    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, AdvancedDeduplicator
+    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, get_shared_deduplicator,
+    get_shared_rate_limiter
 )
+from dedup_store import content_digest
+from http_cache import get_shared_http_cache
+from url_canonical import SeenURLIndex
+from reservoir_sampler import StratifiedReservoirSampler
+from session_pool import get_session_pool
+from result_pipeline import iter_sliding_window
+from html_extractors import get_parsing_stage
+from crawl_checkpoint import get_crawl_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -55,11 +65,13 @@ class FDAAdvancedScraper:
         self.content_discovery = ContentDiscoveryAI()
         self.anti_detection = AntiDetectionAI()
         self.content_quality = ContentQualityAI()
-        self.deduplicator = AdvancedDeduplicator()
+        self.deduplicator = get_shared_deduplicator()
+        self.http_cache = get_shared_http_cache()
+        self.rate_limiter = get_shared_rate_limiter()
+        self.checkpoint = get_crawl_checkpoint()
         
         # Performance tracking
-        self.processed_urls = set()
-        self.api_calls_made = 0
+        self.processed_urls = SeenURLIndex()
         self.success_count = 0
         self.error_count = 0
         self.total_records_processed = 0
@@ -68,7 +80,6 @@ class FDAAdvancedScraper:
         # FDA-specific configuration
         self.max_concurrent_api = 10  # Conservative API limits
         self.max_concurrent_web = 15  # Conservative web scraping
-        self.api_delay = 0.5  # Delay between API calls
         
     async def scrape_complete_fda_database(self) -> Dict[str, Any]:
         """Scrape comprehensive FDA database including APIs and web content"""
@@ -92,6 +103,10 @@ class FDAAdvancedScraper:
         logger.info(f"⚡ Launching {len(fda_extraction_tasks)} parallel FDA database extractions")
         results = await asyncio.gather(*fda_extraction_tasks, return_exceptions=True)
         
+        # A run that finished every web section starts from scratch next time
+        if not self.checkpoint.stop_requested and not any(isinstance(r, Exception) for r in results):
+            self.checkpoint.finish_operation('fda')
+        
         # Process and consolidate FDA data
         consolidated_results = await self._process_fda_comprehensive_data(results)
         
@@ -149,10 +164,9 @@ class FDAAdvancedScraper:
         
         logger.info("⚠️ Starting Safety Communications Extraction")
         
-        safety_urls = await self._discover_safety_communication_urls()
-        logger.info(f"🔍 Discovered {len(safety_urls)} safety communication URLs")
-        
-        safety_communications = await self._scrape_safety_communications_batch(safety_urls)
+        safety_communications = await self._execute_fda_section_scraping(
+            self._discover_safety_communication_urls(), 'safety', "Safety Communications"
+        )
         
         return {
             'database': 'FDA_Safety_Communications',
@@ -202,12 +216,25 @@ class FDAAdvancedScraper:
         
         logger.info("⚕️ Starting Adverse Events Database Extraction")
         
-        # Extract adverse events data (sample due to large volume)
-        adverse_events = await self._extract_adverse_events_sample()
+        # Millions of events: aggregate with count facets, download only a stratified sample
+        current_year = datetime.now().year
+        date_range = (date(current_year - 1, 1, 1), date(current_year, 12, 31))
+        
+        analytics = AdverseEventAnalytics(self.openfda_client)
+        facets = await analytics.collect_facets(date_range)
+        strata = await analytics.sample_events(facets['events_per_day'])
+        
+        adverse_events = [event for stratum in strata.values() for event in stratum['events']]
+        population = sum(entry['count'] for entry in facets['events_per_day'])
+        logger.info(f"⚕️ Adverse events: {population:,} in period, {len(adverse_events):,} sampled across {len(strata)} months")
         
         return {
             'database': 'FDA_Adverse_Events',
             'total_events': len(adverse_events),
+            'population_events': population,
+            'facets': facets,
+            'strata': {month: {key: value for key, value in stratum.items() if key != 'events'}
+                       for month, stratum in strata.items()},
             'events': adverse_events
         }
     
@@ -229,8 +256,9 @@ class FDAAdvancedScraper:
         
         logger.info("📋 Starting Guidance Documents Extraction")
         
-        guidance_urls = await self._discover_guidance_document_urls()
-        guidance_documents = await self._scrape_guidance_documents_batch(guidance_urls)
+        guidance_documents = await self._execute_fda_section_scraping(
+            self._discover_guidance_document_urls(), 'guidance', "Guidance Documents"
+        )
         
         return {
             'database': 'FDA_Guidance_Documents',
@@ -279,17 +307,12 @@ class FDAAdvancedScraper:
         
         all_drug_data = []
         
+        # Each query is paged to the end of its result set; the shared quota paces the requests
         for query in drug_queries:
             try:
-                drugs = await self.openfda_client.search_drug_labels(
-                    search_query=query,
-                    limit=10000  # API limit per query
-                )
+                drugs = await self.openfda_client.search_drug_labels(search_query=query, limit=None)
                 all_drug_data.extend(drugs)
                 
-                self.api_calls_made += 1
-                await asyncio.sleep(self.api_delay)  # Rate limiting
-                
             except Exception as e:
                 logger.warning(f"Error extracting drugs via API with query {query}: {e}")
         
@@ -300,35 +323,15 @@ class FDAAdvancedScraper:
         
         logger.info("🌐 Extracting drugs via web scraping")
         
-        drug_urls = await self._discover_drug_urls()
-        
-        drugs_data = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=30, limit_per_host=10)
-        ) as session:
-            
-            batch_size = 20
-            for i in range(0, len(drug_urls), batch_size):
-                batch_urls = drug_urls[i:i + batch_size]
-                
-                batch_results = await self._scrape_drug_urls_batch(batch_urls, session)
-                drugs_data.extend(batch_results)
-                
-                # Conservative delay for FDA
-                await asyncio.sleep(random.uniform(2.0, 4.0))
-        
-        return drugs_data
+        return await self._execute_fda_section_scraping(self._discover_drug_urls(), 'drugs', "Drugs")
     
     async def _extract_devices_via_api(self) -> List[Dict[str, Any]]:
         """Extract medical device data via OpenFDA API"""
         
         logger.info("🔌 Extracting devices via OpenFDA API")
         
-        devices = await self.openfda_client.search_device_classifications(limit=15000)
+        devices = await self.openfda_client.search_device_classifications(limit=None)
         
-        self.api_calls_made += 1
         return devices
     
     async def _extract_devices_via_web(self) -> List[Dict[str, Any]]:
@@ -336,25 +339,7 @@ class FDAAdvancedScraper:
         
         logger.info("🌐 Extracting devices via web scraping")
         
-        device_urls = await self._discover_device_urls()
-        
-        devices_data = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=25, limit_per_host=8)
-        ) as session:
-            
-            batch_size = 15
-            for i in range(0, len(device_urls), batch_size):
-                batch_urls = device_urls[i:i + batch_size]
-                
-                batch_results = await self._scrape_device_urls_batch(batch_urls, session)
-                devices_data.extend(batch_results)
-                
-                await asyncio.sleep(random.uniform(2.0, 4.0))
-        
-        return devices_data
+        return await self._execute_fda_section_scraping(self._discover_device_urls(), 'devices', "Devices")
     
     async def _extract_recalls_via_api(self) -> List[Dict[str, Any]]:
         """Extract recalls via OpenFDA API"""
@@ -367,15 +352,9 @@ class FDAAdvancedScraper:
         
         for recall_type in recall_types:
             try:
-                recalls = await self.openfda_client.search_recalls(
-                    recall_type=recall_type,
-                    limit=5000
-                )
+                recalls = await self.openfda_client.search_recalls(recall_type=recall_type, limit=None)
                 all_recalls.extend(recalls)
                 
-                self.api_calls_made += 1
-                await asyncio.sleep(self.api_delay)
-                
             except Exception as e:
                 logger.warning(f"Error extracting {recall_type} recalls: {e}")
         
@@ -386,25 +365,7 @@ class FDAAdvancedScraper:
         
         logger.info("🌐 Extracting recalls via web scraping")
         
-        recall_urls = await self._discover_recall_urls()
-        
-        recalls_data = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=20, limit_per_host=6)
-        ) as session:
-            
-            batch_size = 10
-            for i in range(0, len(recall_urls), batch_size):
-                batch_urls = recall_urls[i:i + batch_size]
-                
-                batch_results = await self._scrape_recall_urls_batch(batch_urls, session)
-                recalls_data.extend(batch_results)
-                
-                await asyncio.sleep(random.uniform(3.0, 5.0))
-        
-        return recalls_data
+        return await self._execute_fda_section_scraping(self._discover_recall_urls(), 'recalls', "Recalls")
     
     async def _extract_orange_book_data(self) -> List[Dict[str, Any]]:
         """Extract Orange Book data"""
@@ -419,8 +380,6 @@ class FDAAdvancedScraper:
             api_data = await self.openfda_client.search_orange_book(limit=40000)
             orange_book_data.extend(api_data)
             
-            self.api_calls_made += 1
-            
         except Exception as e:
             logger.warning(f"Orange Book API extraction failed: {e}")
             
@@ -430,62 +389,14 @@ class FDAAdvancedScraper:
         
         return orange_book_data
     
-    async def _extract_adverse_events_sample(self) -> List[Dict[str, Any]]:
-        """Extract sample of adverse events (FAERS data)"""
-        
-        logger.info("⚕️ Extracting adverse events sample")
-        
-        # Extract sample due to large volume (millions of records)
-        adverse_events = []
-        
-        # Query recent adverse events
-        current_year = datetime.now().year
-        date_queries = [
-            f'receivedate:[{current_year}0101+TO+{current_year}1231]',
-            f'receivedate:[{current_year-1}0101+TO+{current_year-1}1231]'
-        ]
-        
-        for date_query in date_queries:
-            try:
-                events = await self.openfda_client.search_adverse_events(
-                    search_query=date_query,
-                    limit=10000  # Sample size per year
-                )
-                adverse_events.extend(events)
-                
-                self.api_calls_made += 1
-                await asyncio.sleep(self.api_delay)
-                
-            except Exception as e:
-                logger.warning(f"Error extracting adverse events for query {date_query}: {e}")
-        
-        return adverse_events
-    
     async def _extract_clinical_trials_data(self) -> List[Dict[str, Any]]:
         """Extract clinical trials data"""
         
         logger.info("🔬 Extracting clinical trials data")
         
-        clinical_trials = []
-        
-        # Discover clinical trials URLs
-        trial_urls = await self._discover_clinical_trial_urls()
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=20, limit_per_host=6)
-        ) as session:
-            
-            batch_size = 12
-            for i in range(0, len(trial_urls), batch_size):
-                batch_urls = trial_urls[i:i + batch_size]
-                
-                batch_results = await self._scrape_clinical_trial_batch(batch_urls, session)
-                clinical_trials.extend(batch_results)
-                
-                await asyncio.sleep(random.uniform(2.5, 4.0))
-        
-        return clinical_trials
+        return await self._execute_fda_section_scraping(
+            self._discover_clinical_trial_urls(), 'clinical_trials', "Clinical Trials"
+        )
     
     async def _extract_food_safety_data(self) -> List[Dict[str, Any]]:
         """Extract food safety data"""
@@ -496,20 +407,17 @@ class FDAAdvancedScraper:
         
         # Extract via API
         try:
-            food_recalls = await self.openfda_client.search_food_enforcement(limit=10000)
+            food_recalls = await self.openfda_client.search_food_enforcement(limit=None)
             food_safety_data.extend(food_recalls)
             
-            self.api_calls_made += 1
-            
         except Exception as e:
             logger.warning(f"Food safety API extraction failed: {e}")
         
         # Extract via web scraping
-        food_urls = await self._discover_food_safety_urls()
-        
-        async with aiohttp.ClientSession() as session:
-            web_food_data = await self._scrape_food_safety_batch(food_urls[:1000], session)
-            food_safety_data.extend(web_food_data)
+        web_food_data = await self._execute_fda_section_scraping(
+            self._discover_food_safety_urls(), 'food_safety', "Food Safety", limit=1000
+        )
+        food_safety_data.extend(web_food_data)
         
         return food_safety_data
     
@@ -518,316 +426,209 @@ class FDAAdvancedScraper:
         
         logger.info("🚬 Extracting tobacco product data")
         
-        tobacco_data = []
-        
-        tobacco_urls = await self._discover_tobacco_urls()
-        
-        async with aiohttp.ClientSession() as session:
-            tobacco_data = await self._scrape_tobacco_batch(tobacco_urls[:2000], session)
-        
-        return tobacco_data
+        return await self._execute_fda_section_scraping(
+            self._discover_tobacco_urls(), 'tobacco', "Tobacco", limit=2000
+        )
     
     # URL Discovery Methods
-    async def _discover_drug_urls(self) -> List[str]:
+    async def _discover_drug_urls(self) -> AsyncIterator[str]:
         """Discover drug-related URLs"""
         
         base_url = self.fda_sources['drug_database']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_drugs"
-        )
+        ):
+            yield url
     
-    async def _discover_device_urls(self) -> List[str]:
+    async def _discover_device_urls(self) -> AsyncIterator[str]:
         """Discover device-related URLs"""
         
         base_url = self.fda_sources['device_database']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_devices"
-        )
+        ):
+            yield url
     
-    async def _discover_safety_communication_urls(self) -> List[str]:
+    async def _discover_safety_communication_urls(self) -> AsyncIterator[str]:
         """Discover safety communication URLs"""
         
         base_url = self.fda_sources['safety_communications']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_safety"
-        )
+        ):
+            yield url
     
-    async def _discover_recall_urls(self) -> List[str]:
+    async def _discover_recall_urls(self) -> AsyncIterator[str]:
         """Discover recall URLs"""
         
         base_url = self.fda_sources['recalls_database']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_recalls"
-        )
+        ):
+            yield url
     
-    async def _discover_guidance_document_urls(self) -> List[str]:
+    async def _discover_guidance_document_urls(self) -> AsyncIterator[str]:
         """Discover guidance document URLs"""
         
         base_url = self.fda_sources['guidance_documents']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_guidance"
-        )
+        ):
+            yield url
     
-    async def _discover_clinical_trial_urls(self) -> List[str]:
+    async def _discover_clinical_trial_urls(self) -> AsyncIterator[str]:
         """Discover clinical trial URLs"""
         
         base_url = self.fda_sources['clinical_trials']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_clinical_trials"
-        )
+        ):
+            yield url
     
-    async def _discover_food_safety_urls(self) -> List[str]:
+    async def _discover_food_safety_urls(self) -> AsyncIterator[str]:
         """Discover food safety URLs"""
         
         base_url = self.fda_sources['food_safety']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_food_safety"
-        )
+        ):
+            yield url
     
-    async def _discover_tobacco_urls(self) -> List[str]:
+    async def _discover_tobacco_urls(self) -> AsyncIterator[str]:
         """Discover tobacco product URLs"""
         
         base_url = self.fda_sources['tobacco_products']
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             base_url,
             "fda_tobacco"
-        )
+        ):
+            yield url
     
-    # Batch scraping methods
-    async def _scrape_drug_urls_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Scrape batch of drug URLs"""
-        
-        return await self._scrape_fda_urls_batch(urls, session, "drugs")
-    
-    async def _scrape_device_urls_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Scrape batch of device URLs"""
-        
-        return await self._scrape_fda_urls_batch(urls, session, "devices")
-    
-    async def _scrape_safety_communications_batch(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """Scrape safety communications"""
-        
-        async with aiohttp.ClientSession() as session:
-            return await self._scrape_fda_urls_batch(urls, session, "safety")
-    
-    async def _scrape_recall_urls_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Scrape batch of recall URLs"""
-        
-        return await self._scrape_fda_urls_batch(urls, session, "recalls")
-    
-    async def _scrape_guidance_documents_batch(self, urls: List[str]) -> List[Dict[str, Any]]:
-        """Scrape guidance documents"""
-        
-        async with aiohttp.ClientSession() as session:
-            return await self._scrape_fda_urls_batch(urls, session, "guidance")
-    
-    async def _scrape_clinical_trial_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Scrape clinical trial batch"""
-        
-        return await self._scrape_fda_urls_batch(urls, session, "clinical_trials")
-    
-    async def _scrape_food_safety_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Scrape food safety batch"""
-        
-        return await self._scrape_fda_urls_batch(urls, session, "food_safety")
-    
-    async def _scrape_tobacco_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Scrape tobacco batch"""
-        
-        return await self._scrape_fda_urls_batch(urls, session, "tobacco")
-    
-    async def _scrape_fda_urls_batch(self, urls: List[str], session: aiohttp.ClientSession, 
-                                    content_type: str) -> List[Dict[str, Any]]:
-        """Generic FDA URL batch scraping"""
+    # Section scraping methods
+    async def _execute_fda_section_scraping(self, urls: AsyncIterator[str], section_name: str,
+                                            display_name: str, limit: Optional[int] = None,
+                                            window_size: int = 8) -> List[Dict[str, Any]]:
+        """Execute FDA section scraping with a small sliding window of in-flight requests"""
         
+        section_stats = self.database_stats[section_name]
         scraped_data = []
         
-        for url in urls:
-            try:
-                headers = await self.anti_detection.get_optimized_headers(url, len(self.processed_urls))
+        # Discovery streams into the section's persistent frontier while fetching drains it;
+        # URLs completed by an earlier run are already marked done there and never refetched
+        frontier = self.checkpoint.start_section('fda', section_name)
+        discovery = frontier.start_feed(urls)
+        saved_stats = self.checkpoint.load_stats('fda', section_name)
+        if saved_stats:
+            # Failed URLs are fetched again, so only completed work carries over
+            section_stats['processed'] = section_stats['successful'] = saved_stats['successful']
+        
+        try:
+            async with get_session_pool().borrow('fda') as session:
                 
-                async with session.get(url, headers=headers, timeout=45) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        
-                        # Extract FDA-specific data
-                        extracted = await self._extract_fda_structured_data(content, url, content_type)
-                        
+                # Conservative FDA pacing comes from the shared rate limiter
+                async with aclosing(iter_sliding_window(
+                    frontier,
+                    lambda url: self._scrape_fda_url(url, session, section_name),
+                    window_size
+                )) as results:
+                    async for url, succeeded, extracted in results:
                         if extracted:
                             scraped_data.append(extracted)
-                            self.success_count += 1
-                
-                self.processed_urls.add(url)
-                
-            except Exception as e:
-                logger.warning(f"Error scraping FDA URL {url}: {e}")
-                self.error_count += 1
-        
+                        
+                        section_stats['processed'] += 1
+                        if succeeded:
+                            section_stats['successful'] += 1
+                            self.checkpoint.mark_completed('fda', section_name, url, section_stats)
+                        else:
+                            section_stats['errors'] += 1
+                        
+                        if section_stats['processed'] % 50 == 0:
+                            logger.info(f"🏛️ FDA {display_name}: {section_stats['processed']} processed, {frontier.pending_count()} queued")
+                        
+                        if limit is not None and section_stats['successful'] >= limit:
+                            break
+                        
+                        if self.checkpoint.stop_requested:
+                            logger.info(f"🛑 FDA {display_name}: stopping, progress checkpointed")
+                            break
+        finally:
+            discovery.cancel()
+            self.checkpoint.save_stats('fda', section_name, section_stats)
+            self.checkpoint.checkpoint()
+        
+        logger.info(f"✅ FDA {display_name} section complete: {len(scraped_data)} records extracted")
         return scraped_data
     
-    async def _extract_fda_structured_data(self, content: str, url: str, content_type: str) -> Dict[str, Any]:
-        """Extract FDA-specific structured data"""
+    async def _scrape_fda_url(self, url: str, session: aiohttp.ClientSession,
+                              content_type: str) -> Tuple[str, bool, Optional[Dict[str, Any]]]:
+        """Fetch one FDA URL; returns the URL, whether it completed, and its extracted data"""
         
         try:
-            soup = BeautifulSoup(content, 'lxml')
-            
-            extracted = {
-                'url': url,
-                'content_type': content_type,
-                'title': '',
-                'summary': '',
-                'fda_data': {},
-                'regulatory_info': {},
-                'metadata': {},
-                'extracted_at': datetime.utcnow().isoformat()
-            }
-            
-            # Extract title
-            title_elem = soup.find('h1') or soup.find('title')
-            if title_elem:
-                extracted['title'] = title_elem.get_text(strip=True)
+            headers = await self.anti_detection.get_optimized_headers(url, len(self.processed_urls))
+            headers.update(self.http_cache.conditional_headers(url))
             
-            # Extract FDA-specific data based on content type
-            if content_type == 'drugs':
-                extracted['fda_data'] = await self._extract_drug_specific_data(soup)
-            elif content_type == 'devices':
-                extracted['fda_data'] = await self._extract_device_specific_data(soup)
-            elif content_type == 'safety':
-                extracted['fda_data'] = await self._extract_safety_specific_data(soup)
-            elif content_type == 'recalls':
-                extracted['fda_data'] = await self._extract_recall_specific_data(soup)
+            await self.rate_limiter.wait_for_permit(url)
+            request_start = time.time()
             
-            # Extract regulatory information
-            extracted['regulatory_info'] = await self._extract_regulatory_info(soup, content_type)
-            
-            # Quality assessment
-            quality_score = await self.content_quality.assess_content_quality(content, url)
-            extracted['quality_score'] = min(1.0, quality_score * 1.3)  # Boost for FDA
-            
-            extracted['metadata'] = {
-                'word_count': len(content.split()),
-                'fda_authority_score': 0.98,
-                'regulatory_relevance': self._calculate_regulatory_relevance(content),
-                'government_source': True
-            }
+            async with session.get(url, headers=headers, timeout=45) as response:
+                self.rate_limiter.record_request_result(
+                    url, response.status in (200, 304), time.time() - request_start, response.status
+                )
+                
+                content = await response.text() if response.status == 200 else None
+                digest = content_digest(content) if content is not None else None
+                extracted = None
+                
+                # Unchanged since last crawl - reuse previous extraction
+                cached = self.http_cache.lookup_unchanged(url, response.status, digest)
+                if cached is not None:
+                    extracted = cached.extracted_data or None
+                
+                elif response.status == 200:
+                    # Extract FDA-specific data
+                    extracted = await self._extract_fda_structured_data(content, url, content_type)
+                    
+                    if extracted:
+                        self.http_cache.store(url, response.headers, digest, extracted,
+                                              extracted.get('quality_score', 0.0), len(content))
+                        self.success_count += 1
             
-            return extracted
+            self.processed_urls.add(url)
+            return url, response.status in (200, 304), extracted
             
         except Exception as e:
-            logger.error(f"Error extracting FDA structured data: {e}")
-            return None
-    
-    async def _extract_drug_specific_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Extract drug-specific data"""
-        
-        drug_data = {
-            'drug_name': '',
-            'active_ingredients': [],
-            'indications': [],
-            'dosage_forms': [],
-            'approval_date': '',
-            'nda_number': ''
-        }
-        
-        # Extract drug name
-        name_selectors = ['.drug-name', '.product-name', 'h1']
-        for selector in name_selectors:
-            name_elem = soup.select_one(selector)
-            if name_elem:
-                drug_data['drug_name'] = name_elem.get_text(strip=True)
-                break
-        
-        # Extract indications
-        indication_text = soup.get_text().lower()
-        if 'indication' in indication_text:
-            # Simplified indication extraction
-            indication_matches = re.findall(r'indication[s]?[:\-]\s*([^.]+)', indication_text)
-            drug_data['indications'] = indication_matches[:3]
-        
-        return drug_data
-    
-    async def _extract_device_specific_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Extract device-specific data"""
-        
-        device_data = {
-            'device_name': '',
-            'classification': '',
-            'intended_use': '',
-            'clearance_number': '',
-            'device_class': ''
-        }
-        
-        # Extract device name
-        name_elem = soup.find('h1')
-        if name_elem:
-            device_data['device_name'] = name_elem.get_text(strip=True)
-        
-        return device_data
-    
-    async def _extract_safety_specific_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Extract safety communication specific data"""
-        
-        safety_data = {
-            'alert_type': '',
-            'affected_products': [],
-            'safety_concern': '',
-            'date_issued': ''
-        }
-        
-        return safety_data
+            logger.warning(f"Error scraping FDA URL {url}: {e}")
+            self.error_count += 1
+            if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                self.rate_limiter.record_request_result(url, False, 0.0)
+            return url, False, None
     
-    async def _extract_recall_specific_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Extract recall-specific data"""
+    async def _extract_fda_structured_data(self, content: str, url: str, content_type: str) -> Optional[Dict[str, Any]]:
+        """Extract FDA-specific structured data in the parsing pool"""
         
-        recall_data = {
-            'recall_number': '',
-            'product_name': '',
-            'recall_reason': '',
-            'recall_class': '',
-            'recall_date': ''
-        }
-        
-        return recall_data
-    
-    async def _extract_regulatory_info(self, soup: BeautifulSoup, content_type: str) -> Dict[str, Any]:
-        """Extract regulatory information"""
-        
-        regulatory_info = {
-            'approval_status': '',
-            'regulatory_pathway': '',
-            'fda_center': '',
-            'cfr_reference': ''
-        }
-        
-        return regulatory_info
-    
-    def _calculate_regulatory_relevance(self, content: str) -> float:
-        """Calculate regulatory relevance score"""
-        
-        regulatory_terms = [
-            'approval', 'clearance', 'regulation', 'compliance', 'guidance',
-            'cfr', 'federal register', 'premarket', 'clinical trial', 'safety'
-        ]
+        extracted = await get_parsing_stage().parse('fda', content, url, content_type)
         
-        content_lower = content.lower()
-        found_terms = sum(1 for term in regulatory_terms if term in content_lower)
+        if extracted:
+            # Quality assessment
+            quality_score = await self.content_quality.assess_content_quality(content, url)
+            extracted['quality_score'] = min(1.0, quality_score * 1.3)  # Boost for FDA
         
-        return min(1.0, found_terms / len(regulatory_terms) * 2)
+        return extracted
     
     # Data processing and merging methods
     async def _merge_drug_data(self, api_data: List[Dict[str, Any]], 
@@ -912,12 +713,16 @@ class FDAAdvancedScraper:
                 
                 total_records += record_count
         
+        # The extractions run concurrently on one client, so its counters are read once here
+        api_calls_made = self.openfda_client.api_calls
+        
         final_summary = {
             'fda_scraping_summary': {
                 'operation_type': 'FDA Comprehensive Database Scraping',
                 'databases_processed': len(consolidated_results),
                 'total_records_extracted': total_records,
-                'api_calls_made': self.api_calls_made,
+                'api_calls_made': api_calls_made,
+                'failed_api_requests': self.openfda_client.failed_requests,
                 'success_count': self.success_count,
                 'error_count': self.error_count,
                 'regulatory_authority_score': 0.99,  # Highest for FDA
@@ -925,7 +730,7 @@ class FDAAdvancedScraper:
             },
             'database_results': consolidated_results,
             'performance_metrics': {
-                'records_per_api_call': total_records / max(self.api_calls_made, 1),
+                'records_per_api_call': total_records / max(api_calls_made, 1),
                 'success_rate': self.success_count / max(self.success_count + self.error_count, 1),
                 'regulatory_comprehensiveness': 0.95,
                 'data_authority_score': 0.99
@@ -937,7 +742,7 @@ class FDAAdvancedScraper:
         logger.info("=" * 80)
         logger.info(f"📊 Total Records Extracted: {total_records:,}")
         logger.info(f"🗃️ Databases Processed: {len(consolidated_results)}")
-        logger.info(f"🔌 API Calls Made: {self.api_calls_made:,}")
+        logger.info(f"🔌 API Calls Made: {api_calls_made:,}")
         logger.info(f"🏛️ Regulatory Authority Score: 0.99")
         logger.info(f"✅ Success Rate: {(self.success_count / max(self.success_count + self.error_count, 1)):.1%}")
         logger.info("=" * 80)
@@ -949,7 +754,10 @@ class FDAAdvancedScraper:
 class OpenFDAAdvancedClient:
     """Advanced client for OpenFDA API with comprehensive endpoints"""
     
-    def __init__(self):
+    MAX_PAGE_SIZE = 1000   # OpenFDA limit per request
+    MAX_SKIP = 25000       # Deeper pages are only reachable through search_after links
+    
+    def __init__(self, quota: Optional['OpenFDAQuota'] = None, max_attempts: int = 3):
         self.base_url = 'https://api.fda.gov/'
         self.endpoints = {
             'drug_labels': 'drug/label.json',
@@ -961,68 +769,217 @@ class OpenFDAAdvancedClient:
             'food_enforcement': 'food/enforcement.json',
             'other_substance': 'other/substance.json'
         }
-    
-    async def search_drug_labels(self, search_query: str = '', limit: int = 1000) -> List[Dict[str, Any]]:
-        """Search drug labels via OpenFDA API"""
         
-        url = f"{self.base_url}{self.endpoints['drug_labels']}"
-        params = {
-            'search': search_query,
-            'limit': min(limit, 1000)  # API limit
+        # Date field (and first full year of data) used to partition large result sets
+        self.date_fields = {
+            'drug_labels': ('effective_time', 1990),
+            'drug_adverse_events': ('receivedate', 2004),
+            'drug_enforcement': ('report_date', 2004),
+            'device_adverse_events': ('date_received', 1991),
+            'device_enforcement': ('report_date', 2004),
+            'food_enforcement': ('report_date', 2004)
         }
         
-        if not search_query:
-            params = {'limit': min(limit, 1000)}
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('results', [])
-        except Exception as e:
-            logger.warning(f"Error searching drug labels: {e}")
-        
-        return []
+        self.quota = quota or get_openfda_quota()
+        self.max_attempts = max_attempts
+        self.api_calls = 0
+        self.failed_requests = 0
     
-    async def search_device_classifications(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Search device classifications"""
+    async def request_page(self, url: str, params: Optional[Dict[str, Any]] = None
+                           ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Quota-governed GET of one result page; returns the JSON body (None on failure) and the search_after link"""
         
-        url = f"{self.base_url}{self.endpoints['device_classifications']}"
-        params = {'limit': min(limit, 1000)}
+        if params is not None and self.quota.api_key:
+            params = {**params, 'api_key': self.quota.api_key}
         
-        try:
-            async with aiohttp.ClientSession() as session:
+        for attempt in range(self.max_attempts):
+            if not await self.quota.acquire():
+                return None, None
+            
+            self.api_calls += 1
+            async with get_session_pool().borrow('openfda') as session:
                 async with session.get(url, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('results', [])
-        except Exception as e:
-            logger.warning(f"Error searching device classifications: {e}")
-        
-        return []
+                    self.quota.record_response(response.status, response.headers.get('Retry-After'))
+                    
+                    if response.status == 429:
+                        continue  # The quota has backed off; try again in a later slot
+                    if response.status == 404:
+                        return {'meta': {'results': {'total': 0}}, 'results': []}, None  # OpenFDA's "No matches found"
+                    if response.status != 200:
+                        logger.warning(f"OpenFDA {url} returned HTTP {response.status}")
+                        return None, None
+                    
+                    next_link = response.links.get('next')
+                    return await response.json(), str(next_link['url']) if next_link else None
+        
+        logger.warning(f"OpenFDA {url} still throttled after {self.max_attempts} attempts")
+        return None, None
+    
+    def _date_partitions(self, field: str, first_year: int,
+                         date_range: Optional[Tuple[date, date]] = None) -> List[Tuple[str, Optional[Tuple[date, date]]]]:
+        """Yearly date-range partitions (within date_range if given; otherwise plus everything older
+        and records without the field)"""
+        
+        if date_range is not None:
+            start, end = date_range
+            spans = [(max(start, date(year, 1, 1)), min(end, date(year, 12, 31)))
+                     for year in range(start.year, end.year + 1)]
+            return [(self.date_clause(field, span), span) for span in spans]
+        
+        spans = [(date(1900, 1, 1), date(first_year - 1, 12, 31))]
+        spans.extend((date(year, 1, 1), date(year, 12, 31)) for year in range(first_year, datetime.utcnow().year + 1))
+        
+        partitions = [(self.date_clause(field, span), span) for span in spans]
+        partitions.append((f'_missing_:{field}', None))
+        return partitions
+    
+    def date_clause(self, field: str, span: Tuple[date, date]) -> str:
+        """Search clause matching a field within an inclusive date range"""
+        return f"{field}:[{span[0]:%Y%m%d} TO {span[1]:%Y%m%d}]"
     
-    async def search_adverse_events(self, search_query: str = '', limit: int = 1000) -> List[Dict[str, Any]]:
-        """Search adverse events"""
+    def _abandon_partition(self, url: str, clause: str, offset: int):
+        """Count a partition whose paging stopped on a failed page, so truncated result sets show up"""
         
-        url = f"{self.base_url}{self.endpoints['drug_adverse_events']}"
-        params = {
-            'search': search_query,
-            'limit': min(limit, 1000)
-        }
+        self.failed_requests += 1
+        logger.warning(f"OpenFDA {url} partition '{clause}' abandoned after {offset} records; the rest are missing")
+    
+    async def _iter_partition(self, url: str, search: str, field: Optional[str],
+                              partition: Tuple[str, Optional[Tuple[date, date]]],
+                              partitions: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        """Page through one partition with skip, splitting it when it is too deep for skip paging"""
+        
+        clause, span = partition
+        query = f"({search}) AND {clause}" if search and clause else (search or clause)
+        params = {'limit': self.MAX_PAGE_SIZE}
+        if query:
+            params['search'] = query
+        
+        data, next_url = await self.request_page(url, params)
+        if data is None:
+            self._abandon_partition(url, clause, 0)
+            return
+        
+        total = data.get('meta', {}).get('results', {}).get('total', 0)
+        skip_window = self.MAX_SKIP + self.MAX_PAGE_SIZE
+        
+        if total > skip_window and span is not None and span[0] < span[1]:
+            # Halve the date range; the halves are paged by whichever workers pick them up
+            middle = span[0] + (span[1] - span[0]) // 2
+            for half in ((span[0], middle), (middle + timedelta(days=1), span[1])):
+                partitions.put_nowait((self.date_clause(field, half), half))
+            return
+        
+        for record in data.get('results', []):
+            yield record
+        
+        if total <= skip_window:
+            for skip in range(self.MAX_PAGE_SIZE, total, self.MAX_PAGE_SIZE):
+                data, _ = await self.request_page(url, {**params, 'skip': skip})
+                if data is None:
+                    self._abandon_partition(url, clause, skip)
+                    return
+                for record in data.get('results', []):
+                    yield record
+        else:
+            # A single day (or an undated set) past the skip window: follow the search_after links
+            fetched = len(data.get('results', []))
+            while next_url:
+                data, next_url = await self.request_page(next_url)
+                if data is None:
+                    self._abandon_partition(url, clause, fetched)
+                    return
+                fetched += len(data.get('results', []))
+                for record in data.get('results', []):
+                    yield record
+    
+    async def iter_records(self, endpoint: str, search: str = '', date_range: Optional[Tuple[date, date]] = None,
+                           max_records: Optional[int] = None, concurrency: int = 4) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every record matching a search (optionally within a date range), paging
+        date-range partitions concurrently"""
+        
+        url = f"{self.base_url}{self.endpoints[endpoint]}"
+        field, first_year = self.date_fields.get(endpoint, (None, None))
+        
+        partitions: asyncio.Queue = asyncio.Queue()
+        for partition in (self._date_partitions(field, first_year, date_range) if field else [('', None)]):
+            partitions.put_nowait(partition)
+        
+        records: asyncio.Queue = asyncio.Queue(maxsize=2000)
+        finished = object()
+        
+        async def worker():
+            while True:
+                partition = await partitions.get()
+                try:
+                    async for record in self._iter_partition(url, search, field, partition, partitions):
+                        await records.put(record)
+                except Exception as e:
+                    logger.warning(f"Error paging OpenFDA {endpoint} partition '{partition[0]}': {e}")
+                    self.failed_requests += 1
+                finally:
+                    partitions.task_done()
+        
+        async def run_all():
+            workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+            try:
+                await partitions.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+            await records.put(finished)
+        
+        producer = asyncio.ensure_future(run_all())
+        yielded = 0
+        try:
+            while max_records is None or yielded < max_records:
+                record = await records.get()
+                if record is finished:
+                    break
+                yielded += 1
+                yield record
+        finally:
+            producer.cancel()
+    
+    async def collect_records(self, endpoint: str, search: str = '', limit: Optional[int] = None,
+                              date_range: Optional[Tuple[date, date]] = None) -> List[Dict[str, Any]]:
+        """Gather up to `limit` records of a search (all of them when limit is None)"""
         
+        records = []
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('results', [])
+            async for record in self.iter_records(endpoint, search, date_range, max_records=limit):
+                records.append(record)
         except Exception as e:
-            logger.warning(f"Error searching adverse events: {e}")
+            logger.warning(f"Error searching OpenFDA {endpoint}: {e}")
         
-        return []
+        return records
+    
+    async def count_by(self, endpoint: str, field: str, search: str = '', limit: int = 1000) -> List[Dict[str, Any]]:
+        """Count facet: matching records per value of a field (per day for date fields) in one request"""
+        
+        params = {'count': field, 'limit': limit}
+        if search:
+            params['search'] = search
+        
+        data, _ = await self.request_page(f"{self.base_url}{self.endpoints[endpoint]}", params)
+        if data is None:
+            self.failed_requests += 1
+            return []
+        return data.get('results', [])
     
-    async def search_recalls(self, recall_type: str = 'drug', limit: int = 1000) -> List[Dict[str, Any]]:
+    async def search_drug_labels(self, search_query: str = '', limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
+        """Search drug labels via OpenFDA API"""
+        return await self.collect_records('drug_labels', search_query, limit)
+    
+    async def search_device_classifications(self, limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
+        """Search device classifications"""
+        return await self.collect_records('device_classifications', limit=limit)
+    
+    async def search_adverse_events(self, search_query: str = '', limit: Optional[int] = 1000,
+                                    date_range: Optional[Tuple[date, date]] = None) -> List[Dict[str, Any]]:
+        """Search adverse events (received within date_range if given)"""
+        return await self.collect_records('drug_adverse_events', search_query, limit, date_range)
+    
+    async def search_recalls(self, recall_type: str = 'drug', limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Search recalls by type"""
         
         endpoint_map = {
@@ -1031,20 +988,7 @@ class OpenFDAAdvancedClient:
             'food': 'food_enforcement'
         }
         
-        endpoint = self.endpoints.get(endpoint_map.get(recall_type, 'drug_enforcement'))
-        url = f"{self.base_url}{endpoint}"
-        params = {'limit': min(limit, 1000)}
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('results', [])
-        except Exception as e:
-            logger.warning(f"Error searching {recall_type} recalls: {e}")
-        
-        return []
+        return await self.collect_records(endpoint_map.get(recall_type, 'drug_enforcement'), limit=limit)
     
     async def search_orange_book(self, limit: int = 1000) -> List[Dict[str, Any]]:
         """Search Orange Book data (if available via API)"""
@@ -1054,22 +998,197 @@ class OpenFDAAdvancedClient:
         
         return []
     
-    async def search_food_enforcement(self, limit: int = 1000) -> List[Dict[str, Any]]:
+    async def search_food_enforcement(self, limit: Optional[int] = 1000) -> List[Dict[str, Any]]:
         """Search food enforcement records"""
+        return await self.collect_records('food_enforcement', limit=limit)
+
+
+class AdverseEventAnalytics:
+    """FAERS analytics from OpenFDA count facets, plus stratified samples of raw events"""
+    
+    REACTION_FIELD = 'patient.reaction.reactionmeddrapt.exact'
+    DRUG_FIELD = 'patient.drug.medicinalproduct.exact'
+    OUTCOME_FIELD = 'patient.reaction.reactionoutcome'
+    
+    def __init__(self, client: OpenFDAAdvancedClient, seed: Optional[int] = None):
+        self.client = client
+        self.seed = seed
+        self._random = random.Random(seed)
+    
+    def _received_within(self, date_range: Tuple[date, date]) -> str:
+        return self.client.date_clause('receivedate', date_range)
+    
+    async def collect_facets(self, date_range: Tuple[date, date], top_drugs: int = 25) -> Dict[str, Any]:
+        """Aggregate picture of a period: daily volume, top reactions and drugs, reactions per drug,
+        outcomes and seriousness per year"""
         
-        url = f"{self.base_url}{self.endpoints['food_enforcement']}"
-        params = {'limit': min(limit, 1000)}
+        period = self._received_within(date_range)
+        endpoint = 'drug_adverse_events'
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('results', [])
-        except Exception as e:
-            logger.warning(f"Error searching food enforcement: {e}")
+        facets = {
+            'events_per_day': await self.client.count_by(endpoint, 'receivedate', period),
+            'top_reactions': await self.client.count_by(endpoint, self.REACTION_FIELD, period),
+            'top_drugs': await self.client.count_by(endpoint, self.DRUG_FIELD, period, limit=top_drugs)
+        }
         
-        return []
+        # Reactions per drug: one facet query per top drug, run concurrently under the shared quota
+        drugs = [entry['term'] for entry in facets['top_drugs']]
+        per_drug = await asyncio.gather(*(
+            self.client.count_by(endpoint, self.REACTION_FIELD,
+                                 f'{period} AND {self.DRUG_FIELD}:"{drug}"', limit=25)
+            for drug in drugs
+        ))
+        facets['reactions_per_drug'] = dict(zip(drugs, per_drug))
+        
+        years = range(date_range[0].year, date_range[1].year + 1)
+        year_periods = [
+            self._received_within((max(date_range[0], date(year, 1, 1)), min(date_range[1], date(year, 12, 31))))
+            for year in years
+        ]
+        outcomes = await asyncio.gather(*(self.client.count_by(endpoint, self.OUTCOME_FIELD, p) for p in year_periods))
+        serious = await asyncio.gather(*(self.client.count_by(endpoint, 'serious', p) for p in year_periods))
+        facets['outcomes_per_year'] = dict(zip(years, outcomes))
+        facets['serious_per_year'] = dict(zip(years, serious))
+        
+        return facets
+    
+    async def sample_events(self, events_per_day: List[Dict[str, Any]], per_stratum: int = 200,
+                            page_size: int = 100, oversample: float = 2.0) -> Dict[str, Dict[str, Any]]:
+        """Uniform sample of raw events per month, drawn from randomly chosen pages of each month's days"""
+        
+        # Every page of every day in a month is equally likely to be fetched, so each event is too
+        month_pages = defaultdict(list)
+        month_population = defaultdict(int)
+        for entry in events_per_day:
+            day, count = entry['time'], entry['count']
+            month_population[day[:6]] += count
+            reachable = min(count, self.client.MAX_SKIP + page_size)
+            month_pages[day[:6]].extend((day, skip) for skip in range(0, reachable, page_size))
+        
+        sampler = StratifiedReservoirSampler(per_stratum, lambda event: event.get('receivedate', '')[:6], self.seed)
+        pages_per_stratum = max(1, math.ceil(per_stratum * oversample / page_size))
+        
+        async def fetch_page(day: str, skip: int) -> List[Dict[str, Any]]:
+            data, _ = await self.client.request_page(
+                f"{self.client.base_url}{self.client.endpoints['drug_adverse_events']}",
+                {'search': f'receivedate:{day}', 'limit': page_size, 'skip': skip}
+            )
+            return (data or {}).get('results', [])
+        
+        chosen = [page for pages in month_pages.values()
+                  for page in self._random.sample(pages, min(pages_per_stratum, len(pages)))]
+        for events in await asyncio.gather(*(fetch_page(day, skip) for day, skip in chosen)):
+            sampler.extend(events)
+        
+        samples = sampler.samples()
+        return {
+            month: {
+                'population': population,
+                'sample_size': len(samples.get(month, [])),
+                'sampling_fraction': len(samples.get(month, [])) / population if population else 0.0,
+                'events': samples.get(month, [])
+            }
+            for month, population in sorted(month_population.items())
+        }
+
+
+class OpenFDAQuota:
+    """OpenFDA per-minute and per-day request quota shared by every client in the process"""
+    
+    PER_MINUTE = 240
+    PER_DAY = 1000             # Without an API key (per IP)
+    PER_DAY_API_KEY = 120000
+    
+    def __init__(self, api_key: Optional[str] = None, max_backoff: float = 16.0):
+        self.api_key = api_key
+        self.max_backoff = max_backoff
+        
+        self._backoff = 1.0
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._day = datetime.utcnow().date()
+        self._used_today = 0
+        
+        self.requests_made = 0
+        self.throttled_responses = 0
+        self.total_wait = 0.0
+        self.exhausted = False
+    
+    @property
+    def per_day(self) -> int:
+        return self.PER_DAY_API_KEY if self.api_key else self.PER_DAY
+    
+    @property
+    def requests_per_second(self) -> float:
+        """Currently granted rate: the per-minute quota reduced by any 429 backoff"""
+        return self.PER_MINUTE / 60.0 / self._backoff
+    
+    async def acquire(self) -> bool:
+        """Wait for the next request slot; False once today's quota is used up"""
+        
+        today = datetime.utcnow().date()
+        if today != self._day:
+            self._day, self._used_today, self.exhausted = today, 0, False
+        
+        if self._used_today >= self.per_day:
+            if not self.exhausted:
+                logger.warning(f"⚠️ OpenFDA daily quota of {self.per_day:,} requests used up")
+            self.exhausted = True
+            return False
+        self._used_today += 1
+        
+        # The slot is reserved before any await, so concurrent callers always get distinct slots
+        now = time.monotonic()
+        slot = max(now, self._next_slot, self._paused_until)
+        self._next_slot = slot + 1.0 / self.requests_per_second
+        self.requests_made += 1
+        
+        wait_time = slot - now
+        self.total_wait += wait_time
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return True
+    
+    def record_response(self, status: int, retry_after: Optional[str] = None):
+        """Feed a response status back: 429 halves the rate and pauses, successes recover it"""
+        
+        if status == 429:
+            self.throttled_responses += 1
+            self._backoff = min(self.max_backoff, self._backoff * 2.0)
+            try:
+                pause = float(retry_after) if retry_after else self._backoff
+            except ValueError:
+                pause = self._backoff
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            logger.warning(f"⚠️ OpenFDA throttled (429) - pausing {pause:.1f}s, rate now {self.requests_per_second:.2f} req/s")
+        elif status < 400 and self._backoff > 1.0:
+            self._backoff = max(1.0, self._backoff * 0.9)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Quota usage metrics"""
+        
+        return {
+            'api_key_tier': bool(self.api_key),
+            'per_minute_limit': self.PER_MINUTE,
+            'per_day_limit': self.per_day,
+            'used_today': self._used_today,
+            'remaining_today': max(0, self.per_day - self._used_today),
+            'granted_per_second': self.requests_per_second,
+            'backoff_factor': self._backoff,
+            'requests_made': self.requests_made,
+            'throttled_429': self.throttled_responses,
+            'avg_wait_ms': self.total_wait / self.requests_made * 1000 if self.requests_made else 0.0
+        }
+
+_openfda_quota: Optional[OpenFDAQuota] = None
+
+def get_openfda_quota() -> OpenFDAQuota:
+    """Get the process-wide OpenFDA quota (API key from OPENFDA_API_KEY)"""
+    
+    global _openfda_quota
+    if _openfda_quota is None:
+        _openfda_quota = OpenFDAQuota(api_key=os.environ.get('OPENFDA_API_KEY') or None)
+    return _openfda_quota
 
 
 class FDAWebScraper:
@@ -1134,4 +1253,7 @@ class DrugLabelParser:
         return parsed_label
 
 # Export main class
-__all__ = ['FDAAdvancedScraper']
\ No newline at end of file
+__all__ = [
+    'FDAAdvancedScraper', 'OpenFDAAdvancedClient', 'AdverseEventAnalytics',
+    'OpenFDAQuota', 'get_openfda_quota'
+]
\ No newline at end of file
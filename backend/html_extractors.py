@@ -0,0 +1,856 @@
+"""
+HTML Extractors and Parsing Stage
+Pure structured-data extractors run in a process pool so HTML parsing stays off the event loop
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for HTML parsing (0 parses inline on the event loop)
+DEFAULT_PARSE_WORKERS = int(os.environ.get('SCRAPER_PARSE_WORKERS', os.cpu_count() or 1))
+
+# Tags whose strings BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = frozenset(('script', 'style', 'template'))
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4')
+_HTML_PARSER = etree.HTMLParser(encoding='utf-8')
+
+def extract_structured_data(content: str, url: str) -> Dict[str, Any]:
+    """Extract structured medical data from content"""
+
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+
+        extracted = {
+            'title': '',
+            'description': '',
+            'medical_content': {},
+            'metadata': {},
+            'links': []
+        }
+
+        # Extract title
+        title_tag = soup.find('title')
+        if title_tag:
+            extracted['title'] = title_tag.get_text(strip=True)
+
+        # Extract meta description
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc:
+            extracted['description'] = meta_desc.get('content', '')
+
+        # Extract headings structure
+        headings = []
+        for tag in ['h1', 'h2', 'h3', 'h4']:
+            for heading in soup.find_all(tag):
+                headings.append({
+                    'level': tag,
+                    'text': heading.get_text(strip=True)
+                })
+        extracted['medical_content']['headings'] = headings
+
+        # Extract main content paragraphs
+        paragraphs = []
+        for p in soup.find_all('p'):
+            text = p.get_text(strip=True)
+            if len(text) > 50:  # Filter out short paragraphs
+                paragraphs.append(text)
+        extracted['medical_content']['paragraphs'] = paragraphs[:10]  # Top 10 paragraphs
+
+        # Extract lists (symptoms, treatments, etc.)
+        lists = []
+        for ul in soup.find_all(['ul', 'ol']):
+            list_items = [li.get_text(strip=True) for li in ul.find_all('li')]
+            if len(list_items) >= 2:  # At least 2 items
+                lists.append(list_items)
+        extracted['medical_content']['lists'] = lists[:5]  # Top 5 lists
+
+        # Extract internal links
+        links = []
+        for a in soup.find_all('a', href=True):
+            href = a.get('href')
+            if href and not href.startswith(('http', '#', 'mailto', 'javascript')):
+                full_url = urljoin(url, href)
+                links.append({
+                    'url': full_url,
+                    'text': a.get_text(strip=True)
+                })
+        extracted['links'] = links[:20]  # Top 20 links
+
+        # Extract metadata
+        extracted['metadata'] = {
+            'word_count': len(content.split()),
+            'paragraph_count': len(paragraphs),
+            'heading_count': len(headings),
+            'list_count': len(lists),
+            'link_count': len(links)
+        }
+
+        return extracted
+
+    except Exception as e:
+        logger.error(f"Error extracting structured data from {url}: {e}")
+        return {'error': str(e)}
+
+def _collect_text(node: Any, parts: List[str]):
+    if node.text:
+        parts.append(node.text)
+    for child in node:
+        # Comments and processing instructions have non-string tags; their tails still count
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+def _element_text(element: Any) -> str:
+    """Equivalent of BeautifulSoup's get_text(strip=True) for an lxml element"""
+
+    parts: List[str] = []
+    _collect_text(element, parts)
+    return ''.join(part.strip() for part in parts if part.strip())
+
+def extract_structured_data_lxml(content: str, url: str) -> Dict[str, Any]:
+    """Single-pass lxml version of extract_structured_data returning the same dict"""
+
+    try:
+        root = etree.fromstring(content.encode('utf-8'), _HTML_PARSER) if content.strip() else None
+
+        title = None
+        description = None
+        headings_by_level: Dict[str, List[Dict[str, str]]] = {tag: [] for tag in _HEADING_TAGS}
+        paragraphs = []
+        lists = []
+        links = []
+
+        for element in (root.iter() if root is not None else ()):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+
+            if tag == 'p':
+                text = _element_text(element)
+                if len(text) > 50:  # Filter out short paragraphs
+                    paragraphs.append(text)
+            elif tag == 'a':
+                href = element.get('href')
+                if href and not href.startswith(('http', '#', 'mailto', 'javascript')):
+                    links.append({
+                        'url': urljoin(url, href),
+                        'text': _element_text(element)
+                    })
+            elif tag in headings_by_level:
+                headings_by_level[tag].append({
+                    'level': tag,
+                    'text': _element_text(element)
+                })
+            elif tag == 'ul' or tag == 'ol':
+                list_items = [_element_text(li) for li in element.iter('li')]
+                if len(list_items) >= 2:  # At least 2 items
+                    lists.append(list_items)
+            elif tag == 'title' and title is None:
+                title = _element_text(element)
+            elif tag == 'meta' and description is None and element.get('name') == 'description':
+                description = element.get('content', '')
+
+        # Headings are grouped by level, matching the per-tag passes of the BeautifulSoup extractor
+        headings = [heading for tag in _HEADING_TAGS for heading in headings_by_level[tag]]
+
+        return {
+            'title': title or '',
+            'description': description or '',
+            'medical_content': {
+                'headings': headings,
+                'paragraphs': paragraphs[:10],  # Top 10 paragraphs
+                'lists': lists[:5]  # Top 5 lists
+            },
+            'metadata': {
+                'word_count': len(content.split()),
+                'paragraph_count': len(paragraphs),
+                'heading_count': len(headings),
+                'list_count': len(lists),
+                'link_count': len(links)
+            },
+            'links': links[:20]  # Top 20 links
+        }
+
+    except Exception as e:
+        logger.error(f"Error extracting structured data from {url}: {e}")
+        return {'error': str(e)}
+
+def extract_medlineplus_data(content: str, url: str, section: str) -> Dict[str, Any]:
+    """Extract structured data specifically tailored for MedlinePlus content"""
+
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+
+        extracted = {
+            'title': '',
+            'summary': '',
+            'medlineplus_section': section,
+            'medical_content': {},
+            'medlineplus_specific': {},
+            'metadata': {},
+            'links': []
+        }
+
+        # Extract MedlinePlus-specific title
+        title_selectors = [
+            'h1.page-title',
+            'h1#pagetitle',
+            'h1',
+            'title'
+        ]
+
+        for selector in title_selectors:
+            title_elem = soup.select_one(selector)
+            if title_elem:
+                extracted['title'] = title_elem.get_text(strip=True)
+                break
+
+        # Extract MedlinePlus summary/overview
+        summary_selectors = [
+            '.summary',
+            '.overview',
+            '.page-summary',
+            'div[data-module="Summary"]',
+            '.mplus-summary'
+        ]
+
+        for selector in summary_selectors:
+            summary_elem = soup.select_one(selector)
+            if summary_elem:
+                extracted['summary'] = summary_elem.get_text(strip=True)
+                break
+
+        # Extract MedlinePlus-specific medical sections
+        medical_sections = {}
+
+        # Look for key medical information sections
+        section_keywords = [
+            ('symptoms', ['symptoms', 'signs']),
+            ('causes', ['causes', 'risk factors']),
+            ('diagnosis', ['diagnosis', 'testing']),
+            ('treatment', ['treatment', 'therapy']),
+            ('prevention', ['prevention', 'avoiding']),
+            ('complications', ['complications', 'side effects']),
+            ('outlook', ['outlook', 'prognosis'])
+        ]
+
+        for section_key, keywords in section_keywords:
+            section_content = []
+
+            for keyword in keywords:
+                # Look for sections containing these keywords
+                sections = soup.find_all(['div', 'section'], 
+                    text=re.compile(keyword, re.IGNORECASE))
+
+                for sect in sections:
+                    # Get the parent container and extract content
+                    parent = sect.parent if sect.parent else sect
+                    paragraphs = parent.find_all('p')
+                    section_text = [p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50]
+                    section_content.extend(section_text)
+
+            if section_content:
+                medical_sections[section_key] = section_content[:3]  # Top 3 relevant paragraphs
+
+        extracted['medical_content']['sections'] = medical_sections
+
+        # Extract MedlinePlus-specific elements
+        medlineplus_specific = {}
+
+        # Extract "Also called" information
+        also_called = soup.select_one('.also-called, .alternative-names')
+        if also_called:
+            medlineplus_specific['also_called'] = also_called.get_text(strip=True)
+
+        # Extract related topics
+        related_topics = []
+        related_selectors = [
+            '.related-topics a',
+            '.see-also a',
+            '.related-links a'
+        ]
+
+        for selector in related_selectors:
+            links = soup.select(selector)
+            for link in links[:10]:  # Top 10 related topics
+                topic_text = link.get_text(strip=True)
+                topic_href = link.get('href', '')
+                if topic_text and len(topic_text) > 3:
+                    related_topics.append({
+                        'title': topic_text,
+                        'url': urljoin(url, topic_href) if topic_href else ''
+                    })
+
+        medlineplus_specific['related_topics'] = related_topics
+
+        # Extract key statistics or numbers
+        numbers_text = soup.get_text()
+        statistics = re.findall(r'(\d+(?:\.\d+)?)\s*(?:%|percent|million|thousand|cases?|patients?)', 
+                              numbers_text, re.IGNORECASE)
+        medlineplus_specific['statistics'] = statistics[:5]  # Top 5 statistics
+
+        extracted['medlineplus_specific'] = medlineplus_specific
+
+        # Extract main content paragraphs
+        content_paragraphs = []
+        main_content_selectors = [
+            '.main-content p',
+            '#main p',
+            '.article-content p',
+            '.page-content p',
+            'p'
+        ]
+
+        for selector in main_content_selectors:
+            paragraphs = soup.select(selector)
+            if paragraphs:
+                for p in paragraphs:
+                    text = p.get_text(strip=True)
+                    if len(text) > 100:  # Substantial paragraphs only
+                        content_paragraphs.append(text)
+                if content_paragraphs:
+                    break  # Use first successful selector
+
+        extracted['medical_content']['paragraphs'] = content_paragraphs[:15]  # Top 15 paragraphs
+
+        # Extract internal MedlinePlus links
+        internal_links = []
+        for a in soup.find_all('a', href=True):
+            href = a.get('href')
+            text = a.get_text(strip=True)
+
+            # Filter for MedlinePlus internal links
+            if (href and 
+                ('medlineplus.gov' in href or href.startswith('/')) and
+                text and 
+                len(text) > 5 and
+                not href.startswith('#')):
+
+                full_url = urljoin(url, href)
+                internal_links.append({
+                    'url': full_url,
+                    'text': text
+                })
+
+        extracted['links'] = internal_links[:25]  # Top 25 internal links
+
+        # Extract comprehensive metadata
+        extracted['metadata'] = {
+            'word_count': len(content.split()),
+            'paragraph_count': len(content_paragraphs),
+            'medical_sections_count': len(medical_sections),
+            'related_topics_count': len(related_topics),
+            'internal_links_count': len(internal_links),
+            'statistics_count': len(statistics),
+            'content_depth_score': _calculate_content_depth(medical_sections, content_paragraphs),
+            'extracted_at': datetime.utcnow().isoformat(),
+            'source_authority': 'medlineplus.gov',
+            'government_source': True
+        }
+
+        return extracted
+
+    except Exception as e:
+        logger.error(f"Error extracting MedlinePlus structured data from {url}: {e}")
+        return {'error': str(e), 'url': url, 'section': section}
+
+def _calculate_content_depth(medical_sections: Dict[str, List[str]], paragraphs: List[str]) -> float:
+    """Calculate content depth score based on medical information completeness"""
+
+    depth_score = 0.0
+
+    # Score based on medical sections presence
+    section_weights = {
+        'symptoms': 0.2,
+        'causes': 0.15,
+        'diagnosis': 0.15,
+        'treatment': 0.25,
+        'prevention': 0.1,
+        'complications': 0.1,
+        'outlook': 0.05
+    }
+
+    for section, weight in section_weights.items():
+        if section in medical_sections and medical_sections[section]:
+            depth_score += weight
+
+    # Score based on content volume
+    content_volume_score = min(0.3, len(paragraphs) * 0.02)  # Max 0.3 for volume
+    depth_score += content_volume_score
+
+    return min(1.0, depth_score)
+
+def extract_cdc_data(content: str, url: str, section: str) -> Dict[str, Any]:
+    """Extract structured data specifically tailored for CDC content"""
+
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+
+        extracted = {
+            'title': '',
+            'summary': '',
+            'cdc_section': section,
+            'public_health_content': {},
+            'cdc_specific': {},
+            'surveillance_data': {},
+            'metadata': {},
+            'links': []
+        }
+
+        # Extract CDC-specific title patterns
+        title_selectors = [
+            'h1.page-title',
+            'h1.content-title',
+            '.hero-title h1',
+            'h1',
+            'title'
+        ]
+
+        for selector in title_selectors:
+            title_elem = soup.select_one(selector)
+            if title_elem:
+                extracted['title'] = title_elem.get_text(strip=True)
+                break
+
+        # Extract CDC summary/key points
+        summary_selectors = [
+            '.key-points',
+            '.summary',
+            '.overview',
+            '.highlights',
+            '.fast-facts',
+            '.at-a-glance'
+        ]
+
+        for selector in summary_selectors:
+            summary_elem = soup.select_one(selector)
+            if summary_elem:
+                extracted['summary'] = summary_elem.get_text(strip=True)
+                break
+
+        # Extract public health sections
+        public_health_sections = {}
+
+        # Look for CDC-specific medical sections
+        cdc_section_keywords = [
+            ('symptoms', ['symptoms', 'signs and symptoms', 'clinical features']),
+            ('transmission', ['transmission', 'how it spreads', 'spread']),
+            ('prevention', ['prevention', 'protect yourself', 'prevention tips']),
+            ('treatment', ['treatment', 'medical care', 'therapy']),
+            ('surveillance', ['surveillance', 'monitoring', 'tracking']),
+            ('outbreak', ['outbreak', 'epidemic', 'cluster']),
+            ('risk_factors', ['risk factors', 'who is at risk', 'high risk']),
+            ('complications', ['complications', 'severe illness', 'serious outcomes'])
+        ]
+
+        for section_key, keywords in cdc_section_keywords:
+            section_content = []
+
+            for keyword in keywords:
+                # Find headers containing keywords
+                headers = soup.find_all(['h1', 'h2', 'h3', 'h4'], 
+                    text=re.compile(keyword, re.IGNORECASE))
+
+                for header in headers:
+                    # Get following content
+                    content_elem = header.find_next_sibling(['p', 'div', 'ul'])
+                    if content_elem:
+                        text = content_elem.get_text(strip=True)
+                        if len(text) > 100:
+                            section_content.append(text)
+
+            if section_content:
+                public_health_sections[section_key] = section_content[:2]
+
+        extracted['public_health_content']['sections'] = public_health_sections
+
+        # Extract CDC-specific elements
+        cdc_specific = {}
+
+        # Extract fast facts
+        fast_facts = []
+        fact_selectors = ['.fast-facts li', '.key-points li', '.highlights li']
+
+        for selector in fact_selectors:
+            facts = soup.select(selector)
+            for fact in facts[:10]:
+                fact_text = fact.get_text(strip=True)
+                if len(fact_text) > 20:
+                    fast_facts.append(fact_text)
+            if fast_facts:
+                break
+
+        cdc_specific['fast_facts'] = fast_facts
+
+        # Extract statistics and numbers
+        numbers_text = soup.get_text()
+        statistics_patterns = [
+            r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:%|percent|cases?|deaths?|infections?)',
+            r'(\d+(?:,\d+)*)\s*(?:people|individuals|patients?|americans?)',
+            r'(\d+(?:,\d+)*)\s*(?:per\s+\d+(?:,\d+)*|annually|yearly|daily)'
+        ]
+
+        all_statistics = []
+        for pattern in statistics_patterns:
+            matches = re.findall(pattern, numbers_text, re.IGNORECASE)
+            all_statistics.extend(matches[:5])
+
+        cdc_specific['statistics'] = all_statistics[:10]
+
+        # Extract surveillance data indicators
+        surveillance_indicators = []
+        surveillance_keywords = [
+            'incidence', 'prevalence', 'mortality rate', 'case fatality',
+            'outbreak', 'surveillance', 'reporting', 'notifiable'
+        ]
+
+        for keyword in surveillance_keywords:
+            if keyword.lower() in content.lower():
+                # Extract surrounding context
+                pattern = rf'.{{0,100}}{re.escape(keyword)}.{{0,100}}'
+                matches = re.findall(pattern, content, re.IGNORECASE)
+                surveillance_indicators.extend(matches[:2])
+
+        extracted['surveillance_data']['indicators'] = surveillance_indicators[:5]
+
+        # Extract related CDC pages
+        related_links = []
+        for a in soup.find_all('a', href=True):
+            href = a.get('href')
+            text = a.get_text(strip=True)
+
+            if (href and 
+                ('cdc.gov' in href or href.startswith('/')) and
+                text and 
+                len(text) > 5 and
+                not href.startswith('#')):
+
+                full_url = urljoin(url, href)
+                related_links.append({
+                    'url': full_url,
+                    'text': text
+                })
+
+        extracted['links'] = related_links[:30]
+
+        # Extract comprehensive metadata
+        extracted['metadata'] = {
+            'word_count': len(content.split()),
+            'public_health_sections_count': len(public_health_sections),
+            'fast_facts_count': len(fast_facts),
+            'statistics_count': len(all_statistics),
+            'surveillance_indicators_count': len(surveillance_indicators),
+            'related_links_count': len(related_links),
+            'government_authority_score': _calculate_government_authority(content),
+            'extracted_at': datetime.utcnow().isoformat(),
+            'source_authority': 'cdc.gov',
+            'government_source': True,
+            'public_health_relevance': _calculate_public_health_relevance(content)
+        }
+
+        extracted['cdc_specific'] = cdc_specific
+
+        return extracted
+
+    except Exception as e:
+        logger.error(f"Error extracting CDC structured data from {url}: {e}")
+        return {'error': str(e), 'url': url, 'section': section}
+
+def _calculate_government_authority(content: str) -> float:
+    """Calculate government authority score"""
+
+    authority_indicators = [
+        'centers for disease control', 'cdc', 'public health',
+        'surveillance', 'epidemiology', 'morbidity', 'mortality',
+        'notifiable disease', 'outbreak investigation', 'prevention'
+    ]
+
+    content_lower = content.lower()
+    found_indicators = sum(1 for indicator in authority_indicators if indicator in content_lower)
+
+    return min(1.0, found_indicators / len(authority_indicators) * 2)
+
+def _calculate_public_health_relevance(content: str) -> float:
+    """Calculate public health relevance score"""
+
+    public_health_terms = [
+        'public health', 'prevention', 'surveillance', 'outbreak', 'epidemic',
+        'population health', 'community health', 'health promotion',
+        'disease prevention', 'health protection', 'environmental health'
+    ]
+
+    content_lower = content.lower()
+    relevance_count = sum(1 for term in public_health_terms if term in content_lower)
+
+    return min(1.0, relevance_count / len(public_health_terms) * 2.5)
+
+def extract_fda_data(content: str, url: str, content_type: str) -> Optional[Dict[str, Any]]:
+    """Extract FDA-specific structured data"""
+
+    try:
+        soup = BeautifulSoup(content, 'lxml')
+
+        extracted = {
+            'url': url,
+            'content_type': content_type,
+            'title': '',
+            'summary': '',
+            'fda_data': {},
+            'regulatory_info': {},
+            'metadata': {},
+            'extracted_at': datetime.utcnow().isoformat()
+        }
+
+        # Extract title
+        title_elem = soup.find('h1') or soup.find('title')
+        if title_elem:
+            extracted['title'] = title_elem.get_text(strip=True)
+
+        # Extract FDA-specific data based on content type
+        if content_type == 'drugs':
+            extracted['fda_data'] = _extract_drug_specific_data(soup)
+        elif content_type == 'devices':
+            extracted['fda_data'] = _extract_device_specific_data(soup)
+        elif content_type == 'safety':
+            extracted['fda_data'] = _extract_safety_specific_data(soup)
+        elif content_type == 'recalls':
+            extracted['fda_data'] = _extract_recall_specific_data(soup)
+
+        # Extract regulatory information
+        extracted['regulatory_info'] = _extract_regulatory_info(soup, content_type)
+
+        extracted['metadata'] = {
+            'word_count': len(content.split()),
+            'fda_authority_score': 0.98,
+            'regulatory_relevance': _calculate_regulatory_relevance(content),
+            'government_source': True
+        }
+
+        return extracted
+
+    except Exception as e:
+        logger.error(f"Error extracting FDA structured data: {e}")
+        return None
+
+def _extract_drug_specific_data(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Extract drug-specific data"""
+
+    drug_data = {
+        'drug_name': '',
+        'active_ingredients': [],
+        'indications': [],
+        'dosage_forms': [],
+        'approval_date': '',
+        'nda_number': ''
+    }
+
+    # Extract drug name
+    name_selectors = ['.drug-name', '.product-name', 'h1']
+    for selector in name_selectors:
+        name_elem = soup.select_one(selector)
+        if name_elem:
+            drug_data['drug_name'] = name_elem.get_text(strip=True)
+            break
+
+    # Extract indications
+    indication_text = soup.get_text().lower()
+    if 'indication' in indication_text:
+        # Simplified indication extraction
+        indication_matches = re.findall(r'indication[s]?[:\-]\s*([^.]+)', indication_text)
+        drug_data['indications'] = indication_matches[:3]
+
+    return drug_data
+
+def _extract_device_specific_data(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Extract device-specific data"""
+
+    device_data = {
+        'device_name': '',
+        'classification': '',
+        'intended_use': '',
+        'clearance_number': '',
+        'device_class': ''
+    }
+
+    # Extract device name
+    name_elem = soup.find('h1')
+    if name_elem:
+        device_data['device_name'] = name_elem.get_text(strip=True)
+
+    return device_data
+
+def _extract_safety_specific_data(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Extract safety communication specific data"""
+
+    safety_data = {
+        'alert_type': '',
+        'affected_products': [],
+        'safety_concern': '',
+        'date_issued': ''
+    }
+
+    return safety_data
+
+def _extract_recall_specific_data(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Extract recall-specific data"""
+
+    recall_data = {
+        'recall_number': '',
+        'product_name': '',
+        'recall_reason': '',
+        'recall_class': '',
+        'recall_date': ''
+    }
+
+    return recall_data
+
+def _extract_regulatory_info(soup: BeautifulSoup, content_type: str) -> Dict[str, Any]:
+    """Extract regulatory information"""
+
+    regulatory_info = {
+        'approval_status': '',
+        'regulatory_pathway': '',
+        'fda_center': '',
+        'cfr_reference': ''
+    }
+
+    return regulatory_info
+
+def _calculate_regulatory_relevance(content: str) -> float:
+    """Calculate regulatory relevance score"""
+
+    regulatory_terms = [
+        'approval', 'clearance', 'regulation', 'compliance', 'guidance',
+        'cfr', 'federal register', 'premarket', 'clinical trial', 'safety'
+    ]
+
+    content_lower = content.lower()
+    found_terms = sum(1 for term in regulatory_terms if term in content_lower)
+
+    return min(1.0, found_terms / len(regulatory_terms) * 2)
+
+# Extractors addressable by name so only plain data crosses the process boundary
+EXTRACTORS: Dict[str, Callable[..., Optional[Dict[str, Any]]]] = {
+    'generic': extract_structured_data,
+    'lxml': extract_structured_data_lxml,
+    'medlineplus': extract_medlineplus_data,
+    'cdc': extract_cdc_data,
+    'fda': extract_fda_data
+}
+
+# Interchangeable extractors returning the same page dict; the source extractors each return their own shape
+PAGE_EXTRACTORS = ('generic', 'lxml')
+
+def run_extractor(name: str, content: str, url: str, *args: Any) -> Optional[Dict[str, Any]]:
+    """Run a named extractor (process pool entry point)"""
+    return EXTRACTORS[name](content, url, *args)
+
+class ParsingStage:
+    """Process-pool HTML parsing with bounded in-flight work for backpressure"""
+
+    def __init__(self, max_workers: int = DEFAULT_PARSE_WORKERS, max_pending: Optional[int] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max(1, max_workers) * 4
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.parsed = 0
+        self.inline_parsed = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores are bound to the loop they are first awaited on
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._loop = loop
+        return self._slots
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._executor is None and self.max_workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info(f"🧮 Started HTML parsing pool with {self.max_workers} workers")
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool so the next call starts a fresh one"""
+
+        # Concurrent parses all see the same broken pool; only the first replaces it
+        if self._executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def parse(self, extractor: str, content: str, url: str, *args: Any) -> Optional[Dict[str, Any]]:
+        """Parse a page with a named extractor, waiting for a free slot when the pool is saturated"""
+
+        executor = self._get_executor()
+        if executor is None:
+            self.inline_parsed += 1
+            return run_extractor(extractor, content, url, *args)
+
+        loop = asyncio.get_running_loop()
+        async with self._get_slots():
+            try:
+                result = await loop.run_in_executor(executor, run_extractor, extractor, content, url, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM, crash in lxml); restart the pool and retry the page once
+                logger.warning(f"⚠️ HTML parsing pool broke while parsing {url}; restarting it")
+                self._discard_executor(executor)
+                executor = self._get_executor()
+                try:
+                    result = await loop.run_in_executor(executor, run_extractor, extractor, content, url, *args)
+                except BrokenProcessPool:
+                    self._discard_executor(executor)
+                    raise
+        self.parsed += 1
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get parsing stage counters"""
+
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'parsed_in_pool': self.parsed,
+            'parsed_inline': self.inline_parsed
+        }
+
+    def close(self):
+        """Shut down the worker processes"""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+_parsing_stage: Optional[ParsingStage] = None
+
+def get_parsing_stage() -> ParsingStage:
+    """Get the process-wide parsing stage"""
+
+    global _parsing_stage
+    if _parsing_stage is None:
+        _parsing_stage = ParsingStage()
+        atexit.register(_parsing_stage.close)
+    return _parsing_stage
+
+# Export main classes
+__all__ = [
+    'ParsingStage', 'get_parsing_stage', 'run_extractor', 'EXTRACTORS', 'PAGE_EXTRACTORS',
+    'extract_structured_data', 'extract_structured_data_lxml',
+    'extract_medlineplus_data', 'extract_cdc_data', 'extract_fda_data'
+]
@@ -0,0 +1,189 @@
+"""
+HTTP Validator Cache
+Per-URL ETag / Last-Modified / content digest store for conditional recrawls
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Location of the validator database (overridable for multi-crawl deployments)
+DEFAULT_HTTP_CACHE_PATH = os.environ.get(
+    'SCRAPER_HTTP_CACHE_PATH',
+    os.path.join('scraper_state', 'http_validators.sqlite3')
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_digest BLOB,
+    content_length INTEGER NOT NULL DEFAULT 0,
+    quality_score REAL NOT NULL DEFAULT 0.0,
+    extracted_data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+@dataclass
+class CachedPage:
+    """Validators and previous extraction of a fetched URL"""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_digest: Optional[int] = None
+    content_length: int = 0
+    quality_score: float = 0.0
+    extracted_data: Dict[str, Any] = field(default_factory=dict)
+    fetched_at: float = 0.0
+
+class HTTPValidatorCache:
+    """SQLite-backed cache of HTTP validators and extraction results keyed by URL"""
+
+    def __init__(self, path: str = DEFAULT_HTTP_CACHE_PATH):
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+        self.hits = 0
+        self.revalidated = 0
+        self.stores = 0
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Get the cached entry for a URL"""
+
+        row = self._conn.execute(
+            'SELECT etag, last_modified, content_digest, content_length, quality_score, '
+            'extracted_data, fetched_at FROM validators WHERE url = ?', (url,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        etag, last_modified, digest, content_length, quality_score, extracted_data, fetched_at = row
+        return CachedPage(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            content_digest=int.from_bytes(digest, 'little') if digest else None,
+            content_length=content_length,
+            quality_score=quality_score,
+            extracted_data=json.loads(extracted_data),
+            fetched_at=fetched_at
+        )
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL"""
+
+        row = self._conn.execute(
+            'SELECT etag, last_modified FROM validators WHERE url = ?', (url,)
+        ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def lookup_unchanged(self, url: str, status: int, digest: Optional[int] = None) -> Optional[CachedPage]:
+        """Return the previous extraction if the response shows the page is unchanged"""
+
+        if status != 304 and digest is None:
+            return None
+
+        cached = self.get(url)
+        if cached is None:
+            return None
+
+        if status == 304:
+            self.revalidated += 1
+        elif cached.content_digest != digest:
+            return None
+
+        self.hits += 1
+        self._conn.execute('UPDATE validators SET fetched_at = ? WHERE url = ?', (time.time(), url))
+        self._conn.commit()
+        return cached
+
+    def store(self, url: str, response_headers: Mapping[str, str], digest: int,
+              extracted_data: Dict[str, Any], quality_score: float = 0.0, content_length: int = 0):
+        """Record validators and extraction of a freshly fetched page"""
+
+        # Failed extractions are never reused
+        if not extracted_data or 'error' in extracted_data:
+            return
+
+        self._conn.execute(
+            'INSERT OR REPLACE INTO validators (url, etag, last_modified, content_digest, '
+            'content_length, quality_score, extracted_data, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                url,
+                response_headers.get('ETag'),
+                response_headers.get('Last-Modified'),
+                digest.to_bytes(8, 'little'),
+                content_length,
+                quality_score,
+                json.dumps(extracted_data, default=str),
+                time.time()
+            )
+        )
+        self._conn.commit()
+        self.stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit statistics"""
+
+        entries = self._conn.execute('SELECT COUNT(*) FROM validators').fetchone()[0]
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'revalidated_304': self.revalidated,
+            'stores': self.stores,
+            'path': self.path
+        }
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+def unchanged_metadata(cached: CachedPage) -> Dict[str, Any]:
+    """Result metadata marking a page served from the validator cache"""
+
+    return {
+        'unchanged': True,
+        'cached_at': datetime.utcfromtimestamp(cached.fetched_at).isoformat()
+    }
+
+_shared_caches: Dict[str, HTTPValidatorCache] = {}
+
+def get_shared_http_cache(path: Optional[str] = None) -> HTTPValidatorCache:
+    """Get the process-wide validator cache for a path, opening it on first use"""
+
+    path = os.path.abspath(path or DEFAULT_HTTP_CACHE_PATH)
+    cache = _shared_caches.get(path)
+    if cache is None:
+        cache = HTTPValidatorCache(path)
+        _shared_caches[path] = cache
+    return cache
+
+# Export main classes
+__all__ = ['HTTPValidatorCache', 'CachedPage', 'get_shared_http_cache', 'unchanged_metadata']
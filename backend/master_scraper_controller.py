@@ -10,16 +10,23 @@ from typing import List, Dict, Optional, Any, Union
 from datetime import datetime, timedelta
 import json
 from collections import defaultdict, deque
-import statistics
 import random
 import time
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 from ai_scraper_core import (
     ScrapingTask, ScrapingResult, ScrapingPriority, ContentType, ScrapingTier,
     ContentDiscoveryAI, ScraperOptimizationAI, AntiDetectionAI, ContentQualityAI,
-    IntelligentTaskScheduler, AdaptiveRateLimiter, IntelligentProxyRotator, AdvancedDeduplicator
+    IntelligentTaskScheduler, IntelligentProxyRotator, get_shared_deduplicator,
+    get_shared_rate_limiter
 )
+from dedup_store import content_digest
+from blob_store import get_shared_blob_store
+from http_cache import get_shared_http_cache, unchanged_metadata
+from url_canonical import SeenURLIndex
+from session_pool import get_session_pool
+from result_pipeline import ResultPipeline, ResultStatistics, interleave_by_host, iter_sliding_window
+from html_extractors import PAGE_EXTRACTORS, get_parsing_stage
 
 # Import Phase 2 comprehensive scrapers
 from medlineplus_scraper import MedlinePlusAdvancedScraper
@@ -32,21 +39,29 @@ logger = logging.getLogger(__name__)
 class TierScraperBase:
     """Base class for all tier-specific scrapers"""
     
-    def __init__(self, tier: ScrapingTier, max_concurrent: int = 50):
+    def __init__(self, tier: ScrapingTier, max_concurrent: int = 50, html_extractor: str = 'lxml'):
         self.tier = tier
         self.max_concurrent = max_concurrent
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        if html_extractor not in PAGE_EXTRACTORS:
+            raise ValueError(f"Unknown page extractor {html_extractor!r}; expected one of {PAGE_EXTRACTORS}")
+        self.html_extractor = html_extractor  # 'lxml' single-pass or 'generic' BeautifulSoup
         
         # AI systems
         self.content_discovery = ContentDiscoveryAI()
         self.anti_detection = AntiDetectionAI()
         self.content_quality = ContentQualityAI()
-        self.deduplicator = AdvancedDeduplicator()
+        self.deduplicator = get_shared_deduplicator()
+        self.http_cache = get_shared_http_cache()
+        self.blob_store = get_shared_blob_store()
+        self.rate_limiter = get_shared_rate_limiter()
+        self.result_pipeline = ResultPipeline()
         
         # Performance tracking
-        self.processed_urls = set()
+        self.processed_urls = SeenURLIndex()
         self.success_count = 0
         self.error_count = 0
+        self.unchanged_count = 0
         self.total_content_size = 0
         
     async def scrape_complete_tier(self) -> List[ScrapingResult]:
@@ -57,159 +72,127 @@ class TierScraperBase:
                                      retry_count: int = 0) -> ScrapingResult:
         """Extract content from a single URL with advanced processing"""
         
-        task_id = f"{self.tier.value}_{hash(url)}"
-        
-        async with self.semaphore:
+        while True:
+            # Wait for the domain's rate budget before taking a concurrency slot
+            await self.rate_limiter.wait_for_permit(url)
+            
             try:
-                # Get optimized headers
-                headers = await self.anti_detection.get_optimized_headers(url, len(self.processed_urls))
-                
-                # Make request with timeout and retries
-                async with session.get(url, headers=headers, timeout=30) as response:
-                    start_time = time.time()
-                    
-                    if response.status == 200:
-                        content = await response.text()
-                        processing_time = time.time() - start_time
-                        
-                        # Check for duplicates
-                        if await self.deduplicator.is_duplicate(content, url):
-                            return ScrapingResult(
-                                task_id=task_id,
-                                url=url,
-                                success=False,
-                                error_details="Duplicate content detected"
-                            )
-                        
-                        # Extract structured data
-                        extracted_data = await self._extract_structured_data(content, url)
-                        
-                        # Assess content quality
-                        quality_score = await self.content_quality.assess_content_quality(content, url)
-                        
-                        # Build result
-                        result = ScrapingResult(
-                            task_id=task_id,
-                            url=url,
-                            success=True,
-                            content=content,
-                            extracted_data=extracted_data,
-                            processing_time=processing_time,
-                            content_length=len(content),
-                            quality_score=quality_score,
-                            confidence_score=0.9,  # High confidence for successful extraction
-                            timestamp=datetime.utcnow()
-                        )
-                        
-                        self.success_count += 1
-                        self.total_content_size += len(content)
-                        
-                        return result
-                        
-                    else:
-                        # Handle error response
-                        return ScrapingResult(
-                            task_id=task_id,
-                            url=url,
-                            success=False,
-                            error_details=f"HTTP {response.status}: {response.reason}",
-                            timestamp=datetime.utcnow()
-                        )
-                        
+                async with self.semaphore:
+                    return await self._fetch_and_extract(url, session)
             except Exception as e:
                 self.error_count += 1
+                self.deduplicator.discard(url)
+                if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                    self.rate_limiter.record_request_result(url, False, 0.0)
+                
+                if retry_count >= 3:
+                    return ScrapingResult(
+                        task_id=f"{self.tier.value}_{hash(url)}",
+                        url=url,
+                        success=False,
+                        error_details=str(e),
+                        timestamp=datetime.utcnow()
+                    )
+            
+            # Retry logic - back off without holding a concurrency slot
+            await asyncio.sleep(2 ** retry_count)  # Exponential backoff
+            retry_count += 1
+    
+    async def _fetch_and_extract(self, url: str, session: aiohttp.ClientSession) -> ScrapingResult:
+        """Fetch and process one URL; the caller holds a concurrency slot and handles retries"""
+        
+        task_id = f"{self.tier.value}_{hash(url)}"
+        
+        # Get optimized headers
+        headers = await self.anti_detection.get_optimized_headers(url, len(self.processed_urls))
+        headers.update(self.http_cache.conditional_headers(url))
+        
+        # Make request with timeout and retries
+        request_start = time.time()
+        async with session.get(url, headers=headers, timeout=30) as response:
+            start_time = time.time()
+            self.rate_limiter.record_request_result(
+                url, response.status in (200, 304), start_time - request_start, response.status
+            )
+            
+            content = await response.text() if response.status == 200 else None
+            digest = content_digest(content) if content is not None else None
+            
+            # Unchanged since last crawl - reuse previous extraction
+            cached = self.http_cache.lookup_unchanged(url, response.status, digest)
+            if cached is not None:
+                self.unchanged_count += 1
+                return ScrapingResult(
+                    task_id=task_id,
+                    url=url,
+                    success=True,
+                    extracted_data=cached.extracted_data,
+                    content_digest=cached.content_digest,
+                    metadata=unchanged_metadata(cached),
+                    processing_time=time.time() - start_time,
+                    content_length=cached.content_length,
+                    quality_score=cached.quality_score,
+                    confidence_score=0.9,
+                    timestamp=datetime.utcnow()
+                )
+            
+            if response.status == 200:
+                processing_time = time.time() - start_time
+                
+                # Check for duplicates
+                if await self.deduplicator.is_duplicate(content, url):
+                    return ScrapingResult(
+                        task_id=task_id,
+                        url=url,
+                        success=False,
+                        error_details="Duplicate content detected"
+                    )
+                
+                # Extract structured data
+                extracted_data = await self._extract_structured_data(content, url)
+                
+                # Assess content quality
+                quality_score = await self.content_quality.assess_content_quality(content, url)
+                
+                self.http_cache.store(url, response.headers, digest, extracted_data,
+                                      quality_score, len(content))
+                
+                # Raw HTML goes to the blob store; the result carries only its digest
+                self.blob_store.put(content, urlparse(url).netloc, digest)
+                self.deduplicator.commit(url)
+                
+                # Build result
+                result = ScrapingResult(
+                    task_id=task_id,
+                    url=url,
+                    success=True,
+                    content_digest=digest,
+                    extracted_data=extracted_data,
+                    processing_time=processing_time,
+                    content_length=len(content),
+                    quality_score=quality_score,
+                    confidence_score=0.9,  # High confidence for successful extraction
+                    timestamp=datetime.utcnow()
+                )
+                
+                self.success_count += 1
+                self.total_content_size += len(content)
                 
-                # Retry logic
-                if retry_count < 3:
-                    await asyncio.sleep(2 ** retry_count)  # Exponential backoff
-                    return await self.extract_content_from_url(url, session, retry_count + 1)
+                return result
                 
+            else:
+                # Handle error response
                 return ScrapingResult(
                     task_id=task_id,
                     url=url,
                     success=False,
-                    error_details=str(e),
+                    error_details=f"HTTP {response.status}: {response.reason}",
                     timestamp=datetime.utcnow()
                 )
                 
     async def _extract_structured_data(self, content: str, url: str) -> Dict[str, Any]:
-        """Extract structured medical data from content"""
-        
-        from bs4 import BeautifulSoup
-        
-        try:
-            soup = BeautifulSoup(content, 'lxml')
-            
-            extracted = {
-                'title': '',
-                'description': '',
-                'medical_content': {},
-                'metadata': {},
-                'links': []
-            }
-            
-            # Extract title
-            title_tag = soup.find('title')
-            if title_tag:
-                extracted['title'] = title_tag.get_text(strip=True)
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                extracted['description'] = meta_desc.get('content', '')
-            
-            # Extract headings structure
-            headings = []
-            for tag in ['h1', 'h2', 'h3', 'h4']:
-                for heading in soup.find_all(tag):
-                    headings.append({
-                        'level': tag,
-                        'text': heading.get_text(strip=True)
-                    })
-            extracted['medical_content']['headings'] = headings
-            
-            # Extract main content paragraphs
-            paragraphs = []
-            for p in soup.find_all('p'):
-                text = p.get_text(strip=True)
-                if len(text) > 50:  # Filter out short paragraphs
-                    paragraphs.append(text)
-            extracted['medical_content']['paragraphs'] = paragraphs[:10]  # Top 10 paragraphs
-            
-            # Extract lists (symptoms, treatments, etc.)
-            lists = []
-            for ul in soup.find_all(['ul', 'ol']):
-                list_items = [li.get_text(strip=True) for li in ul.find_all('li')]
-                if len(list_items) >= 2:  # At least 2 items
-                    lists.append(list_items)
-            extracted['medical_content']['lists'] = lists[:5]  # Top 5 lists
-            
-            # Extract internal links
-            links = []
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                if href and not href.startswith(('http', '#', 'mailto', 'javascript')):
-                    full_url = urljoin(url, href)
-                    links.append({
-                        'url': full_url,
-                        'text': a.get_text(strip=True)
-                    })
-            extracted['links'] = links[:20]  # Top 20 links
-            
-            # Extract metadata
-            extracted['metadata'] = {
-                'word_count': len(content.split()),
-                'paragraph_count': len(paragraphs),
-                'heading_count': len(headings),
-                'list_count': len(lists),
-                'link_count': len(links)
-            }
-            
-            return extracted
-            
-        except Exception as e:
-            logger.error(f"Error extracting structured data from {url}: {e}")
-            return {'error': str(e)}
+        """Extract structured medical data from content in the parsing pool"""
+        return await get_parsing_stage().parse(self.html_extractor, content, url)
 
 class GovernmentScraper(TierScraperBase):
     """Tier 1: Government sources scraper (NIH, CDC, FDA, etc.) - Phase 2 Enhanced"""
@@ -223,6 +206,10 @@ class GovernmentScraper(TierScraperBase):
         self.cdc_scraper = CDCAdvancedScraper()
         self.fda_scraper = FDAAdvancedScraper()
         
+        # Section scrapers stream their results straight into the tier pipeline
+        self.medlineplus_scraper.result_pipeline.add_sink(self.result_pipeline)
+        self.cdc_scraper.result_pipeline.add_sink(self.result_pipeline)
+        
         # Legacy government sources (Phase 1)
         self.government_sources = {
             'medlineplus': {
@@ -274,23 +261,16 @@ class GovernmentScraper(TierScraperBase):
         logger.info(f"⚡ Launching {len(phase2_scraping_tasks)} Phase 2 government scraping operations")
         phase2_results = await asyncio.gather(*phase2_scraping_tasks, return_exceptions=True)
         
-        # Process and consolidate Phase 2 results
-        all_results = []
-        
+        # MedlinePlus and CDC results already streamed into the tier pipeline
         for result in phase2_results:
-            if isinstance(result, dict) and 'extracted_content' in result:
-                # Extract the actual ScrapingResult objects
-                extracted_content = result['extracted_content']
-                if isinstance(extracted_content, list):
-                    all_results.extend(extracted_content)
-            elif isinstance(result, list):
+            if isinstance(result, list):
                 # Direct list of ScrapingResult objects
-                all_results.extend(result)
+                await self.result_pipeline.process_batch(result)
             elif isinstance(result, Exception):
                 logger.warning(f"Phase 2 scraping error: {result}")
         
-        logger.info(f"✅ Phase 2 {self.tier.value} completed: {len(all_results)} total extractions")
-        return all_results
+        logger.info(f"✅ Phase 2 {self.tier.value} completed: {self.result_pipeline.statistics.processed} total extractions")
+        return self.result_pipeline.samples
     
     async def _execute_medlineplus_comprehensive(self) -> Dict[str, Any]:
         """Execute MedlinePlus comprehensive scraping"""
@@ -399,36 +379,22 @@ class InternationalScraper(TierScraperBase):
         
         logger.info(f"Starting {self.tier.value} scraping")
         
-        all_results = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=150, limit_per_host=40)
-        ) as session:
+        async with get_session_pool().borrow('default') as session:
             
             for source_name, source_config in self.international_sources.items():
                 logger.info(f"Scraping international source: {source_name}")
                 
                 source_urls = await self._discover_international_urls(source_name, source_config)
                 
-                tasks = [
-                    self.extract_content_from_url(url, session)
-                    for url in source_urls[:3000]  # Limit per international source
-                ]
-                
-                # Execute in smaller batches for international sites
-                batch_size = 50
-                for i in range(0, len(tasks), batch_size):
-                    batch = tasks[i:i + batch_size]
-                    batch_results = await asyncio.gather(*batch, return_exceptions=True)
-                    
-                    valid_results = [r for r in batch_results if isinstance(r, ScrapingResult)]
-                    all_results.extend(valid_results)
-                    
-                    # Longer delays for international sites
-                    await asyncio.sleep(random.uniform(3.0, 8.0))
-        
-        return all_results
+                # Smaller window for international sites; the rate limiter paces each host
+                async for result in iter_sliding_window(
+                    interleave_by_host(source_urls[:3000]),  # Limit per international source
+                    lambda url: self.extract_content_from_url(url, session),
+                    50
+                ):
+                    await self.result_pipeline.process(result, group=source_name)
+        
+        return self.result_pipeline.samples
     
     async def _discover_international_urls(self, source_name: str, source_config: Dict[str, Any]) -> List[str]:
         """Discover URLs for international sources"""
@@ -477,35 +443,21 @@ class AcademicScraper(TierScraperBase):
         
         logger.info(f"Starting {self.tier.value} scraping")
         
-        all_results = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=200, limit_per_host=60)
-        ) as session:
+        async with get_session_pool().borrow('default') as session:
             
             for source_name, source_config in self.academic_sources.items():
                 logger.info(f"Scraping academic source: {source_name}")
                 
                 source_urls = await self._discover_academic_urls(source_name, source_config)
                 
-                tasks = [
-                    self.extract_content_from_url(url, session)
-                    for url in source_urls[:4000]  # Limit per academic source
-                ]
-                
-                batch_size = 80
-                for i in range(0, len(tasks), batch_size):
-                    batch = tasks[i:i + batch_size]
-                    batch_results = await asyncio.gather(*batch, return_exceptions=True)
-                    
-                    valid_results = [r for r in batch_results if isinstance(r, ScrapingResult)]
-                    all_results.extend(valid_results)
-                    
-                    # Moderate delays for academic sites
-                    await asyncio.sleep(random.uniform(1.0, 3.0))
-        
-        return all_results
+                async for result in iter_sliding_window(
+                    interleave_by_host(source_urls[:4000]),  # Limit per academic source
+                    lambda url: self.extract_content_from_url(url, session),
+                    80
+                ):
+                    await self.result_pipeline.process(result, group=source_name)
+        
+        return self.result_pipeline.samples
     
     async def _discover_academic_urls(self, source_name: str, source_config: Dict[str, Any]) -> List[str]:
         """Discover URLs for academic sources"""
@@ -540,7 +492,7 @@ class WorldClassMedicalScraper:
         # AI systems
         self.scraper_optimization = ScraperOptimizationAI()
         self.task_scheduler = IntelligentTaskScheduler()
-        self.rate_limiter = AdaptiveRateLimiter()
+        self.rate_limiter = get_shared_rate_limiter()
         
         # Performance tracking
         self.total_processed = 0
@@ -652,23 +604,25 @@ class WorldClassMedicalScraper:
         try:
             results = await scraper.scrape_complete_tier()
             
+            # Counts come from the tier's running statistics; results is only a bounded sample
             execution_time = time.time() - start_time
-            success_count = sum(1 for r in results if r.success)
-            error_count = len(results) - success_count
+            tier_statistics = scraper.result_pipeline.statistics
+            total_processed = tier_statistics.processed
+            success_count = tier_statistics.successful
             
             tier_summary = {
                 'tier': tier.value,
-                'total_processed': len(results),
+                'total_processed': total_processed,
                 'success_count': success_count,
-                'error_count': error_count,
-                'success_rate': success_count / len(results) if results else 0,
+                'error_count': tier_statistics.failed,
+                'success_rate': success_count / total_processed if total_processed else 0,
                 'execution_time': execution_time,
-                'avg_quality_score': statistics.mean([r.quality_score for r in results if r.success and r.quality_score > 0]) if success_count > 0 else 0,
-                'total_content_size': sum(r.content_length for r in results if r.success),
+                'avg_quality_score': tier_statistics.average_quality,
+                'total_content_size': tier_statistics.successful_content_size,
                 'results': results
             }
             
-            logger.info(f"✅ {tier.value} completed: {success_count}/{len(results)} successful in {execution_time:.1f}s")
+            logger.info(f"✅ {tier.value} completed: {success_count}/{total_processed} successful in {execution_time:.1f}s")
             return tier_summary
             
         except Exception as e:
@@ -692,6 +646,7 @@ class WorldClassMedicalScraper:
         total_content_size = 0
         all_results = []
         tier_summaries = {}
+        combined_statistics = ResultStatistics()
         
         for tier_result in tier_results_list:
             if isinstance(tier_result, dict) and 'tier' in tier_result:
@@ -706,14 +661,17 @@ class WorldClassMedicalScraper:
                 if 'results' in tier_result:
                     all_results.extend(tier_result['results'])
         
+        for tier in target_tiers:
+            if tier in self.tier_scrapers:
+                combined_statistics.merge(self.tier_scrapers[tier].result_pipeline.statistics)
+        
         # Calculate overall statistics
         execution_time = (datetime.utcnow() - self.start_time).total_seconds()
         success_rate = total_success / total_processed if total_processed > 0 else 0
         processing_rate = total_processed / execution_time if execution_time > 0 else 0
         
         # Calculate average quality score
-        quality_scores = [r.quality_score for r in all_results if isinstance(r, ScrapingResult) and r.success and r.quality_score > 0]
-        avg_quality_score = statistics.mean(quality_scores) if quality_scores else 0
+        avg_quality_score = combined_statistics.average_quality
         
         final_summary = {
             'operation_summary': {
@@ -731,9 +689,9 @@ class WorldClassMedicalScraper:
             'performance_metrics': {
                 'documents_per_second': processing_rate,
                 'mb_per_second': (total_content_size / (1024 * 1024)) / execution_time if execution_time > 0 else 0,
-                'high_quality_documents': len([r for r in all_results if isinstance(r, ScrapingResult) and r.quality_score >= 0.8]),
-                'medium_quality_documents': len([r for r in all_results if isinstance(r, ScrapingResult) and 0.5 <= r.quality_score < 0.8]),
-                'low_quality_documents': len([r for r in all_results if isinstance(r, ScrapingResult) and 0 < r.quality_score < 0.5])
+                'high_quality_documents': combined_statistics.count_quality_between(0.8),
+                'medium_quality_documents': combined_statistics.count_quality_between(0.5, 0.8),
+                'low_quality_documents': combined_statistics.count_quality_between(0.0, 0.5)
             },
             'extracted_results': all_results
         }
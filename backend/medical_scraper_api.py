@@ -12,6 +12,7 @@ import json
 from datetime import datetime
 
 from phase1_implementation import Phase1MedicalScraperSystem
+from crawl_checkpoint import get_crawl_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +91,7 @@ async def start_medical_extraction(request: ScrapingRequest, background_tasks: B
         }
         
         # Start extraction in background
+        get_crawl_checkpoint().clear_stop()
         background_tasks.add_task(run_extraction_background, operation_id)
         
         return {
@@ -167,7 +169,8 @@ async def start_comprehensive_scraping(request: ScrapingRequest, background_task
             }
         }
         
-        # Start Phase 2 comprehensive scraping in background
+        # Start Phase 2 comprehensive scraping in background (resumes from any checkpoint)
+        get_crawl_checkpoint().clear_stop()
         background_tasks.add_task(run_phase2_comprehensive_scraping, operation_id)
         
         return {
@@ -274,9 +277,14 @@ async def stop_extraction():
     current_operation['status'] = 'stopped'
     current_operation['stopped_at'] = datetime.utcnow()
     
+    # Running sections stop at their next result; fetched work stays in the checkpoint
+    checkpoint = get_crawl_checkpoint()
+    checkpoint.request_stop()
+    
     return {
         'message': 'Extraction operation stopped',
-        'operation_id': current_operation['operation_id']
+        'operation_id': current_operation['operation_id'],
+        'checkpoint': checkpoint.get_stats()
     }
 
 @router.get("/health", response_model=Dict[str, Any])
@@ -365,8 +373,9 @@ async def run_phase2_comprehensive_scraping(operation_id: str):
         # Execute Phase 2 comprehensive scraping
         results = await phase1_system.execute_phase2_comprehensive()
         
-        # Update operation with results
-        current_operation['status'] = 'completed'
+        # Update operation with results (a stopped run keeps its status and can be resumed)
+        if current_operation['status'] != 'stopped':
+            current_operation['status'] = 'completed'
         current_operation['completed_at'] = datetime.utcnow()
         current_operation['results_summary'] = results
         
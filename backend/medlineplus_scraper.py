@@ -7,20 +7,30 @@ Target: 17,000+ medical articles across all MedlinePlus sections
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterator
 from datetime import datetime
 import json
 import random
 import time
-from urllib.parse import urljoin, urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs
 from bs4 import BeautifulSoup
 import re
 from collections import defaultdict
+from contextlib import aclosing
 
 from ai_scraper_core import (
     ScrapingTask, ScrapingResult, ScrapingPriority, ContentType, ScrapingTier,
-    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, AdvancedDeduplicator
+    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, get_shared_deduplicator,
+    get_shared_rate_limiter
 )
+from dedup_store import content_digest
+from blob_store import get_shared_blob_store
+from http_cache import get_shared_http_cache, unchanged_metadata
+from url_canonical import SeenURLIndex
+from session_pool import get_session_pool
+from result_pipeline import ResultPipeline, ResultStatistics, iter_sliding_window
+from html_extractors import get_parsing_stage
+from crawl_checkpoint import get_crawl_checkpoint
 
 logger = logging.getLogger(__name__)
 
@@ -58,10 +68,15 @@ class MedlinePlusAdvancedScraper:
         self.content_discovery = ContentDiscoveryAI()
         self.anti_detection = AntiDetectionAI()
         self.content_quality = ContentQualityAI()
-        self.deduplicator = AdvancedDeduplicator()
+        self.deduplicator = get_shared_deduplicator()
+        self.http_cache = get_shared_http_cache()
+        self.blob_store = get_shared_blob_store()
+        self.rate_limiter = get_shared_rate_limiter()
+        self.result_pipeline = ResultPipeline(successful_samples_only=True)
+        self.checkpoint = get_crawl_checkpoint()
         
         # Performance tracking
-        self.processed_urls = set()
+        self.processed_urls = SeenURLIndex()
         self.success_count = 0
         self.error_count = 0
         self.total_content_size = 0
@@ -89,6 +104,10 @@ class MedlinePlusAdvancedScraper:
         logger.info(f"📊 Launching {len(scraping_tasks)} parallel scraping operations")
         results = await asyncio.gather(*scraping_tasks, return_exceptions=True)
         
+        # A run that finished every section starts from scratch next time
+        if not self.checkpoint.stop_requested and not any(isinstance(r, Exception) for r in results):
+            self.checkpoint.finish_operation('medlineplus')
+        
         # Process and integrate results
         processed_content = await self.process_and_store_content(results)
         
@@ -97,279 +116,146 @@ class MedlinePlusAdvancedScraper:
         
         return processed_content
     
-    async def scrape_encyclopedia_complete(self) -> List[ScrapingResult]:
+    async def scrape_encyclopedia_complete(self) -> ResultStatistics:
         """Scrape all encyclopedia entries with intelligent discovery"""
         
         logger.info("📚 Starting Encyclopedia section scraping")
         section_name = "encyclopedia"
         
-        # AI discovers all possible encyclopedia URLs
-        encyclopedia_urls = await self._discover_encyclopedia_urls()
-        logger.info(f"🔍 Discovered {len(encyclopedia_urls)} encyclopedia URLs")
-        
-        scraped_articles = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=100, limit_per_host=25)
-        ) as session:
-            
-            # Intelligent batching for optimal performance
-            batch_size = 50
-            for i in range(0, len(encyclopedia_urls), batch_size):
-                batch_urls = encyclopedia_urls[i:i + batch_size]
-                
-                logger.info(f"📖 Processing encyclopedia batch {i//batch_size + 1}/{len(encyclopedia_urls)//batch_size + 1}")
-                
-                # Parallel scraping with anti-detection
-                batch_results = await self._scrape_url_batch_with_protection(
-                    batch_urls, session, section_name
-                )
-                scraped_articles.extend(batch_results)
-                
-                # Update section stats
-                successful = sum(1 for r in batch_results if r.success)
-                self.section_stats[section_name]['processed'] += len(batch_results)
-                self.section_stats[section_name]['successful'] += successful
-                self.section_stats[section_name]['errors'] += len(batch_results) - successful
-                
-                # Intelligent delay between batches
-                delay = await self.timing_humanizer.calculate_adaptive_delay(
-                    "medlineplus.gov", successful / len(batch_results) if batch_results else 0
-                )
-                await asyncio.sleep(delay)
-        
-        logger.info(f"✅ Encyclopedia section complete: {len(scraped_articles)} articles processed")
-        return scraped_articles
+        return await self._execute_section_scraping(
+            self._discover_encyclopedia_urls(), section_name, "📖 Encyclopedia", window_size=25
+        )
     
-    async def scrape_health_topics_complete(self) -> List[ScrapingResult]:
+    async def scrape_health_topics_complete(self) -> ResultStatistics:
         """Scrape all health topics with comprehensive coverage"""
         
         logger.info("🏥 Starting Health Topics section scraping")
         section_name = "health_topics"
         
-        # Discover health topic URLs using multiple strategies
-        health_topic_urls = await self._discover_health_topic_urls()
-        logger.info(f"🔍 Discovered {len(health_topic_urls)} health topic URLs")
-        
-        scraped_topics = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=100, limit_per_host=25)
-        ) as session:
-            
-            batch_size = 40  # Smaller batches for health topics
-            for i in range(0, len(health_topic_urls), batch_size):
-                batch_urls = health_topic_urls[i:i + batch_size]
-                
-                logger.info(f"🏥 Processing health topics batch {i//batch_size + 1}/{len(health_topic_urls)//batch_size + 1}")
-                
-                batch_results = await self._scrape_url_batch_with_protection(
-                    batch_urls, session, section_name
-                )
-                scraped_topics.extend(batch_results)
-                
-                # Update stats
-                successful = sum(1 for r in batch_results if r.success)
-                self.section_stats[section_name]['processed'] += len(batch_results)
-                self.section_stats[section_name]['successful'] += successful
-                self.section_stats[section_name]['errors'] += len(batch_results) - successful
-                
-                # Adaptive delay
-                delay = await self.timing_humanizer.calculate_adaptive_delay(
-                    "medlineplus.gov", successful / len(batch_results) if batch_results else 0
-                )
-                await asyncio.sleep(delay)
-        
-        logger.info(f"✅ Health Topics section complete: {len(scraped_topics)} topics processed")
-        return scraped_topics
+        return await self._execute_section_scraping(
+            self._discover_health_topic_urls(), section_name, "🏥 Health Topics", window_size=25
+        )
     
-    async def scrape_drug_database_complete(self) -> List[ScrapingResult]:
+    async def scrape_drug_database_complete(self) -> ResultStatistics:
         """Scrape comprehensive drug information database"""
         
         logger.info("💊 Starting Drug Information section scraping")
         section_name = "drug_info"
         
-        # Discover drug information URLs
-        drug_urls = await self._discover_drug_information_urls()
-        logger.info(f"🔍 Discovered {len(drug_urls)} drug information URLs")
-        
-        scraped_drugs = []
-        
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=80, limit_per_host=20)
-        ) as session:
-            
-            batch_size = 35
-            for i in range(0, len(drug_urls), batch_size):
-                batch_urls = drug_urls[i:i + batch_size]
-                
-                logger.info(f"💊 Processing drugs batch {i//batch_size + 1}/{len(drug_urls)//batch_size + 1}")
-                
-                batch_results = await self._scrape_url_batch_with_protection(
-                    batch_urls, session, section_name
-                )
-                scraped_drugs.extend(batch_results)
-                
-                # Update stats
-                successful = sum(1 for r in batch_results if r.success)
-                self.section_stats[section_name]['processed'] += len(batch_results)
-                self.section_stats[section_name]['successful'] += successful
-                self.section_stats[section_name]['errors'] += len(batch_results) - successful
-                
-                # Longer delay for drug information (more sensitive)
-                delay = await self.timing_humanizer.calculate_adaptive_delay(
-                    "medlineplus.gov", successful / len(batch_results) if batch_results else 0
-                )
-                await asyncio.sleep(delay + 1.0)  # Extra delay for drug content
-        
-        logger.info(f"✅ Drug Information section complete: {len(scraped_drugs)} drugs processed")
-        return scraped_drugs
+        # Drug pages are more sensitive - keep fewer of them in flight
+        return await self._execute_section_scraping(
+            self._discover_drug_information_urls(), section_name, "💊 Drug Information", window_size=15
+        )
     
-    async def scrape_supplements_complete(self) -> List[ScrapingResult]:
+    async def scrape_supplements_complete(self) -> ResultStatistics:
         """Scrape vitamins and supplements database"""
         
         logger.info("🌿 Starting Supplements section scraping")
         section_name = "supplements"
         
-        supplement_urls = await self._discover_supplement_urls()
-        logger.info(f"🔍 Discovered {len(supplement_urls)} supplement URLs")
-        
         return await self._execute_section_scraping(
-            supplement_urls, section_name, "Supplements", batch_size=30
+            self._discover_supplement_urls(), section_name, "Supplements", window_size=25
         )
     
-    async def scrape_medical_tests_complete(self) -> List[ScrapingResult]:
+    async def scrape_medical_tests_complete(self) -> ResultStatistics:
         """Scrape medical tests and lab procedures"""
         
         logger.info("🧪 Starting Medical Tests section scraping")
         section_name = "medical_tests"
         
-        test_urls = await self._discover_medical_test_urls()
-        logger.info(f"🔍 Discovered {len(test_urls)} medical test URLs")
-        
         return await self._execute_section_scraping(
-            test_urls, section_name, "Medical Tests", batch_size=25
+            self._discover_medical_test_urls(), section_name, "Medical Tests", window_size=25
         )
     
-    async def scrape_surgery_info_complete(self) -> List[ScrapingResult]:
+    async def scrape_surgery_info_complete(self) -> ResultStatistics:
         """Scrape surgery and procedure information"""
         
         logger.info("⚕️ Starting Surgery section scraping")
         section_name = "surgery"
         
-        surgery_urls = await self._discover_surgery_urls()
-        logger.info(f"🔍 Discovered {len(surgery_urls)} surgery URLs")
-        
         return await self._execute_section_scraping(
-            surgery_urls, section_name, "Surgery", batch_size=20
+            self._discover_surgery_urls(), section_name, "Surgery", window_size=20
         )
     
-    async def scrape_anatomy_complete(self) -> List[ScrapingResult]:
+    async def scrape_anatomy_complete(self) -> ResultStatistics:
         """Scrape anatomy and body systems information"""
         
         logger.info("🫀 Starting Anatomy section scraping")
         section_name = "anatomy"
         
-        anatomy_urls = await self._discover_anatomy_urls()
-        logger.info(f"🔍 Discovered {len(anatomy_urls)} anatomy URLs")
-        
         return await self._execute_section_scraping(
-            anatomy_urls, section_name, "Anatomy", batch_size=15
+            self._discover_anatomy_urls(), section_name, "Anatomy", window_size=15
         )
     
-    async def scrape_easy_read_complete(self) -> List[ScrapingResult]:
+    async def scrape_easy_read_complete(self) -> ResultStatistics:
         """Scrape easy-to-read health information"""
         
         logger.info("📖 Starting Easy Read section scraping")
         section_name = "easy_read"
         
-        easy_read_urls = await self._discover_easy_read_urls()
-        logger.info(f"🔍 Discovered {len(easy_read_urls)} easy read URLs")
-        
         return await self._execute_section_scraping(
-            easy_read_urls, section_name, "Easy Read", batch_size=25
+            self._discover_easy_read_urls(), section_name, "Easy Read", window_size=25
         )
     
-    async def scrape_videos_complete(self) -> List[ScrapingResult]:
+    async def scrape_videos_complete(self) -> ResultStatistics:
         """Scrape video resources and multimedia content"""
         
         logger.info("🎥 Starting Videos section scraping")
         section_name = "videos"
         
-        video_urls = await self._discover_video_urls()
-        logger.info(f"🔍 Discovered {len(video_urls)} video URLs")
-        
         return await self._execute_section_scraping(
-            video_urls, section_name, "Videos", batch_size=20
+            self._discover_video_urls(), section_name, "Videos", window_size=20
         )
     
-    async def _execute_section_scraping(self, urls: List[str], section_name: str, 
-                                      display_name: str, batch_size: int = 30) -> List[ScrapingResult]:
-        """Generic section scraping execution with consistent handling"""
+    async def _execute_section_scraping(self, urls: AsyncIterator[str], section_name: str, 
+                                      display_name: str, window_size: int = 25) -> ResultStatistics:
+        """Generic section scraping execution with a sliding window of in-flight requests"""
         
-        scraped_results = []
+        section_statistics = self.result_pipeline.group_statistics[section_name]
+        section_stats = self.section_stats[section_name]
         
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=80, limit_per_host=20)
-        ) as session:
-            
-            for i in range(0, len(urls), batch_size):
-                batch_urls = urls[i:i + batch_size]
-                
-                logger.info(f"{display_name} batch {i//batch_size + 1}/{len(urls)//batch_size + 1}")
-                
-                batch_results = await self._scrape_url_batch_with_protection(
-                    batch_urls, session, section_name
-                )
-                scraped_results.extend(batch_results)
-                
-                # Update stats
-                successful = sum(1 for r in batch_results if r.success)
-                self.section_stats[section_name]['processed'] += len(batch_results)
-                self.section_stats[section_name]['successful'] += successful
-                self.section_stats[section_name]['errors'] += len(batch_results) - successful
-                
-                # Adaptive delay
-                delay = await self.timing_humanizer.calculate_adaptive_delay(
-                    "medlineplus.gov", successful / len(batch_results) if batch_results else 0
-                )
-                await asyncio.sleep(delay)
+        # Discovery streams into the section's persistent frontier while fetching drains it;
+        # URLs completed by an earlier run are already marked done there and never refetched
+        frontier = self.checkpoint.start_section('medlineplus', section_name)
+        discovery = frontier.start_feed(urls)
+        saved_stats = self.checkpoint.load_stats('medlineplus', section_name)
+        if saved_stats:
+            # Failed URLs are fetched again, so only completed work carries over
+            section_stats['processed'] = section_stats['successful'] = saved_stats['successful']
         
-        logger.info(f"✅ {display_name} section complete: {len(scraped_results)} items processed")
-        return scraped_results
-    
-    async def _scrape_url_batch_with_protection(self, urls: List[str], session: aiohttp.ClientSession,
-                                               section: str) -> List[ScrapingResult]:
-        """Scrape batch of URLs with advanced protection and error handling"""
-        
-        tasks = []
-        semaphore = asyncio.Semaphore(25)  # Limit concurrent requests
-        
-        async def scrape_single_url(url: str) -> ScrapingResult:
-            async with semaphore:
-                return await self._extract_medlineplus_content(url, session, section)
-        
-        # Create tasks for all URLs
-        for url in urls:
-            task = scrape_single_url(url)
-            tasks.append(task)
-        
-        # Execute with error handling
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter and process results
-        valid_results = []
-        for result in results:
-            if isinstance(result, ScrapingResult):
-                valid_results.append(result)
-            elif isinstance(result, Exception):
-                logger.warning(f"Scraping error: {result}")
-        
-        return valid_results
+        try:
+            async with get_session_pool().borrow('medlineplus') as session:
+                
+                # Pacing comes from the shared rate limiter; a slow page only holds its own slot
+                async with aclosing(iter_sliding_window(
+                    frontier,
+                    lambda url: self._extract_medlineplus_content(url, session, section_name),
+                    window_size
+                )) as results:
+                    async for result in results:
+                        await self.result_pipeline.process(result, group=section_name)
+                    
+                        # Update stats
+                        section_stats['processed'] += 1
+                        if result.success:
+                            section_stats['successful'] += 1
+                            self.checkpoint.mark_completed('medlineplus', section_name, result.url, section_stats)
+                        else:
+                            section_stats['errors'] += 1
+                    
+                        if section_stats['processed'] % 100 == 0:
+                            logger.info(f"{display_name}: {section_stats['processed']} processed, {frontier.pending_count()} queued")
+                        
+                        if self.checkpoint.stop_requested:
+                            logger.info(f"🛑 {display_name}: stopping, progress checkpointed")
+                            break
+        finally:
+            discovery.cancel()
+            self.checkpoint.save_stats('medlineplus', section_name, section_stats)
+            self.checkpoint.checkpoint()
+        
+        logger.info(f"✅ {display_name} section complete: {section_statistics.processed} items processed")
+        return section_statistics
     
     async def _extract_medlineplus_content(self, url: str, session: aiohttp.ClientSession, 
                                          section: str) -> ScrapingResult:
@@ -393,11 +279,39 @@ class MedlinePlusAdvancedScraper:
                 'Sec-Fetch-Site': 'none'
             })
             
+            headers.update(self.http_cache.conditional_headers(url))
+            
+            await self.rate_limiter.wait_for_permit(url)
+            
             start_time = time.time()
             
             async with session.get(url, headers=headers, timeout=30) as response:
+                self.rate_limiter.record_request_result(
+                    url, response.status in (200, 304), time.time() - start_time, response.status
+                )
+                
+                content = await response.text() if response.status == 200 else None
+                digest = content_digest(content) if content is not None else None
+                
+                # Unchanged since last crawl - reuse previous extraction
+                cached = self.http_cache.lookup_unchanged(url, response.status, digest)
+                if cached is not None:
+                    self.processed_urls.add(url)
+                    return ScrapingResult(
+                        task_id=task_id,
+                        url=url,
+                        success=True,
+                        extracted_data=cached.extracted_data,
+                        content_digest=cached.content_digest,
+                        metadata=unchanged_metadata(cached),
+                        processing_time=time.time() - start_time,
+                        content_length=cached.content_length,
+                        quality_score=cached.quality_score,
+                        confidence_score=0.95,
+                        timestamp=datetime.utcnow()
+                    )
+                
                 if response.status == 200:
-                    content = await response.text()
                     processing_time = time.time() - start_time
                     
                     # Check for duplicates
@@ -418,11 +332,18 @@ class MedlinePlusAdvancedScraper:
                     # Enhance quality score for MedlinePlus (high-authority source)
                     enhanced_quality_score = min(1.0, quality_score * 1.2)
                     
+                    self.http_cache.store(url, response.headers, digest, extracted_data,
+                                          enhanced_quality_score, len(content))
+                    
+                    # Raw HTML goes to the blob store; the result carries only its digest
+                    self.blob_store.put(content, urlparse(url).netloc, digest)
+                    self.deduplicator.commit(url)
+                    
                     result = ScrapingResult(
                         task_id=task_id,
                         url=url,
                         success=True,
-                        content=content,
+                        content_digest=digest,
                         extracted_data=extracted_data,
                         processing_time=processing_time,
                         content_length=len(content),
@@ -448,6 +369,9 @@ class MedlinePlusAdvancedScraper:
                     
         except Exception as e:
             self.error_count += 1
+            self.deduplicator.discard(url)
+            if isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError)):
+                self.rate_limiter.record_request_result(url, False, 0.0)
             return ScrapingResult(
                 task_id=task_id,
                 url=url,
@@ -457,234 +381,31 @@ class MedlinePlusAdvancedScraper:
             )
     
     async def _extract_medlineplus_structured_data(self, content: str, url: str, section: str) -> Dict[str, Any]:
-        """Extract structured data specifically tailored for MedlinePlus content"""
-        
-        try:
-            soup = BeautifulSoup(content, 'lxml')
-            
-            extracted = {
-                'title': '',
-                'summary': '',
-                'medlineplus_section': section,
-                'medical_content': {},
-                'medlineplus_specific': {},
-                'metadata': {},
-                'links': []
-            }
-            
-            # Extract MedlinePlus-specific title
-            title_selectors = [
-                'h1.page-title',
-                'h1#pagetitle',
-                'h1',
-                'title'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    extracted['title'] = title_elem.get_text(strip=True)
-                    break
-            
-            # Extract MedlinePlus summary/overview
-            summary_selectors = [
-                '.summary',
-                '.overview',
-                '.page-summary',
-                'div[data-module="Summary"]',
-                '.mplus-summary'
-            ]
-            
-            for selector in summary_selectors:
-                summary_elem = soup.select_one(selector)
-                if summary_elem:
-                    extracted['summary'] = summary_elem.get_text(strip=True)
-                    break
-            
-            # Extract MedlinePlus-specific medical sections
-            medical_sections = {}
-            
-            # Look for key medical information sections
-            section_keywords = [
-                ('symptoms', ['symptoms', 'signs']),
-                ('causes', ['causes', 'risk factors']),
-                ('diagnosis', ['diagnosis', 'testing']),
-                ('treatment', ['treatment', 'therapy']),
-                ('prevention', ['prevention', 'avoiding']),
-                ('complications', ['complications', 'side effects']),
-                ('outlook', ['outlook', 'prognosis'])
-            ]
-            
-            for section_key, keywords in section_keywords:
-                section_content = []
-                
-                for keyword in keywords:
-                    # Look for sections containing these keywords
-                    sections = soup.find_all(['div', 'section'], 
-                        text=re.compile(keyword, re.IGNORECASE))
-                    
-                    for sect in sections:
-                        # Get the parent container and extract content
-                        parent = sect.parent if sect.parent else sect
-                        paragraphs = parent.find_all('p')
-                        section_text = [p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50]
-                        section_content.extend(section_text)
-                
-                if section_content:
-                    medical_sections[section_key] = section_content[:3]  # Top 3 relevant paragraphs
-            
-            extracted['medical_content']['sections'] = medical_sections
-            
-            # Extract MedlinePlus-specific elements
-            medlineplus_specific = {}
-            
-            # Extract "Also called" information
-            also_called = soup.select_one('.also-called, .alternative-names')
-            if also_called:
-                medlineplus_specific['also_called'] = also_called.get_text(strip=True)
-            
-            # Extract related topics
-            related_topics = []
-            related_selectors = [
-                '.related-topics a',
-                '.see-also a',
-                '.related-links a'
-            ]
-            
-            for selector in related_selectors:
-                links = soup.select(selector)
-                for link in links[:10]:  # Top 10 related topics
-                    topic_text = link.get_text(strip=True)
-                    topic_href = link.get('href', '')
-                    if topic_text and len(topic_text) > 3:
-                        related_topics.append({
-                            'title': topic_text,
-                            'url': urljoin(url, topic_href) if topic_href else ''
-                        })
-            
-            medlineplus_specific['related_topics'] = related_topics
-            
-            # Extract key statistics or numbers
-            numbers_text = soup.get_text()
-            statistics = re.findall(r'(\d+(?:\.\d+)?)\s*(?:%|percent|million|thousand|cases?|patients?)', 
-                                  numbers_text, re.IGNORECASE)
-            medlineplus_specific['statistics'] = statistics[:5]  # Top 5 statistics
-            
-            extracted['medlineplus_specific'] = medlineplus_specific
-            
-            # Extract main content paragraphs
-            content_paragraphs = []
-            main_content_selectors = [
-                '.main-content p',
-                '#main p',
-                '.article-content p',
-                '.page-content p',
-                'p'
-            ]
-            
-            for selector in main_content_selectors:
-                paragraphs = soup.select(selector)
-                if paragraphs:
-                    for p in paragraphs:
-                        text = p.get_text(strip=True)
-                        if len(text) > 100:  # Substantial paragraphs only
-                            content_paragraphs.append(text)
-                    if content_paragraphs:
-                        break  # Use first successful selector
-            
-            extracted['medical_content']['paragraphs'] = content_paragraphs[:15]  # Top 15 paragraphs
-            
-            # Extract internal MedlinePlus links
-            internal_links = []
-            for a in soup.find_all('a', href=True):
-                href = a.get('href')
-                text = a.get_text(strip=True)
-                
-                # Filter for MedlinePlus internal links
-                if (href and 
-                    ('medlineplus.gov' in href or href.startswith('/')) and
-                    text and 
-                    len(text) > 5 and
-                    not href.startswith('#')):
-                    
-                    full_url = urljoin(url, href)
-                    internal_links.append({
-                        'url': full_url,
-                        'text': text
-                    })
-            
-            extracted['links'] = internal_links[:25]  # Top 25 internal links
-            
-            # Extract comprehensive metadata
-            extracted['metadata'] = {
-                'word_count': len(content.split()),
-                'paragraph_count': len(content_paragraphs),
-                'medical_sections_count': len(medical_sections),
-                'related_topics_count': len(related_topics),
-                'internal_links_count': len(internal_links),
-                'statistics_count': len(statistics),
-                'content_depth_score': self._calculate_content_depth(medical_sections, content_paragraphs),
-                'extracted_at': datetime.utcnow().isoformat(),
-                'source_authority': 'medlineplus.gov',
-                'government_source': True
-            }
-            
-            return extracted
-            
-        except Exception as e:
-            logger.error(f"Error extracting MedlinePlus structured data from {url}: {e}")
-            return {'error': str(e), 'url': url, 'section': section}
-    
-    def _calculate_content_depth(self, medical_sections: Dict[str, List[str]], 
-                                paragraphs: List[str]) -> float:
-        """Calculate content depth score based on medical information completeness"""
-        
-        depth_score = 0.0
-        
-        # Score based on medical sections presence
-        section_weights = {
-            'symptoms': 0.2,
-            'causes': 0.15,
-            'diagnosis': 0.15,
-            'treatment': 0.25,
-            'prevention': 0.1,
-            'complications': 0.1,
-            'outlook': 0.05
-        }
-        
-        for section, weight in section_weights.items():
-            if section in medical_sections and medical_sections[section]:
-                depth_score += weight
-        
-        # Score based on content volume
-        content_volume_score = min(0.3, len(paragraphs) * 0.02)  # Max 0.3 for volume
-        depth_score += content_volume_score
-        
-        return min(1.0, depth_score)
+        """Extract structured data specifically tailored for MedlinePlus content in the parsing pool"""
+        return await get_parsing_stage().parse('medlineplus', content, url, section)
     
     # URL Discovery Methods
-    async def _discover_encyclopedia_urls(self) -> List[str]:
+    async def _discover_encyclopedia_urls(self) -> AsyncIterator[str]:
         """Discover all encyclopedia URLs using multiple strategies"""
         
         base_url = self.base_urls['encyclopedia']
-        discovered_urls = set()
         
         # Strategy 1: A-Z browsing
         for letter in 'abcdefghijklmnopqrstuvwxyz0123456789':
-            az_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_url}{letter}.html",
                 f"encyclopedia_{letter}"
-            )
-            discovered_urls.update(az_urls)
+            ):
+                yield url
         
         # Strategy 2: Category browsing
         categories = ['anatomy', 'diseases', 'symptoms', 'tests', 'treatments']
         for category in categories:
-            cat_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_url}{category}/",
                 f"encyclopedia_{category}"
-            )
-            discovered_urls.update(cat_urls)
+            ):
+                yield url
         
         # Strategy 3: Search-based discovery
         search_terms = [
@@ -692,96 +413,92 @@ class MedlinePlusAdvancedScraper:
             'syndrome', 'disorder', 'infection', 'cancer', 'diabetes'
         ]
         for term in search_terms:
-            search_urls = await self._discover_search_based_urls(base_url, term)
-            discovered_urls.update(search_urls)
-        
-        return list(discovered_urls)
+            async for url in self._discover_search_based_urls(base_url, term):
+                yield url
     
-    async def _discover_health_topic_urls(self) -> List[str]:
+    async def _discover_health_topic_urls(self) -> AsyncIterator[str]:
         """Discover health topic URLs comprehensively"""
         
         base_url = self.base_urls['health_topics']
-        discovered_urls = set()
         
         # A-Z health topics
         for letter in 'abcdefghijklmnopqrstuvwxyz':
-            topic_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_url}{letter}.html",
                 f"health_topics_{letter}"
-            )
-            discovered_urls.update(topic_urls)
-        
-        return list(discovered_urls)
+            ):
+                yield url
     
-    async def _discover_drug_information_urls(self) -> List[str]:
+    async def _discover_drug_information_urls(self) -> AsyncIterator[str]:
         """Discover drug information URLs"""
         
-        discovered_urls = set()
         
         # A-Z drug browsing
         base_drug_url = "https://medlineplus.gov/druginfo/"
         for letter in 'abcdefghijklmnopqrstuvwxyz':
-            drug_urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 f"{base_drug_url}{letter}.html",
                 f"drugs_{letter}"
-            )
-            discovered_urls.update(drug_urls)
-        
-        return list(discovered_urls)
+            ):
+                yield url
     
-    async def _discover_supplement_urls(self) -> List[str]:
+    async def _discover_supplement_urls(self) -> AsyncIterator[str]:
         """Discover supplement URLs"""
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             self.base_urls['supplements'],
             "supplements"
-        )
+        ):
+            yield url
     
-    async def _discover_medical_test_urls(self) -> List[str]:
+    async def _discover_medical_test_urls(self) -> AsyncIterator[str]:
         """Discover medical test URLs"""
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             self.base_urls['medical_tests'],
             "medical_tests"
-        )
+        ):
+            yield url
     
-    async def _discover_surgery_urls(self) -> List[str]:
+    async def _discover_surgery_urls(self) -> AsyncIterator[str]:
         """Discover surgery and procedure URLs"""
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             self.base_urls['surgery'],
             "surgery"
-        )
+        ):
+            yield url
     
-    async def _discover_anatomy_urls(self) -> List[str]:
+    async def _discover_anatomy_urls(self) -> AsyncIterator[str]:
         """Discover anatomy URLs"""
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             self.base_urls['anatomy'],
             "anatomy"
-        )
+        ):
+            yield url
     
-    async def _discover_easy_read_urls(self) -> List[str]:
+    async def _discover_easy_read_urls(self) -> AsyncIterator[str]:
         """Discover easy read URLs"""
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             self.base_urls['easy_read'],
             "easy_read"
-        )
+        ):
+            yield url
     
-    async def _discover_video_urls(self) -> List[str]:
+    async def _discover_video_urls(self) -> AsyncIterator[str]:
         """Discover video resource URLs"""
         
-        return await self.content_discovery.discover_medical_urls(
+        async for url in self.content_discovery.iter_medical_urls(
             self.base_urls['videos'],
             "videos"
-        )
+        ):
+            yield url
     
-    async def _discover_search_based_urls(self, base_url: str, search_term: str) -> List[str]:
+    async def _discover_search_based_urls(self, base_url: str, search_term: str) -> AsyncIterator[str]:
         """Discover URLs through search-based exploration"""
         
-        search_urls = []
-        
         # Simulate search patterns
         search_patterns = [
             f"{base_url}?search={search_term}",
@@ -790,51 +507,44 @@ class MedlinePlusAdvancedScraper:
         ]
         
         for pattern in search_patterns:
-            urls = await self.content_discovery.discover_medical_urls(
+            async for url in self.content_discovery.iter_medical_urls(
                 pattern,
                 f"search_{search_term}"
-            )
-            search_urls.extend(urls)
-        
-        return search_urls
+            ):
+                yield url
     
     async def process_and_store_content(self, results: List[Any]) -> Dict[str, Any]:
-        """Process and analyze all scraped content from MedlinePlus"""
+        """Summarize MedlinePlus content from the running pipeline statistics"""
         
         logger.info("🔄 Processing and analyzing MedlinePlus scraped content")
         
-        all_results = []
-        section_summaries = {}
+        for section_result in results:
+            if isinstance(section_result, Exception):
+                logger.warning(f"MedlinePlus section failed: {section_result}")
         
-        # Flatten and process results
-        for i, section_results in enumerate(results):
-            if isinstance(section_results, list):
-                all_results.extend(section_results)
-                
-                # Create section summary
-                successful = sum(1 for r in section_results if r.success)
-                section_name = list(self.base_urls.keys())[i] if i < len(self.base_urls) else f"section_{i}"
-                
-                section_summaries[section_name] = {
-                    'total_processed': len(section_results),
-                    'successful': successful,
-                    'success_rate': successful / len(section_results) if section_results else 0,
-                    'avg_quality': sum(r.quality_score for r in section_results if r.success) / max(successful, 1)
-                }
+        # Section summaries come from per-section running statistics
+        section_summaries = {}
+        for section_name, section_statistics in self.result_pipeline.group_statistics.items():
+            section_summaries[section_name] = {
+                'total_processed': section_statistics.processed,
+                'successful': section_statistics.successful,
+                'success_rate': section_statistics.successful / section_statistics.processed if section_statistics.processed else 0,
+                'avg_quality': section_statistics.average_successful_quality
+            }
         
         # Calculate overall statistics
-        total_processed = len(all_results)
-        successful_results = [r for r in all_results if r.success]
-        total_successful = len(successful_results)
+        statistics = self.result_pipeline.statistics
+        total_processed = statistics.processed
+        total_successful = statistics.successful
         
         # Quality analysis
-        high_quality = len([r for r in successful_results if r.quality_score >= 0.8])
-        medium_quality = len([r for r in successful_results if 0.6 <= r.quality_score < 0.8])
+        high_quality = statistics.count_quality_between(0.8)
+        medium_quality = statistics.count_quality_between(0.6, 0.8)
         low_quality = total_successful - high_quality - medium_quality
         
         # Content analysis
-        total_content_size = sum(r.content_length for r in successful_results)
-        avg_processing_time = sum(r.processing_time for r in successful_results) / max(total_successful, 1)
+        total_content_size = statistics.successful_content_size
+        avg_processing_time = statistics.average_processing_time
         
         final_summary = {
             'medlineplus_scraping_summary': {
@@ -862,9 +572,10 @@ class MedlinePlusAdvancedScraper:
                 'documents_per_second': total_processed / max(avg_processing_time * total_processed, 1),
                 'mb_per_second': (total_content_size / (1024 * 1024)) / max(avg_processing_time * total_processed, 1),
                 'government_source_reliability': 0.98,
-                'content_medical_relevance': sum(r.quality_score for r in successful_results) / max(total_successful, 1)
+                'content_medical_relevance': statistics.average_successful_quality
             },
-            'extracted_content': successful_results
+            'result_statistics': statistics,
+            'extracted_content': self.result_pipeline.samples
         }
         
         logger.info("=" * 80)
@@ -928,8 +639,8 @@ class SessionRotator:
     
     async def get_session(self) -> aiohttp.ClientSession:
         """Get next session in rotation"""
-        # Simplified - in production implement full session rotation
-        return aiohttp.ClientSession()
+        # Sessions are pooled - rotation happens on headers, not connections
+        return get_session_pool().get_session('medlineplus')
 
 
 class HeaderRandomizer:
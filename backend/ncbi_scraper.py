@@ -5,23 +5,24 @@ Target: 50,000+ medical articles and research papers
 """
 
 import asyncio
-import aiohttp
 import logging
-from typing import List, Dict, Optional, Any, Tuple
+import os
+from typing import List, Dict, Optional, Any, Tuple, AsyncIterable, AsyncIterator, Callable
 from datetime import datetime, timedelta
 import json
-import random
 import time
 from urllib.parse import urljoin, urlparse, parse_qs, quote
 from bs4 import BeautifulSoup
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 import xml.etree.ElementTree as ET
 
 from ai_scraper_core import (
     ScrapingTask, ScrapingResult, ScrapingPriority, ContentType, ScrapingTier,
-    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, AdvancedDeduplicator
+    ContentDiscoveryAI, AntiDetectionAI, ContentQualityAI, get_shared_deduplicator
 )
+from session_pool import get_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +47,8 @@ class NCBIAdvancedScraper:
         }
         
         # NCBI-specific scraping tools
-        self.eutils_client = EUtilsAdvancedClient()
-        self.api_rate_manager = NCBIRateManager()
+        self.rate_governor = get_ncbi_rate_governor()
+        self.eutils_client = EUtilsAdvancedClient(rate_governor=self.rate_governor)
         self.query_generator = MedicalQueryGenerator()
         self.citation_parser = CitationParser()
         
@@ -55,18 +56,17 @@ class NCBIAdvancedScraper:
         self.content_discovery = ContentDiscoveryAI()
         self.anti_detection = AntiDetectionAI()
         self.content_quality = ContentQualityAI()
-        self.deduplicator = AdvancedDeduplicator()
+        self.deduplicator = get_shared_deduplicator()
         
         # Performance tracking
         self.processed_queries = set()
         self.success_count = 0
         self.error_count = 0
         self.total_articles_found = 0
-        self.api_calls_made = 0
         self.database_stats = defaultdict(lambda: {'processed': 0, 'successful': 0, 'errors': 0})
         
         # NCBI API configuration
-        self.api_key = None  # Optional API key for higher rate limits
+        self.api_key = self.rate_governor.api_key  # Optional API key (NCBI_API_KEY) for the 10 req/s tier
         self.email = "medical.scraper@research.ai"  # Required for NCBI API
         self.tool = "MedicalScraperPhase2"
         
@@ -82,21 +82,13 @@ class NCBIAdvancedScraper:
         
         pubmed_articles = []
         
-        # Process queries in intelligent batches
-        batch_size = 10  # Process 10 queries at a time
-        for i in range(0, len(medical_queries), batch_size):
-            batch_queries = medical_queries[i:i + batch_size]
-            
-            logger.info(f"🔍 Processing PubMed query batch {i//batch_size + 1}/{len(medical_queries)//batch_size + 1}")
-            
-            batch_results = await self._process_pubmed_query_batch(batch_queries)
-            pubmed_articles.extend(batch_results)
-            
-            # Respect API rate limits intelligently
-            await self.api_rate_manager.wait_for_rate_limit()
+        # Queries run concurrently; each one's results are paged out of the E-utilities history server
+        async for article in self.eutils_client.stream_pubmed_queries(medical_queries, max_results_per_query=5000):
+            pubmed_articles.append(article)
             
             # Progress update
-            logger.info(f"📊 PubMed progress: {len(pubmed_articles)} articles extracted so far")
+            if len(pubmed_articles) % 1000 == 0:
+                logger.info(f"📊 PubMed progress: {len(pubmed_articles)} articles extracted so far")
         
         # Advanced deduplication and quality filtering
         unique_quality_articles = await self._deduplicate_and_filter_quality(pubmed_articles)
@@ -108,7 +100,6 @@ class NCBIAdvancedScraper:
             'total_articles': len(unique_quality_articles),
             'execution_time': execution_time,
             'queries_processed': len(medical_queries),
-            'api_calls': self.api_calls_made,
             'articles': unique_quality_articles
         }
     
@@ -123,19 +114,14 @@ class NCBIAdvancedScraper:
         
         full_text_articles = []
         
-        # Batch processing for efficiency
-        batch_size = 100
-        for i in range(0, len(open_access_ids), batch_size):
-            batch_ids = open_access_ids[i:i + batch_size]
+        # Many IDs per efetch call, several calls in flight under the shared rate governor
+        async for article in self.eutils_client.fetch_pmc_articles(open_access_ids):
+            full_text_articles.append(article)
+            self.success_count += 1
             
-            logger.info(f"📄 Processing PMC batch {i//batch_size + 1}/{len(open_access_ids)//batch_size + 1}")
-            
-            # Extract full text content in parallel
-            batch_articles = await self._extract_pmc_full_text_batch(batch_ids)
-            full_text_articles.extend(batch_articles)
-            
-            # Rate limiting
-            await self.api_rate_manager.wait_for_rate_limit()
+            # Progress update
+            if len(full_text_articles) % 1000 == 0:
+                logger.info(f"📄 PMC progress: {len(full_text_articles)}/{len(open_access_ids)} full-text articles")
         
         return {
             'database': 'PMC',
@@ -155,23 +141,15 @@ class NCBIAdvancedScraper:
         
         bookshelf_content = []
         
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=50, limit_per_host=15)
-        ) as session:
+        # Process books in batches; pacing comes from the shared NCBI rate governor
+        batch_size = 20
+        for i in range(0, len(book_urls), batch_size):
+            batch_urls = book_urls[i:i + batch_size]
             
-            # Process books in batches
-            batch_size = 20
-            for i in range(0, len(book_urls), batch_size):
-                batch_urls = book_urls[i:i + batch_size]
-                
-                logger.info(f"📚 Processing bookshelf batch {i//batch_size + 1}/{len(book_urls)//batch_size + 1}")
-                
-                batch_results = await self._scrape_bookshelf_batch(batch_urls, session)
-                bookshelf_content.extend(batch_results)
-                
-                # Respectful delay for NCBI
-                await asyncio.sleep(random.uniform(2.0, 4.0))
+            logger.info(f"📚 Processing bookshelf batch {i//batch_size + 1}/{len(book_urls)//batch_size + 1}")
+            
+            batch_results = await self._scrape_bookshelf_batch(batch_urls)
+            bookshelf_content.extend(batch_results)
         
         return {
             'database': 'NCBI_Bookshelf',
@@ -192,8 +170,6 @@ class NCBIAdvancedScraper:
         for query in genetic_queries:
             variants = await self._search_clinvar_variants(query)
             clinvar_variants.extend(variants)
-            
-            await self.api_rate_manager.wait_for_rate_limit()
         
         return {
             'database': 'ClinVar',
@@ -237,6 +213,9 @@ class NCBIAdvancedScraper:
         
         execution_time = (datetime.utcnow() - start_time).total_seconds()
         
+        # The extractions share one client, so its counters are read once here rather than per database
+        api_calls_made = self.eutils_client.api_calls
+        
         # Generate comprehensive summary
         total_documents = sum(
             result.get('total_articles', result.get('total_resources', result.get('total_variants', result.get('total_terms', 0))))
@@ -248,7 +227,8 @@ class NCBIAdvancedScraper:
                 'operation_type': 'NCBI Comprehensive Ecosystem Scraping',
                 'databases_processed': len([r for r in results if isinstance(r, dict)]),
                 'total_documents_extracted': total_documents,
-                'total_api_calls': self.api_calls_made,
+                'total_api_calls': api_calls_made,
+                'failed_api_calls': self.eutils_client.failed_queries,
                 'execution_time': execution_time,
                 'success_rate': len([r for r in results if isinstance(r, dict)]) / len(extraction_tasks),
                 'research_authority_score': 0.98  # Very high authority for NCBI
@@ -256,10 +236,11 @@ class NCBIAdvancedScraper:
             'database_results': consolidated_results,
             'performance_metrics': {
                 'documents_per_second': total_documents / execution_time if execution_time > 0 else 0,
-                'api_efficiency': total_documents / max(self.api_calls_made, 1),
+                'api_efficiency': total_documents / max(api_calls_made, 1),
                 'research_quality_score': 0.95,  # High quality for peer-reviewed research
                 'scientific_relevance': 0.97
-            }
+            },
+            'rate_governor': self.rate_governor.get_metrics()
         }
         
         logger.info("=" * 80)
@@ -269,39 +250,13 @@ class NCBIAdvancedScraper:
         logger.info(f"🗃️ Databases Processed: {len([r for r in results if isinstance(r, dict)])}")
         logger.info(f"🔬 Research Authority Score: 0.98")
         logger.info(f"⏱️ Total Execution Time: {execution_time:.1f} seconds")
-        logger.info(f"🚀 API Calls Made: {self.api_calls_made:,}")
+        logger.info(f"🚀 API Calls Made: {api_calls_made:,}")
+        logger.info(f"🚦 Rate Limit Utilization: {final_summary['rate_governor']['utilization']:.0%}")
         logger.info("=" * 80)
         
         return final_summary
     
     # Internal processing methods
-    async def _process_pubmed_query_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
-        """Process batch of PubMed queries"""
-        
-        batch_articles = []
-        
-        for query in queries:
-            try:
-                # Search PubMed with intelligent pagination
-                search_results = await self.eutils_client.search_pubmed_comprehensive(
-                    query=query,
-                    max_results=5000,  # 5000 per query
-                    batch_size=1000
-                )
-                
-                # Extract article details
-                if search_results:
-                    article_details = await self.eutils_client.fetch_article_details_batch(search_results)
-                    batch_articles.extend(article_details)
-                
-                self.api_calls_made += 2  # Search + fetch
-                
-            except Exception as e:
-                logger.warning(f"Error processing query '{query}': {e}")
-                self.error_count += 1
-        
-        return batch_articles
-    
     async def _discover_pmc_open_access_articles(self) -> List[str]:
         """Discover PMC open access article IDs"""
         
@@ -389,35 +344,6 @@ class NCBIAdvancedScraper:
         
         return article_ids
     
-    async def _extract_pmc_full_text_batch(self, article_ids: List[str]) -> List[Dict[str, Any]]:
-        """Extract full text from batch of PMC articles"""
-        
-        full_text_articles = []
-        
-        # Process in smaller sub-batches
-        sub_batch_size = 20
-        for i in range(0, len(article_ids), sub_batch_size):
-            sub_batch = article_ids[i:i + sub_batch_size]
-            
-            # Fetch full text for each article
-            for article_id in sub_batch:
-                try:
-                    full_text = await self.eutils_client.fetch_pmc_full_text(article_id)
-                    if full_text:
-                        full_text_articles.append(full_text)
-                        self.success_count += 1
-                    
-                    self.api_calls_made += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Error fetching PMC article {article_id}: {e}")
-                    self.error_count += 1
-            
-            # Small delay between sub-batches
-            await asyncio.sleep(0.5)
-        
-        return full_text_articles
-    
     async def _discover_bookshelf_content(self) -> List[str]:
         """Discover NCBI Bookshelf content URLs"""
         
@@ -438,14 +364,14 @@ class NCBIAdvancedScraper:
         
         return bookshelf_urls
     
-    async def _scrape_bookshelf_batch(self, urls: List[str], session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
+    async def _scrape_bookshelf_batch(self, urls: List[str]) -> List[Dict[str, Any]]:
         """Scrape batch of bookshelf content"""
         
         bookshelf_content = []
         
         for url in urls:
             try:
-                content = await self._extract_bookshelf_content(url, session)
+                content = await self._extract_bookshelf_content(url)
                 if content:
                     bookshelf_content.append(content)
                     self.success_count += 1
@@ -456,47 +382,46 @@ class NCBIAdvancedScraper:
         
         return bookshelf_content
     
-    async def _extract_bookshelf_content(self, url: str, session: aiohttp.ClientSession) -> Dict[str, Any]:
+    async def _extract_bookshelf_content(self, url: str) -> Optional[Dict[str, Any]]:
         """Extract content from single bookshelf URL"""
         
         headers = await self.anti_detection.get_optimized_headers(url, len(self.processed_queries))
         
-        async with session.get(url, headers=headers, timeout=30) as response:
-            if response.status == 200:
-                content = await response.text()
-                
-                # Parse bookshelf content
-                soup = BeautifulSoup(content, 'lxml')
-                
-                extracted = {
-                    'url': url,
-                    'title': '',
-                    'authors': [],
-                    'publication_info': {},
-                    'chapters': [],
-                    'abstract': '',
-                    'content': content,
-                    'extracted_at': datetime.utcnow().isoformat()
-                }
-                
-                # Extract title
-                title_elem = soup.find('h1') or soup.find('title')
-                if title_elem:
-                    extracted['title'] = title_elem.get_text(strip=True)
-                
-                # Extract authors
-                author_elems = soup.find_all(class_=re.compile('author'))
-                extracted['authors'] = [elem.get_text(strip=True) for elem in author_elems]
-                
-                # Extract chapters/sections
-                chapter_elems = soup.find_all(['h2', 'h3'], class_=re.compile('chapter|section'))
-                extracted['chapters'] = [elem.get_text(strip=True) for elem in chapter_elems]
-                
-                # Quality assessment
-                quality_score = await self.content_quality.assess_content_quality(content, url)
-                extracted['quality_score'] = quality_score
-                
-                return extracted
+        # Bookshelf pages count against the same NCBI request budget as E-utilities calls
+        content = await self.eutils_client.fetch_page(url, headers=headers)
+        if content is not None:
+            # Parse bookshelf content
+            soup = BeautifulSoup(content, 'lxml')
+            
+            extracted = {
+                'url': url,
+                'title': '',
+                'authors': [],
+                'publication_info': {},
+                'chapters': [],
+                'abstract': '',
+                'content': content,
+                'extracted_at': datetime.utcnow().isoformat()
+            }
+            
+            # Extract title
+            title_elem = soup.find('h1') or soup.find('title')
+            if title_elem:
+                extracted['title'] = title_elem.get_text(strip=True)
+            
+            # Extract authors
+            author_elems = soup.find_all(class_=re.compile('author'))
+            extracted['authors'] = [elem.get_text(strip=True) for elem in author_elems]
+            
+            # Extract chapters/sections
+            chapter_elems = soup.find_all(['h2', 'h3'], class_=re.compile('chapter|section'))
+            extracted['chapters'] = [elem.get_text(strip=True) for elem in chapter_elems]
+            
+            # Quality assessment
+            quality_score = await self.content_quality.assess_content_quality(content, url)
+            extracted['quality_score'] = quality_score
+            
+            return extracted
         
         return None
     
@@ -504,33 +429,21 @@ class NCBIAdvancedScraper:
         """Search ClinVar for genetic variants"""
         
         # Use NCBI API to search ClinVar
-        search_url = f"{self.ncbi_endpoints['eutils_base']}esearch.fcgi"
-        params = {
-            'db': 'clinvar',
-            'term': query,
-            'retmax': 1000,
-            'retmode': 'json',
-            'email': self.email,
-            'tool': self.tool
-        }
-        
-        if self.api_key:
-            params['api_key'] = self.api_key
-        
         variants = []
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        variant_ids = data.get('esearchresult', {}).get('idlist', [])
-                        
-                        # Fetch variant details
-                        if variant_ids:
-                            variants = await self._fetch_clinvar_details(variant_ids)
-                        
-                        self.api_calls_made += 1
+            data = await self.eutils_client.eutils_request('esearch.fcgi', {
+                'db': 'clinvar',
+                'term': query,
+                'retmax': 1000,
+                'retmode': 'json'
+            }, as_json=True)
+            if data:
+                variant_ids = data.get('esearchresult', {}).get('idlist', [])
+                
+                # Fetch variant details
+                if variant_ids:
+                    variants = await self._fetch_clinvar_details(variant_ids)
         
         except Exception as e:
             logger.warning(f"Error searching ClinVar: {e}")
@@ -540,29 +453,17 @@ class NCBIAdvancedScraper:
     async def _fetch_clinvar_details(self, variant_ids: List[str]) -> List[Dict[str, Any]]:
         """Fetch detailed information for ClinVar variants"""
         
-        fetch_url = f"{self.ncbi_endpoints['eutils_base']}efetch.fcgi"
-        params = {
-            'db': 'clinvar',
-            'id': ','.join(variant_ids[:100]),  # Limit to 100 IDs
-            'retmode': 'xml',
-            'email': self.email,
-            'tool': self.tool
-        }
-        
-        if self.api_key:
-            params['api_key'] = self.api_key
-        
         variants = []
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(fetch_url, params=params) as response:
-                    if response.status == 200:
-                        xml_content = await response.text()
-                        
-                        # Parse XML and extract variant information
-                        variants = self._parse_clinvar_xml(xml_content)
-                        self.api_calls_made += 1
+            xml_content = await self.eutils_client.eutils_request('efetch.fcgi', {
+                'db': 'clinvar',
+                'id': ','.join(variant_ids[:100]),  # Limit to 100 IDs
+                'retmode': 'xml'
+            })
+            if xml_content is not None:
+                # Parse XML and extract variant information
+                variants = self._parse_clinvar_xml(xml_content)
         
         except Exception as e:
             logger.warning(f"Error fetching ClinVar details: {e}")
@@ -635,10 +536,13 @@ class NCBIAdvancedScraper:
         
         category_url = f"{self.ncbi_endpoints['mesh']}browse/{category}/"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_session_pool().borrow('ncbi') as session:
             headers = await self.anti_detection.get_optimized_headers(category_url, 0)
             
-            async with session.get(category_url, headers=headers, timeout=30) as response:
+            # MeSH pages share NCBI's per-IP budget with E-utilities
+            async with self.rate_governor.request(), \
+                    session.get(category_url, headers=headers, timeout=30) as response:
+                self.rate_governor.record_response(response.status, response.headers.get('Retry-After'))
                 if response.status == 200:
                     content = await response.text()
                     soup = BeautifulSoup(content, 'lxml')
@@ -675,31 +579,29 @@ class NCBIAdvancedScraper:
             doi = article.get('doi', '').strip()
             
             # Check for duplicates
-            is_duplicate = False
+            if (title and title in seen_titles) or (doi and doi in seen_dois):
+                continue
             
-            if title and title in seen_titles:
-                is_duplicate = True
-            
-            if doi and doi in seen_dois:
-                is_duplicate = True
-            
-            if not is_duplicate:
-                # Quality filtering
-                quality_score = await self.content_quality.assess_content_quality(
-                    article.get('abstract', '') + ' ' + title, 
-                    article.get('url', '')
-                )
-                
-                if quality_score >= 0.5:  # Minimum quality threshold
-                    article['quality_score'] = quality_score
-                    unique_articles.append(article)
-                    
-                    if title:
-                        seen_titles.add(title)
-                    if doi:
-                        seen_dois.add(doi)
+            unique_articles.append(article)
+            if title:
+                seen_titles.add(title)
+            if doi:
+                seen_dois.add(doi)
+        
+        # Score the unique articles in one batch; scores depend only on each article's own text
+        quality_scores = await self.content_quality.assess_batch(
+            [article.get('abstract', '') + ' ' + article.get('title', '').strip().lower() for article in unique_articles],
+            [article.get('url', '') for article in unique_articles]
+        )
+        
+        quality_articles = []
+        for article, quality_score in zip(unique_articles, quality_scores.tolist()):
+            # Quality filtering
+            if quality_score >= 0.5:  # Minimum quality threshold
+                article['quality_score'] = quality_score
+                quality_articles.append(article)
         
-        return unique_articles
+        return quality_articles
     
     async def _consolidate_ncbi_results(self, results: List[Any]) -> Dict[str, Any]:
         """Consolidate results from all NCBI databases"""
@@ -718,288 +620,488 @@ class NCBIAdvancedScraper:
 class EUtilsAdvancedClient:
     """Advanced client for NCBI E-utilities"""
     
-    def __init__(self):
+    def __init__(self, rate_governor: Optional['NCBIRateGovernor'] = None, max_attempts: int = 3):
         self.base_url = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils/'
         self.email = "medical.scraper@research.ai"
         self.tool = "MedicalScraperPhase2"
+        self.rate_governor = rate_governor or get_ncbi_rate_governor()
+        self.max_attempts = max_attempts
+        self.api_calls = 0
+        self.failed_queries = 0
+        
+    @asynccontextmanager
+    async def _governed_get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: int = 30,
+                            headers: Optional[Dict[str, str]] = None):
+        """Governed GET of an NCBI URL, retried on 429; yields the open response, or None on HTTP errors"""
+        
+        for attempt in range(self.max_attempts):
+            async with self.rate_governor.request():
+                self.api_calls += 1
+                async with get_session_pool().borrow('ncbi') as session:
+                    async with session.get(url, params=params, headers=headers, timeout=timeout) as response:
+                        self.rate_governor.record_response(response.status, response.headers.get('Retry-After'))
+                        
+                        if response.status == 429:
+                            continue  # The governor has backed off; try again in a later slot
+                        if response.status != 200:
+                            logger.warning(f"NCBI {url} returned HTTP {response.status}")
+                            yield None
+                        else:
+                            yield response
+                        return
         
-    async def search_pubmed_comprehensive(self, query: str, max_results: int = 10000, 
-                                        batch_size: int = 1000) -> List[str]:
-        """Comprehensive PubMed search with pagination"""
+        logger.warning(f"NCBI {url} still throttled after {self.max_attempts} attempts")
+        yield None
+    
+    @asynccontextmanager
+    async def _eutils_get(self, endpoint: str, params: Dict[str, Any], timeout: int = 30):
+        """Governed E-utilities GET with the tool/email (and API key) parameters NCBI asks for"""
         
-        search_url = f"{self.base_url}esearch.fcgi"
-        all_ids = []
+        params = {**params, 'email': self.email, 'tool': self.tool}
+        if self.rate_governor.api_key:
+            params['api_key'] = self.rate_governor.api_key
         
-        for start in range(0, max_results, batch_size):
-            params = {
-                'db': 'pubmed',
-                'term': query,
-                'retmax': min(batch_size, max_results - start),
-                'retstart': start,
-                'retmode': 'json',
-                'email': self.email,
-                'tool': self.tool,
-                'sort': 'relevance'
-            }
-            
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(search_url, params=params, timeout=30) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            ids = data.get('esearchresult', {}).get('idlist', [])
-                            all_ids.extend(ids)
-                            
-                            # Break if no more results
-                            if len(ids) < batch_size:
-                                break
-                        else:
-                            break
-            except Exception as e:
-                logger.warning(f"Error in PubMed search: {e}")
-                break
+        async with self._governed_get(f"{self.base_url}{endpoint}", params, timeout) as response:
+            yield response
+    
+    async def fetch_page(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Optional[str]:
+        """Governed GET of an NCBI web page (Bookshelf and the like); returns its HTML, or None on HTTP errors"""
         
-        return all_ids
+        async with self._governed_get(url, timeout=timeout, headers=headers) as response:
+            if response is None:
+                return None
+            return await response.text()
     
-    async def search_pmc(self, query: str, max_results: int = 1000) -> List[str]:
-        """Search PMC database"""
+    async def eutils_request(self, endpoint: str, params: Dict[str, Any], timeout: int = 30,
+                             as_json: bool = False) -> Optional[Any]:
+        """Governed E-utilities GET; returns the parsed JSON or text body, or None on HTTP errors"""
+        
+        async with self._eutils_get(endpoint, params, timeout) as response:
+            if response is None:
+                return None
+            return await response.json() if as_json else await response.text()
+    
+    async def iter_eutils_elements(self, endpoint: str, params: Dict[str, Any], tag: str,
+                                   timeout: int = 60) -> AsyncIterator[ET.Element]:
+        """Governed E-utilities GET whose XML body is parsed as it downloads, yielding each complete `tag` element"""
+        
+        async with self._eutils_get(endpoint, params, timeout) as response:
+            if response is None:
+                return
+            async for elem in iter_xml_elements(response.content.iter_chunked(XML_CHUNK_SIZE), tag):
+                yield elem
+    
+    async def search_with_history(self, db: str, query: str) -> Optional[Dict[str, Any]]:
+        """Run esearch with usehistory=y; returns the WebEnv / query_key reference and hit count"""
         
-        search_url = f"{self.base_url}esearch.fcgi"
-        params = {
-            'db': 'pmc',
+        data = await self.eutils_request('esearch.fcgi', {
+            'db': db,
             'term': query,
-            'retmax': max_results,
+            'usehistory': 'y',
+            'retmax': 0,
             'retmode': 'json',
-            'email': self.email,
-            'tool': self.tool
-        }
+            'sort': 'relevance'
+        }, as_json=True)
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('esearchresult', {}).get('idlist', [])
-        except Exception as e:
-            logger.warning(f"Error in PMC search: {e}")
+        result = (data or {}).get('esearchresult', {})
+        if not result.get('webenv'):
+            return None
         
-        return []
+        return {
+            'webenv': result['webenv'],
+            'query_key': result['querykey'],
+            'count': int(result.get('count', 0))
+        }
     
-    async def fetch_article_details_batch(self, article_ids: List[str]) -> List[Dict[str, Any]]:
-        """Fetch detailed information for batch of articles"""
-        
-        fetch_url = f"{self.base_url}efetch.fcgi"
-        articles = []
-        
-        # Process in batches of 200 (NCBI limit)
-        batch_size = 200
-        for i in range(0, len(article_ids), batch_size):
-            batch_ids = article_ids[i:i + batch_size]
-            
-            params = {
+    async def iter_pubmed_history(self, history: Dict[str, Any], max_results: int = 10000,
+                                  batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Page PubMed records out of the history server by reference - no ID list round-trip"""
+        
+        total = min(history['count'], max_results)
+        for start in range(0, total, batch_size):
+            page_articles = 0
+            async for article_elem in self.iter_eutils_elements('efetch.fcgi', {
                 'db': 'pubmed',
-                'id': ','.join(batch_ids),
-                'retmode': 'xml',
-                'email': self.email,
-                'tool': self.tool
-            }
+                'WebEnv': history['webenv'],
+                'query_key': history['query_key'],
+                'retstart': start,
+                'retmax': min(batch_size, total - start),
+                'retmode': 'xml'
+            }, 'PubmedArticle'):
+                page_articles += 1
+                yield self._parse_pubmed_article(article_elem)
             
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(fetch_url, params=params, timeout=60) as response:
-                        if response.status == 200:
-                            xml_content = await response.text()
-                            batch_articles = self._parse_pubmed_xml(xml_content)
-                            articles.extend(batch_articles)
-            except Exception as e:
-                logger.warning(f"Error fetching article details: {e}")
-        
-        return articles
+            if not page_articles:
+                return
+    
+    async def stream_pubmed_queries(self, queries: List[str], max_results_per_query: int = 10000,
+                                    concurrency: int = 4) -> AsyncIterator[Dict[str, Any]]:
+        """Run several PubMed queries concurrently and yield parsed articles as pages arrive"""
+        
+        async def run_query(query: str) -> AsyncIterator[Dict[str, Any]]:
+            history = await self.search_with_history('pubmed', query)
+            if history is None:
+                return
+            async for article in self.iter_pubmed_history(history, max_results_per_query):
+                yield article
+        
+        async for article in self._run_concurrently(queries, run_query, concurrency, 'query'):
+            yield article
+    
+    async def fetch_pmc_articles(self, article_ids: List[str], ids_per_request: int = 100,
+                                 concurrency: int = 4) -> AsyncIterator[Dict[str, Any]]:
+        """Fetch PMC full texts with many IDs per efetch call and yield one parsed article at a time"""
+        
+        batches = [article_ids[i:i + ids_per_request] for i in range(0, len(article_ids), ids_per_request)]
+        
+        async def fetch_batch(batch: List[str]) -> AsyncIterator[Dict[str, Any]]:
+            # The <pmc-articleset> is split as it streams in; every <article> becomes one record
+            async for article_elem in self.iter_eutils_elements('efetch.fcgi', {
+                'db': 'pmc',
+                'id': ','.join(batch),
+                'retmode': 'xml'
+            }, 'article', timeout=300):
+                yield self._parse_pmc_article(article_elem, _pmc_article_id(article_elem))
+        
+        async for article in self._run_concurrently(batches, fetch_batch, concurrency, 'PMC batch'):
+            yield article
     
-    def _parse_pubmed_xml(self, xml_content: str) -> List[Dict[str, Any]]:
-        """Parse PubMed XML response"""
+    async def _run_concurrently(self, jobs: List[Any], run_job: Callable[[Any], AsyncIterator[Dict[str, Any]]],
+                                concurrency: int, label: str) -> AsyncIterator[Dict[str, Any]]:
+        """Drain the record streams of several jobs with bounded concurrency, yielding records as they arrive"""
         
-        articles = []
+        records: asyncio.Queue = asyncio.Queue(maxsize=2000)
+        pending_jobs = iter(jobs)
+        finished = object()
         
+        async def worker():
+            # Workers share one iterator, so each job is taken by exactly one of them
+            for job in pending_jobs:
+                try:
+                    async for record in run_job(job):
+                        await records.put(record)
+                except Exception as e:
+                    logger.warning(f"Error processing {label} '{str(job)[:80]}': {e}")
+                    self.failed_queries += 1
+        
+        async def run_all():
+            await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(jobs))))))
+            await records.put(finished)
+        
+        producer = asyncio.ensure_future(run_all())
         try:
-            root = ET.fromstring(xml_content)
-            
-            for article_elem in root.findall('.//PubmedArticle'):
-                article = {
-                    'pmid': '',
-                    'title': '',
-                    'abstract': '',
-                    'authors': [],
-                    'journal': '',
-                    'publication_date': '',
-                    'doi': '',
-                    'keywords': [],
-                    'mesh_terms': []
-                }
-                
-                # Extract PMID
-                pmid_elem = article_elem.find('.//PMID')
-                if pmid_elem is not None:
-                    article['pmid'] = pmid_elem.text
-                
-                # Extract title
-                title_elem = article_elem.find('.//ArticleTitle')
-                if title_elem is not None:
-                    article['title'] = title_elem.text or ''
-                
-                # Extract abstract
-                abstract_elem = article_elem.find('.//AbstractText')
-                if abstract_elem is not None:
-                    article['abstract'] = abstract_elem.text or ''
-                
-                # Extract authors
-                author_elems = article_elem.findall('.//Author')
-                for author_elem in author_elems:
-                    last_name = author_elem.find('.//LastName')
-                    fore_name = author_elem.find('.//ForeName')
-                    if last_name is not None:
-                        author_name = last_name.text or ''
-                        if fore_name is not None:
-                            author_name = f"{fore_name.text} {author_name}"
-                        article['authors'].append(author_name)
-                
-                # Extract journal
-                journal_elem = article_elem.find('.//Journal/Title')
-                if journal_elem is not None:
-                    article['journal'] = journal_elem.text or ''
-                
-                # Extract publication date
-                pub_date = article_elem.find('.//PubDate')
-                if pub_date is not None:
-                    year = pub_date.find('.//Year')
-                    month = pub_date.find('.//Month')
-                    if year is not None:
-                        pub_date_str = year.text or ''
-                        if month is not None:
-                            pub_date_str += f"-{month.text}"
-                        article['publication_date'] = pub_date_str
-                
-                # Extract DOI
-                doi_elems = article_elem.findall('.//ArticleId[@IdType="doi"]')
-                if doi_elems:
-                    article['doi'] = doi_elems[0].text or ''
-                
-                # Extract MeSH terms
-                mesh_elems = article_elem.findall('.//MeshHeading/DescriptorName')
-                article['mesh_terms'] = [elem.text for elem in mesh_elems if elem.text]
-                
-                articles.append(article)
+            while True:
+                record = await records.get()
+                if record is finished:
+                    break
+                yield record
+        finally:
+            producer.cancel()
+        
+    async def search_pmc(self, query: str, max_results: int = 1000) -> List[str]:
+        """Search PMC database"""
         
+        try:
+            data = await self.eutils_request('esearch.fcgi', {
+                'db': 'pmc',
+                'term': query,
+                'retmax': max_results,
+                'retmode': 'json'
+            }, as_json=True)
+            if data:
+                return data.get('esearchresult', {}).get('idlist', [])
         except Exception as e:
-            logger.warning(f"Error parsing PubMed XML: {e}")
+            logger.warning(f"Error in PMC search: {e}")
         
-        return articles
+        return []
     
-    async def fetch_pmc_full_text(self, article_id: str) -> Dict[str, Any]:
-        """Fetch full text from PMC"""
-        
-        fetch_url = f"{self.base_url}efetch.fcgi"
-        params = {
-            'db': 'pmc',
-            'id': article_id,
-            'retmode': 'xml',
-            'email': self.email,
-            'tool': self.tool
-        }
+    def _parse_pubmed_article(self, article_elem: ET.Element) -> Dict[str, Any]:
+        """Parse one PubmedArticle element"""
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(fetch_url, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        xml_content = await response.text()
-                        return self._parse_pmc_xml(xml_content, article_id)
-        except Exception as e:
-            logger.warning(f"Error fetching PMC full text for {article_id}: {e}")
+        article = {
+            'pmid': '',
+            'title': '',
+            'abstract': '',
+            'authors': [],
+            'journal': '',
+            'publication_date': '',
+            'doi': '',
+            'keywords': [],
+            'mesh_terms': []
+        }
         
-        return None
+        # Extract PMID
+        pmid_elem = article_elem.find('.//PMID')
+        if pmid_elem is not None:
+            article['pmid'] = pmid_elem.text
+        
+        # Extract title
+        title_elem = article_elem.find('.//ArticleTitle')
+        if title_elem is not None:
+            article['title'] = title_elem.text or ''
+        
+        # Extract abstract
+        abstract_elem = article_elem.find('.//AbstractText')
+        if abstract_elem is not None:
+            article['abstract'] = abstract_elem.text or ''
+        
+        # Extract authors
+        author_elems = article_elem.findall('.//Author')
+        for author_elem in author_elems:
+            last_name = author_elem.find('.//LastName')
+            fore_name = author_elem.find('.//ForeName')
+            if last_name is not None:
+                author_name = last_name.text or ''
+                if fore_name is not None:
+                    author_name = f"{fore_name.text} {author_name}"
+                article['authors'].append(author_name)
+        
+        # Extract journal
+        journal_elem = article_elem.find('.//Journal/Title')
+        if journal_elem is not None:
+            article['journal'] = journal_elem.text or ''
+        
+        # Extract publication date
+        pub_date = article_elem.find('.//PubDate')
+        if pub_date is not None:
+            year = pub_date.find('.//Year')
+            month = pub_date.find('.//Month')
+            if year is not None:
+                pub_date_str = year.text or ''
+                if month is not None:
+                    pub_date_str += f"-{month.text}"
+                article['publication_date'] = pub_date_str
+        
+        # Extract DOI
+        doi_elems = article_elem.findall('.//ArticleId[@IdType="doi"]')
+        if doi_elems:
+            article['doi'] = doi_elems[0].text or ''
+        
+        # Extract MeSH terms
+        mesh_elems = article_elem.findall('.//MeshHeading/DescriptorName')
+        article['mesh_terms'] = [elem.text for elem in mesh_elems if elem.text]
+        
+        return article
     
-    def _parse_pmc_xml(self, xml_content: str, article_id: str) -> Dict[str, Any]:
-        """Parse PMC XML full text"""
+    def _parse_pmc_article(self, article_elem: ET.Element, article_id: str) -> Dict[str, Any]:
+        """Parse one PMC (JATS) article element"""
         
-        try:
-            root = ET.fromstring(xml_content)
-            
-            article = {
-                'pmc_id': article_id,
-                'title': '',
-                'abstract': '',
-                'full_text': '',
-                'sections': [],
-                'references': [],
-                'figures': [],
-                'tables': []
-            }
-            
-            # Extract title
-            title_elem = root.find('.//article-title')
-            if title_elem is not None:
-                article['title'] = ''.join(title_elem.itertext()).strip()
+        article = {
+            'pmc_id': article_id,
+            'title': '',
+            'abstract': '',
+            'full_text': '',
+            'sections': [],
+            'references': [],
+            'figures': [],
+            'tables': []
+        }
+        
+        # Extract title
+        title_elem = article_elem.find('.//article-title')
+        if title_elem is not None:
+            article['title'] = ''.join(title_elem.itertext()).strip()
+        
+        # Extract abstract
+        abstract_elem = article_elem.find('.//abstract')
+        if abstract_elem is not None:
+            article['abstract'] = ''.join(abstract_elem.itertext()).strip()
+        
+        # Extract full text sections; each text node belongs to its innermost section only
+        body_elem = article_elem.find('.//body')
+        if body_elem is not None:
+            sections = []
+            for sec_elem in body_elem.iter('sec'):
+                title_elem = sec_elem.find('title')
+                section_title = ''.join(title_elem.itertext()).strip() if title_elem is not None else 'Untitled'
+                
+                sections.append({
+                    'title': section_title,
+                    'content': _own_section_text(sec_elem)
+                })
             
-            # Extract abstract
-            abstract_elem = root.find('.//abstract')
-            if abstract_elem is not None:
-                article['abstract'] = ''.join(abstract_elem.itertext()).strip()
+            article['sections'] = sections
+            article['full_text'] = '\n\n'.join([sec['content'] for sec in sections if sec['content']])
+        
+        # Extract references
+        references = []
+        for ref_elem in article_elem.iter('ref'):
+            ref_text = ''.join(ref_elem.itertext()).strip()
+            if ref_text:
+                references.append(ref_text)
+                if len(references) >= 50:  # Limit references
+                    break
+        article['references'] = references
+        
+        return article
+
+XML_CHUNK_SIZE = 64 * 1024
+
+async def iter_xml_elements(chunks: AsyncIterable[bytes], tag: str) -> AsyncIterator[ET.Element]:
+    """Incrementally parse streamed XML, yielding each complete `tag` element and then discarding it
+    (a truncated or malformed body raises ET.ParseError instead of ending the stream early)"""
+    
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    open_elements: List[ET.Element] = []
+    
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                open_elements.append(elem)
+                continue
             
-            # Extract full text sections
-            body_elem = root.find('.//body')
-            if body_elem is not None:
-                sections = []
-                for sec_elem in body_elem.findall('.//sec'):
-                    title_elem = sec_elem.find('.//title')
-                    section_title = ''.join(title_elem.itertext()).strip() if title_elem is not None else 'Untitled'
-                    section_text = ''.join(sec_elem.itertext()).strip()
-                    
-                    sections.append({
-                        'title': section_title,
-                        'content': section_text
-                    })
-                
-                article['sections'] = sections
-                article['full_text'] = '\n\n'.join([sec['content'] for sec in sections])
+            open_elements.pop()
+            if elem.tag != tag:
+                continue
             
-            # Extract references
-            ref_elems = root.findall('.//ref')
-            references = []
-            for ref_elem in ref_elems:
-                ref_text = ''.join(ref_elem.itertext()).strip()
-                if ref_text:
-                    references.append(ref_text)
-            article['references'] = references[:50]  # Limit references
+            yield elem
             
-            return article
-        
-        except Exception as e:
-            logger.warning(f"Error parsing PMC XML: {e}")
-            return None
+            # Detach the finished element so the partial tree never grows past one element
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+    parser.close()
 
+def _pmc_article_id(article_elem: ET.Element) -> str:
+    """Numeric PMC ID of an article element (as returned by esearch)"""
+    
+    for id_elem in article_elem.iter('article-id'):
+        if id_elem.get('pub-id-type') in ('pmc', 'pmcid') and id_elem.text:
+            return id_elem.text.strip().upper().replace('PMC', '')
+    return ''
 
-class NCBIRateManager:
-    """Manage NCBI API rate limits"""
+def _own_section_text(sec_elem: ET.Element) -> str:
+    """Text of a section excluding its nested subsections (which are reported on their own)"""
     
-    def __init__(self):
-        self.last_request = 0
-        self.requests_per_second = 3  # NCBI limit without API key
-        self.requests_made = 0
+    parts = []
+    
+    def collect(elem: ET.Element):
+        if elem.text:
+            parts.append(elem.text)
+        for child in elem:
+            if child.tag != 'sec':
+                collect(child)
+            if child.tail:
+                parts.append(child.tail)
+    
+    collect(sec_elem)
+    return ''.join(parts).strip()
+
+
+class NCBIRateGovernor:
+    """Async-safe E-utilities rate governor shared by every NCBI request in the process"""
+    
+    BASE_RATE = 3.0      # NCBI limit without an API key (requests/second)
+    API_KEY_RATE = 10.0  # NCBI limit with an API key
+    
+    def __init__(self, api_key: Optional[str] = None, max_backoff: float = 16.0, metrics_window: float = 10.0):
+        self.api_key = api_key
+        self.max_backoff = max_backoff
+        self.metrics_window = metrics_window
+        
+        self._backoff = 1.0
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._recent_permits = deque()
+        self._in_flight = 0
         
-    async def wait_for_rate_limit(self):
-        """Wait if necessary to respect rate limits"""
+        self.requests_made = 0
+        self.throttled_responses = 0
+        self.total_wait = 0.0
+    
+    @property
+    def limit_per_second(self) -> float:
+        return self.API_KEY_RATE if self.api_key else self.BASE_RATE
+    
+    @property
+    def requests_per_second(self) -> float:
+        """Currently granted rate: the legal limit reduced by any 429 backoff"""
+        return self.limit_per_second / self._backoff
+    
+    def set_api_key(self, api_key: Optional[str]):
+        """Switch the rate tier (3 req/s without a key, 10 req/s with one)"""
+        self.api_key = api_key
+    
+    async def acquire(self) -> float:
+        """Wait for the next request slot; returns seconds waited"""
         
-        current_time = time.time()
-        time_since_last = current_time - self.last_request
+        # The slot is reserved before any await, so concurrent callers always get distinct slots
+        now = time.monotonic()
+        slot = max(now, self._next_slot, self._paused_until)
+        self._next_slot = slot + 1.0 / self.requests_per_second
         
-        min_interval = 1.0 / self.requests_per_second
+        self.requests_made += 1
+        self._prune_permits(now)
+        self._recent_permits.append(slot)
         
-        if time_since_last < min_interval:
-            wait_time = min_interval - time_since_last
+        wait_time = slot - now
+        self.total_wait += wait_time
+        if wait_time > 0:
             await asyncio.sleep(wait_time)
+        return wait_time
+    
+    def _prune_permits(self, now: float):
+        # Only permits inside the metrics window are kept; older ones are dropped as new ones arrive
+        while self._recent_permits and self._recent_permits[0] < now - self.metrics_window:
+            self._recent_permits.popleft()
+    
+    @asynccontextmanager
+    async def request(self):
+        """Hold a permit for the duration of one NCBI request"""
         
-        self.last_request = time.time()
-        self.requests_made += 1
+        await self.acquire()
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+    
+    def record_response(self, status: int, retry_after: Optional[str] = None):
+        """Feed a response status back: 429 halves the rate and pauses, successes recover it"""
+        
+        if status == 429:
+            self.throttled_responses += 1
+            self._backoff = min(self.max_backoff, self._backoff * 2.0)
+            try:
+                pause = float(retry_after) if retry_after else self._backoff
+            except ValueError:
+                pause = self._backoff
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            logger.warning(f"⚠️ NCBI throttled (429) - pausing {pause:.1f}s, rate now {self.requests_per_second:.2f} req/s")
+        elif status < 400 and self._backoff > 1.0:
+            self._backoff = max(1.0, self._backoff * 0.9)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Live utilization metrics"""
+        
+        now = time.monotonic()
+        self._prune_permits(now)
+        observed = sum(1 for permit in self._recent_permits if permit <= now) / self.metrics_window
+        
+        return {
+            'api_key_tier': bool(self.api_key),
+            'limit_per_second': self.limit_per_second,
+            'granted_per_second': self.requests_per_second,
+            'observed_per_second': observed,
+            'utilization': observed / self.limit_per_second,
+            'queued_requests': sum(1 for permit in self._recent_permits if permit > now),
+            'in_flight': self._in_flight,
+            'backoff_factor': self._backoff,
+            'requests_made': self.requests_made,
+            'throttled_429': self.throttled_responses,
+            'avg_wait_ms': self.total_wait / self.requests_made * 1000 if self.requests_made else 0.0
+        }
+
+_ncbi_rate_governor: Optional[NCBIRateGovernor] = None
+
+def get_ncbi_rate_governor() -> NCBIRateGovernor:
+    """Get the process-wide NCBI rate governor (API key from NCBI_API_KEY)"""
+    
+    global _ncbi_rate_governor
+    if _ncbi_rate_governor is None:
+        _ncbi_rate_governor = NCBIRateGovernor(api_key=os.environ.get('NCBI_API_KEY') or None)
+    return _ncbi_rate_governor
 
 
 class MedicalQueryGenerator:
@@ -1103,4 +1205,7 @@ class CitationParser:
         return citation
 
 # Export main class
-__all__ = ['NCBIAdvancedScraper']
\ No newline at end of file
+__all__ = [
+    'NCBIAdvancedScraper', 'EUtilsAdvancedClient', 'NCBIRateGovernor',
+    'get_ncbi_rate_governor', 'iter_xml_elements'
+]
\ No newline at end of file
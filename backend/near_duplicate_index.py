@@ -0,0 +1,185 @@
+"""
+Near-Duplicate Detection Index
+MinHash signatures with a locality-sensitive hashing band index for constant-time candidate lookup
+"""
+
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Universal hashing parameters (same construction as classic MinHash implementations)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Precompiled normalization patterns - pages are compared on visible text, not markup
+_SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style|noscript)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_WORD_PATTERN = re.compile(r'\w+')
+
+# Rough per-document bookkeeping cost of one band bucket entry (dict slot + int key + value)
+_BUCKET_ENTRY_BYTES = 120
+_SLOT_KEY_BYTES = 100
+
+class MinHashLSHIndex:
+    """MinHash + LSH band index for near-duplicate content detection"""
+
+    def __init__(self, num_bands: int = 16, rows_per_band: int = 8, shingle_size: int = 5,
+                 similarity_threshold: float = 0.85, max_memory_mb: float = 256.0,
+                 max_documents: Optional[int] = None, seed: int = 1):
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        self.num_perm = num_bands * rows_per_band
+        self.shingle_size = shingle_size
+        self.similarity_threshold = similarity_threshold
+
+        # Random permutations for universal hashing
+        rng = np.random.RandomState(seed)
+        self._perm_a = rng.randint(1, _MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)
+        self._perm_b = rng.randint(0, _MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)
+
+        # Capacity is derived from the memory cap unless given explicitly
+        self.capacity = max_documents or self._capacity_for_memory(max_memory_mb)
+
+        # Signatures live in a fixed ring buffer; the oldest documents are evicted first
+        self._signatures = np.zeros((self.capacity, self.num_perm), dtype=np.uint32)
+        self._slot_keys: List[Optional[str]] = [None] * self.capacity
+        self._next_slot = 0
+        self._size = 0
+
+        # One hash table per band: band key -> slot or list of slots
+        self._bands: List[Dict[int, Union[int, List[int]]]] = [{} for _ in range(num_bands)]
+
+        self.evictions = 0
+
+    def _capacity_for_memory(self, max_memory_mb: float) -> int:
+        """Derive how many signatures fit in the configured memory cap"""
+
+        per_document = (self.num_perm * 4) + (self.num_bands * _BUCKET_ENTRY_BYTES) + _SLOT_KEY_BYTES
+        return max(1, int(max_memory_mb * 1024 * 1024) // per_document)
+
+    def compute_signature(self, content: str) -> Optional[np.ndarray]:
+        """Compute MinHash signature of the visible text in a page"""
+
+        if not content:
+            return None
+
+        text = _TAG_PATTERN.sub(' ', _SCRIPT_STYLE_PATTERN.sub(' ', content))
+        tokens = _WORD_PATTERN.findall(text.lower())
+
+        if not tokens:
+            return None
+
+        k = self.shingle_size
+        if len(tokens) <= k:
+            shingles = [' '.join(tokens)]
+        else:
+            shingles = (' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1))
+
+        shingle_hashes = np.unique(np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64
+        ))
+
+        # (a * x + b) mod p, truncated to 32 bits, minimised over all shingles
+        permuted = (np.outer(shingle_hashes, self._perm_a) + self._perm_b) % _MERSENNE_PRIME
+        permuted &= _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        """Hash each band of a signature into a bucket key"""
+
+        bands = signature.reshape(self.num_bands, self.rows_per_band)
+        return [hash(band.tobytes()) for band in bands]
+
+    def query(self, signature: Optional[np.ndarray]) -> Optional[Tuple[str, float]]:
+        """Return (key, estimated Jaccard) of the most similar stored document above threshold"""
+
+        if signature is None or self._size == 0:
+            return None
+
+        candidates = set()
+        for band_table, band_key in zip(self._bands, self._band_keys(signature)):
+            bucket = band_table.get(band_key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, int):
+                candidates.add(bucket)
+            else:
+                candidates.update(bucket)
+
+        if not candidates:
+            return None
+
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarities = (self._signatures[slots] == signature).mean(axis=1)
+        best = int(similarities.argmax())
+
+        if similarities[best] >= self.similarity_threshold:
+            return self._slot_keys[slots[best]], float(similarities[best])
+        return None
+
+    def insert(self, signature: Optional[np.ndarray], key: str):
+        """Store a signature, evicting the oldest document once capacity is reached"""
+
+        if signature is None:
+            return
+
+        slot = self._next_slot
+        if self._size == self.capacity:
+            self._evict(slot)
+        else:
+            self._size += 1
+
+        self._signatures[slot] = signature
+        self._slot_keys[slot] = key
+
+        for band_table, band_key in zip(self._bands, self._band_keys(signature)):
+            bucket = band_table.get(band_key)
+            if bucket is None:
+                band_table[band_key] = slot
+            elif isinstance(bucket, int):
+                band_table[band_key] = [bucket, slot]
+            else:
+                bucket.append(slot)
+
+        self._next_slot = (slot + 1) % self.capacity
+
+    def _evict(self, slot: int):
+        """Remove the document held in a ring-buffer slot from every band"""
+
+        for band_table, band_key in zip(self._bands, self._band_keys(self._signatures[slot])):
+            bucket = band_table.get(band_key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, int):
+                if bucket == slot:
+                    del band_table[band_key]
+            else:
+                if slot in bucket:
+                    bucket.remove(slot)
+                if len(bucket) == 1:
+                    band_table[band_key] = bucket[0]
+
+        self._slot_keys[slot] = None
+        self.evictions += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get index utilisation statistics"""
+
+        return {
+            'documents_indexed': self._size,
+            'capacity': self.capacity,
+            'evictions': self.evictions,
+            'num_perm': self.num_perm,
+            'bands': self.num_bands,
+            'rows_per_band': self.rows_per_band,
+            'signature_memory_mb': self._signatures.nbytes / (1024 * 1024)
+        }
+
+# Export main class
+__all__ = ['MinHashLSHIndex']
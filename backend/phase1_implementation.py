@@ -5,7 +5,7 @@ World-Class Medical Scraper - Super-Intelligent Architecture Foundation
 
 import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+from typing import Dict, Optional, Any
 from datetime import datetime
 import json
 import os
@@ -13,6 +13,9 @@ import os
 from ai_scraper_core import ScrapingTier
 from master_scraper_controller import WorldClassMedicalScraper
 from super_parallel_engine import SuperParallelScrapingEngine
+from session_pool import get_session_pool
+from result_pipeline import ResultStatistics
+from result_archive import ResultArchiveWriter, DEFAULT_ARCHIVE_PATH
 
 # Configure advanced logging
 logging.basicConfig(
@@ -57,10 +60,14 @@ class Phase1MedicalScraperSystem:
             'max_concurrent_workers': 1000,
             'quality_threshold': 0.6,
             'enable_ai_optimization': True,
-            'enable_performance_monitoring': True
+            'enable_performance_monitoring': True,
+            'archive_dir': DEFAULT_ARCHIVE_PATH,
+            # Worker processes for the distributed crawl mode (0 runs every tier in this process)
+            'crawl_worker_processes': int(os.environ.get('SCRAPER_CRAWL_WORKERS', '0'))
         }
         
         # Results storage
+        self.result_archive: Optional[ResultArchiveWriter] = None
         self.extraction_results = []
         self.performance_metrics = {}
         self.system_logs = []
@@ -136,11 +143,22 @@ class Phase1MedicalScraperSystem:
         
         logger.info(f"🎯 Processing {len(phase1_tier_scrapers)} tiers with super-parallel engine")
         
+        # Stream every result into the columnar archive; only statistics and a sample stay in memory
+        self.result_archive = ResultArchiveWriter(self.phase1_config['archive_dir'])
+        self.super_parallel_engine.result_pipeline.add_sink(self.result_archive)
+        
         # Launch super-parallel extraction
-        results = await self.super_parallel_engine.launch_super_parallel_extraction(
-            tier_scrapers=phase1_tier_scrapers,
-            target_documents=self.phase1_config['target_documents']
-        )
+        if self.phase1_config['crawl_worker_processes']:
+            results = await self.super_parallel_engine.launch_distributed_extraction(
+                tier_scrapers=phase1_tier_scrapers,
+                target_documents=self.phase1_config['target_documents'],
+                num_workers=self.phase1_config['crawl_worker_processes']
+            )
+        else:
+            results = await self.super_parallel_engine.launch_super_parallel_extraction(
+                tier_scrapers=phase1_tier_scrapers,
+                target_documents=self.phase1_config['target_documents']
+            )
         
         logger.info("✅ Super-parallel scraping operation completed!")
         return results
@@ -155,12 +173,13 @@ class Phase1MedicalScraperSystem:
         tier_results = scraping_results.get('tier_results', {})
         system_performance = scraping_results.get('system_performance', {})
         extracted_data = scraping_results.get('extracted_data', [])
+        statistics = scraping_results.get('result_statistics') or ResultStatistics()
         
         # Calculate quality distribution
-        quality_distribution = await self._analyze_quality_distribution(extracted_data)
+        quality_distribution = await self._analyze_quality_distribution(statistics)
         
         # Calculate content type distribution
-        content_distribution = await self._analyze_content_distribution(extracted_data)
+        content_distribution = await self._analyze_content_distribution(statistics)
         
         # Calculate tier performance comparison
         tier_performance = await self._analyze_tier_performance(tier_results)
@@ -176,79 +195,52 @@ class Phase1MedicalScraperSystem:
             'content_analysis': content_distribution,
             'tier_performance_analysis': tier_performance,
             'efficiency_metrics': efficiency_metrics,
-            'extracted_documents': len(extracted_data),
+            'extracted_documents': statistics.processed,
             'raw_data': extracted_data[:1000]  # Store sample of raw data
         }
         
         logger.info("📊 Results processing complete!")
         return processed_results
     
-    async def _analyze_quality_distribution(self, extracted_data: List[Any]) -> Dict[str, Any]:
+    async def _analyze_quality_distribution(self, statistics: ResultStatistics) -> Dict[str, Any]:
         """Analyze quality distribution of extracted content"""
         
-        if not extracted_data:
+        if not statistics.processed:
             return {'error': 'No data to analyze'}
         
-        quality_scores = []
-        for item in extracted_data:
-            if hasattr(item, 'quality_score') and item.quality_score > 0:
-                quality_scores.append(item.quality_score)
-        
-        if not quality_scores:
+        scored = statistics.scored_count
+        if not scored:
             return {'error': 'No quality scores available'}
         
-        high_quality = len([s for s in quality_scores if s >= 0.8])
-        medium_quality = len([s for s in quality_scores if 0.6 <= s < 0.8])
-        low_quality = len([s for s in quality_scores if 0.3 <= s < 0.6])
-        very_low_quality = len([s for s in quality_scores if s < 0.3])
+        high_quality = statistics.count_quality_between(0.8)
+        medium_quality = statistics.count_quality_between(0.6, 0.8)
+        low_quality = statistics.count_quality_between(0.3, 0.6)
+        very_low_quality = statistics.count_quality_between(0.0, 0.3)
         
         return {
-            'total_scored_documents': len(quality_scores),
-            'average_quality_score': sum(quality_scores) / len(quality_scores),
+            'total_scored_documents': scored,
+            'average_quality_score': statistics.average_quality,
             'quality_distribution': {
-                'high_quality': {'count': high_quality, 'percentage': (high_quality / len(quality_scores)) * 100},
-                'medium_quality': {'count': medium_quality, 'percentage': (medium_quality / len(quality_scores)) * 100},
-                'low_quality': {'count': low_quality, 'percentage': (low_quality / len(quality_scores)) * 100},
-                'very_low_quality': {'count': very_low_quality, 'percentage': (very_low_quality / len(quality_scores)) * 100}
+                'high_quality': {'count': high_quality, 'percentage': (high_quality / scored) * 100},
+                'medium_quality': {'count': medium_quality, 'percentage': (medium_quality / scored) * 100},
+                'low_quality': {'count': low_quality, 'percentage': (low_quality / scored) * 100},
+                'very_low_quality': {'count': very_low_quality, 'percentage': (very_low_quality / scored) * 100}
             }
         }
     
-    async def _analyze_content_distribution(self, extracted_data: List[Any]) -> Dict[str, Any]:
+    async def _analyze_content_distribution(self, statistics: ResultStatistics) -> Dict[str, Any]:
         """Analyze content type and source distribution"""
         
-        if not extracted_data:
+        if not statistics.processed:
             return {'error': 'No data to analyze'}
         
-        source_distribution = {}
-        content_size_distribution = {'small': 0, 'medium': 0, 'large': 0, 'very_large': 0}
-        
-        total_content_size = 0
-        
-        for item in extracted_data:
-            # Analyze source distribution
-            if hasattr(item, 'url'):
-                domain = item.url.split('/')[2] if '/' in item.url else 'unknown'
-                source_distribution[domain] = source_distribution.get(domain, 0) + 1
-            
-            # Analyze content size distribution
-            if hasattr(item, 'content_length'):
-                size = item.content_length
-                total_content_size += size
-                
-                if size < 1000:  # < 1KB
-                    content_size_distribution['small'] += 1
-                elif size < 10000:  # < 10KB
-                    content_size_distribution['medium'] += 1
-                elif size < 100000:  # < 100KB
-                    content_size_distribution['large'] += 1
-                else:  # >= 100KB
-                    content_size_distribution['very_large'] += 1
+        total_content_size = statistics.total_content_size
         
         return {
-            'source_distribution': dict(list(source_distribution.items())[:10]),  # Top 10 sources
-            'content_size_distribution': content_size_distribution,
+            'source_distribution': dict(statistics.source_counts.most_common(10)),  # Top 10 sources
+            'content_size_distribution': statistics.content_size_distribution(),
             'total_content_size_mb': total_content_size / (1024 * 1024),
-            'average_document_size_kb': (total_content_size / len(extracted_data)) / 1024 if extracted_data else 0
+            'average_document_size_kb': (total_content_size / statistics.processed) / 1024
         }
     
     async def _analyze_tier_performance(self, tier_results: Dict[str, Any]) -> Dict[str, Any]:
@@ -343,6 +335,10 @@ class Phase1MedicalScraperSystem:
             'content_analysis': processed_results.get('content_analysis', {}),
             'system_performance': processed_results.get('system_performance', {}),
             'efficiency_metrics': processed_results.get('efficiency_metrics', {}),
+            'result_archive': {
+                'path': self.phase1_config['archive_dir'],
+                'records_archived': self.result_archive.records_written if self.result_archive else 0
+            },
             'achievements': await self._calculate_phase1_achievements(processed_results),
             'next_steps': self._get_phase2_recommendations(),
             'technical_details': {
@@ -492,13 +488,15 @@ class Phase1MedicalScraperSystem:
             
             logger.info("🏛️ Executing comprehensive government sources scraping...")
             
-            # Execute comprehensive government scraping
+            # Execute comprehensive government scraping. MedlinePlus, CDC and the FDA web sections resume
+            # from their crawl checkpoints; NCBI E-utilities and OpenFDA API extractions are not
+            # checkpointed and start over (their records are only returned, so skipping pages would lose them)
             government_results = await government_scraper.scrape_complete_tier()
             
-            # Process results
-            total_processed = len(government_results)
-            successful_results = [r for r in government_results if r.success]
-            total_successful = len(successful_results)
+            # Process results from the tier's running statistics
+            statistics = government_scraper.result_pipeline.statistics
+            total_processed = statistics.processed
+            total_successful = statistics.successful
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
             
@@ -520,12 +518,12 @@ class Phase1MedicalScraperSystem:
                     'sources_processed': ['MedlinePlus', 'NCBI', 'CDC', 'FDA']
                 },
                 'government_sources_summary': {
-                    'medlineplus_documents': len([r for r in successful_results if 'medlineplus' in r.url.lower()]),
-                    'ncbi_documents': len([r for r in successful_results if 'ncbi' in r.url.lower()]),
-                    'cdc_documents': len([r for r in successful_results if 'cdc' in r.url.lower()]),
-                    'fda_documents': len([r for r in successful_results if 'fda' in r.url.lower()])
+                    'medlineplus_documents': statistics.count_successful_from('medlineplus'),
+                    'ncbi_documents': statistics.count_successful_from('ncbi'),
+                    'cdc_documents': statistics.count_successful_from('cdc'),
+                    'fda_documents': statistics.count_successful_from('fda')
                 },
-                'extracted_content': successful_results
+                'extracted_content': [r for r in government_results if r.success]
             }
             
             logger.info(f"✅ Phase 2 completed: {total_successful} documents extracted from government sources")
@@ -551,6 +549,9 @@ async def run_phase1_complete():
     except Exception as e:
         logger.error(f"Phase 1 execution failed: {e}")
         raise
+    
+    finally:
+        await get_session_pool().close()
 
 # Export main classes and functions
 __all__ = ['Phase1MedicalScraperSystem', 'run_phase1_complete']
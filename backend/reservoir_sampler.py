@@ -0,0 +1,85 @@
+"""
+Stratified Reservoir Sampler
+Fixed-size uniform samples per stratum from record streams of unknown length (Algorithm L)
+"""
+
+import math
+import random
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+class _Reservoir:
+    """Sample state of one stratum"""
+
+    __slots__ = ('items', 'seen', 'weight', 'next_index')
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.seen = 0
+        self.weight = 1.0
+        self.next_index = 0
+
+class StratifiedReservoirSampler:
+    """Keep a uniform random sample of up to `capacity` items for every stratum of a stream"""
+
+    def __init__(self, capacity: int, stratum_key: Callable[[Any], Hashable], seed: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.stratum_key = stratum_key
+        self._random = random.Random(seed)
+        self._reservoirs: Dict[Hashable, _Reservoir] = {}
+
+    def _skip(self, reservoir: _Reservoir):
+        """Draw the index of the next item that enters a full reservoir (skips need no per-item random draw)"""
+
+        reservoir.weight *= math.exp(math.log(1.0 - self._random.random()) / self.capacity)
+        gap = 0
+        if reservoir.weight < 1.0:
+            gap = math.floor(math.log(1.0 - self._random.random()) / math.log1p(-reservoir.weight))
+        reservoir.next_index += gap + 1
+
+    def add(self, item: Any):
+        """Offer one item to the sample of its stratum"""
+
+        stratum = self.stratum_key(item)
+        reservoir = self._reservoirs.get(stratum)
+        if reservoir is None:
+            reservoir = self._reservoirs[stratum] = _Reservoir()
+
+        index = reservoir.seen
+        reservoir.seen += 1
+
+        if index < self.capacity:
+            reservoir.items.append(item)
+            if index == self.capacity - 1:
+                reservoir.next_index = index
+                self._skip(reservoir)
+        elif index == reservoir.next_index:
+            reservoir.items[self._random.randrange(self.capacity)] = item
+            self._skip(reservoir)
+
+    def extend(self, items: Iterable[Any]):
+        """Offer several items"""
+        for item in items:
+            self.add(item)
+
+    def samples(self) -> Dict[Hashable, List[Any]]:
+        """Current sample of every stratum"""
+        return {stratum: list(reservoir.items) for stratum, reservoir in self._reservoirs.items()}
+
+    def seen_counts(self) -> Dict[Hashable, int]:
+        """Number of items offered per stratum"""
+        return {stratum: reservoir.seen for stratum, reservoir in self._reservoirs.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampler statistics"""
+
+        return {
+            'strata': len(self._reservoirs),
+            'items_seen': sum(reservoir.seen for reservoir in self._reservoirs.values()),
+            'items_sampled': sum(len(reservoir.items) for reservoir in self._reservoirs.values()),
+            'capacity_per_stratum': self.capacity
+        }
+
+# Export main classes
+__all__ = ['StratifiedReservoirSampler']
@@ -0,0 +1,230 @@
+"""
+Columnar Result Archive
+Hive-partitioned Parquet archive of scraping results (tier/source/date) with memory-mapped, filtered reads
+"""
+
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote, urlparse
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from ai_scraper_core import ScrapingResult
+from blob_store import ContentBlobStore, get_shared_blob_store
+
+logger = logging.getLogger(__name__)
+
+# Location of the archive (overridable for multi-crawl deployments)
+DEFAULT_ARCHIVE_PATH = os.environ.get(
+    'SCRAPER_ARCHIVE_PATH',
+    os.path.join('scraper_state', 'result_archive')
+)
+
+RESULT_SCHEMA = pa.schema([
+    ('task_id', pa.string()),
+    ('url', pa.string()),
+    ('success', pa.bool_()),
+    ('content', pa.large_string()),
+    ('extracted_data', pa.large_string()),   # JSON
+    ('metadata', pa.string()),               # JSON
+    ('processing_time', pa.float64()),
+    ('content_length', pa.int64()),
+    ('quality_score', pa.float64()),
+    ('confidence_score', pa.float64()),
+    ('extracted_entities', pa.list_(pa.string())),
+    ('medical_concepts', pa.list_(pa.string())),
+    ('error_details', pa.string()),
+    ('timestamp', pa.timestamp('us')),
+    ('content_digest', pa.uint64())          # Raw page in the content blob store
+])
+
+PARTITION_SCHEMA = pa.schema([('tier', pa.string()), ('source', pa.string()), ('date', pa.string())])
+
+PartitionKey = Tuple[str, str, str]
+
+def _partition_key(result: ScrapingResult, group: Optional[str]) -> PartitionKey:
+    tier = group or result.metadata.get('tier') or 'unknown'
+    source = urlparse(result.url).netloc.lower() or 'unknown'
+    day = (result.timestamp or datetime.utcnow()).strftime('%Y-%m-%d')
+    return str(tier), source, day
+
+def _result_row(result: ScrapingResult) -> Dict[str, Any]:
+    return {
+        'task_id': result.task_id,
+        'url': result.url,
+        'success': result.success,
+        'content': result.content,
+        'extracted_data': json.dumps(result.extracted_data, default=str, ensure_ascii=False),
+        'metadata': json.dumps(result.metadata, default=str, ensure_ascii=False),
+        'processing_time': result.processing_time,
+        'content_length': result.content_length,
+        'quality_score': result.quality_score,
+        'confidence_score': result.confidence_score,
+        'extracted_entities': list(result.extracted_entities),
+        'medical_concepts': list(result.medical_concepts),
+        'error_details': result.error_details,
+        'timestamp': result.timestamp,
+        'content_digest': result.content_digest
+    }
+
+class ResultArchiveWriter:
+    """Result sink appending to the archive: rows are buffered per partition and written as Parquet row groups"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_PATH, rows_per_file: int = 5000,
+                 compression: str = 'zstd', compression_level: int = 6):
+        self.root = root
+        self.rows_per_file = rows_per_file
+        self.compression = compression
+        self.compression_level = compression_level
+
+        os.makedirs(root, exist_ok=True)
+        self._buffers: Dict[PartitionKey, List[Dict[str, Any]]] = defaultdict(list)
+        self._run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+        self._file_sequence = 0
+
+        self.records_written = 0
+        self.files_written = 0
+
+    async def write(self, result: ScrapingResult, group: Optional[str] = None):
+        key = _partition_key(result, group)
+        buffer = self._buffers[key]
+        buffer.append(_result_row(result))
+        if len(buffer) >= self.rows_per_file:
+            self._flush_partition(key)
+
+    def _flush_partition(self, key: PartitionKey):
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+
+        directory = os.path.join(self.root, *(f"{name}={quote(value, safe='')}"
+                                              for name, value in zip(PARTITION_SCHEMA.names, key)))
+        os.makedirs(directory, exist_ok=True)
+
+        self._file_sequence += 1
+        filename = f"part-{self._run_id}-{self._file_sequence:05d}.parquet"
+        table = pa.Table.from_pylist(rows, schema=RESULT_SCHEMA)
+
+        # Written under a hidden name (skipped by dataset discovery) so readers never see a half-written file
+        temporary_path = os.path.join(directory, f".{filename}.tmp")
+        pq.write_table(table, temporary_path, compression=self.compression,
+                       compression_level=self.compression_level, use_dictionary=['url', 'task_id'])
+        os.replace(temporary_path, os.path.join(directory, filename))
+
+        self.records_written += len(rows)
+        self.files_written += 1
+
+    def flush(self):
+        """Write every buffered partition"""
+        for key in list(self._buffers):
+            self._flush_partition(key)
+
+    async def close(self):
+        self.flush()
+        logger.info(f"🗄️ {self.records_written:,} results archived to {self.root} ({self.files_written} files)")
+
+class ResultArchive:
+    """Reader over the archive; filters prune partitions and row groups before any data is loaded"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_PATH, blob_store: Optional[ContentBlobStore] = None):
+        self.root = root
+        self.blob_store = blob_store
+        self._dataset: Optional[ds.Dataset] = None
+
+    @property
+    def dataset(self) -> ds.Dataset:
+        # Opened lazily and memory-mapped: column buffers are paged in from disk instead of copied
+        if self._dataset is None:
+            self._dataset = ds.dataset(
+                self.root,
+                schema=pa.unify_schemas([RESULT_SCHEMA, PARTITION_SCHEMA]),
+                format='parquet',
+                partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+                filesystem=fs.LocalFileSystem(use_mmap=True)
+            )
+        return self._dataset
+
+    def refresh(self):
+        """Pick up files written since the archive was opened"""
+        self._dataset = None
+
+    def build_filter(self, min_quality: Optional[float] = None, max_quality: Optional[float] = None,
+                     sources: Optional[Iterable[str]] = None, tiers: Optional[Iterable[str]] = None,
+                     since: Optional[Union[date, str]] = None, until: Optional[Union[date, str]] = None,
+                     successful_only: bool = False) -> Optional[pc.Expression]:
+        """Combine the given conditions into one dataset filter expression"""
+
+        conditions = []
+        if min_quality is not None:
+            conditions.append(pc.field('quality_score') >= min_quality)
+        if max_quality is not None:
+            conditions.append(pc.field('quality_score') < max_quality)
+        if sources is not None:
+            conditions.append(pc.field('source').isin([source.lower() for source in sources]))
+        if tiers is not None:
+            conditions.append(pc.field('tier').isin(list(tiers)))
+        if since is not None:
+            conditions.append(pc.field('date') >= str(since)[:10])
+        if until is not None:
+            conditions.append(pc.field('date') <= str(until)[:10])
+        if successful_only:
+            conditions.append(pc.field('success'))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def scan(self, columns: Optional[List[str]] = None, batch_size: int = 10000,
+             **filters: Any) -> Iterator[pa.RecordBatch]:
+        """Stream matching record batches (only the requested columns are read)"""
+
+        scanner = self.dataset.scanner(columns=columns, filter=self.build_filter(**filters), batch_size=batch_size)
+        yield from scanner.to_batches()
+
+    def to_table(self, columns: Optional[List[str]] = None, **filters: Any) -> pa.Table:
+        """Load matching rows as one Arrow table"""
+        return self.dataset.to_table(columns=columns, filter=self.build_filter(**filters))
+
+    def count(self, **filters: Any) -> int:
+        """Count matching rows (answered from Parquet metadata where the filter allows)"""
+        return self.dataset.count_rows(filter=self.build_filter(**filters))
+
+    def iter_results(self, include_content: bool = True, **filters: Any) -> Iterator[ScrapingResult]:
+        """Rebuild ScrapingResult objects for re-analysis, re-scoring or question generation
+        (raw pages stored only by digest are loaded from the blob store)"""
+
+        columns = [name for name in RESULT_SCHEMA.names if include_content or name != 'content']
+        blob_store = (self.blob_store or get_shared_blob_store()) if include_content else None
+        for batch in self.scan(columns=columns, **filters):
+            for row in batch.to_pylist():
+                if blob_store is not None and row['content'] is None and row['content_digest'] is not None:
+                    row['content'] = blob_store.get(row['content_digest'])
+                row['extracted_data'] = json.loads(row['extracted_data'] or '{}')
+                row['metadata'] = json.loads(row['metadata'] or '{}')
+                row['extracted_entities'] = row['extracted_entities'] or []
+                row['medical_concepts'] = row['medical_concepts'] or []
+                yield ScrapingResult(**row)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get archive statistics"""
+
+        files = self.dataset.files
+        return {
+            'root': self.root,
+            'files': len(files),
+            'records': self.dataset.count_rows(),
+            'size_mb': sum(os.path.getsize(path) for path in files) / (1024 * 1024)
+        }
+
+# Export main classes
+__all__ = ['ResultArchiveWriter', 'ResultArchive', 'RESULT_SCHEMA', 'DEFAULT_ARCHIVE_PATH']
@@ -0,0 +1,379 @@
+"""
+Streaming Result Pipeline
+Running statistics, bounded sampling and pluggable sinks for scraping results as they complete
+"""
+
+import asyncio
+import json
+import logging
+import os
+from bisect import bisect_right
+from collections import Counter, OrderedDict, defaultdict, deque
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlparse
+
+from ai_scraper_core import ScrapingResult
+
+logger = logging.getLogger(__name__)
+
+# Histogram edges cover every quality / size threshold used by the scraper summaries
+QUALITY_BUCKET_EDGES = (0.3, 0.5, 0.6, 0.8)
+CONTENT_SIZE_EDGES = (1000, 10000, 100000)
+CONTENT_SIZE_LABELS = ('small', 'medium', 'large', 'very_large')
+
+class ResultStatistics:
+    """Running counters and histograms over a stream of scraping results"""
+
+    def __init__(self):
+        self.processed = 0
+        self.successful = 0
+        self.total_content_size = 0
+        self.successful_content_size = 0
+        self.successful_processing_time = 0.0
+        self.successful_quality_total = 0.0
+        self.scored_count = 0
+        self.scored_quality_total = 0.0
+        self.quality_histogram = [0] * (len(QUALITY_BUCKET_EDGES) + 1)
+        self.content_size_histogram = [0] * len(CONTENT_SIZE_LABELS)
+        self.source_counts = Counter()
+        self.successful_source_counts = Counter()
+
+    @property
+    def failed(self) -> int:
+        return self.processed - self.successful
+
+    def update(self, result: ScrapingResult):
+        """Fold one result into the running statistics"""
+
+        self.processed += 1
+        self.total_content_size += result.content_length
+        self.content_size_histogram[bisect_right(CONTENT_SIZE_EDGES, result.content_length)] += 1
+
+        source = urlparse(result.url).netloc.lower() or 'unknown'
+        self.source_counts[source] += 1
+
+        if result.success:
+            self.successful += 1
+            self.successful_content_size += result.content_length
+            self.successful_processing_time += result.processing_time
+            self.successful_quality_total += result.quality_score
+            self.successful_source_counts[source] += 1
+
+            if result.quality_score > 0:
+                self.scored_count += 1
+                self.scored_quality_total += result.quality_score
+                self.quality_histogram[bisect_right(QUALITY_BUCKET_EDGES, result.quality_score)] += 1
+
+    def merge(self, other: 'ResultStatistics'):
+        """Add another statistics object into this one"""
+
+        self.processed += other.processed
+        self.successful += other.successful
+        self.total_content_size += other.total_content_size
+        self.successful_content_size += other.successful_content_size
+        self.successful_processing_time += other.successful_processing_time
+        self.successful_quality_total += other.successful_quality_total
+        self.scored_count += other.scored_count
+        self.scored_quality_total += other.scored_quality_total
+        self.quality_histogram = [a + b for a, b in zip(self.quality_histogram, other.quality_histogram)]
+        self.content_size_histogram = [a + b for a, b in zip(self.content_size_histogram, other.content_size_histogram)]
+        self.source_counts.update(other.source_counts)
+        self.successful_source_counts.update(other.successful_source_counts)
+
+    def count_quality_between(self, low: float = 0.0, high: Optional[float] = None) -> int:
+        """Count scored successful results with low <= quality < high (bounds must be bucket edges)"""
+
+        start = 0 if low <= 0 else QUALITY_BUCKET_EDGES.index(low) + 1
+        end = len(self.quality_histogram) if high is None else QUALITY_BUCKET_EDGES.index(high) + 1
+        return sum(self.quality_histogram[start:end])
+
+    def count_successful_from(self, source_fragment: str) -> int:
+        """Count successful results whose host contains a fragment"""
+
+        return sum(count for source, count in self.successful_source_counts.items() if source_fragment in source)
+
+    @property
+    def average_quality(self) -> float:
+        """Mean quality over scored successful results"""
+        return self.scored_quality_total / self.scored_count if self.scored_count else 0.0
+
+    @property
+    def average_successful_quality(self) -> float:
+        """Mean quality over all successful results"""
+        return self.successful_quality_total / max(self.successful, 1)
+
+    @property
+    def average_processing_time(self) -> float:
+        """Mean processing time over successful results"""
+        return self.successful_processing_time / max(self.successful, 1)
+
+    def content_size_distribution(self) -> Dict[str, int]:
+        """Content size histogram keyed by size label"""
+        return dict(zip(CONTENT_SIZE_LABELS, self.content_size_histogram))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable snapshot of the statistics"""
+
+        return {
+            'processed': self.processed,
+            'successful': self.successful,
+            'failed': self.failed,
+            'success_rate': self.successful / self.processed if self.processed else 0,
+            'total_content_size_mb': self.total_content_size / (1024 * 1024),
+            'average_quality': self.average_quality,
+            'average_processing_time': self.average_processing_time,
+            'quality_histogram': dict(zip(
+                ['<0.3', '0.3-0.5', '0.5-0.6', '0.6-0.8', '>=0.8'], self.quality_histogram
+            )),
+            'content_size_distribution': self.content_size_distribution(),
+            'top_sources': dict(self.source_counts.most_common(10))
+        }
+
+def result_to_record(result: ScrapingResult, include_content: bool = True) -> Dict[str, Any]:
+    """Convert a result into a JSON/BSON-friendly record"""
+
+    record = result.to_dict()
+    record['timestamp'] = result.timestamp.isoformat()
+    if result.content_digest is not None:
+        record['content_digest'] = f"{result.content_digest:016x}"  # Unsigned 64-bit overflows BSON integers
+    if not include_content:
+        record.pop('content', None)
+    return record
+
+def result_from_record(record: Dict[str, Any]) -> ScrapingResult:
+    """Rebuild a result from a record made by result_to_record"""
+
+    fields = {name: record[name] for name in ScrapingResult.FIELDS if name in record}
+    if fields.get('timestamp'):
+        fields['timestamp'] = datetime.fromisoformat(fields['timestamp'])
+    if fields.get('content_digest') is not None:
+        fields['content_digest'] = int(fields['content_digest'], 16)
+    return ScrapingResult(**fields)
+
+class JSONLResultSink:
+    """Append results to a JSON Lines file"""
+
+    def __init__(self, path: str, include_content: bool = True):
+        self.path = path
+        self.include_content = include_content
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, 'a', encoding='utf-8')
+        self.records_written = 0
+
+    async def write(self, result: ScrapingResult, group: Optional[str] = None):
+        record = result_to_record(result, self.include_content)
+        if group:
+            record['group'] = group
+        self._file.write(json.dumps(record, default=str, ensure_ascii=False) + '\n')
+        self.records_written += 1
+
+    async def close(self):
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"📄 {self.records_written:,} results written to {self.path}")
+
+class MongoResultSink:
+    """Insert results into a Motor collection in batches"""
+
+    def __init__(self, collection: Any, batch_size: int = 500, include_content: bool = True):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.include_content = include_content
+        self._buffer: List[Dict[str, Any]] = []
+        self.records_written = 0
+
+    async def write(self, result: ScrapingResult, group: Optional[str] = None):
+        record = result_to_record(result, self.include_content)
+        if group:
+            record['group'] = group
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            await self._flush()
+
+    async def _flush(self):
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            await self.collection.insert_many(batch, ordered=False)
+            self.records_written += len(batch)
+
+    async def close(self):
+        await self._flush()
+
+class ResultPipeline:
+    """Stream results through running statistics into sinks, keeping only a bounded sample in memory"""
+
+    def __init__(self, sinks: Optional[List[Any]] = None, sample_size: int = 1000,
+                 successful_samples_only: bool = False):
+        self.sinks = list(sinks or [])
+        self.sample_size = sample_size
+        self.successful_samples_only = successful_samples_only
+
+        self.statistics = ResultStatistics()
+        self.group_statistics: Dict[str, ResultStatistics] = defaultdict(ResultStatistics)
+        self.samples: List[ScrapingResult] = []
+
+    def add_sink(self, sink: Any):
+        """Attach a sink (anything with async write/close, including another pipeline)"""
+        self.sinks.append(sink)
+
+    async def process(self, result: ScrapingResult, group: Optional[str] = None):
+        """Account for a completed result and hand it to every sink"""
+
+        self.statistics.update(result)
+        if group:
+            self.group_statistics[group].update(result)
+
+        for sink in self.sinks:
+            await sink.write(result, group)
+
+        if len(self.samples) < self.sample_size and (result.success or not self.successful_samples_only):
+            # Raw HTML has already been handed to the sinks; samples keep only extracted data
+            self.samples.append(result.replace(content=None) if result.content is not None else result)
+
+    async def process_batch(self, results: Iterable[Any], group: Optional[str] = None) -> int:
+        """Process a gathered batch, skipping exceptions; returns the number of results processed"""
+
+        processed = 0
+        for result in results:
+            if isinstance(result, ScrapingResult):
+                await self.process(result, group)
+                processed += 1
+            elif isinstance(result, Exception):
+                logger.warning(f"Scraping error: {result}")
+        return processed
+
+    async def consume(self, results: AsyncIterator[ScrapingResult], group: Optional[str] = None) -> ResultStatistics:
+        """Drain an async stream of results through the pipeline"""
+
+        async for result in results:
+            await self.process(result, group)
+        return self.statistics
+
+    async def write(self, result: ScrapingResult, group: Optional[str] = None):
+        """Sink interface - lets a parent pipeline subscribe to a child pipeline"""
+        await self.process(result, group)
+
+    async def close(self):
+        """Close every attached sink"""
+
+        for sink in self.sinks:
+            await sink.close()
+
+async def iter_completed(aws: Iterable[Awaitable[Any]]) -> AsyncIterator[Any]:
+    """Yield awaitable results in completion order; failures are logged and skipped"""
+
+    for future in asyncio.as_completed(list(aws)):
+        try:
+            yield await future
+        except Exception as e:
+            logger.warning(f"Scraping error: {e}")
+
+def interleave_by_host(urls: Iterable[str]) -> List[str]:
+    """Order URLs round-robin by host so neighbouring dispatches hit different domains"""
+
+    host_queues: Dict[str, deque] = OrderedDict()
+    for url in urls:
+        host_queues.setdefault(urlparse(url).netloc.lower(), deque()).append(url)
+
+    interleaved = []
+    while host_queues:
+        for host in list(host_queues):
+            queue = host_queues[host]
+            interleaved.append(queue.popleft())
+            if not queue:
+                del host_queues[host]
+    return interleaved
+
+async def iter_sliding_window(items: Union[Iterable[Any], AsyncIterable[Any]],
+                              worker: Callable[[Any], Awaitable[Any]],
+                              window_size: int) -> AsyncIterator[Any]:
+    """Keep up to window_size worker calls in flight, refilling each slot as soon as it frees up"""
+
+    if hasattr(items, '__aiter__'):
+        window = _iter_async_window(items, worker, window_size)
+        try:
+            async for result in window:
+                yield result
+        finally:
+            await window.aclose()  # async for does not close the inner generator on early exit
+        return
+
+    pending_items = iter(items)
+    in_flight = set()
+
+    def refill():
+        for item in pending_items:
+            in_flight.add(asyncio.ensure_future(worker(item)))
+            if len(in_flight) >= window_size:
+                break
+
+    refill()
+    try:
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            refill()
+
+            for future in done:
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.warning(f"Scraping error: {e}")
+    finally:
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+
+async def _iter_async_window(items: AsyncIterable[Any], worker: Callable[[Any], Awaitable[Any]],
+                             window_size: int) -> AsyncIterator[Any]:
+    """Sliding window over an async source; waiting for the next item never blocks finished results"""
+
+    source = items.__aiter__()
+    in_flight = set()
+    next_item = None
+    exhausted = False
+
+    try:
+        while True:
+            if next_item is None and not exhausted and len(in_flight) < window_size:
+                next_item = asyncio.ensure_future(source.__anext__())
+
+            waiting = in_flight | ({next_item} if next_item is not None else set())
+            if not waiting:
+                return
+
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            if next_item in done:
+                try:
+                    in_flight.add(asyncio.ensure_future(worker(next_item.result())))
+                except StopAsyncIteration:
+                    exhausted = True
+                next_item = None
+
+            for future in done & in_flight:
+                in_flight.discard(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.warning(f"Scraping error: {e}")
+    finally:
+        if next_item is not None:
+            next_item.cancel()
+            await asyncio.gather(next_item, return_exceptions=True)
+        for future in in_flight:
+            future.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        if hasattr(source, 'aclose'):
+            await source.aclose()
+
+# Export main classes
+__all__ = [
+    'ResultPipeline', 'ResultStatistics', 'JSONLResultSink', 'MongoResultSink',
+    'result_to_record', 'result_from_record', 'iter_completed', 'iter_sliding_window', 'interleave_by_host'
+]
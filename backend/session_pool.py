@@ -0,0 +1,166 @@
+"""
+Pooled HTTP Session Manager
+Long-lived aiohttp sessions with one keep-alive connector per host group, shared by every scraper and API client
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class HostGroupConfig:
+    """Connection limits for a group of hosts sharing one connector"""
+    hosts: Tuple[str, ...]
+    limit: int
+    limit_per_host: int
+    timeout: float = 60.0
+
+# Host groups mirror the per-source limits the scrapers used to configure individually
+HOST_GROUPS: Dict[str, HostGroupConfig] = {
+    'ncbi': HostGroupConfig(hosts=('ncbi.nlm.nih.gov',), limit=50, limit_per_host=15),
+    'openfda': HostGroupConfig(hosts=('api.fda.gov',), limit=20, limit_per_host=6),
+    'fda': HostGroupConfig(hosts=('fda.gov', 'accessdata.fda.gov'), limit=30, limit_per_host=10),
+    'cdc': HostGroupConfig(hosts=('cdc.gov',), limit=30, limit_per_host=10, timeout=90.0),
+    'medlineplus': HostGroupConfig(hosts=('medlineplus.gov', 'nlm.nih.gov'), limit=100, limit_per_host=25),
+    'default': HostGroupConfig(hosts=(), limit=200, limit_per_host=50)
+}
+
+class SessionPool:
+    """Per-host-group pool of long-lived aiohttp sessions"""
+
+    def __init__(self, host_groups: Optional[Dict[str, HostGroupConfig]] = None,
+                 keepalive_timeout: float = 60.0, dns_cache_ttl: int = 300):
+        self.host_groups = host_groups or HOST_GROUPS
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._group_cache: Dict[str, str] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    def host_group(self, url: str) -> str:
+        """Resolve the host group for a URL or bare host name"""
+
+        host = urlparse(url).hostname if '://' in url else url
+        host = (host or '').lower()
+
+        group = self._group_cache.get(host)
+        if group is None:
+            group = 'default'
+            for name, config in self.host_groups.items():
+                if any(host == suffix or host.endswith('.' + suffix) for suffix in config.hosts):
+                    group = name
+                    break
+            self._group_cache[host] = group
+        return group
+
+    def get_session(self, group: str = 'default') -> aiohttp.ClientSession:
+        """Get the shared session for a host group, creating it on first use"""
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Sessions are bound to the loop they were created on
+            self._discard_sessions()
+            self._loop = loop
+
+        session = self._sessions.get(group)
+        if session is None or session.closed:
+            config = self.host_groups.get(group, self.host_groups['default'])
+            connector = aiohttp.TCPConnector(
+                limit=config.limit,
+                limit_per_host=config.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=config.timeout)
+            )
+            self._sessions[group] = session
+            logger.info(f"🔌 Opened pooled session for '{group}' "
+                        f"(limit={config.limit}, per_host={config.limit_per_host})")
+        return session
+
+    def _discard_sessions(self):
+        """Close sessions left on a previous event loop through their public close()"""
+
+        stale = [group for group, session in self._sessions.items() if not session.closed]
+        sessions = [self._sessions[group] for group in stale]
+        if self._loop is not None and self._loop.is_running():
+            # The previous loop still runs in another thread; close the sessions there
+            for session in sessions:
+                asyncio.run_coroutine_threadsafe(session.close(), self._loop)
+        elif sessions:
+            # A stopped loop cannot be awaited, but aiohttp closes its connections without it
+            task = asyncio.get_running_loop().create_task(self._close_sessions(sessions))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        if stale:
+            logger.warning(f"♻️ Event loop changed: closing {len(stale)} pooled sessions from the previous loop "
+                           f"({', '.join(stale)})")
+        self._sessions = {}
+
+    @staticmethod
+    async def _close_sessions(sessions: List[aiohttp.ClientSession]):
+        for session in sessions:
+            try:
+                await session.close()
+            except RuntimeError as e:
+                # Transports are already closed; only the wait for them is bound to the old loop
+                logger.debug(f"Pooled session closed without waiting on its loop: {e}")
+
+    def session_for(self, url: str) -> aiohttp.ClientSession:
+        """Get the shared session serving a URL's host group"""
+        return self.get_session(self.host_group(url))
+
+    @asynccontextmanager
+    async def borrow(self, group: str = 'default') -> AsyncIterator[aiohttp.ClientSession]:
+        """Borrow a pooled session; it stays open for the next borrower"""
+        yield self.get_session(group)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get open connection counts per host group"""
+
+        stats = {}
+        for group, session in self._sessions.items():
+            connector = session.connector
+            stats[group] = {
+                'closed': int(session.closed),
+                'limit': connector.limit if connector else 0,
+                'limit_per_host': connector.limit_per_host if connector else 0
+            }
+        return stats
+
+    async def close(self):
+        """Close every pooled session"""
+
+        if self._loop is asyncio.get_running_loop():
+            await self._close_sessions([session for session in self._sessions.values() if not session.closed])
+        else:
+            self._discard_sessions()
+        if self._closing:
+            await asyncio.gather(*self._closing)
+        self._sessions = {}
+        self._loop = None
+
+_session_pool: Optional[SessionPool] = None
+
+def get_session_pool() -> SessionPool:
+    """Get the process-wide session pool"""
+
+    global _session_pool
+    if _session_pool is None:
+        _session_pool = SessionPool()
+    return _session_pool
+
+# Export main classes
+__all__ = ['SessionPool', 'HostGroupConfig', 'HOST_GROUPS', 'get_session_pool']
@@ -16,16 +16,17 @@ import time
 import resource
 import psutil
 from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor
 import threading
-from queue import PriorityQueue, Empty
 import heapq
 
 from ai_scraper_core import (
     ScrapingTask, ScrapingResult, ScrapingPriority, ContentType, ScrapingTier,
     ContentDiscoveryAI, ScraperOptimizationAI, AntiDetectionAI, ContentQualityAI,
-    IntelligentTaskScheduler, AdaptiveRateLimiter, IntelligentProxyRotator, AdvancedDeduplicator
+    IntelligentTaskScheduler, AdaptiveRateLimiter, IntelligentProxyRotator, AdvancedDeduplicator,
+    get_shared_rate_limiter
 )
+from session_pool import get_session_pool
+from result_pipeline import ResultPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -377,7 +378,6 @@ class SuperParallelScrapingEngine:
         # Core configuration
         self.max_total_workers = 1000
         self.max_concurrent_sessions = 200
-        self.worker_pool = None
         
         # AI and optimization systems
         self.load_balancer = DynamicLoadBalancer()
@@ -385,11 +385,12 @@ class SuperParallelScrapingEngine:
         self.bandwidth_optimizer = BandwidthOptimizationAI()
         self.retry_system = IntelligentRetrySystem()
         
-        # Processing queues and tracking
-        self.processing_queue = PriorityQueue()
-        self.active_tasks = {}
-        self.completed_tasks = []
-        self.failed_tasks = []
+        # Processing queues and tracking - workers pull from domains the rate limiter will admit
+        self.task_scheduler = IntelligentTaskScheduler(rate_limiter=get_shared_rate_limiter())
+        self.active_tasks = self.task_scheduler.running_tasks
+        
+        # Results stream through running statistics into sinks instead of accumulating
+        self.result_pipeline = ResultPipeline()
         
         # Real-time metrics
         self.metrics = ProcessingMetrics()
@@ -406,23 +407,27 @@ class SuperParallelScrapingEngine:
         self.start_time = time.time()
         logger.info(f"🚀 Launching Super-Parallel Extraction - Target: {target_documents:,} documents")
         
-        # Initialize worker pool
-        self.worker_pool = ThreadPoolExecutor(max_workers=self.max_total_workers)
-        
         # Start performance monitoring
         monitoring_task = asyncio.create_task(self._continuous_performance_monitoring())
         
-        # Launch tier processors
-        tier_tasks = []
-        for tier, scraper in tier_scrapers.items():
-            tier_task = asyncio.create_task(
-                self._process_tier_super_parallel(tier, scraper, target_documents // len(tier_scrapers))
-            )
-            tier_tasks.append(tier_task)
+        # Queue every tier's work on the shared scheduler
+        tier_concurrency = await asyncio.gather(*[
+            self._schedule_tier_tasks(tier, target_documents // len(tier_scrapers))
+            for tier in tier_scrapers
+        ], return_exceptions=True)
+        for tier, outcome in zip(tier_scrapers, tier_concurrency):
+            if isinstance(outcome, BaseException):
+                logger.error(f"❌ Scheduling {tier.value} failed - no tasks queued for it: {outcome}", exc_info=outcome)
+        
+        # One fixed worker pool drains all tiers
+        pool_size = min(
+            self.max_concurrent_sessions,
+            sum(c for c in tier_concurrency if isinstance(c, int)) or 1
+        )
+        logger.info(f"👷 Starting {pool_size} workers for {self.task_scheduler.pending_count():,} queued tasks")
         
-        # Wait for all tier processing to complete
         try:
-            tier_results = await asyncio.gather(*tier_tasks, return_exceptions=True)
+            await self.run_worker_pool(tier_scrapers, pool_size)
         finally:
             # Stop monitoring
             monitoring_task.cancel()
@@ -431,41 +436,68 @@ class SuperParallelScrapingEngine:
             except asyncio.CancelledError:
                 pass
         
+        tier_results = [self._tier_summary(tier) for tier in tier_scrapers]
+        
         # Process final results
         final_results = await self._compile_super_parallel_results(tier_results)
         
-        # Cleanup
-        if self.worker_pool:
-            self.worker_pool.shutdown(wait=True)
+        return final_results
+    
+    async def launch_distributed_extraction(self, tier_scrapers: Dict[ScrapingTier, Any],
+                                            target_documents: int = 100000,
+                                            num_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Run the extraction across worker processes that lease tasks from a local broker
+        (each worker builds its own tier scrapers; results stream back into this engine's pipeline)"""
+        
+        # Imported here because the worker processes import this module
+        from distributed_crawl import CrawlCoordinator
+        
+        self.start_time = time.time()
+        logger.info(f"🚀 Launching Distributed Extraction - Target: {target_documents:,} documents")
+        
+        coordinator = CrawlCoordinator(num_workers=num_workers, result_pipeline=self.result_pipeline)
+        for tier in tier_scrapers:
+            target_urls = await self._generate_tier_urls(tier, target_documents // len(tier_scrapers))
+            await coordinator.add_tasks_async(
+                ScrapingTask(url=url, tier=tier, source_name=f"{tier.value}_source") for url in target_urls
+            )
+        
+        crawl_stats = await coordinator.run()
         
+        final_results = await self._compile_super_parallel_results(
+            [self._tier_summary(tier) for tier in tier_scrapers]
+        )
+        final_results['distributed_crawl'] = crawl_stats
         return final_results
     
-    async def _process_tier_super_parallel(self, tier: ScrapingTier, scraper: Any, 
-                                         target_documents: int) -> Dict[str, Any]:
-        """Process a tier with super-parallel optimization"""
+    async def _schedule_tier_tasks(self, tier: ScrapingTier, target_documents: int) -> int:
+        """Queue a tier's URLs on the scheduler; returns the tier's optimal concurrency"""
         
-        logger.info(f"🎯 Processing {tier.value} with super-parallel engine")
+        logger.info(f"🎯 Scheduling {tier.value} on super-parallel engine")
         
         # Get optimal concurrency for this tier
         optimal_concurrency = await self.load_balancer.calculate_optimal_concurrency(tier, self.metrics)
         logger.info(f"📊 {tier.value} optimal concurrency: {optimal_concurrency}")
         
-        # Create semaphore for this tier
-        tier_semaphore = asyncio.Semaphore(optimal_concurrency)
-        
         # Generate URLs for processing
         target_urls = await self._generate_tier_urls(tier, target_documents)
         
-        # Process URLs in optimized batches
-        tier_results = await self._process_urls_in_batches(
-            tier, target_urls, tier_semaphore, scraper
-        )
+        await self.task_scheduler.enqueue_tasks([
+            ScrapingTask(url=url, tier=tier, source_name=f"{tier.value}_source")
+            for url in target_urls
+        ])
+        
+        return optimal_concurrency
+    
+    def _tier_summary(self, tier: ScrapingTier) -> Dict[str, Any]:
+        """Summarize a tier from its pipeline statistics"""
         
+        tier_statistics = self.result_pipeline.group_statistics[tier.value]
         return {
             'tier': tier.value,
-            'processed_count': len(tier_results),
-            'success_count': sum(1 for r in tier_results if r.success),
-            'results': tier_results
+            'processed_count': tier_statistics.processed,
+            'success_count': tier_statistics.successful,
+            'statistics': tier_statistics.to_dict()
         }
     
     async def _generate_tier_urls(self, tier: ScrapingTier, target_count: int) -> List[str]:
@@ -510,115 +542,76 @@ class SuperParallelScrapingEngine:
         
         return generated_urls[:target_count]
     
-    async def _process_urls_in_batches(self, tier: ScrapingTier, urls: List[str], 
-                                     semaphore: asyncio.Semaphore, scraper: Any) -> List[ScrapingResult]:
-        """Process URLs in optimized batches"""
+    async def run_worker_pool(self, tier_scrapers: Dict[ScrapingTier, Any], pool_size: int):
+        """Run a fixed pool of workers until the scheduler has no tasks left"""
         
-        # Get bandwidth optimization settings
-        current_bandwidth = await self._estimate_current_bandwidth()
-        batch_config = await self.bandwidth_optimizer.optimize_request_batching(tier, current_bandwidth)
-        
-        batch_size = batch_config['optimal_batch_size']
-        batch_delay = batch_config['batch_delay']
-        
-        logger.info(f"📦 {tier.value} batch config: size={batch_size}, delay={batch_delay}s")
+        # A failing worker cancels its siblings instead of leaving them running unobserved
+        async with asyncio.TaskGroup() as workers:
+            for _ in range(pool_size):
+                workers.create_task(self._scheduler_worker(tier_scrapers))
+    
+    async def _scheduler_worker(self, tier_scrapers: Dict[ScrapingTier, Any]):
+        """Pull tasks from the scheduler until it runs dry, streaming results into the pipeline"""
         
-        all_results = []
+        session_pool = get_session_pool()
         
-        # Process URLs in batches
-        for i in range(0, len(urls), batch_size):
-            batch_urls = urls[i:i + batch_size]
+        while True:
+            task = await self.task_scheduler.next_task()
+            if task is None:
+                return
             
-            # Create session for this batch
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30),
-                connector=aiohttp.TCPConnector(limit=200, limit_per_host=50)
-            ) as session:
-                
-                # Process batch concurrently
-                batch_tasks = [
-                    self._process_single_url_with_retry(tier, url, session, semaphore, scraper)
-                    for url in batch_urls
-                ]
-                
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                
-                # Filter valid results
-                valid_results = [
-                    r for r in batch_results 
-                    if isinstance(r, ScrapingResult)
-                ]
-                
-                all_results.extend(valid_results)
-                
-                # Update metrics
-                await self._update_batch_metrics(tier, len(batch_urls), len(valid_results))
-                
-                logger.info(f"📊 {tier.value} batch {i//batch_size + 1}: {len(valid_results)}/{len(batch_urls)} successful")
-                
-                # Adaptive delay between batches
-                if i + batch_size < len(urls):
-                    await asyncio.sleep(batch_delay)
-        
-        return all_results
+            try:
+                result = await self._process_task_attempt(
+                    task, tier_scrapers[task.tier], session_pool.session_for(task.url)
+                )
+                if result is not None:
+                    await self.result_pipeline.process(result, group=task.tier.value)
+                    await self._update_batch_metrics(task.tier, 1, int(result.success))
+            finally:
+                self.task_scheduler.task_done(task)
     
-    async def _process_single_url_with_retry(self, tier: ScrapingTier, url: str, 
-                                           session: aiohttp.ClientSession, 
-                                           semaphore: asyncio.Semaphore, 
-                                           scraper: Any) -> ScrapingResult:
-        """Process single URL with intelligent retry"""
-        
-        task = ScrapingTask(
-            url=url,
-            tier=tier,
-            source_name=f"{tier.value}_source"
-        )
+    async def _process_task_attempt(self, task: ScrapingTask, scraper: Any,
+                                    session: aiohttp.ClientSession) -> Optional[ScrapingResult]:
+        """Run one attempt of a task; returns None when it has been requeued for a retry"""
         
-        async with semaphore:
-            attempt = 0
-            last_error = None
+        attempt = task.retry_count
+        
+        try:
+            # Use the scraper's extraction method
+            result = await scraper.extract_content_from_url(task.url, session, attempt)
             
-            while attempt < 5:  # Max 5 attempts
-                try:
-                    # Use the scraper's extraction method
-                    result = await scraper.extract_content_from_url(url, session, attempt)
-                    
-                    # Record success
-                    self.retry_system.record_retry_result(task, attempt, result.success)
-                    
-                    if result.success:
-                        # Update load balancer performance
-                        self.load_balancer.update_tier_performance(
-                            tier, result.processing_time, True, len(self.active_tasks)
-                        )
-                        return result
-                    else:
-                        last_error = Exception(result.error_details or "Unknown error")
-                        
-                except Exception as e:
-                    last_error = e
-                
-                # Check if should retry
-                if not await self.retry_system.should_retry(task, last_error, attempt):
-                    break
-                
-                # Calculate retry delay
-                retry_delay = await self.retry_system.calculate_retry_delay(task, attempt, last_error)
-                await asyncio.sleep(retry_delay)
-                
-                attempt += 1
+            if result.success:
+                self.retry_system.record_retry_result(task, attempt, True)
+                # Update load balancer performance
+                self.load_balancer.update_tier_performance(
+                    task.tier, result.processing_time, True, len(self.active_tasks)
+                )
+                return result
             
-            # All retries failed
-            self.retry_system.record_retry_result(task, attempt, False)
-            self.load_balancer.update_tier_performance(tier, 0, False, len(self.active_tasks))
+            last_error = Exception(result.error_details or "Unknown error")
             
-            return ScrapingResult(
-                task_id=task.id,
-                url=url,
-                success=False,
-                error_details=str(last_error),
-                timestamp=datetime.utcnow()
-            )
+        except Exception as e:
+            last_error = e
+        
+        # Retries go back on the scheduler with a delay so the worker moves on to other work
+        if attempt < 4 and await self.retry_system.should_retry(task, last_error, attempt):
+            self.retry_system.record_retry_result(task, attempt, False)
+            retry_delay = await self.retry_system.calculate_retry_delay(task, attempt, last_error)
+            task.retry_count += 1
+            self.task_scheduler.submit(task, delay=retry_delay)
+            return None
+        
+        # All retries failed
+        self.retry_system.record_retry_result(task, attempt, False)
+        self.load_balancer.update_tier_performance(task.tier, 0, False, len(self.active_tasks))
+        
+        return ScrapingResult(
+            task_id=str(task.id),
+            url=task.url,
+            success=False,
+            error_details=str(last_error),
+            timestamp=datetime.utcnow()
+        )
     
     async def _continuous_performance_monitoring(self):
         """Continuously monitor system performance"""
@@ -683,7 +676,6 @@ class SuperParallelScrapingEngine:
         # Aggregate results
         total_processed = 0
         total_success = 0
-        all_results = []
         tier_summaries = {}
         
         for tier_result in tier_results:
@@ -693,9 +685,8 @@ class SuperParallelScrapingEngine:
                 
                 total_processed += tier_result.get('processed_count', 0)
                 total_success += tier_result.get('success_count', 0)
-                
-                if 'results' in tier_result:
-                    all_results.extend(tier_result['results'])
+        
+        await self.result_pipeline.close()
         
         # Calculate performance metrics
         processing_rate = total_processed / total_execution_time if total_execution_time > 0 else 0
@@ -722,7 +713,8 @@ class SuperParallelScrapingEngine:
                 'optimization_suggestions': self.performance_monitor.get_optimization_suggestions(),
                 'performance_alerts': self.performance_monitor.get_performance_alerts()
             },
-            'extracted_data': all_results
+            'result_statistics': self.result_pipeline.statistics,
+            'extracted_data': self.result_pipeline.samples
         }
 
 # Export main classes
@@ -0,0 +1,152 @@
+"""
+URL Canonicalization
+Canonical URL normalizer and a compact NumPy-backed index of seen URL hashes
+"""
+
+import re
+from typing import Dict, Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from dedup_store import content_digest
+
+# Query parameters that only track campaigns or sessions and never change page content
+TRACKING_PARAMS = frozenset({
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', '_hsenc', '_hsmi', 'jsessionid', 'phpsessid', 'sessionid', 'sid'
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+_DUPLICATE_SLASHES = re.compile(r'/{2,}')
+_NUMERIC_SEGMENT = re.compile(r'/\d+')
+_PAGE_NUMBER = re.compile(r'page=\d+')
+
+_EMPTY_SLOT = 0
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form of a URL: lowercase scheme/host, no default port, fragment or tracking params,
+    sorted query and no trailing slash (except the root path)"""
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 literal
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host
+    if port is not None and str(port) != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+
+    path = _DUPLICATE_SLASHES.sub('/', parts.path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = ''
+    if parts.query:
+        params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                  if not _is_tracking_param(name)]
+        query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+def url_hash(url: str) -> int:
+    """64-bit hash of a URL's canonical form (never zero)"""
+    return content_digest(canonicalize_url(url))
+
+def url_pattern(url: str) -> str:
+    """Host and path with numeric segments replaced by placeholders, for template-level duplicate checks"""
+
+    parts = urlsplit(url)
+    pattern_path = _NUMERIC_SEGMENT.sub('/[ID]', parts.path.rstrip('/'))
+    pattern_path = _PAGE_NUMBER.sub('page=[NUM]', pattern_path)
+    return f"{parts.netloc}{pattern_path}"
+
+class SeenURLIndex:
+    """Open-addressing hash set of 64-bit URL hashes (8 bytes per slot instead of a full string per URL)"""
+
+    def __init__(self, initial_capacity: int = 1 << 12, max_load_factor: float = 0.7,
+                 canonicalize: bool = True):
+        self.max_load_factor = max_load_factor
+        self.canonicalize = canonicalize
+
+        capacity = 1 << max(4, (initial_capacity - 1).bit_length())
+        self._table = np.zeros(capacity, dtype=np.uint64)
+        self._mask = capacity - 1
+        self._count = 0
+
+    def _hash(self, key: str) -> int:
+        return url_hash(key) if self.canonicalize else content_digest(key)
+
+    def _find_slot(self, digest: int) -> int:
+        """Linear-probe for the slot holding a hash or the first empty slot"""
+
+        table = self._table
+        slot = digest & self._mask
+        while True:
+            stored = int(table[slot])
+            if stored == digest or stored == _EMPTY_SLOT:
+                return slot
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, key: str) -> bool:
+        digest = self._hash(key)
+        return int(self._table[self._find_slot(digest)]) == digest
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, key: str) -> bool:
+        """Insert a URL; returns False if it (or an equivalent URL) was already seen"""
+
+        digest = self._hash(key)
+        slot = self._find_slot(digest)
+        if int(self._table[slot]) == digest:
+            return False
+
+        self._table[slot] = digest
+        self._count += 1
+        if self._count > len(self._table) * self.max_load_factor:
+            self._grow()
+        return True
+
+    def update(self, keys: Iterable[str]):
+        """Insert several URLs"""
+        for key in keys:
+            self.add(key)
+
+    def _grow(self):
+        """Rehash into a table of twice the capacity"""
+
+        digests = self._table[self._table != _EMPTY_SLOT]
+        self._table = np.zeros(len(self._table) * 2, dtype=np.uint64)
+        self._mask = len(self._table) - 1
+
+        for digest in digests.tolist():
+            slot = digest & self._mask
+            while self._table[slot] != _EMPTY_SLOT:
+                slot = (slot + 1) & self._mask
+            self._table[slot] = digest
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get index utilisation statistics"""
+
+        return {
+            'urls_seen': self._count,
+            'capacity': len(self._table),
+            'load_factor': self._count / len(self._table),
+            'memory_mb': self._table.nbytes / (1024 * 1024)
+        }
+
+# Export main classes
+__all__ = ['SeenURLIndex', 'canonicalize_url', 'url_hash', 'url_pattern']
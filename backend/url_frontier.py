@@ -0,0 +1,252 @@
+"""
+Persistent URL Frontier
+Disk-backed, priority-ordered crawl queue with an in-memory head buffer and a seen-URL filter
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from url_canonical import SeenURLIndex, canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Location of the frontier database (overridable for multi-crawl deployments)
+DEFAULT_FRONTIER_PATH = os.environ.get(
+    'SCRAPER_FRONTIER_PATH',
+    os.path.join('scraper_state', 'url_frontier.sqlite3')
+)
+
+# Row states: queued on disk, handed out through the head buffer, fetched successfully
+QUEUED, LEASED, DONE = 0, 1, 2
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS frontier_urls (
+        frontier TEXT NOT NULL,
+        url TEXT NOT NULL,          -- canonical form, the dedup key
+        priority INTEGER NOT NULL DEFAULT 0,
+        state INTEGER NOT NULL DEFAULT 0,
+        fetch_url TEXT,             -- URL as discovered, which is what gets fetched
+        PRIMARY KEY (frontier, url)
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS frontier_queue ON frontier_urls (frontier, state, priority)'
+)
+
+_connections: Dict[str, sqlite3.Connection] = {}
+
+def _open_database(path: str) -> sqlite3.Connection:
+    """Get the connection shared by every frontier stored in a database file"""
+
+    path = os.path.abspath(path)
+    conn = _connections.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        # Databases written before fetch_url existed hold canonical URLs only
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(frontier_urls)')}
+        if 'fetch_url' not in columns:
+            conn.execute('ALTER TABLE frontier_urls ADD COLUMN fetch_url TEXT')
+        conn.commit()
+        _connections[path] = conn
+    return conn
+
+class URLFrontier:
+    """Named crawl frontier: URLs stream in from discovery and stream out by priority (lower first)"""
+
+    def __init__(self, name: str, path: str = DEFAULT_FRONTIER_PATH,
+                 head_size: int = 500, write_batch: int = 500):
+        self.name = name
+        self.path = path
+        self.head_size = head_size
+        self.write_batch = write_batch
+
+        self._conn = _open_database(path)
+        self._head: Deque[str] = deque()
+        self._done_buffer: List[Tuple[str, str]] = []
+        self._producers = 0
+        self._available = asyncio.Event()
+
+        # In-memory filter in front of the table's primary key; repeats never reach SQLite
+        self._seen = SeenURLIndex()
+
+        self.added = 0
+        self.duplicates = 0
+
+        self.requeue_unconfirmed()
+
+    def requeue_unconfirmed(self) -> int:
+        """Queue again every URL handed out but never confirmed (in flight at a crash or stop, or failed);
+        call before a frontier that outlived its crawl is drained again"""
+
+        self.flush()
+        self._head.clear()
+        with self._conn:
+            resumed = self._conn.execute(
+                'UPDATE frontier_urls SET state = ? WHERE frontier = ? AND state = ?', (QUEUED, self.name, LEASED)
+            ).rowcount
+        if resumed:
+            logger.info(f"♻️ Frontier {self.name}: re-queued {resumed:,} unconfirmed URLs")
+        return resumed
+
+    def add_many(self, urls: Iterable[str], priority: int = 0) -> int:
+        """Queue URLs whose canonical form this frontier has not seen; returns how many were new
+        (the canonical form is only the key - URLs are fetched as discovered)"""
+
+        rows = []
+        submitted = 0
+        for url in urls:
+            submitted += 1
+            if self._seen.add(url):
+                rows.append((self.name, canonicalize_url(url), priority, url))
+        self.duplicates += submitted - len(rows)
+        if not rows:
+            return 0
+
+        before = self._conn.total_changes
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO frontier_urls (frontier, url, priority, fetch_url) VALUES (?, ?, ?, ?)', rows
+            )
+        added = self._conn.total_changes - before
+
+        self.added += added
+        self.duplicates += len(rows) - added
+        if added:
+            self._available.set()
+        return added
+
+    def add(self, url: str, priority: int = 0) -> bool:
+        """Queue a single URL; False if it was already seen"""
+        return self.add_many((url,), priority) == 1
+
+    def start_feed(self, urls: Union[Iterable[str], AsyncIterable[str]], priority: int = 0) -> asyncio.Task:
+        """Stream URLs from a discovery source into the frontier in a background task"""
+
+        # Registered before the task runs so consumers never mistake a fresh frontier for a finished one
+        self._producers += 1
+        return asyncio.ensure_future(self._feed(urls, priority))
+
+    async def _feed(self, urls: Union[Iterable[str], AsyncIterable[str]], priority: int):
+        batch = []
+        try:
+            if hasattr(urls, '__aiter__'):
+                async for url in urls:
+                    batch.append(url)
+                    if len(batch) >= self.write_batch:
+                        self.add_many(batch, priority)
+                        batch = []
+            else:
+                for url in urls:
+                    batch.append(url)
+                    if len(batch) >= self.write_batch:
+                        self.add_many(batch, priority)
+                        batch = []
+                        await asyncio.sleep(0)
+            self.add_many(batch, priority)
+        except Exception as e:
+            logger.warning(f"Frontier {self.name}: discovery failed: {e}")
+        finally:
+            self._producers -= 1
+            self._available.set()
+
+    def _refill_head(self):
+        """Move the next batch of queued URLs from disk into the head buffer"""
+
+        self.flush()
+        rows = self._conn.execute(
+            'SELECT rowid, COALESCE(fetch_url, url) FROM frontier_urls WHERE frontier = ? AND state = ? '
+            'ORDER BY priority, rowid LIMIT ?', (self.name, QUEUED, self.head_size)
+        ).fetchall()
+        if not rows:
+            return
+
+        with self._conn:
+            self._conn.executemany(
+                'UPDATE frontier_urls SET state = ? WHERE rowid = ?', [(LEASED, rowid) for rowid, _ in rows]
+            )
+        self._head.extend(url for _, url in rows)
+
+    async def get(self) -> Optional[str]:
+        """Next URL to fetch; None once discovery has finished and the frontier is drained"""
+
+        while True:
+            if not self._head:
+                self._refill_head()
+            if self._head:
+                return self._head.popleft()
+            if self._producers == 0:
+                return None
+
+            self._available.clear()
+            await self._available.wait()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            url = await self.get()
+            if url is None:
+                return
+            yield url
+
+    def mark_done(self, url: str):
+        """Record a successfully fetched URL so a resumed crawl never refetches it"""
+
+        self._done_buffer.append((self.name, canonicalize_url(url)))
+        if len(self._done_buffer) >= self.write_batch:
+            self.flush()
+
+    def flush(self):
+        """Write buffered completions to disk"""
+
+        if not self._done_buffer:
+            return
+        with self._conn:
+            self._conn.executemany(
+                f'UPDATE frontier_urls SET state = {DONE} WHERE frontier = ? AND url = ?', self._done_buffer
+            )
+        self._done_buffer.clear()
+
+    def clear(self):
+        """Forget every URL of this frontier (the crawl it belonged to is complete)"""
+
+        self._head.clear()
+        self._done_buffer.clear()
+        self._seen = SeenURLIndex()
+        with self._conn:
+            self._conn.execute('DELETE FROM frontier_urls WHERE frontier = ?', (self.name,))
+
+    def pending_count(self) -> int:
+        """URLs queued on disk or waiting in the head buffer"""
+
+        queued = self._conn.execute(
+            'SELECT COUNT(*) FROM frontier_urls WHERE frontier = ? AND state = ?', (self.name, QUEUED)
+        ).fetchone()[0]
+        return queued + len(self._head)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frontier statistics"""
+
+        counts = dict(self._conn.execute(
+            'SELECT state, COUNT(*) FROM frontier_urls WHERE frontier = ? GROUP BY state', (self.name,)
+        ).fetchall())
+        return {
+            'frontier': self.name,
+            'queued': counts.get(QUEUED, 0),
+            'in_head': len(self._head),
+            'done': counts.get(DONE, 0) + len(self._done_buffer),
+            'added': self.added,
+            'duplicates_filtered': self.duplicates,
+            'seen_index_mb': self._seen.get_stats()['memory_mb'],
+            'discovery_running': self._producers > 0
+        }
+
+# Export main classes
+__all__ = ['URLFrontier', 'DEFAULT_FRONTIER_PATH']
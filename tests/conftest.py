@@ -0,0 +1,24 @@
+"""
+Test configuration: backend modules are imported by bare name, and scraper state goes to a scratch directory
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+# Module-level defaults read these at import time, so they are set before any backend module is imported
+_STATE_DIR = tempfile.mkdtemp(prefix='scraper_state_')
+for name, filename in (
+    ('SCRAPER_DEDUP_STORE_PATH', 'content_digests.bin'),
+    ('SCRAPER_HTTP_CACHE_PATH', 'http_cache.sqlite3'),
+    ('SCRAPER_CHECKPOINT_PATH', 'crawl_checkpoints.sqlite3'),
+    ('SCRAPER_FRONTIER_PATH', 'url_frontier.sqlite3'),
+    ('SCRAPER_BLOB_STORE_PATH', 'content_blobs'),
+    ('SCRAPER_ARCHIVE_PATH', 'result_archive'),
+    ('SCRAPER_BROKER_PATH', 'crawl_broker.sqlite3'),
+    ('SCRAPER_WORKER_STATE_PATH', 'crawl_workers'),
+):
+    os.environ.setdefault(name, os.path.join(_STATE_DIR, filename))
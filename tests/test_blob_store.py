@@ -0,0 +1,77 @@
+import threading
+
+from blob_store import ContentBlobStore
+
+def _page(i):
+    return ('<html><head><title>MedlinePlus Health Topic</title></head><body><nav>Health Topics Drugs Genetics</nav>'
+            + f'<h1>Topic {i}</h1>' + ' '.join(f'paragraph {i}-{j} about symptoms and treatment' for j in range(40))
+            + '<footer>U.S. National Library of Medicine</footer></body></html>')
+
+def test_put_get_round_trip_survives_reopen(tmp_path):
+    store = ContentBlobStore(str(tmp_path))
+    digests = [store.put(_page(i), 'medlineplus.gov') for i in range(5)]
+    assert store.get(digests[3]) == _page(3)
+    store.close()
+
+    reopened = ContentBlobStore(str(tmp_path))
+    assert [reopened.get(digest) for digest in digests] == [_page(i) for i in range(5)]
+    assert reopened.get(12345) is None
+
+def test_identical_pages_are_stored_once(tmp_path):
+    store = ContentBlobStore(str(tmp_path))
+    first = store.put(_page(1), 'cdc.gov')
+    second = store.put(_page(1), 'www.cdc.gov')
+
+    assert first == second
+    assert store.stored == 1
+    assert store.deduplicated == 1
+    assert store.get_stats()['blobs_stored'] == 1
+
+def test_dictionary_is_trained_per_source_and_pages_still_decode(tmp_path):
+    store = ContentBlobStore(str(tmp_path), dictionary_samples=16, dictionary_size=4096)
+    digests = [store.put(_page(i), 'medlineplus.gov') for i in range(40)]
+
+    assert store.get_stats()['trained_dictionaries'] == 1
+    assert store._samples == {} and store._sample_bytes == 0
+    store.close()
+
+    reopened = ContentBlobStore(str(tmp_path), dictionary_samples=16, dictionary_size=4096)
+    assert 'medlineplus.gov' in reopened._compressors
+    assert [reopened.get(digest) for digest in digests] == [_page(i) for i in range(40)]
+
+def test_failed_training_stops_sampling_the_source(tmp_path):
+    # A dictionary far larger than the material available cannot be trained
+    store = ContentBlobStore(str(tmp_path), dictionary_samples=4, dictionary_size=16 * 1024 * 1024)
+    digests = [store.put(f'page {i}', 'tiny.example') for i in range(20)]
+
+    assert 'tiny.example' in store._untrainable
+    assert store._samples == {} and store._sample_bytes == 0
+    assert [store.get(digest) for digest in digests] == [f'page {i}' for i in range(20)]
+
+def test_sample_collection_stays_within_the_byte_budget(tmp_path):
+    store = ContentBlobStore(str(tmp_path), dictionary_samples=1000, sample_max_bytes=512, max_sample_bytes=4096)
+    for i in range(200):
+        store.put(_page(i), f'host-{i % 50}.example')
+
+    assert store._sample_bytes <= 4096
+    assert store._sample_bytes == sum(len(sample) for samples in store._samples.values() for sample in samples)
+    assert all(len(sample) <= 512 for samples in store._samples.values() for sample in samples)
+
+def test_stores_sharing_a_directory_reserve_distinct_segments(tmp_path):
+    stores = [ContentBlobStore(str(tmp_path)) for _ in range(2)]
+    reserved = [[], []]
+    barrier = threading.Barrier(2)
+
+    def reserve(index):
+        barrier.wait()
+        for _ in range(200):
+            reserved[index].append(stores[index]._reserve_segment())
+
+    threads = [threading.Thread(target=reserve, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(reserved[0]) == len(reserved[1]) == 200
+    assert sorted(reserved[0] + reserved[1]) == list(range(1, 401))
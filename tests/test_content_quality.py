@@ -0,0 +1,65 @@
+import asyncio
+import random
+
+from ai_scraper_core import ContentQualityAI
+
+FILLER = ['the', 'of', 'patients', 'with', 'in', 'may', 'fever', 'symptoms', 'trials', 'reviewed', 'clinically']
+URLS = ['https://www.cdc.gov/flu/index.html', 'https://pubmed.ncbi.nlm.nih.gov/123/',
+        'https://www.fda.gov/drugs/', 'https://example.com/blog']
+
+def _documents(count, seed=0):
+    quality = ContentQualityAI()
+    vocabulary = sorted(quality.medical_keywords | set(quality.technical_indicators)) + FILLER * 4
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        text = ' '.join(rng.choice(vocabulary) for _ in range(rng.choice([5, 30, 150, 400, 2000])))
+        # Keywords glued together or upper-cased must still match the way substring checks do
+        if rng.random() < 0.2:
+            text = text.replace(' ', rng.choice(['', '-', '\n']), 10)
+        if rng.random() < 0.2:
+            text = text.upper()
+        documents.append(text)
+    return documents + ['', 'x' * 99]
+
+def test_batch_scores_equal_scalar_scores():
+    quality = ContentQualityAI()
+    documents = _documents(200)
+    urls = [URLS[i % len(URLS)] for i in range(len(documents))]
+
+    async def score():
+        scalar = [await quality.assess_content_quality(content, url) for content, url in zip(documents, urls)]
+        return scalar, await quality.assess_batch(documents, urls)
+
+    scalar, batch = asyncio.run(score())
+    assert batch.tolist() == scalar
+
+def test_overlapping_keywords_are_all_found():
+    quality = ContentQualityAI()
+    content = 'A randomized clinical trial. ' * 10
+
+    async def score():
+        return await quality.assess_content_quality(content, URLS[0]), await quality.assess_batch([content], URLS[:1])
+
+    scalar, batch = asyncio.run(score())
+    assert batch[0] == scalar
+
+def test_rare_keywords_are_found_past_the_gram_filter():
+    quality = ContentQualityAI()
+    rng = random.Random(1)
+    filler = ['lorem', 'ipsum', 'dolor', 'amet', 'medicine', 'clinic', 'studio', 'dat']
+    documents = [' '.join(rng.choice(filler) for _ in range(200)) for _ in range(60)]
+    # Keywords in a few pages only, at odd and even offsets, glued to neighbours and at the very end
+    documents[40] = 'x' + documents[40] + ' randomized clinical trial'
+    documents[41] = documents[41] + ' peer-reviewedsystematic review'
+    documents[42] = 'xx' + documents[42] + 'methodology' + 'x' * 3 + ' drug data'
+    documents[43] = documents[43] + '\x1cdiagnosis prevention café pharmaceutical'
+    urls = [URLS[i % len(URLS)] for i in range(len(documents))]
+
+    async def score():
+        scalar = [await quality.assess_content_quality(content, url) for content, url in zip(documents, urls)]
+        return scalar, await quality.assess_batch(documents, urls)
+
+    scalar, batch = asyncio.run(score())
+    assert batch.tolist() == scalar
+    assert len(set(scalar[40:44])) > 1
@@ -0,0 +1,74 @@
+import asyncio
+
+from ai_scraper_core import AdvancedDeduplicator
+from crawl_checkpoint import CrawlCheckpoint
+from dedup_store import PersistentDigestStore
+
+URLS = ['https://www.cdc.gov/flu', 'https://www.cdc.gov/measles', 'https://www.cdc.gov/covid']
+
+async def _drain(frontier):
+    urls = []
+    while True:
+        url = await frontier.get()
+        if url is None:
+            return urls
+        urls.append(url)
+
+def test_stop_and_resume_in_same_process_requeues_unconfirmed_urls(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / 'checkpoints.sqlite3'))
+
+    frontier = checkpoint.start_section('cdc', 'diseases')
+    frontier.add_many(URLS)
+    leased = asyncio.run(_drain(frontier))
+    assert sorted(leased) == sorted(URLS)
+
+    # One URL completes; one was in flight at the stop and one failed - neither is confirmed
+    checkpoint.mark_completed('cdc', 'diseases', leased[0])
+    checkpoint.request_stop()
+    checkpoint.clear_stop()
+
+    resumed = checkpoint.start_section('cdc', 'diseases')
+    assert resumed is frontier
+    assert sorted(asyncio.run(_drain(resumed))) == sorted(leased[1:])
+
+def test_start_section_does_not_refetch_completed_urls(tmp_path):
+    path = str(tmp_path / 'checkpoints.sqlite3')
+    checkpoint = CrawlCheckpoint(path)
+    frontier = checkpoint.start_section('cdc', 'diseases')
+    frontier.add_many(URLS)
+    for url in asyncio.run(_drain(frontier)):
+        checkpoint.mark_completed('cdc', 'diseases', url)
+    checkpoint.checkpoint()
+
+    assert asyncio.run(_drain(checkpoint.start_section('cdc', 'diseases'))) == []
+    assert CrawlCheckpoint(path).start_section('cdc', 'diseases').pending_count() == 0
+
+def test_resumed_run_refetches_a_url_whose_extraction_failed(tmp_path):
+    path = str(tmp_path / 'checkpoints.sqlite3')
+    digests = str(tmp_path / 'digests.bin')
+    pages = {url: f'<html><body>{url} ' + 'outbreak guidance ' * 80 + '</body></html>' for url in URLS}
+
+    checkpoint = CrawlCheckpoint(path)
+    deduplicator = AdvancedDeduplicator(digest_store=PersistentDigestStore(digests))
+    frontier = checkpoint.start_section('cdc', 'diseases')
+    frontier.add_many(URLS)
+    leased = asyncio.run(_drain(frontier))
+
+    # The first page is extracted and cached; extraction of the others raises before anything is stored
+    for url in leased:
+        assert not asyncio.run(deduplicator.is_duplicate(pages[url], url))
+    deduplicator.commit(leased[0])
+    checkpoint.mark_completed('cdc', 'diseases', leased[0])
+    for url in leased[1:]:
+        deduplicator.discard(url)
+    checkpoint.close()
+    deduplicator.digest_store.flush()
+
+    resumed_checkpoint = CrawlCheckpoint(path)
+    resumed_deduplicator = AdvancedDeduplicator(digest_store=PersistentDigestStore(digests))
+    refetched = asyncio.run(_drain(resumed_checkpoint.start_section('cdc', 'diseases')))
+
+    assert sorted(refetched) == sorted(leased[1:])
+    for url in refetched:
+        assert not asyncio.run(resumed_deduplicator.is_duplicate(pages[url], url))
+    assert asyncio.run(resumed_deduplicator.is_duplicate(pages[leased[0]], leased[0] + '?print=1'))
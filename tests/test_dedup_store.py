@@ -0,0 +1,59 @@
+import pytest
+
+from dedup_store import PersistentDigestStore, content_digest
+
+def test_digests_persist_across_reopen(tmp_path):
+    path = str(tmp_path / 'digests.bin')
+    store = PersistentDigestStore(path, initial_capacity=64)
+    digests = [content_digest(f'page {i}') for i in range(20)]
+
+    assert all(store.add(digest) for digest in digests)
+    assert not store.add(digests[0])
+    store.flush()
+
+    reopened = PersistentDigestStore(path)
+    assert len(reopened) == 20
+    assert all(digest in reopened for digest in digests)
+    assert content_digest('page 20') not in reopened
+
+def test_growth_rehashes_and_keeps_every_digest(tmp_path):
+    path = str(tmp_path / 'digests.bin')
+    store = PersistentDigestStore(path, initial_capacity=16)
+    digests = [content_digest(f'page {i}') for i in range(200)]
+    for digest in digests:
+        store.add(digest)
+
+    assert store.get_stats()['capacity'] >= 256
+    assert store.get_stats()['load_factor'] <= store.max_load_factor
+    store.flush()
+
+    reopened = PersistentDigestStore(path)
+    assert len(reopened) == 200
+    assert all(digest in reopened for digest in digests)
+
+def test_unflushed_count_is_recovered_from_the_table(tmp_path):
+    path = str(tmp_path / 'digests.bin')
+    store = PersistentDigestStore(path, initial_capacity=64, flush_interval=5)
+    for i in range(7):
+        store.add(content_digest(f'page {i}'))
+
+    # The header count is only rewritten on flush, but every digest is already in the shared mapping
+    assert len(PersistentDigestStore(path)) == 7
+
+def test_reopen_grows_a_table_filled_past_its_load_factor(tmp_path):
+    path = str(tmp_path / 'digests.bin')
+    store = PersistentDigestStore(path, initial_capacity=16, max_load_factor=1.0, flush_interval=1000)
+    digests = [content_digest(f'page {i}') for i in range(14)]
+    for digest in digests:
+        store.add(digest)
+
+    reopened = PersistentDigestStore(path, max_load_factor=0.7)
+    assert len(reopened) == 14
+    assert reopened.get_stats()['load_factor'] <= 0.7
+    assert all(digest in reopened for digest in digests)
+
+def test_rejects_files_that_are_not_stores(tmp_path):
+    path = tmp_path / 'digests.bin'
+    path.write_bytes(b'not a dedup store' * 10)
+    with pytest.raises(ValueError):
+        PersistentDigestStore(str(path))
@@ -0,0 +1,51 @@
+import asyncio
+
+from ai_scraper_core import AdvancedDeduplicator
+from dedup_store import PersistentDigestStore
+
+URL = 'https://medlineplus.gov/ency/article/000001.htm'
+PAGE = '<html><body>' + ' '.join(f'influenza symptom {i} fever cough fatigue' for i in range(60)) + '</body></html>'
+
+def _deduplicator(path):
+    return AdvancedDeduplicator(digest_store=PersistentDigestStore(path, initial_capacity=64))
+
+def test_failed_extraction_does_not_mark_the_retry_a_duplicate(tmp_path):
+    path = str(tmp_path / 'digests.bin')
+    deduplicator = _deduplicator(path)
+    assert not asyncio.run(deduplicator.is_duplicate(PAGE, URL))
+
+    # Extraction raised before the page was cached: the retry, in this process or a resumed one, goes through
+    deduplicator.discard(URL)
+    assert not asyncio.run(deduplicator.is_duplicate(PAGE, URL))
+
+    deduplicator.digest_store.flush()
+    assert not asyncio.run(_deduplicator(path).is_duplicate(PAGE, URL))
+
+def test_cancelled_fetch_is_not_its_own_duplicate(tmp_path):
+    deduplicator = _deduplicator(str(tmp_path / 'digests.bin'))
+    assert not asyncio.run(deduplicator.is_duplicate(PAGE, URL))
+    # Neither commit() nor discard() ran (the task was cancelled); the same URL is fetched again
+    assert not asyncio.run(deduplicator.is_duplicate(PAGE, URL))
+
+def test_committed_pages_are_duplicates_across_restarts(tmp_path):
+    path = str(tmp_path / 'digests.bin')
+    deduplicator = _deduplicator(path)
+    assert not asyncio.run(deduplicator.is_duplicate(PAGE, URL))
+    deduplicator.commit(URL)
+
+    assert asyncio.run(deduplicator.is_duplicate(PAGE, 'https://medlineplus.gov/print/000001.htm'))
+    deduplicator.digest_store.flush()
+    assert asyncio.run(_deduplicator(path).is_duplicate(PAGE, 'https://medlineplus.gov/print/000001.htm'))
+
+def test_page_in_flight_under_another_url_is_a_duplicate(tmp_path):
+    deduplicator = _deduplicator(str(tmp_path / 'digests.bin'))
+    assert not asyncio.run(deduplicator.is_duplicate(PAGE, URL))
+    assert asyncio.run(deduplicator.is_duplicate(PAGE, 'https://medlineplus.gov/copy.htm'))
+
+def test_pending_checks_are_bounded(tmp_path):
+    deduplicator = AdvancedDeduplicator(digest_store=PersistentDigestStore(str(tmp_path / 'digests.bin')),
+                                        max_pending=8)
+    for i in range(20):
+        assert not asyncio.run(deduplicator.is_duplicate(f'page {i} ' * 50, f'https://example.org/{i}'))
+    assert len(deduplicator._pending) == 8
+    assert len(deduplicator._pending_digests) == 8
@@ -0,0 +1,179 @@
+import asyncio
+import os
+
+from ai_scraper_core import ScrapingResult, ScrapingTask, ScrapingTier
+from dedup_store import PersistentDigestStore, content_digest, get_shared_digest_store
+from distributed_crawl import BrokerResultSink, CrawlBroker, CrawlCoordinator, CrawlWorker
+from result_pipeline import ResultPipeline
+
+PAGES = {
+    'https://www.cdc.gov/flu/': 'influenza',
+    'https://www.cdc.gov/measles/': 'measles',
+    'https://www.cdc.gov/flu/about/': 'influenza',   # same page under a second URL
+    'https://www.cdc.gov/mumps/': 'mumps'
+}
+
+def _crawl(broker_path, crawl, unchanged=(), digest_store=None):
+    """Run one crawl's task/result round trip through the broker, as a worker would, and drain it"""
+
+    coordinator = CrawlCoordinator(num_workers=1, crawl=crawl, broker_path=broker_path,
+                                   result_pipeline=ResultPipeline(), digest_store=digest_store)
+    coordinator.add_tasks(ScrapingTask(url=url, tier=ScrapingTier.TIER_1_GOVERNMENT) for url in PAGES)
+
+    broker = coordinator.broker
+    broker.register_worker('worker-0.1')
+    leased = broker.lease('worker-0.1', 100)
+    for task in leased:
+        content = PAGES[task.url]
+        result = ScrapingResult(task_id=str(task.id), url=task.url, success=True, content=content,
+                                content_digest=content_digest(content),
+                                metadata={'unchanged': True} if task.url in unchanged else None)
+        assert broker.complete('worker-0.1', result)
+
+    asyncio.run(coordinator._drain_results())
+    return coordinator, leased
+
+def test_tasks_are_fetched_as_queued(tmp_path):
+    _, leased = _crawl(str(tmp_path / 'broker.sqlite3'), 'crawl-a')
+    assert sorted(task.url for task in leased) == sorted(PAGES)
+
+def test_duplicates_are_only_counted_within_one_crawl(tmp_path):
+    broker_path = str(tmp_path / 'broker.sqlite3')
+    # Digests left in the shared store by earlier runs must not mark this crawl's pages as duplicates
+    for content in set(PAGES.values()):
+        get_shared_digest_store().add(content_digest(content))
+
+    first, _ = _crawl(broker_path, 'crawl-1')
+    second, _ = _crawl(broker_path, 'crawl-2')
+
+    for coordinator in (first, second):
+        assert coordinator.results_received == 4
+        assert coordinator.duplicates == 1
+        assert coordinator.result_pipeline.statistics.successful == 3
+
+def test_unchanged_pages_are_not_duplicates(tmp_path):
+    # Validator-cache hits carry the digest of the page they stand for; they are not new copies of it
+    coordinator, _ = _crawl(str(tmp_path / 'broker.sqlite3'), 'crawl-u',
+                            unchanged={'https://www.cdc.gov/flu/', 'https://www.cdc.gov/flu/about/'})
+    assert coordinator.duplicates == 0
+
+def test_accepted_pages_are_written_back_to_the_digest_store(tmp_path):
+    store = PersistentDigestStore(str(tmp_path / 'digests.bin'))
+    _crawl(str(tmp_path / 'broker.sqlite3'), 'crawl-w', digest_store=store)
+
+    assert len(store) == 3
+    assert all(content_digest(content) in store for content in PAGES.values())
+
+def test_leased_task_ids_are_unique_across_workers(tmp_path):
+    broker_path = str(tmp_path / 'broker.sqlite3')
+    urls = ['https://www.cdc.gov/flu/', 'https://www.cdc.gov/mumps/',
+            'https://www.fda.gov/drugs/', 'https://www.fda.gov/food/']
+    CrawlBroker('crawl-ids', broker_path).add_tasks(
+        ScrapingTask(url=url, tier=ScrapingTier.TIER_1_GOVERNMENT) for url in urls
+    )
+
+    # Each worker process would number its own tasks from 1; broker keys are unique across them
+    leased = []
+    for worker in ('worker-0.1', 'worker-1.1'):
+        broker = CrawlBroker('crawl-ids', broker_path, domains_per_lease=1)
+        broker.register_worker(worker)
+        leased += broker.lease(worker, 10)
+
+    assert sorted(task.url for task in leased) == sorted(urls)
+    assert len({str(task.id) for task in leased}) == 4
+
+    # A redelivered task keeps its id, whichever process leases it next
+    broker.release()
+    redelivered = CrawlBroker('crawl-ids', broker_path, domains_per_lease=2).lease('worker-2.1', 10)
+    assert {task.url: task.id for task in redelivered} == {task.url: task.id for task in leased}
+
+class RecordingProcess:
+    """Stands in for a spawned worker; records the parsing pool size it was given"""
+
+    started = []
+
+    def __init__(self, **kwargs):
+        self.name = kwargs['name']
+
+    def start(self):
+        RecordingProcess.started.append((self.name, os.environ['SCRAPER_PARSE_WORKERS']))
+
+def _recording_coordinator(tmp_path, monkeypatch, num_workers):
+    coordinator = CrawlCoordinator(num_workers=num_workers, crawl='crawl-env',
+                                   broker_path=str(tmp_path / 'broker.sqlite3'),
+                                   state_path=str(tmp_path / 'workers'), result_pipeline=ResultPipeline())
+    RecordingProcess.started = []
+    monkeypatch.setattr(os, 'cpu_count', lambda: 16)
+    monkeypatch.setattr(coordinator._context, 'Process', RecordingProcess)
+    return coordinator
+
+def test_workers_split_the_parsing_pool(tmp_path, monkeypatch):
+    coordinator = _recording_coordinator(tmp_path, monkeypatch, num_workers=4)
+    coordinator._spawn(0, [])
+
+    assert RecordingProcess.started == [('worker-0.1', '4')]
+
+def test_workers_beyond_the_active_domains_are_not_started(tmp_path, monkeypatch):
+    coordinator = _recording_coordinator(tmp_path, monkeypatch, num_workers=8)
+    coordinator.add_tasks(ScrapingTask(url=url, tier=ScrapingTier.TIER_1_GOVERNMENT)
+                          for url in ['https://www.cdc.gov/flu/', 'https://www.cdc.gov/mumps/', 'https://www.fda.gov/drugs/'])
+
+    # Two hosts: two workers, each parsing on half the cores instead of one eighth
+    asyncio.run(coordinator._scale_workers([]))
+    assert RecordingProcess.started == [('worker-0.1', '8'), ('worker-1.1', '8')]
+
+    # Tasks on three more hosts arrive mid-crawl: three more workers, sharing the cores five ways
+    coordinator.add_tasks(ScrapingTask(url=f'https://site{i}.example.org/', tier=ScrapingTier.TIER_1_GOVERNMENT)
+                          for i in range(3))
+    asyncio.run(coordinator._scale_workers([]))
+    assert RecordingProcess.started[2:] == [('worker-2.1', '3'), ('worker-3.1', '3'), ('worker-4.1', '3')]
+
+    # No new hosts: nothing more to start
+    asyncio.run(coordinator._scale_workers([]))
+    assert len(RecordingProcess.started) == 5
+
+def _leased_results(broker, worker, count):
+    broker.add_tasks(ScrapingTask(url=f'https://site{i}.example.org/page', tier=ScrapingTier.TIER_1_GOVERNMENT)
+                     for i in range(count))
+    broker.register_worker(worker)
+    return [ScrapingResult(task_id=str(task.id), url=task.url, success=True, content='page')
+            for task in broker.lease(worker, count)]
+
+def test_result_sink_completes_leases_in_batches(tmp_path):
+    broker = CrawlBroker('crawl-sink', str(tmp_path / 'broker.sqlite3'), domains_per_lease=10)
+    results = _leased_results(broker, 'worker-0.1', 5)
+    sink = BrokerResultSink(broker, 'worker-0.1', batch_size=2)
+    stranger = ScrapingResult(task_id='0', url='https://unleased.example.org/', success=True, content='page')
+
+    async def write(items):
+        for result in items:
+            await sink.write(result, 'tier_1')
+
+    asyncio.run(write(results[:3]))
+    # The first two went out as one batch; the third waits for the next batch or a flush
+    assert len(broker.take_results()) == 2
+    assert sink.records_written == 2
+
+    asyncio.run(write(results[3:] + [stranger]))
+    asyncio.run(sink.close())
+    assert [record['group'] for record in broker.take_results()] == ['tier_1'] * 3
+    assert (sink.records_written, sink.lost_leases) == (5, 1)
+    assert broker.is_finished()
+
+def test_worker_flushes_partial_batches_and_finishes(tmp_path):
+    broker = CrawlBroker('crawl-worker', str(tmp_path / 'broker.sqlite3'), domains_per_lease=10)
+    broker.add_tasks(ScrapingTask(url=f'https://site{i}.example.org/page', tier=ScrapingTier.TIER_1_GOVERNMENT)
+                     for i in range(3))
+
+    class PageScraper:
+        async def extract_content_from_url(self, url, session, attempt=0):
+            return ScrapingResult(task_id='', url=url, success=True, content='page')
+
+    worker = CrawlWorker(broker, 'worker-0.1', {ScrapingTier.TIER_1_GOVERNMENT: PageScraper()},
+                         concurrency=4, poll_interval=0.01)
+    # Fewer results than a sink batch: the feed has to flush them or the crawl never looks finished
+    summary = asyncio.run(asyncio.wait_for(worker.run(), timeout=30))
+
+    assert (summary['leased'], summary['completed'], summary['lost_leases']) == (3, 3, 0)
+    assert len(broker.take_results()) == 3
+    assert broker.is_finished()
@@ -0,0 +1,80 @@
+import asyncio
+
+from ai_scraper_core import (
+    AdaptiveRateLimiter, ContentQualityAI, IntelligentTaskScheduler, ScrapingPriority, ScrapingTask, ScrapingTier
+)
+from domain_credibility import DEFAULT_BASE_DELAY, DEFAULT_CREDIBILITY, DomainCredibilityResolver, host_labels
+
+def test_most_specific_suffix_wins():
+    resolver = DomainCredibilityResolver()
+
+    assert resolver.profile('nih.gov').base_delay == 3.5
+    assert resolver.profile('usa.gov').base_delay == 3.0
+    assert resolver.profile('nih.gov').credibility == 1.0
+    assert resolver.profile('usa.gov').credibility == 0.9
+    assert resolver.profile('cancer.org').credibility == 0.7
+    assert resolver.profile('cancer.org').base_delay == 1.5
+
+def test_subdomains_inherit_their_parent_suffix():
+    resolver = DomainCredibilityResolver()
+
+    assert resolver.profile('www.ncbi.nlm.nih.gov').base_delay == 3.5
+    assert resolver.profile('www.ncbi.nlm.nih.gov').priority_source
+    assert resolver.profile('med.stanford.edu').credibility == 1.0
+    assert resolver.profile('news.example.edu').credibility == 0.7
+    # Suffixes match whole labels only
+    assert resolver.profile('notnih.gov').base_delay == 3.0
+    assert not resolver.profile('notnih.gov').priority_source
+
+def test_ports_credentials_and_case_are_ignored():
+    resolver = DomainCredibilityResolver()
+
+    assert host_labels('User:Secret@WWW.CDC.gov:8443') == ('www', 'cdc', 'gov')
+    assert resolver.profile('user:secret@www.cdc.gov:8443') == resolver.profile('www.cdc.gov')
+    assert resolver.profile('WWW.NIH.GOV.') == resolver.profile('www.nih.gov')
+
+def test_unknown_domains_get_the_defaults():
+    resolver = DomainCredibilityResolver()
+
+    for netloc in ('example.com', 'localhost:8080', '[::1]:443', ''):
+        profile = resolver.profile(netloc)
+        assert profile.credibility == DEFAULT_CREDIBILITY
+        assert profile.base_delay == DEFAULT_BASE_DELAY
+        assert not profile.priority_source
+
+def test_profiles_are_cached_by_netloc():
+    resolver = DomainCredibilityResolver(cache_size=2)
+    resolver.profile('www.cdc.gov')
+    resolver.profile('www.cdc.gov')
+
+    assert resolver.get_stats() == {'hits': 1, 'misses': 1, 'cached_domains': 1}
+
+def test_quality_scoring_uses_the_resolved_credibility():
+    quality = ContentQualityAI()
+
+    assert quality._calculate_source_credibility('https://pubmed.ncbi.nlm.nih.gov/123/') == 1.0
+    assert quality._calculate_source_credibility('https://www.usa.gov/health') == 0.9
+    assert quality._calculate_source_credibility('https://www.webmd.com/flu') == 0.7
+    assert quality._calculate_source_credibility('https://blog.example.com/flu') == DEFAULT_CREDIBILITY
+
+def test_scheduler_boosts_priority_sources_only():
+    scheduler = IntelligentTaskScheduler()
+
+    def priority(url):
+        task = ScrapingTask(url=url, tier=ScrapingTier.TIER_6_MEDICAL_SITES, priority=ScrapingPriority.LOW)
+        return asyncio.run(scheduler._analyze_task_priority(task))
+
+    assert priority('https://www.mayoclinic.org/diseases') == ScrapingPriority.MEDIUM
+    assert priority('https://user@www.cdc.gov:443/flu') == ScrapingPriority.MEDIUM
+    assert priority('https://www.webmd.com/flu') == ScrapingPriority.LOW
+
+def test_rate_limiter_starts_from_the_resolved_base_delay():
+    limiter = AdaptiveRateLimiter()
+
+    def delay(domain):
+        return asyncio.run(limiter._calculate_adaptive_delay(domain, limiter.domain_stats[domain]))
+
+    assert delay('www.nih.gov') == 3.5
+    assert delay('www.who.int') == 4.0
+    assert delay('www.fda.gov:443') == 3.0
+    assert delay('example.com') == DEFAULT_BASE_DELAY
@@ -0,0 +1,195 @@
+import asyncio
+import xml.etree.ElementTree as ET
+from contextlib import asynccontextmanager
+
+import pytest
+
+import ncbi_scraper
+from ncbi_scraper import EUtilsAdvancedClient, NCBIRateGovernor, iter_xml_elements
+
+class ScriptedEUtils(EUtilsAdvancedClient):
+    """E-utilities client answering esearch/efetch from in-memory result sets keyed by query"""
+
+    def __init__(self, hits, failing_queries=(), empty_pages=()):
+        super().__init__(rate_governor=NCBIRateGovernor())
+        self.hits = hits
+        self.failing_queries = set(failing_queries)
+        self.empty_pages = set(empty_pages)
+        self.efetch_calls = []
+
+    async def eutils_request(self, endpoint, params, timeout=30, as_json=False):
+        query = params['term']
+        if query in self.failing_queries:
+            raise RuntimeError(f'esearch failed for {query}')
+        if query not in self.hits:
+            return {'esearchresult': {'count': '0'}}
+        return {'esearchresult': {'webenv': f'WE_{query}', 'querykey': '1', 'count': str(self.hits[query])}}
+
+    async def iter_eutils_elements(self, endpoint, params, tag, timeout=60):
+        self.efetch_calls.append(params)
+        query = params['WebEnv'][len('WE_'):]
+        if (query, params['retstart']) in self.empty_pages:
+            return
+        for n in range(params['retstart'], params['retstart'] + params['retmax']):
+            yield ET.fromstring(f'<PubmedArticle><MedlineCitation><PMID>{query}-{n}</PMID></MedlineCitation></PubmedArticle>')
+
+def _collect(stream):
+    async def run():
+        return [record async for record in stream]
+    return asyncio.run(run())
+
+def test_history_is_paged_by_reference():
+    client = ScriptedEUtils({'flu': 1200})
+    history = asyncio.run(client.search_with_history('pubmed', 'flu'))
+    assert history == {'webenv': 'WE_flu', 'query_key': '1', 'count': 1200}
+
+    articles = _collect(client.iter_pubmed_history(history, max_results=1000, batch_size=300))
+
+    assert [article['pmid'] for article in articles] == [f'flu-{n}' for n in range(1000)]
+    assert [(call['retstart'], call['retmax']) for call in client.efetch_calls] == [(0, 300), (300, 300), (600, 300), (900, 100)]
+    assert all(call['WebEnv'] == 'WE_flu' and call['query_key'] == '1' for call in client.efetch_calls)
+    assert all('id' not in call for call in client.efetch_calls)
+
+def test_paging_stops_at_the_first_empty_page():
+    client = ScriptedEUtils({'flu': 1000}, empty_pages={('flu', 300)})
+    history = asyncio.run(client.search_with_history('pubmed', 'flu'))
+
+    articles = _collect(client.iter_pubmed_history(history, batch_size=300))
+
+    assert len(articles) == 300
+    assert [call['retstart'] for call in client.efetch_calls] == [0, 300]
+
+def test_queries_fan_out_and_failures_are_counted():
+    client = ScriptedEUtils({'flu': 5, 'measles': 3, 'asthma': 4}, failing_queries={'broken'})
+
+    articles = _collect(client.stream_pubmed_queries(['flu', 'broken', 'measles', 'no hits', 'asthma'],
+                                                     concurrency=3))
+
+    pmids = sorted(article['pmid'] for article in articles)
+    assert pmids == sorted([f'flu-{n}' for n in range(5)] + [f'measles-{n}' for n in range(3)]
+                           + [f'asthma-{n}' for n in range(4)])
+    assert client.failed_queries == 1  # A query with no hits is not a failure
+
+PUBMED_SET = (
+    '<?xml version="1.0"?><PubmedArticleSet>'
+    + ''.join(f'<PubmedArticle><MedlineCitation><PMID>{n}</PMID><Article><ArticleTitle>Title {n}</ArticleTitle>'
+              f'</Article></MedlineCitation></PubmedArticle>' for n in range(5))
+    + '</PubmedArticleSet>'
+).encode()
+
+async def _chunks(body, size=7):
+    # Small chunks split the body mid-tag and mid-text
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+        self.content = self
+
+    def iter_chunked(self, size):
+        return _chunks(self.body)
+
+class StreamingEUtils(EUtilsAdvancedClient):
+    """E-utilities client whose efetch bodies stream through the real XML parser in small chunks"""
+
+    def __init__(self, bodies):
+        super().__init__(rate_governor=NCBIRateGovernor())
+        self.bodies = bodies
+
+    async def eutils_request(self, endpoint, params, timeout=30, as_json=False):
+        return {'esearchresult': {'webenv': params['term'], 'querykey': '1', 'count': '5'}}
+
+    @asynccontextmanager
+    async def _eutils_get(self, endpoint, params, timeout=30):
+        yield _Response(self.bodies[params.get('WebEnv') or params['id']])
+
+class _RootRecordingParser(ET.XMLPullParser):
+    """Pull parser that keeps a handle on the document root so tests can inspect the partial tree"""
+
+    roots = []
+
+    def read_events(self):
+        for event, elem in super().read_events():
+            if event == 'start' and not self.roots:
+                self.roots.append(elem)
+            yield event, elem
+
+def test_streamed_articles_are_yielded_and_detached(monkeypatch):
+    _RootRecordingParser.roots = []
+    monkeypatch.setattr(ncbi_scraper.ET, 'XMLPullParser', _RootRecordingParser)
+
+    async def run():
+        pmids = []
+        async for elem in iter_xml_elements(_chunks(PUBMED_SET), 'PubmedArticle'):
+            pmids.append(elem.find('.//PMID').text)
+            assert list(_RootRecordingParser.roots[0]) == [elem]  # Earlier articles are already gone
+        return pmids
+
+    assert asyncio.run(run()) == ['0', '1', '2', '3', '4']
+    assert len(_RootRecordingParser.roots[0]) == 0
+
+def test_truncated_body_raises():
+    async def run():
+        return [elem async for elem in iter_xml_elements(_chunks(PUBMED_SET[:-40]), 'PubmedArticle')]
+
+    with pytest.raises(ET.ParseError):
+        asyncio.run(run())
+
+def test_truncated_efetch_page_counts_as_a_failed_query():
+    client = StreamingEUtils({'flu': PUBMED_SET, 'measles': PUBMED_SET[:-40]})
+
+    articles = _collect(client.stream_pubmed_queries(['flu', 'measles'], concurrency=2))
+
+    # Five complete articles from each query, except the last one cut off by the truncation
+    assert len(articles) == 9
+    assert client.failed_queries == 1
+
+def test_section_text_excludes_nested_sections():
+    article_elem = ET.fromstring(
+        '<article><body><sec><title>Methods</title><p>Outer text.</p>'
+        '<sec><title>Sampling</title><p>Inner text.</p></sec><p>Closing text.</p></sec></body></article>'
+    )
+
+    article = EUtilsAdvancedClient(rate_governor=NCBIRateGovernor())._parse_pmc_article(article_elem, '1')
+
+    assert [section['title'] for section in article['sections']] == ['Methods', 'Sampling']
+    assert article['sections'][0]['content'] == 'MethodsOuter text.Closing text.'
+    assert article['sections'][1]['content'] == 'SamplingInner text.'
+    assert article['full_text'].count('Inner text.') == 1
+
+PMC_ARTICLES = [
+    '<article><front><article-meta><article-id pub-id-type="pmid">111</article-id>'
+    '<article-id pub-id-type="pmc">PMC7001</article-id><title-group><article-title>First</article-title>'
+    '</title-group></article-meta></front><body><sec><title>Intro</title><p>One.</p></sec></body></article>',
+    '<article><front><article-meta><article-id pub-id-type="pmcid">pmc7002 </article-id>'
+    '<title-group><article-title>Second</article-title></title-group></article-meta></front></article>',
+    '<article><front><article-meta><article-id pub-id-type="pmc">7003</article-id>'
+    '<title-group><article-title>Third</article-title></title-group></article-meta></front></article>'
+]
+
+def _pmc_set(*articles):
+    return ('<?xml version="1.0"?><pmc-articleset>' + ''.join(articles) + '</pmc-articleset>').encode()
+
+def test_pmc_articleset_is_split_into_records():
+    client = StreamingEUtils({'7001,7002': _pmc_set(*PMC_ARTICLES[:2]), '7003': _pmc_set(PMC_ARTICLES[2])})
+
+    articles = _collect(client.fetch_pmc_articles(['7001', '7002', '7003'], ids_per_request=2))
+
+    assert sorted((article['pmc_id'], article['title']) for article in articles) == [
+        ('7001', 'First'), ('7002', 'Second'), ('7003', 'Third')
+    ]
+    first = next(article for article in articles if article['pmc_id'] == '7001')
+    assert first['sections'] == [{'title': 'Intro', 'content': 'IntroOne.'}]
+    assert client.failed_queries == 0
+
+def test_pmc_article_id_forms():
+    def article(*ids):
+        return ET.fromstring('<article><front><article-meta>' + ''.join(
+            f'<article-id pub-id-type="{kind}">{value}</article-id>' for kind, value in ids
+        ) + '</article-meta></front></article>')
+
+    assert ncbi_scraper._pmc_article_id(article(('pmid', '111'), ('pmc', 'PMC7001'))) == '7001'
+    assert ncbi_scraper._pmc_article_id(article(('pmcid', ' pmc7002 '))) == '7002'
+    assert ncbi_scraper._pmc_article_id(article(('pmc', '7003'))) == '7003'
+    assert ncbi_scraper._pmc_article_id(article(('pmid', '111'), ('doi', '10.1/x'))) == ''
@@ -0,0 +1,81 @@
+import asyncio
+
+from crawl_checkpoint import CrawlCheckpoint
+from fda_scraper import FDAAdvancedScraper
+
+URLS = [f'https://www.fda.gov/drugs/page-{i}' for i in range(6)]
+
+async def _discover():
+    for url in URLS:
+        yield url
+
+def _scraper(tmp_path, failing):
+    scraper = FDAAdvancedScraper()
+    scraper.checkpoint = CrawlCheckpoint(str(tmp_path / 'checkpoints.sqlite3'))
+    fetched = []
+
+    async def scrape_url(url, session, content_type):
+        fetched.append(url)
+        if url in failing:
+            return url, False, None
+        return url, True, {'url': url, 'content_type': content_type}
+
+    scraper._scrape_fda_url = scrape_url
+    return scraper, fetched
+
+def test_section_streams_discovery_and_resumes_only_unfinished_urls(tmp_path):
+    scraper, fetched = _scraper(tmp_path, failing={URLS[2]})
+    records = asyncio.run(scraper._execute_fda_section_scraping(_discover(), 'drugs', "Drugs"))
+
+    assert sorted(fetched) == sorted(URLS)
+    assert len(records) == 5
+    assert scraper.database_stats['drugs']['errors'] == 1
+
+    # A later run rediscovers everything but fetches only the URL that failed
+    resumed, refetched = _scraper(tmp_path, failing=set())
+    records = asyncio.run(resumed._execute_fda_section_scraping(_discover(), 'drugs', "Drugs"))
+
+    assert refetched == [URLS[2]]
+    assert [record['url'] for record in records] == [URLS[2]]
+    assert resumed.database_stats['drugs']['successful'] == 6
+
+def test_section_limit_stops_after_enough_completed_urls(tmp_path):
+    scraper, fetched = _scraper(tmp_path, failing=set())
+    records = asyncio.run(scraper._execute_fda_section_scraping(_discover(), 'tobacco', "Tobacco",
+                                                                limit=2, window_size=1))
+
+    assert len(records) == 2
+    assert len(fetched) == 2
+
+def test_failed_window_loop_stops_discovery_and_checkpoints(tmp_path):
+    scraper, _ = _scraper(tmp_path, failing=set())
+    discovery_closed = asyncio.Event()
+
+    async def endless_discovery():
+        try:
+            # One full frontier write batch reaches the window; discovery is still running when the loop fails
+            for i in range(500):
+                yield f'https://www.fda.gov/medical-devices/page-{i}'
+            await asyncio.Event().wait()
+        finally:
+            discovery_closed.set()
+
+    def fail_on_completion(*args, **kwargs):
+        raise RuntimeError('checkpoint write failed')
+
+    scraper.checkpoint.mark_completed = fail_on_completion
+
+    async def run():
+        try:
+            await scraper._execute_fda_section_scraping(endless_discovery(), 'devices', "Devices")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError('the loop failure should propagate')
+        await asyncio.wait_for(discovery_closed.wait(), timeout=1.0)
+
+    asyncio.run(run())
+
+    frontier = scraper.checkpoint.section_frontier('fda', 'devices')
+    assert frontier.get_stats()['discovery_running'] is False
+    assert scraper.checkpoint.load_stats('fda', 'devices')['processed'] == 1
@@ -0,0 +1,30 @@
+import pytest
+
+from benchmark_extractors import _generate_page
+from html_extractors import extract_structured_data, extract_structured_data_lxml
+
+URL = 'https://www.cdc.gov/flu/about/index.html'
+
+EDGE_PAGES = {
+    'nested inline tags': '<html><head><title>Flu</title></head><body><h1>Influenza <em>A</em></h1>'
+                          '<p>Fever <b>and <i>cough</i></b> are common.</p></body></html>',
+    'script and comment inside text': '<html><body><p>Before<script>var x = 1;</script> after'
+                                      '<!-- hidden --> end.</p><h2>Care</h2></body></html>',
+    'entities and whitespace': '<html><head><title>A &amp; B</title></head><body>'
+                               '<p>Dose &lt; 5&nbsp;mg\n\n  daily &mdash; see &quot;label&quot;.</p></body></html>',
+    'relative and anchor links': '<html><body><a href="../vaccines/">Vaccines</a><a href="#top">Top</a>'
+                                 '<a href="https://www.nih.gov/">NIH</a><a>no href</a></body></html>',
+    'nested lists': '<html><body><ul><li>One<ul><li>One a</li><li>One b</li></ul></li><li>Two</li></ul>'
+                    '<ol><li>First</li></ol></body></html>',
+    'missing title and body text': '<html><head></head><body></body></html>',
+}
+
+@pytest.mark.parametrize('source', ['cdc', 'medlineplus', 'fda'])
+def test_lxml_extractor_matches_beautifulsoup_on_generated_pages(source):
+    page = _generate_page(source, 5)
+    assert extract_structured_data_lxml(page, URL) == extract_structured_data(page, URL)
+
+@pytest.mark.parametrize('name', sorted(EDGE_PAGES))
+def test_lxml_extractor_matches_beautifulsoup_on_edge_cases(name):
+    page = EDGE_PAGES[name]
+    assert extract_structured_data_lxml(page, URL) == extract_structured_data(page, URL)
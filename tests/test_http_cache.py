@@ -0,0 +1,50 @@
+from http_cache import HTTPValidatorCache, unchanged_metadata
+
+URL = 'https://www.cdc.gov/flu/'
+HEADERS = {'ETag': '"abc123"', 'Last-Modified': 'Wed, 01 Oct 2025 10:00:00 GMT'}
+EXTRACTED = {'title': 'Influenza', 'sections': ['Symptoms', 'Prevention']}
+
+def test_stored_validators_become_conditional_headers_after_reopen(tmp_path):
+    path = str(tmp_path / 'validators.sqlite3')
+    cache = HTTPValidatorCache(path)
+    assert cache.conditional_headers(URL) == {}
+
+    cache.store(URL, HEADERS, 42, EXTRACTED, quality_score=0.8, content_length=1000)
+    cache.close()
+
+    reopened = HTTPValidatorCache(path)
+    assert reopened.conditional_headers(URL) == {
+        'If-None-Match': '"abc123"',
+        'If-Modified-Since': 'Wed, 01 Oct 2025 10:00:00 GMT'
+    }
+    cached = reopened.get(URL)
+    assert (cached.content_digest, cached.quality_score, cached.extracted_data) == (42, 0.8, EXTRACTED)
+
+def test_304_reuses_the_previous_extraction(tmp_path):
+    cache = HTTPValidatorCache(str(tmp_path / 'validators.sqlite3'))
+    cache.store(URL, HEADERS, 42, EXTRACTED)
+
+    cached = cache.lookup_unchanged(URL, 304)
+    assert cached.extracted_data == EXTRACTED
+    assert unchanged_metadata(cached)['unchanged'] is True
+    assert (cache.hits, cache.revalidated) == (1, 1)
+
+    # No validator to revalidate against: nothing to reuse
+    assert cache.lookup_unchanged('https://www.cdc.gov/measles/', 304) is None
+
+def test_200_with_same_digest_is_unchanged_and_new_digest_is_not(tmp_path):
+    cache = HTTPValidatorCache(str(tmp_path / 'validators.sqlite3'))
+    cache.store(URL, {}, 42, EXTRACTED)
+
+    assert cache.lookup_unchanged(URL, 200, 42).extracted_data == EXTRACTED
+    assert cache.lookup_unchanged(URL, 200, 43) is None
+    assert cache.lookup_unchanged(URL, 200) is None
+    assert (cache.hits, cache.revalidated) == (1, 0)
+
+def test_failed_extractions_are_not_cached(tmp_path):
+    cache = HTTPValidatorCache(str(tmp_path / 'validators.sqlite3'))
+    cache.store(URL, HEADERS, 42, {'error': 'parse failed'})
+    cache.store('https://www.cdc.gov/measles/', HEADERS, 43, {})
+
+    assert cache.get_stats()['entries'] == 0
+    assert cache.lookup_unchanged(URL, 304) is None
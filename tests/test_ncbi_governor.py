@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import ncbi_scraper
+from ncbi_scraper import NCBIRateGovernor
+
+def test_recent_permits_stay_within_the_metrics_window(monkeypatch):
+    clock = [1000.0]
+
+    async def advance(seconds):
+        clock[0] += seconds
+
+    monkeypatch.setattr(ncbi_scraper.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(ncbi_scraper.asyncio, 'sleep', advance)
+
+    governor = NCBIRateGovernor(api_key='key', metrics_window=2.0)
+
+    async def run():
+        for _ in range(500):
+            await governor.acquire()
+
+    asyncio.run(run())
+
+    # About 10 req/s over a 2 s window (plus the slot just reserved), however long the crawl has been running
+    assert governor.requests_made == 500
+    assert len(governor._recent_permits) <= 25
+
+def _patch_clock(monkeypatch, advance_on_sleep=True):
+    clock = [1000.0]
+
+    async def sleep(seconds):
+        if advance_on_sleep:
+            clock[0] += seconds
+
+    monkeypatch.setattr(ncbi_scraper.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(ncbi_scraper.asyncio, 'sleep', sleep)
+    return clock
+
+def _acquire_in_turn(governor, count):
+    async def run():
+        return [await governor.acquire() for _ in range(count)]
+    return asyncio.run(run())
+
+def test_slots_are_a_third_of_a_second_apart_without_a_key(monkeypatch):
+    clock = _patch_clock(monkeypatch)
+    governor = NCBIRateGovernor()
+
+    waits = _acquire_in_turn(governor, 4)
+
+    assert waits == pytest.approx([0.0, 1 / 3, 1 / 3, 1 / 3])
+    assert clock[0] == pytest.approx(1001.0)
+
+def test_slots_are_a_tenth_of_a_second_apart_with_a_key(monkeypatch):
+    _patch_clock(monkeypatch)
+    governor = NCBIRateGovernor(api_key='key')
+
+    assert _acquire_in_turn(governor, 4) == pytest.approx([0.0, 0.1, 0.1, 0.1])
+
+    governor.set_api_key(None)
+    assert governor.limit_per_second == NCBIRateGovernor.BASE_RATE
+
+def test_concurrent_callers_get_distinct_slots(monkeypatch):
+    _patch_clock(monkeypatch, advance_on_sleep=False)
+    governor = NCBIRateGovernor(api_key='key')
+
+    async def run():
+        return await asyncio.gather(*(governor.acquire() for _ in range(5)))
+
+    waits = asyncio.run(run())
+
+    assert sorted(waits) == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+    assert len(set(governor._recent_permits)) == 5
+
+def test_throttling_pauses_and_halves_the_rate_until_successes_recover_it(monkeypatch):
+    clock = _patch_clock(monkeypatch)
+    governor = NCBIRateGovernor()
+    _acquire_in_turn(governor, 1)
+
+    governor.record_response(429, '2')
+    assert governor.requests_per_second == pytest.approx(1.5)
+    assert governor.throttled_responses == 1
+
+    # The next slot waits out the Retry-After pause, then slots are spaced at the halved rate
+    waits = _acquire_in_turn(governor, 2)
+    assert waits == pytest.approx([2.0, 1 / 1.5])
+    assert clock[0] == pytest.approx(1000.0 + 2.0 + 1 / 1.5)
+
+    for _ in range(3):
+        governor.record_response(200)
+    assert 1.5 < governor.requests_per_second < 3.0
+    for _ in range(5):
+        governor.record_response(200)
+    assert governor.requests_per_second == NCBIRateGovernor.BASE_RATE
@@ -0,0 +1,73 @@
+import random
+
+from near_duplicate_index import MinHashLSHIndex
+
+WORDS = ['influenza', 'fever', 'cough', 'vaccine', 'symptom', 'treatment', 'virus', 'season', 'risk', 'adult',
+         'child', 'hospital', 'antiviral', 'dose', 'prevention', 'outbreak', 'test', 'care', 'health', 'report']
+
+def _text(seed, length=400):
+    rng = random.Random(seed)
+    return [rng.choice(WORDS) for _ in range(length)]
+
+def _page(words, chrome='nav'):
+    return f'<html><head><script>var {chrome} = 1;</script></head><body><div class="{chrome}">' \
+           + ' '.join(words) + '</div></body></html>'
+
+def _mutate(words, fraction, seed):
+    rng = random.Random(seed)
+    words = list(words)
+    for i in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[i] = f'edit{i}'
+    return words
+
+def test_same_text_in_different_markup_is_a_near_duplicate():
+    index = MinHashLSHIndex(max_documents=100)
+    words = _text(1)
+    index.insert(index.compute_signature(_page(words)), 'https://www.cdc.gov/flu/')
+
+    match = index.query(index.compute_signature(_page(words, chrome='header')))
+    assert match is not None
+    key, similarity = match
+    assert key == 'https://www.cdc.gov/flu/'
+    assert similarity == 1.0
+
+def test_only_pages_above_the_similarity_threshold_match():
+    index = MinHashLSHIndex(max_documents=100, similarity_threshold=0.85)
+    words = _text(2)
+    index.insert(index.compute_signature(_page(words)), 'original')
+
+    # One word in a hundred changed keeps most shingles; one in four changes most of them
+    assert index.query(index.compute_signature(_page(_mutate(words, 0.01, seed=3)))) is not None
+    assert index.query(index.compute_signature(_page(_mutate(words, 0.25, seed=4)))) is None
+    assert index.query(index.compute_signature(_page(_text(5)))) is None
+
+def test_threshold_is_the_cut_off_for_estimated_similarity():
+    words = _text(6)
+    edited = _page(_mutate(words, 0.03, seed=7))
+
+    loose = MinHashLSHIndex(max_documents=100, similarity_threshold=0.3)
+    loose.insert(loose.compute_signature(_page(words)), 'original')
+    _, similarity = loose.query(loose.compute_signature(edited))
+    assert 0.3 <= similarity < 1.0
+
+    strict = MinHashLSHIndex(max_documents=100, similarity_threshold=min(1.0, similarity + 0.01))
+    strict.insert(strict.compute_signature(_page(words)), 'original')
+    assert strict.query(strict.compute_signature(edited)) is None
+
+def test_oldest_documents_are_evicted_at_capacity():
+    index = MinHashLSHIndex(max_documents=3)
+    pages = [_page(_text(seed)) for seed in range(10, 15)]
+    for i, page in enumerate(pages):
+        index.insert(index.compute_signature(page), f'page-{i}')
+
+    assert index.get_stats()['documents_indexed'] == 3
+    assert index.evictions == 2
+    assert index.query(index.compute_signature(pages[0])) is None
+    assert index.query(index.compute_signature(pages[4]))[0] == 'page-4'
+
+def test_pages_without_text_are_ignored():
+    index = MinHashLSHIndex(max_documents=10)
+    assert index.compute_signature('') is None
+    assert index.compute_signature('<html><script>var x = 1;</script></html>') is None
+    index.insert(None, 'empty')
+    assert index.get_stats()['documents_indexed'] == 0
@@ -0,0 +1,45 @@
+import asyncio
+
+from fda_scraper import OpenFDAAdvancedClient
+
+class ScriptedClient(OpenFDAAdvancedClient):
+    """OpenFDA client answering request_page from an in-memory result set"""
+
+    def __init__(self, total: int, failing_skips=()):
+        super().__init__()
+        self.total = total
+        self.failing_skips = set(failing_skips)
+        self.requested_skips = []
+
+    async def request_page(self, url, params=None):
+        skip = (params or {}).get('skip', 0)
+        self.requested_skips.append(skip)
+        self.api_calls += 1
+        if skip in self.failing_skips:
+            return None, None
+        size = min(self.MAX_PAGE_SIZE, self.total - skip)
+        return {'meta': {'results': {'total': self.total}}, 'results': [{'n': skip + i} for i in range(size)]}, None
+
+def _page_through(client):
+    async def run():
+        partitions = asyncio.Queue()
+        return [record async for record in client._iter_partition('https://api.fda.gov/x.json', '', None, ('', None), partitions)]
+    return asyncio.run(run())
+
+def test_complete_partition_is_not_counted_as_failed():
+    client = ScriptedClient(total=2500)
+    assert len(_page_through(client)) == 2500
+    assert client.failed_requests == 0
+
+def test_failed_page_counts_the_truncated_partition():
+    client = ScriptedClient(total=3500, failing_skips={2000})
+    records = _page_through(client)
+
+    assert len(records) == 2000
+    assert client.requested_skips == [0, 1000, 2000]
+    assert client.failed_requests == 1
+
+def test_failed_first_page_is_counted():
+    client = ScriptedClient(total=10, failing_skips={0})
+    assert _page_through(client) == []
+    assert client.failed_requests == 1
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from html_extractors import EXTRACTORS, ParsingStage, extract_structured_data_lxml
+
+URL = 'https://www.cdc.gov/flu/index.html'
+PAGE = '<html><head><title>Flu</title></head><body><h1>Influenza</h1><p>' + 'Fever and cough. ' * 10 + '</p></body></html>'
+
+def _crash(content, url):
+    os._exit(1)  # Stands in for a worker killed by the OOM killer or a segfault
+
+def test_pool_and_inline_parsing_match_the_extractor():
+    expected = extract_structured_data_lxml(PAGE, URL)
+
+    pooled = ParsingStage(max_workers=1)
+    try:
+        assert asyncio.run(pooled.parse('lxml', PAGE, URL)) == expected
+        assert pooled.get_stats()['parsed_in_pool'] == 1
+    finally:
+        pooled.close()
+
+    inline = ParsingStage(max_workers=0)
+    assert asyncio.run(inline.parse('lxml', PAGE, URL)) == expected
+    assert inline.get_stats()['parsed_inline'] == 1
+    assert inline._executor is None
+
+def test_page_is_retried_on_a_fresh_pool_after_a_worker_dies():
+    stage = ParsingStage(max_workers=1)
+    try:
+        asyncio.run(stage.parse('lxml', PAGE, URL))
+        broken = stage._executor
+        for process in list(broken._processes.values()):
+            process.kill()
+            process.join()
+
+        assert asyncio.run(stage.parse('lxml', PAGE, URL)) == extract_structured_data_lxml(PAGE, URL)
+        assert stage._executor is not broken
+    finally:
+        stage.close()
+
+def test_broken_pool_is_replaced(monkeypatch):
+    # Workers are forked after the crashing extractor is registered, so they can find it by name
+    monkeypatch.setitem(EXTRACTORS, 'crash', _crash)
+    stage = ParsingStage(max_workers=1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(stage.parse('crash', PAGE, URL))
+        assert stage._executor is None
+
+        assert asyncio.run(stage.parse('lxml', PAGE, URL)) == extract_structured_data_lxml(PAGE, URL)
+    finally:
+        stage.close()
+
+def test_in_flight_parses_are_limited_to_max_pending(monkeypatch):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow(content, url):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return {'url': url}
+
+    monkeypatch.setitem(EXTRACTORS, 'slow', slow)
+    stage = ParsingStage(max_workers=8, max_pending=2)
+    stage._executor = ThreadPoolExecutor(max_workers=8)  # Threads share the patched registry
+
+    async def parse_many():
+        return await asyncio.gather(*(stage.parse('slow', PAGE, f'{URL}?page={i}') for i in range(10)))
+
+    try:
+        results = asyncio.run(parse_many())
+    finally:
+        stage.close()
+
+    assert len(results) == 10
+    assert peak == 2
+    assert stage.get_stats()['parsed_in_pool'] == 10
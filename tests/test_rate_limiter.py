@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+import ai_scraper_core
+from ai_scraper_core import AdaptiveRateLimiter
+
+URL = 'https://www.cdc.gov/flu/index.html'
+BASE_INTERVAL = 3.0  # Crawl delay for cdc.gov
+
+_real_sleep = asyncio.sleep
+
+class FakeClock:
+    """Virtual monotonic clock; sleepers wake in deadline order when the test advances it"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self._sleepers = []
+        self._sequence = itertools.count()
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + delay, next(self._sequence), future))
+        await future
+
+    async def run(self, *coroutines):
+        """Run coroutines to completion, jumping the clock to each sleeper's deadline"""
+
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        while not all(task.done() for task in tasks):
+            for _ in range(5):
+                await _real_sleep(0)
+            if self._sleepers:
+                deadline, _, future = heapq.heappop(self._sleepers)
+                self.now = max(self.now, deadline)
+                future.set_result(None)
+        return [task.result() for task in tasks]
+
+def _limiter(monkeypatch, burst_capacity=2):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_scraper_core, 'time', clock)
+    monkeypatch.setattr(ai_scraper_core.asyncio, 'sleep', clock.sleep)
+    return AdaptiveRateLimiter(burst_capacity=burst_capacity), clock
+
+def test_burst_permits_are_granted_immediately(monkeypatch):
+    limiter, clock = _limiter(monkeypatch, burst_capacity=3)
+
+    waits = asyncio.run(clock.run(*(limiter.wait_for_permit(URL) for _ in range(3))))
+
+    assert waits == [0.0, 0.0, 0.0]
+    assert clock.sleeps == []
+
+def test_permit_after_the_burst_waits_one_interval(monkeypatch):
+    limiter, clock = _limiter(monkeypatch)
+
+    async def take_three():
+        return [await limiter.wait_for_permit(URL) for _ in range(3)]
+
+    waits, = asyncio.run(clock.run(take_three()))
+
+    assert waits == [0.0, 0.0, BASE_INTERVAL]
+    assert clock.sleeps == [BASE_INTERVAL]
+    assert clock.now == 1000.0 + BASE_INTERVAL
+
+def test_concurrent_waiters_are_released_in_arrival_order(monkeypatch):
+    limiter, clock = _limiter(monkeypatch)
+    released = []
+
+    async def waiter(i):
+        await limiter.wait_for_permit(URL)
+        released.append((i, clock.now))
+
+    asyncio.run(clock.run(*(waiter(i) for i in range(6))))
+
+    assert [i for i, _ in released] == list(range(6))
+    assert [at - 1000.0 for _, at in released] == [0.0, 0.0, 3.0, 6.0, 9.0, 12.0]
+
+def test_acquire_permit_refuses_until_the_domain_is_free(monkeypatch):
+    limiter, clock = _limiter(monkeypatch)
+
+    async def acquire():
+        return await limiter.acquire_permit(URL)
+
+    assert asyncio.run(acquire()) and asyncio.run(acquire())
+    assert not asyncio.run(acquire())
+
+    clock.now += BASE_INTERVAL
+    assert asyncio.run(acquire())
+
+def test_reserved_permits_do_not_count_as_failures(monkeypatch):
+    limiter, clock = _limiter(monkeypatch)
+
+    async def reserve(count):
+        for _ in range(count):
+            assert await limiter.acquire_permit(URL)
+            clock.now += BASE_INTERVAL
+
+    asyncio.run(reserve(12))
+
+    stats = limiter.domain_stats['www.cdc.gov']
+    assert stats['total_requests'] == 12
+    assert limiter.domain_interval['www.cdc.gov'] == BASE_INTERVAL
+
+def test_interval_adapts_to_completed_responses():
+    limiter = AdaptiveRateLimiter()
+
+    for _ in range(6):
+        limiter.record_request_result(URL, True, 0.2)
+    for _ in range(6):
+        limiter.record_request_result(URL, False, 0.2, status_code=404)
+        limiter.domain_stats['www.cdc.gov']['consecutive_errors'] = 0
+    limiter.domain_stats['www.cdc.gov']['rate_limit_detected'] = False
+
+    interval = asyncio.run(limiter._calculate_adaptive_delay('www.cdc.gov', limiter.domain_stats['www.cdc.gov']))
+    assert interval == BASE_INTERVAL * 2.0
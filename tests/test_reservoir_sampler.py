@@ -0,0 +1,78 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from fda_scraper import AdverseEventAnalytics, OpenFDAAdvancedClient
+from reservoir_sampler import StratifiedReservoirSampler
+
+def _stratum(item):
+    return item[0]
+
+def test_capacity_is_respected_per_stratum():
+    sampler = StratifiedReservoirSampler(5, _stratum, seed=7)
+    sampler.extend([('a', i) for i in range(1000)] + [('b', i) for i in range(3)])
+
+    samples = sampler.samples()
+    assert len(samples['a']) == 5 and len(set(samples['a'])) == 5
+    assert sorted(samples['b']) == [('b', 0), ('b', 1), ('b', 2)]
+    assert sampler.seen_counts() == {'a': 1000, 'b': 3}
+    assert sampler.get_stats()['items_sampled'] == 8
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        StratifiedReservoirSampler(0, _stratum)
+
+def test_every_item_is_equally_likely_within_its_stratum():
+    runs, capacity = 4000, 5
+    stream = [('a', i) for i in range(50)] + [('b', i) for i in range(12)]
+    # Interleave the strata so each reservoir sees its items among the other's
+    stream = sorted(stream, key=lambda item: item[1] % 7)
+
+    inclusions = Counter()
+    for seed in range(runs):
+        sampler = StratifiedReservoirSampler(capacity, _stratum, seed=seed)
+        sampler.extend(stream)
+        for items in sampler.samples().values():
+            inclusions.update(items)
+
+    for stratum, size in (('a', 50), ('b', 12)):
+        expected = runs * capacity / size
+        counts = [inclusions[(stratum, i)] for i in range(size)]
+        assert sum(counts) == runs * capacity
+        # Pearson chi-square against the uniform inclusion rate; 0.999 quantile for 49 dof is about 85
+        chi_square = sum((count - expected) ** 2 / expected for count in counts)
+        assert chi_square < 90, (stratum, chi_square)
+        assert max(counts) < expected * 1.25 and min(counts) > expected * 0.75
+
+class ShallowSkipClient(OpenFDAAdvancedClient):
+    """OpenFDA client with a small skip window that records the pages sample_events asks for"""
+
+    MAX_SKIP = 500
+
+    def __init__(self):
+        super().__init__()
+        self.requested = []
+
+    async def request_page(self, url, params=None):
+        self.requested.append((params['search'], params['skip']))
+        day = params['search'].split(':')[1]
+        return {'results': [{'receivedate': day, 'skip': params['skip'], 'n': i} for i in range(params['limit'])]}, None
+
+def test_sample_events_only_requests_pages_within_the_skip_window():
+    client = ShallowSkipClient()
+    analytics = AdverseEventAnalytics(client, seed=3)
+    events_per_day = [
+        {'time': '20240105', 'count': 100000},  # far deeper than the skip window
+        {'time': '20240212', 'count': 250}
+    ]
+
+    strata = asyncio.run(analytics.sample_events(events_per_day, per_stratum=1000, page_size=100))
+
+    january = sorted(skip for search, skip in client.requested if search.endswith('20240105'))
+    february = sorted(skip for search, skip in client.requested if search.endswith('20240212'))
+    assert january == [0, 100, 200, 300, 400, 500]
+    assert february == [0, 100, 200]
+    assert strata['202401']['population'] == 100000
+    assert strata['202401']['sample_size'] == 600
+    assert strata['202402']['sample_size'] == 300
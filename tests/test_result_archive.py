@@ -0,0 +1,72 @@
+import asyncio
+import glob
+import os
+from datetime import datetime
+
+from ai_scraper_core import ScrapingResult
+from blob_store import ContentBlobStore
+from result_archive import ResultArchive, ResultArchiveWriter
+
+DAY = datetime(2025, 10, 1, 12, 0)
+
+def _result(i, host, quality, **kwargs):
+    return ScrapingResult(task_id=str(i), url=f'https://{host}/page-{i}', success=True, quality_score=quality,
+                          extracted_data={'title': f'Page {i}'}, timestamp=DAY, **kwargs)
+
+def _parquet_files(root):
+    return sorted(glob.glob(os.path.join(root, '**', '*.parquet'), recursive=True))
+
+def test_buffered_partitions_are_written_on_close(tmp_path):
+    root = str(tmp_path / 'archive')
+    writer = ResultArchiveWriter(root)
+
+    async def write_all():
+        for i in range(6):
+            await writer.write(_result(i, 'www.cdc.gov' if i % 2 else 'medlineplus.gov', 0.1 * i), group='tier_1')
+        assert _parquet_files(root) == []
+        await writer.close()
+
+    asyncio.run(write_all())
+
+    files = _parquet_files(root)
+    assert len(files) == 2
+    assert any(os.path.join('tier=tier_1', 'source=www.cdc.gov', 'date=2025-10-01') in path for path in files)
+    assert not glob.glob(os.path.join(root, '**', '.*.tmp'), recursive=True)
+
+    archive = ResultArchive(root)
+    assert archive.count() == 6
+    assert archive.count(sources=['www.cdc.gov']) == 3
+    assert archive.count(min_quality=0.3, tiers=['tier_1']) == 3
+    assert archive.count(since='2025-10-02') == 0
+
+def test_full_partitions_flush_before_close(tmp_path):
+    root = str(tmp_path / 'archive')
+    writer = ResultArchiveWriter(root, rows_per_file=2)
+
+    async def write_three():
+        for i in range(3):
+            await writer.write(_result(i, 'www.cdc.gov', 0.5), group='tier_1')
+
+    asyncio.run(write_three())
+    assert len(_parquet_files(root)) == 1
+    assert writer.records_written == 2
+
+    asyncio.run(writer.close())
+    assert len(_parquet_files(root)) == 2
+    assert ResultArchive(root).count() == 3
+
+def test_results_round_trip_with_content_from_the_blob_store(tmp_path):
+    root = str(tmp_path / 'archive')
+    blob_store = ContentBlobStore(str(tmp_path / 'blobs'))
+    page = '<html><body>Influenza symptoms</body></html>'
+    digest = blob_store.put(page, 'www.cdc.gov')
+
+    writer = ResultArchiveWriter(root)
+    asyncio.run(writer.write(_result(1, 'www.cdc.gov', 0.7, content_digest=digest), group='tier_1'))
+    asyncio.run(writer.close())
+
+    (result,) = ResultArchive(root, blob_store=blob_store).iter_results()
+    assert result.url == 'https://www.cdc.gov/page-1'
+    assert result.content == page
+    assert result.extracted_data == {'title': 'Page 1'}
+    assert result.quality_score == 0.7
@@ -0,0 +1,224 @@
+import asyncio
+import json
+
+import pytest
+
+from ai_scraper_core import ScrapingResult
+from result_pipeline import JSONLResultSink, ResultPipeline, ResultStatistics, interleave_by_host, iter_sliding_window
+
+def _result(i, url='https://www.cdc.gov/flu/', success=True, quality=0.0, size=0, content=None):
+    return ScrapingResult(task_id=f'task-{i}', url=url, success=success, quality_score=quality,
+                          content_length=size, processing_time=0.5, content=content)
+
+class _RecordingSink:
+    def __init__(self):
+        self.written = []
+        self.closed = False
+
+    async def write(self, result, group=None):
+        self.written.append((result.task_id, group))
+
+    async def close(self):
+        self.closed = True
+
+def test_statistics_histograms_and_counters():
+    statistics = ResultStatistics()
+    for i, (quality, size) in enumerate([(0.2, 500), (0.4, 5000), (0.55, 50000), (0.7, 200000), (0.9, 1000)]):
+        statistics.update(_result(i, quality=quality, size=size))
+    statistics.update(_result(5, url='https://medlineplus.gov/flu.html', quality=0.0, size=100))
+    statistics.update(_result(6, url='https://www.fda.gov/drugs/', success=False, size=2000))
+
+    assert statistics.processed == 7
+    assert statistics.successful == 6
+    assert statistics.failed == 1
+    assert statistics.quality_histogram == [1, 1, 1, 1, 1]  # The unscored 0.0 result is not bucketed
+    assert statistics.count_quality_between(0.5) == 3
+    assert statistics.count_quality_between(0.3, 0.6) == 2
+    assert statistics.content_size_distribution() == {'small': 2, 'medium': 3, 'large': 1, 'very_large': 1}
+    assert statistics.count_successful_from('cdc.gov') == 5
+    assert statistics.source_counts['www.fda.gov'] == 1
+    assert statistics.average_quality == (0.2 + 0.4 + 0.55 + 0.7 + 0.9) / 5
+    assert statistics.average_processing_time == 0.5
+
+    merged = ResultStatistics()
+    merged.merge(statistics)
+    merged.merge(statistics)
+    assert merged.processed == 14
+    assert merged.quality_histogram == [2, 2, 2, 2, 2]
+    assert merged.count_successful_from('medlineplus') == 2
+
+def test_results_fan_out_to_every_sink_with_their_group(tmp_path):
+    first, second = _RecordingSink(), _RecordingSink()
+    jsonl = JSONLResultSink(str(tmp_path / 'results.jsonl'), include_content=False)
+    pipeline = ResultPipeline(sinks=[first, second, jsonl], sample_size=2)
+
+    async def run():
+        for i in range(3):
+            await pipeline.process(_result(i, content='<html></html>'), 'flu')
+        await pipeline.process(_result(3), None)
+        await pipeline.close()
+
+    asyncio.run(run())
+
+    expected = [('task-0', 'flu'), ('task-1', 'flu'), ('task-2', 'flu'), ('task-3', None)]
+    assert first.written == expected
+    assert second.written == expected
+    assert first.closed and second.closed
+
+    records = [json.loads(line) for line in (tmp_path / 'results.jsonl').read_text().splitlines()]
+    assert [record.get('group') for record in records] == ['flu', 'flu', 'flu', None]
+    assert all('content' not in record for record in records)
+
+    assert len(pipeline.samples) == 2
+    assert all(sample.content is None for sample in pipeline.samples)
+
+def test_parent_pipeline_keeps_child_group_statistics():
+    parent = ResultPipeline()
+    child = ResultPipeline(sinks=[parent])
+
+    async def run():
+        await child.process(_result(0, quality=0.9), 'encyclopedia')
+        await child.process(_result(1, success=False), 'drug_info')
+
+    asyncio.run(run())
+
+    assert parent.statistics.processed == 2
+    assert parent.group_statistics['encyclopedia'].successful == 1
+    assert parent.group_statistics['drug_info'].failed == 1
+
+def _source(items, asynchronous):
+    if not asynchronous:
+        return list(items)
+
+    async def generate():
+        for item in items:
+            await asyncio.sleep(0)
+            yield item
+    return generate()
+
+def _collect(items, worker, window_size):
+    async def run():
+        return [result async for result in iter_sliding_window(items, worker, window_size)]
+    return asyncio.run(run())
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_window_refills_each_slot_as_soon_as_it_frees_up(asynchronous):
+    active = set()
+
+    async def run():
+        releases = [asyncio.Event() for _ in range(10)]
+
+        async def worker(item):
+            active.add(item)
+            await releases[item].wait()
+            active.discard(item)
+            return item
+
+        async def consume():
+            return [result async for result in iter_sliding_window(_source(range(10), asynchronous), worker, 3)]
+
+        consumer = asyncio.create_task(consume())
+        in_flight = []
+        for release in releases:
+            for _ in range(20):
+                await asyncio.sleep(0)
+            in_flight.append(len(active))
+            release.set()
+        return await consumer, in_flight
+
+    results, in_flight = asyncio.run(run())
+
+    assert results == list(range(10))
+    assert in_flight == [3] * 8 + [2, 1]
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_slow_item_does_not_hold_back_finished_results(asynchronous):
+    release = None
+
+    async def worker(item):
+        if item == 'slow':
+            await release.wait()
+        return item
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        results = []
+        async for result in iter_sliding_window(_source(['slow', 'a', 'b', 'c', 'd'], asynchronous), worker, 3):
+            results.append(result)
+            if len(results) == 4:
+                release.set()
+        return results
+
+    results = asyncio.run(run())
+
+    assert sorted(results[:4]) == ['a', 'b', 'c', 'd']
+    assert results[4] == 'slow'
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_empty_source_yields_nothing(asynchronous):
+    calls = []
+
+    async def worker(item):
+        calls.append(item)
+        return item
+
+    assert _collect(_source([], asynchronous), worker, 4) == []
+    assert calls == []
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_failing_worker_calls_are_skipped(asynchronous):
+    async def worker(item):
+        if item % 3 == 0:
+            raise RuntimeError(f'failed {item}')
+        return item
+
+    assert sorted(_collect(_source(range(10), asynchronous), worker, 4)) == [1, 2, 4, 5, 7, 8]
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_closing_the_window_cancels_in_flight_work(asynchronous):
+    started, cancelled, source_closed = [], [], []
+
+    async def worker(item):
+        started.append(item)
+        try:
+            if item:
+                await asyncio.Event().wait()
+            return item
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    async def generate():
+        try:
+            for item in range(10):
+                yield item
+        finally:
+            source_closed.append(True)
+
+    async def run():
+        window = iter_sliding_window(generate() if asynchronous else range(10), worker, 3)
+        first = await window.__anext__()
+        await asyncio.sleep(0)  # Let the calls already dispatched start running
+        await window.aclose()
+        return first, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    first, leftover = asyncio.run(run())
+
+    assert first == 0
+    assert len(started) > 1
+    assert sorted(cancelled) == started[1:]
+    assert leftover == []
+    assert source_closed == ([True] if asynchronous else [])
+
+def test_urls_are_interleaved_round_robin_by_host():
+    urls = [
+        'https://www.cdc.gov/a', 'https://www.cdc.gov/b', 'https://www.cdc.gov/c',
+        'https://WWW.FDA.gov/a', 'https://www.fda.gov/b', 'https://medlineplus.gov/a'
+    ]
+
+    assert interleave_by_host(urls) == [
+        'https://www.cdc.gov/a', 'https://WWW.FDA.gov/a', 'https://medlineplus.gov/a',
+        'https://www.cdc.gov/b', 'https://www.fda.gov/b', 'https://www.cdc.gov/c'
+    ]
+    assert interleave_by_host([]) == []
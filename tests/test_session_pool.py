@@ -0,0 +1,48 @@
+import asyncio
+import gc
+import threading
+import warnings
+
+from session_pool import SessionPool
+
+async def _open(pool, group):
+    return pool.get_session(group)
+
+def test_sessions_of_a_finished_loop_are_closed_when_the_loop_changes():
+    pool = SessionPool()
+    first = asyncio.run(_open(pool, 'cdc'))
+    assert not first.closed
+
+    second = asyncio.run(_open(pool, 'cdc'))
+    assert second is not first
+    assert first.closed
+    assert pool.get_stats() == {'cdc': {'closed': 0, 'limit': 30, 'limit_per_host': 10}}
+
+    # A dropped-but-open session would warn about being unclosed when collected
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        del first
+        gc.collect()
+    assert not [w for w in caught if 'Unclosed' in str(w.message)]
+
+    asyncio.run(pool.close())
+
+def test_sessions_of_a_loop_still_running_elsewhere_are_closed_on_that_loop():
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+        pool = SessionPool()
+        first = asyncio.run_coroutine_threadsafe(_open(pool, 'ncbi'), other_loop).result()
+
+        second = asyncio.run(_open(pool, 'ncbi'))
+        assert second is not first
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other_loop).result()
+        assert first.closed
+
+        asyncio.run(pool.close())
+        assert second.closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from ai_scraper_core import IntelligentTaskScheduler, ScrapingResult, ScrapingTask, ScrapingTier
+from super_parallel_engine import SuperParallelScrapingEngine
+
+class _FailingSink:
+    async def write(self, result, group=None):
+        raise OSError('disk full')
+
+    async def close(self):
+        pass
+
+def test_a_failing_worker_cancels_the_rest_of_the_pool():
+    cancelled = []
+
+    class PageScraper:
+        async def extract_content_from_url(self, url, session, attempt=0):
+            if 'fast' not in url:
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(url)
+                    raise
+            return ScrapingResult(task_id='', url=url, success=True)
+
+    engine = SuperParallelScrapingEngine()
+    engine.task_scheduler = IntelligentTaskScheduler()
+    engine.result_pipeline.add_sink(_FailingSink())
+    for host in ('slow-a', 'slow-b', 'fast'):
+        engine.task_scheduler.submit(ScrapingTask(url=f'https://{host}.example.org/', tier=ScrapingTier.TIER_1_GOVERNMENT))
+
+    async def run():
+        await engine.run_worker_pool({ScrapingTier.TIER_1_GOVERNMENT: PageScraper()}, pool_size=3)
+
+    with pytest.raises(ExceptionGroup) as failure:
+        asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+    assert failure.group_contains(OSError, match='disk full')
+    assert sorted(cancelled) == ['https://slow-a.example.org/', 'https://slow-b.example.org/']
+    assert engine.task_scheduler.pending_count() == 0
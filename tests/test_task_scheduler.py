@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+from ai_scraper_core import IntelligentTaskScheduler, ScrapingPriority, ScrapingTask, TaskTable
+
+def _task(url, priority=ScrapingPriority.MEDIUM, **fields):
+    return ScrapingTask(url=url, priority=priority, **fields)
+
+def _drain(scheduler):
+    async def run():
+        tasks = []
+        while (task := await scheduler.next_task()) is not None:
+            tasks.append(task)
+            scheduler.task_done(task)
+        return tasks
+    return asyncio.run(run())
+
+def test_tasks_are_dispatched_by_priority_then_estimated_cost():
+    scheduler = IntelligentTaskScheduler()
+    for task in [
+        _task('https://a.example.org/low', ScrapingPriority.LOW),
+        _task('https://b.example.org/slow', ScrapingPriority.HIGH, estimated_processing_time=60.0),
+        _task('https://c.example.org/critical', ScrapingPriority.CRITICAL),
+        _task('https://b.example.org/fast', ScrapingPriority.HIGH, estimated_processing_time=5.0),
+        _task('https://d.example.org/background', ScrapingPriority.BACKGROUND),
+    ]:
+        scheduler.submit(task)
+
+    assert [task.url.rsplit('/', 1)[1] for task in _drain(scheduler)] == ['critical', 'fast', 'slow', 'low', 'background']
+    assert scheduler.pending_count() == 0
+
+class _DomainDelays:
+    """Rate limiter stand-in holding back one domain until a fixed time"""
+
+    def __init__(self, held_domain, ready_at):
+        self.held_domain = held_domain
+        self.ready_at = ready_at
+
+    def next_permit_time(self, url):
+        return self.ready_at if self.held_domain in url else 0.0
+
+def test_domain_waiting_for_its_delay_is_deferred_behind_ready_work():
+    ready_at = time.monotonic() + 0.1
+    scheduler = IntelligentTaskScheduler(rate_limiter=_DomainDelays('www.cdc.gov', ready_at))
+    scheduler.submit(_task('https://www.cdc.gov/flu/', ScrapingPriority.CRITICAL))
+    scheduler.submit(_task('https://example.org/a', ScrapingPriority.LOW))
+    scheduler.submit(_task('https://example.org/b', ScrapingPriority.LOW))
+
+    dispatched = []
+
+    async def run():
+        while (task := await scheduler.next_task()) is not None:
+            dispatched.append((task.url, time.monotonic()))
+            scheduler.task_done(task)
+
+    asyncio.run(run())
+
+    assert [url for url, _ in dispatched] == ['https://example.org/a', 'https://example.org/b', 'https://www.cdc.gov/flu/']
+    assert dispatched[1][1] < ready_at <= dispatched[2][1]
+
+def test_task_table_sorts_by_success_cost_quality_then_age():
+    tasks = [
+        _task('https://example.org/0', success_probability=0.5, created_at=1.0),
+        _task('https://example.org/1', success_probability=0.9, estimated_processing_time=40.0, created_at=2.0),
+        _task('https://example.org/2', success_probability=0.9, estimated_processing_time=10.0,
+              content_quality_score=0.2, created_at=3.0),
+        _task('https://example.org/3', success_probability=0.9, estimated_processing_time=10.0,
+              content_quality_score=0.7, created_at=5.0),
+        _task('https://example.org/4', success_probability=0.9, estimated_processing_time=10.0,
+              content_quality_score=0.7, created_at=4.0, priority=ScrapingPriority.LOW),
+    ]
+    table = TaskTable(tasks)
+
+    assert table.sort_order().tolist() == [4, 3, 2, 1, 0]
+    assert table.sort_order(by_priority=True).tolist() == [3, 2, 1, 0, 4]
+    assert table.get_stats()['per_priority']['MEDIUM'] == 4
@@ -0,0 +1,88 @@
+import asyncio
+
+import aiohttp
+
+from ai_scraper_core import ScrapingTier
+from master_scraper_controller import TierScraperBase
+
+URL = 'https://www.cdc.gov/flu/index.html'
+
+class _NoWaitLimiter:
+    """Rate limiter stand-in that grants every permit at once"""
+
+    def __init__(self):
+        self.results = []
+
+    async def wait_for_permit(self, url):
+        return 0.0
+
+    def record_request_result(self, url, success, response_time, status_code=None):
+        self.results.append(success)
+
+class _Response:
+    status = 404
+    reason = 'Not Found'
+    headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+class _FlakySession:
+    """Session whose first requests fail with a connection error, recording the free slots at each request"""
+
+    def __init__(self, scraper, failures):
+        self.scraper = scraper
+        self.failures = failures
+        self.free_slots = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.free_slots.append(self.scraper.semaphore._value)
+        if self.failures:
+            self.failures -= 1
+            raise aiohttp.ClientConnectionError('connection reset')
+        return _Response()
+
+def _skip_backoff(monkeypatch):
+    backoffs = []
+
+    async def record(delay):
+        backoffs.append(delay)
+
+    monkeypatch.setattr('master_scraper_controller.asyncio.sleep', record)
+    return backoffs
+
+def _scraper_and_session(failures):
+    scraper = TierScraperBase(ScrapingTier.TIER_1_GOVERNMENT, max_concurrent=1)
+    scraper.rate_limiter = _NoWaitLimiter()
+    return scraper, _FlakySession(scraper, failures)
+
+def _extract(scraper, session):
+    # A retry that kept its slot would wait forever for the only other one
+    return asyncio.run(asyncio.wait_for(scraper.extract_content_from_url(URL, session), timeout=5))
+
+def test_retries_back_off_without_holding_a_concurrency_slot(monkeypatch):
+    backoffs = _skip_backoff(monkeypatch)
+    scraper, session = _scraper_and_session(failures=2)
+
+    result = _extract(scraper, session)
+
+    assert result.error_details == 'HTTP 404: Not Found'
+    assert backoffs == [1, 2]
+    assert session.free_slots == [0, 0, 0]  # Each attempt holds exactly the one slot
+    assert scraper.semaphore._value == 1
+    assert scraper.error_count == 2
+
+def test_gives_up_after_three_retries(monkeypatch):
+    backoffs = _skip_backoff(monkeypatch)
+    scraper, session = _scraper_and_session(failures=10)
+
+    result = _extract(scraper, session)
+
+    assert not result.success
+    assert result.error_details == 'connection reset'
+    assert backoffs == [1, 2, 4]
+    assert scraper.rate_limiter.results == [False] * 4
+    assert scraper.semaphore._value == 1
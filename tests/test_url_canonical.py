@@ -0,0 +1,75 @@
+import asyncio
+
+from url_canonical import SeenURLIndex, canonicalize_url, url_hash, url_pattern
+from url_frontier import URLFrontier
+
+def test_canonicalize_normalizes_case_ports_fragments_and_slashes():
+    assert canonicalize_url('HTTPS://WWW.CDC.GOV:443//flu//index.html/#top') == 'https://www.cdc.gov/flu/index.html'
+    assert canonicalize_url('http://example.org:8080/a/') == 'http://example.org:8080/a'
+    assert canonicalize_url('https://example.org') == 'https://example.org/'
+    assert canonicalize_url('https://example.org./') == 'https://example.org/'
+
+def test_canonicalize_drops_tracking_params_and_sorts_query():
+    url = 'https://example.org/search?utm_source=x&q=flu&gclid=1&page=2&SessionID=abc'
+    assert canonicalize_url(url) == 'https://example.org/search?page=2&q=flu'
+    assert canonicalize_url('https://example.org/?b=&a=1') == 'https://example.org/?a=1&b='
+
+def test_canonicalize_keeps_ipv6_hosts():
+    assert canonicalize_url('http://[::1]:8000/x/') == 'http://[::1]:8000/x'
+
+def test_url_hash_is_stable_across_equivalent_urls():
+    assert url_hash('https://www.cdc.gov/flu/') == url_hash('HTTPS://www.cdc.gov/flu?utm_medium=email')
+    assert url_hash('https://www.cdc.gov/flu') != url_hash('https://www.cdc.gov/measles')
+    assert url_hash('https://www.cdc.gov/flu') != 0
+
+def test_url_pattern_replaces_numeric_segments_and_page_numbers():
+    assert url_pattern('https://www.cdc.gov/mmwr/volumes/72/wr/mm7201.htm/') == 'www.cdc.gov/mmwr/volumes/[ID]/wr/mm7201.htm'
+    assert url_pattern('https://example.org/news/page=12') == 'example.org/news/page=[NUM]'
+    assert url_pattern('https://example.org/items/42/') == url_pattern('https://example.org/items/7')
+
+def test_seen_index_deduplicates_equivalent_urls():
+    index = SeenURLIndex()
+    assert index.add('https://www.cdc.gov/flu/')
+    assert not index.add('https://WWW.cdc.gov/flu#symptoms')
+    assert 'https://www.cdc.gov/flu' in index
+    assert 'https://www.cdc.gov/measles' not in index
+    assert len(index) == 1
+
+def test_seen_index_grows_and_keeps_every_url():
+    index = SeenURLIndex(initial_capacity=16)
+    urls = [f'https://example.org/page/{i}' for i in range(5000)]
+    assert all(index.add(url) for url in urls)
+    assert not any(index.add(url) for url in urls)
+    assert all(url in index for url in urls)
+
+    stats = index.get_stats()
+    assert stats['urls_seen'] == 5000
+    assert stats['load_factor'] <= 0.7
+    assert stats['capacity'] & (stats['capacity'] - 1) == 0
+
+def test_seen_index_resolves_slot_collisions():
+    index = SeenURLIndex(initial_capacity=16, canonicalize=False)
+    # Digests that all map to slot 3 force linear probing, including across a resize
+    digests = {f'key-{i}': (i + 1) << 20 | 3 for i in range(40)}
+    index._hash = digests.__getitem__
+
+    assert all(index.add(key) for key in digests)
+    assert all(key in index for key in digests)
+    assert not any(index.add(key) for key in digests)
+    assert len(index) == 40
+
+def test_frontier_fetches_urls_as_discovered(tmp_path):
+    frontier = URLFrontier('cdc/diseases', path=str(tmp_path / 'frontier.sqlite3'))
+    assert frontier.add_many(['https://www.cdc.gov/flu/', 'https://www.cdc.gov/flu', 'https://www.cdc.gov/a/?b=2&a=1']) == 2
+
+    async def drain():
+        return [url async for url in frontier]
+
+    fetched = asyncio.run(drain())
+    assert fetched == ['https://www.cdc.gov/flu/', 'https://www.cdc.gov/a/?b=2&a=1']
+
+    # Completion is recorded under the canonical key, whatever form the result URL has
+    for url in fetched:
+        frontier.mark_done(url)
+    frontier.flush()
+    assert frontier.get_stats()['done'] == 2